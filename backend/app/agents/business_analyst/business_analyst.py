@@ -733,7 +733,7 @@ class BusinessAnalyst(BaseAgent, PausableAgentMixin):
                     await self.message_user("thinking", "Đang chuẩn bị câu hỏi...")
         
         # Add user message to shared memory
-        self.context.add_message("user", task.content)  # Save original message to memory
+        self.context.add_message("user", task.content, message_id=task.message_id)  # Save original message to memory
         
         # Load existing PRD from database
         existing_prd = self._load_existing_prd()
@@ -871,10 +871,10 @@ class BusinessAnalyst(BaseAgent, PausableAgentMixin):
             # Add response to shared memory (for conversation context)
             response_summary = result_data.get("summary", "") if isinstance(result_data, dict) else str(result_data)[:200]
             if response_summary:
-                self.context.add_message("assistant", response_summary)
+                self.context.add_message("assistant", response_summary, message_id=self._last_saved_message_id)
             
-            # Check if we should create a conversation summary
-            await self.context.maybe_summarize()
+            # Summarize in the background if enough messages piled up
+            self.context.maybe_summarize()
             
             return TaskResult(
                 success=True,
@@ -10,6 +10,7 @@ from sqlmodel import Session, func, select
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.core.agent.llm_factory import get_llm, create_llm, MODELS
+from app.core.agent.response_cache import bypass_response_cache
 
 from .state import BAState
 from .schemas import (
@@ -29,6 +30,7 @@ from .schemas import (
 from app.core.agent.prompt_utils import (
     load_prompts_yaml,
     extract_agent_personality,
+    cached_system_message,
 )
 
 # Load prompts from YAML (same pattern as Developer V2)
@@ -63,7 +65,8 @@ RETRY_BACKOFF_BASE = 1.0  # Linear backoff: 1s, 2s
 
 # Step mappings for BA agent
 BA_STEP_MAP = {
-    "fast": "router",      # Intent, simple tasks
+    "fast": "router",      # Simple tasks
+    "classify": "classify", # Intent (response-cached)
     "default": "analyze",  # PRD, questions
     "complex": "implement", # Stories
 }
@@ -77,6 +80,7 @@ def _get_llm(tier: str = "default"):
 
 # Pre-configured LLM instances
 _fast_llm = _get_llm("fast")
+_classify_llm = _get_llm("classify")
 _default_llm = _get_llm("default")
 _story_llm = _get_llm("complex")
 
@@ -118,10 +122,12 @@ async def _invoke_structured(
     for attempt in range(max_retries + 1):  # +1 for initial attempt
         try:
             structured_llm = llm.with_structured_output(schema)
-            if config:
-                result = await structured_llm.ainvoke(messages, config=config)
-            else:
-                result = await structured_llm.ainvoke(messages)
+            # Retries must reach the model, not replay a cached bad answer
+            with bypass_response_cache(attempt > 0):
+                if config:
+                    result = await structured_llm.ainvoke(messages, config=config)
+                else:
+                    result = await structured_llm.ainvoke(messages)
             
             # Check if result is None (LLM failed to return structured output)
             if result is None:
@@ -624,7 +630,7 @@ async def analyze_intent(state: BAState, agent=None) -> dict:
         fallback_reason = "Default fallback to interview"
     
     result = await _invoke_structured(
-        llm=_fast_llm,
+        llm=_classify_llm,
         schema=IntentOutput,
         messages=messages,
         config=_cfg(state, "analyze_intent"),
@@ -1476,8 +1482,9 @@ async def _generate_stories_for_epic(
         all_epic_ids=", ".join(all_epic_ids)
     )
     
+    # Same prefix for every epic of the PRD (called once per epic, in parallel)
     messages = [
-        SystemMessage(content=system_prompt),
+        cached_system_message(system_prompt),
         HumanMessage(content=user_prompt)
     ]
     
@@ -3326,7 +3333,6 @@ async def verify_story_simple(state: dict, agent=None) -> dict:
     system_prompt = _sys_prompt(agent, "verify_story")
     user_prompt = _user_prompt(
         "verify_story",
-        prd_context=prd_context,
         stories_context=stories_context,
         story_title=story_info['title'],
         story_description=story_info['description'],
@@ -3334,8 +3340,9 @@ async def verify_story_simple(state: dict, agent=None) -> dict:
         story_type=story_info['type']
     )
 
+    # Persona + PRD are the same for every story of the project; cache them as the prefix
     messages = [
-        SystemMessage(content=system_prompt),
+        cached_system_message(system_prompt, f"PRD Context:\n{prd_context}"),
         HumanMessage(content=user_prompt)
     ]
     
@@ -30,6 +30,14 @@ class Developer(BaseAgent, PausableAgentMixin):
         # Initialize PausableAgentMixin (provides pause/resume/cancel functionality)
         self.init_pausable_mixin()
     
+    async def start(self) -> bool:
+        """Start the agent and pre-warm the project's worktree pool in the background."""
+        started = await super().start()
+        if started:
+            from app.agents.developer.src.nodes.setup_workspace import warm_worktree_pool
+            warm_worktree_pool(self.main_workspace)
+        return started
+    
     # Override _cleanup_story_db_resources for Developer-specific cleanup (running_pid)
     async def _cleanup_story_db_resources(self, story_id: str):
         """Cleanup story-specific DB resources - kill running process."""
@@ -987,8 +995,14 @@ class Developer(BaseAgent, PausableAgentMixin):
         from app.models import Story
         
         try:
+            # 0. Drop the story database
+            from app.agents.developer.src.utils.db_container import release_story_database
+            await asyncio.to_thread(release_story_database, story_id)
+            
             # 1. Remove worktree
             if worktree_path and Path(worktree_path).exists():
+                from app.agents.developer.src.utils.workspace_index import drop_workspace_index
+                drop_workspace_index(worktree_path)
                 try:
                     subprocess.run(
                         ["git", "worktree", "remove", worktree_path, "--force"],
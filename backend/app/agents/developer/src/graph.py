@@ -103,7 +103,7 @@ def route_after_analyze_error(state: DeveloperState) -> Literal["implement", "ru
 async def pause_checkpoint(state: DeveloperState, agent=None) -> DeveloperState:
     """Checkpoint node for pause - calls interrupt() and resumes to implement_parallel."""
     from langgraph.types import interrupt
-    interrupt({"reason": "pause", "node": "pause_checkpoint", "current_layer": state.get("current_layer", 0)})
+    interrupt({"reason": "pause", "node": "pause_checkpoint", "completed_steps": len(state.get("completed_steps") or [])})
     # After resume, clear PAUSED action to continue
     return {**state, "action": "IMPLEMENT"}
 
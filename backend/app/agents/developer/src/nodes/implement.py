@@ -1,4 +1,5 @@
 """Implement node - Direct file output without tools."""
+import asyncio
 import json
 import logging
 import os
@@ -7,17 +8,22 @@ import subprocess
 import hashlib
 from pathlib import Path
 from typing import List, Dict, Optional
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 from app.agents.developer.src.state import DeveloperState
 from app.agents.developer.src.schemas import ImplementOutput
 from app.agents.developer.src.utils.llm_utils import get_langfuse_config as _cfg, track_node
 from app.agents.developer.src.utils.signal_utils import check_interrupt_signal
 from app.agents.developer.src.utils.prompt_utils import format_input_template as _format_input_template, build_system_prompt as _build_system_prompt
 from app.utils.token_utils import truncate_to_tokens
+from app.core.agent.prompt_utils import cached_system_message
+from app.core.agent.response_cache import bypass_response_cache
+from app.core.agent.structured_stream import astream_structured
+from app.core.config import settings
 from app.agents.developer.src.nodes._llm import implement_llm
 from app.agents.developer.src.skills import SkillRegistry
 from app.agents.developer.src.config import MAX_CONCURRENT, MAX_DEBUG_REVIEWS
 from app.utils.git_utils import git_commit_step
+from app.utils.subprocess_utils import run_process
 
 logger = logging.getLogger(__name__)
 
@@ -191,7 +197,8 @@ def _preload_skills(registry: SkillRegistry, skill_ids: list[str], include_bundl
     if not skill_ids:
         return ""
     parts = []
-    for sid in skill_ids:
+    # Sorted so steps with the same skills share a byte-identical (cacheable) system prompt
+    for sid in sorted(set(skill_ids)):
         skill = registry.get_skill(sid)
         if not skill:
             continue
@@ -298,10 +305,12 @@ async def implement(state: DeveloperState, config: dict = None, agent=None) -> D
         # Use structured output
         # Get langfuse callbacks from runtime config (not state - avoids serialization issues)
         structured_llm = implement_llm.with_structured_output(ImplementOutput)
-        output = await structured_llm.ainvoke(
-            [SystemMessage(content=system_prompt), HumanMessage(content=input_text)], 
-            config=_cfg(config, "implement_code")
-        )
+        # Debug / review (LBTM) / react passes need a fresh answer
+        with bypass_response_cache(is_debug or review_count > 0 or react_loop > 0):
+            output = await structured_llm.ainvoke(
+                [cached_system_message(system_prompt), HumanMessage(content=input_text)], 
+                config=_cfg(config, "implement_code")
+            )
         file_content = output.content if output else None
         
         # FIX #1: Removed post-LLM signal check - handled by _run_graph_with_signal_check()
@@ -316,12 +325,12 @@ async def implement(state: DeveloperState, config: dict = None, agent=None) -> D
         new_modified = get_modified_files()
         if any(f.replace("\\", "/").endswith("schema.prisma") for f in new_modified):
             try:
-                subprocess.run("pnpm exec prisma generate", cwd=workspace_path, shell=True, capture_output=True, timeout=60)
-                subprocess.run("pnpm exec prisma db push --accept-data-loss", cwd=workspace_path, shell=True, capture_output=True, timeout=60)
+                await run_process("pnpm exec prisma generate", cwd=workspace_path, timeout=60, node="implement")
+                await run_process("pnpm exec prisma db push --accept-data-loss", cwd=workspace_path, timeout=60, node="implement")
                 seed_file = Path(workspace_path) / "prisma" / "seed.ts"
                 if seed_file.exists():
-                    subprocess.run("pnpm prisma db seed", cwd=workspace_path, shell=True, capture_output=True, timeout=60)
-            except:
+                    await run_process("pnpm prisma db seed", cwd=workspace_path, timeout=60, node="implement")
+            except Exception:
                 pass
         
         all_modified = list(set(state.get("files_modified", []) + new_modified))
@@ -354,10 +363,10 @@ async def implement(state: DeveloperState, config: dict = None, agent=None) -> D
         return {**state, "error": str(e), "action": "RESPOND"}
 
 
-from app.agents.developer.src.nodes.parallel_utils import group_steps_by_layer, run_layer_parallel, MAX_CONCURRENT
+from app.agents.developer.src.nodes.parallel_utils import build_step_dag, dag_depth, run_dag_parallel, MAX_CONCURRENT
 
 
-async def _implement_single_step(step: Dict, state: DeveloperState, skill_registry: SkillRegistry, workspace_path: str, deps_content: Dict, created_components: Dict[str, str] = None, config: dict = None) -> Dict:
+async def _implement_single_step(step: Dict, state: DeveloperState, skill_registry: SkillRegistry, workspace_path: str, deps_content: Dict, created_components: Dict[str, str] = None, config: dict = None, story_logger=None) -> Dict:
     file_path = step.get("file_path", "")
     task = step.get("task", step.get("description", ""))
     action = step.get("action", "")
@@ -395,10 +404,22 @@ async def _implement_single_step(step: Dict, state: DeveloperState, skill_regist
         # Use structured output
         # Get langfuse callbacks from runtime config (not state - avoids serialization issues)
         structured_llm = implement_llm.with_structured_output(ImplementOutput)
-        output = await structured_llm.ainvoke(
-            [SystemMessage(content=system_prompt), HumanMessage(content=input_text)], 
-            config=_cfg(config or {}, f"impl_{file_path}")
-        )
+        messages = [cached_system_message(system_prompt), HumanMessage(content=input_text)]
+        llm_config = _cfg(config or {}, f"impl_{file_path}")
+        
+        if story_logger is not None and story_logger.story_id and file_path and settings.AGENT_STREAM_IMPLEMENT_OUTPUT:
+            # Stream partial content to the story room; the file is written only once the output validates
+            async def on_delta(field: str, text: str) -> None:
+                if field == "content":
+                    await story_logger.stream(file_path, text)
+            
+            async def on_complete(field: str, value) -> None:
+                if field == "content" and value:
+                    await story_logger.stream(file_path, done=True)
+            
+            output = await astream_structured(structured_llm, messages, llm_config, on_delta=on_delta, on_complete=on_complete)
+        else:
+            output = await structured_llm.ainvoke(messages, config=llm_config)
         file_content = output.content if output else None
         
         if file_content and file_path:
@@ -414,7 +435,7 @@ async def _implement_single_step(step: Dict, state: DeveloperState, skill_regist
 
 @track_node("implement_parallel")
 async def implement_parallel(state: DeveloperState, config: dict = None, agent=None) -> DeveloperState:
-    """Execute steps in parallel by layer."""
+    """Execute steps in parallel, each as soon as its dependencies are written."""
     # FIX #1: Removed duplicate signal check - handled by _run_graph_with_signal_check()
     from app.agents.developer.src.utils.story_logger import StoryLogger
     
@@ -433,111 +454,90 @@ async def implement_parallel(state: DeveloperState, config: dict = None, agent=N
         
         skill_registry = state.get("skill_registry") or SkillRegistry.load(tech_stack)
         deps_content = dict(state.get("dependencies_content", {}))
-        layers = group_steps_by_layer(plan_steps)
+        dag = build_step_dag(plan_steps)
         
-        all_modified, all_errors = [], []
+        all_modified = list(state.get("files_modified") or []) if state.get("completed_steps") else []
+        all_errors = []
         created_components = {}
         for step in plan_steps:
             fp = step.get("file_path", "")
             if "/components/" in fp and fp.endswith(".tsx"):
                 created_components[os.path.basename(fp).replace(".tsx", "")] = "@/" + fp.replace(".tsx", "")
         
-        sorted_layer_keys = sorted(layers.keys())
-        total_layers = len(sorted_layer_keys)
-        
         # Milestone message at start (saved to DB)
-        await story_logger.message(f"🔨 Implementing {len(plan_steps)} files in {total_layers} layers...")
-        
-        # Read completed layer from state (for resume support)
-        start_layer = state.get("current_layer", 0)
-        if start_layer > 0:
-            await story_logger.info(f"▶️ Resuming from layer {start_layer + 1}/{total_layers}")
+        await story_logger.message(f"🔨 Implementing {len(plan_steps)} files (dependency depth {dag_depth(dag)}, up to {MAX_CONCURRENT} at once)...")
+        
+        # Completed steps from the pause checkpoint (resume support)
+        completed = set(state.get("completed_steps") or [])
+        if completed:
+            await story_logger.info(f"▶️ Resuming: {len(completed)}/{len(plan_steps)} files already done")
+        
+        paused = False
+        
+        def should_stop() -> bool:
+            """Checked before each step starts: cancel raises, pause stops new steps."""
+            nonlocal paused
+            if not story_id:
+                return False
+            signal = check_interrupt_signal(story_id, agent)
+            if signal == "cancel":
+                from app.core.agent.mixins import StoryStoppedException
+                from app.models.base import StoryAgentState
+                raise StoryStoppedException(
+                    story_id,
+                    StoryAgentState.CANCEL_REQUESTED,
+                    f"Cancel signal detected after {len(completed)}/{len(plan_steps)} steps"
+                )
+            paused = signal == "pause"
+            return paused
+        
+        async def on_step_done(idx: int, r: Dict) -> None:
+            """Make a written file available to its dependents, then commit it."""
+            fp = r.get("file_path") or plan_steps[idx].get("file_path", "")
+            if r.get("success"):
+                all_modified.extend(r.get("modified_files", []))
+                if fp.endswith("schema.prisma"):
+                    try:
+                        await run_process("pnpm exec prisma generate", cwd=workspace_path, timeout=60, node="implement_parallel")
+                        await run_process("pnpm exec prisma db push --accept-data-loss", cwd=workspace_path, timeout=60, node="implement_parallel")
+                    except Exception:
+                        pass
+                full = os.path.join(workspace_path, fp)
+                if fp and os.path.exists(full):
+                    try:
+                        with open(full, 'r', encoding='utf-8') as f:
+                            deps_content[fp] = f.read()
+                        if "/components/" in fp and fp.endswith(".tsx"):
+                            created_components[os.path.basename(fp).replace(".tsx", "")] = "@/" + fp.replace(".tsx", "")
+                    except:
+                        pass
+                step_desc = f"{plan_steps[idx].get('action', 'modify')} {fp}"
+                # git add/commit hold the worktree's index lock; run them off the loop
+                await asyncio.to_thread(git_commit_step, workspace_path, idx + 1, step_desc, r.get("modified_files") or [fp])
+            elif r.get("error"):
+                all_errors.append(f"{fp}: {r.get('error')}")
+            completed.add(idx)
+            await story_logger.info(f"📄 {len(completed)}/{len(plan_steps)}: {fp.split('/')[-1]}")
+        
+        await run_dag_parallel(
+            plan_steps,
+            lambda s: _implement_single_step(s, state, skill_registry, workspace_path, deps_content, created_components, config, story_logger),
+            MAX_CONCURRENT,
+            completed=set(completed),
+            on_step_done=on_step_done,
+            should_stop=should_stop,
+            dag=dag,
+        )
         
-        for layer_idx, layer_num in enumerate(sorted_layer_keys, 1):
-            # Skip already completed layers (resume support)
-            if layer_idx <= start_layer:
-                continue
-            
-            # Check for interrupt BEFORE starting layer
-            if story_id:
-                signal = check_interrupt_signal(story_id, agent)
-                if signal:
-                    if signal == "cancel":
-                        from app.core.agent.mixins import StoryStoppedException
-                        from app.models.base import StoryAgentState
-                        raise StoryStoppedException(
-                            story_id,
-                            StoryAgentState.CANCEL_REQUESTED,
-                            f"Cancel signal detected at layer {layer_idx}"
-                        )
-                    elif signal == "pause":
-                        # Pause: return state to save checkpoint for resume
-                        return {
-                            **state,
-                            "current_layer": layer_idx - 1,
-                            "files_modified": list(set(all_modified)),
-                            "dependencies_content": deps_content,
-                            "action": "PAUSED",
-                        }
-            
-            layer_steps = layers[layer_num]
-            is_parallel = len(layer_steps) > 1 and layer_num >= 4  # CHANGED: từ 5 → 4
-            
-            # Log layer progress
-            files_list = ", ".join([s.get("file_path", "").split("/")[-1] for s in layer_steps[:3]])
-            more = f" +{len(layer_steps)-3}" if len(layer_steps) > 3 else ""
-            await story_logger.info(f"📂 Layer {layer_idx}/{total_layers}: {files_list}{more}")
-            
-            if is_parallel:
-                results = await run_layer_parallel(layer_steps, lambda s, c=created_components: _implement_single_step(s, state, skill_registry, workspace_path, deps_content, c, config), state, MAX_CONCURRENT)
-            else:
-                results = [await _implement_single_step(s, state, skill_registry, workspace_path, deps_content, created_components, config) for s in layer_steps]
-            
-            for r in results:
-                if r.get("success"):
-                    all_modified.extend(r.get("modified_files", []))
-                elif r.get("error"):
-                    all_errors.append(f"{r.get('file_path')}: {r.get('error')}")
-            
-            if layer_num == 1 and any("schema.prisma" in str(r.get("file_path", "")) for r in results):
-                try:
-                    subprocess.run("pnpm exec prisma generate", cwd=workspace_path, shell=True, capture_output=True, timeout=60)
-                    subprocess.run("pnpm exec prisma db push --accept-data-loss", cwd=workspace_path, shell=True, capture_output=True, timeout=60)
-                    sp = os.path.join(workspace_path, "prisma/schema.prisma")
-                    if os.path.exists(sp):
-                        with open(sp, 'r', encoding='utf-8') as f:
-                            deps_content["prisma/schema.prisma"] = f.read()
-                except:
-                    pass
-            elif layer_num == 2:
-                # Layer 2: Types (was layer 3)
-                tp = os.path.join(workspace_path, "src/types/index.ts")
-                if os.path.exists(tp):
-                    with open(tp, 'r', encoding='utf-8') as f:
-                        deps_content["src/types/index.ts"] = f.read()
-            elif layer_num >= 4:
-                # Layer 4+: API/Components (was layer 5+)
-                # Seed.ts is now in layer 4 and runs in parallel with API routes
-                for r in results:
-                    fp = r.get("file_path", "")
-                    if fp and fp.endswith(".tsx"):
-                        full = os.path.join(workspace_path, fp)
-                        if os.path.exists(full):
-                            try:
-                                with open(full, 'r', encoding='utf-8') as f:
-                                    deps_content[fp] = f.read()
-                                if "/components/" in fp:
-                                    created_components[os.path.basename(fp).replace(".tsx", "")] = "@/" + fp.replace(".tsx", "")
-                            except:
-                                pass
-            
-            # Git commit after each layer
-            layer_files = [r.get("file_path") for r in results if r.get("success") and r.get("file_path")]
-            if layer_files:
-                layer_desc = f"layer {layer_num} - {len(layer_files)} files"
-                git_commit_step(workspace_path, layer_num, layer_desc, layer_files)
-            
-
+        if paused and len(completed) < len(plan_steps):
+            # Pause: return state to save checkpoint for resume
+            return {
+                **state,
+                "completed_steps": sorted(completed),
+                "files_modified": list(set(all_modified)),
+                "dependencies_content": deps_content,
+                "action": "PAUSED",
+            }
         
         # Milestone message at end (saved to DB)
         if all_errors:
@@ -545,7 +545,7 @@ async def implement_parallel(state: DeveloperState, config: dict = None, agent=N
         else:
             await story_logger.message(f"Implemented {len(all_modified)} files successfully")
         
-        return {**state, "current_step": len(plan_steps), "total_steps": len(plan_steps), "current_layer": total_layers, "files_modified": list(set(all_modified)), "dependencies_content": deps_content, "parallel_errors": all_errors if all_errors else None, "message": f"Implemented {len(all_modified)} files ({len(layers)} layers)", "action": "VALIDATE"}
+        return {**state, "current_step": len(plan_steps), "total_steps": len(plan_steps), "completed_steps": [], "files_modified": list(set(all_modified)), "dependencies_content": deps_content, "parallel_errors": all_errors if all_errors else None, "message": f"Implemented {len(all_modified)} files (dependency depth {dag_depth(dag)})", "action": "VALIDATE"}
     except Exception as e:
         from langgraph.errors import GraphInterrupt
         from app.core.agent.mixins import StoryStoppedException
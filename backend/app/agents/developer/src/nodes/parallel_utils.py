@@ -1,8 +1,9 @@
 """Parallel implementation utilities."""
 import asyncio
+import heapq
 import logging
 from collections import defaultdict
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
 
 from app.agents.developer.src.config import MAX_CONCURRENT
 
@@ -139,6 +140,176 @@ async def run_layer_parallel(
     return processed_results
 
 
+# =============================================================================
+# DEPENDENCY DAG SCHEDULER
+# =============================================================================
+
+def build_step_dag(steps: List[Dict]) -> Dict[int, Set[int]]:
+    """Map each step index to the indices of the steps it must wait for.
+
+    Edges come from:
+    - Declared ``dependencies`` on files written by other steps in the plan
+      (dependencies on existing files are already satisfied)
+    - File conflicts: steps writing the same file run in plan order
+    - ``prisma/schema.prisma``: every step waits for it, since ``prisma generate``
+      runs once the schema is written
+
+    Cycles are broken by dropping their edges to later steps (plan order wins).
+    """
+    writers: Dict[str, List[int]] = defaultdict(list)
+    for idx, step in enumerate(steps):
+        file_path = step.get("file_path", "")
+        if file_path:
+            writers[file_path].append(idx)
+
+    schema_steps = [idx for fp, idxs in writers.items() if fp.endswith("schema.prisma") for idx in idxs]
+    deps: Dict[int, Set[int]] = {}
+    for idx, step in enumerate(steps):
+        wait_for: Set[int] = set()
+        for dep in step.get("dependencies") or []:
+            # The last writer before this step, or any writer if the dependency comes later in the plan
+            dep_writers = writers.get(dep, [])
+            earlier = [w for w in dep_writers if w < idx]
+            wait_for.update(earlier[-1:] or dep_writers)
+        same_file = [w for w in writers.get(step.get("file_path", ""), []) if w < idx]
+        wait_for.update(same_file[-1:])
+        wait_for.update(schema_steps)
+        wait_for.discard(idx)
+        deps[idx] = wait_for
+
+    for cycle in find_cycles(deps):
+        logger.warning(
+            f"[dag] Dependency cycle between {sorted(steps[i].get('file_path', i) for i in cycle)}, "
+            f"falling back to plan order for those steps"
+        )
+        for idx in cycle:
+            deps[idx] = {d for d in deps[idx] if d < idx or d not in cycle}
+    return deps
+
+
+def find_cycles(deps: Dict[int, Set[int]]) -> List[Set[int]]:
+    """Strongly connected components with more than one step, via Tarjan's algorithm.
+
+    Steps that are only downstream of a cycle are not part of it.
+    """
+    index: Dict[int, int] = {}
+    lowlink: Dict[int, int] = {}
+    stack: List[int] = []
+    on_stack: Set[int] = set()
+    cycles: List[Set[int]] = []
+
+    def visit(idx: int) -> None:
+        index[idx] = lowlink[idx] = len(index)
+        stack.append(idx)
+        on_stack.add(idx)
+        for dep in deps[idx]:
+            if dep not in index:
+                visit(dep)
+                lowlink[idx] = min(lowlink[idx], lowlink[dep])
+            elif dep in on_stack:
+                lowlink[idx] = min(lowlink[idx], index[dep])
+        if lowlink[idx] == index[idx]:
+            component: Set[int] = set()
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.add(member)
+                if member == idx:
+                    break
+            if len(component) > 1:
+                cycles.append(component)
+
+    for idx in deps:
+        if idx not in index:
+            visit(idx)
+    return cycles
+
+
+def dag_depth(deps: Dict[int, Set[int]]) -> int:
+    """Length of the longest dependency chain (number of steps)."""
+    depth: Dict[int, int] = {}
+
+    def visit(idx: int) -> int:
+        if idx not in depth:
+            depth[idx] = 1 + max((visit(d) for d in deps[idx]), default=0)
+        return depth[idx]
+
+    return max((visit(idx) for idx in deps), default=0)
+
+
+async def run_dag_parallel(
+    steps: List[Dict],
+    implement_fn: Callable[[Dict], Awaitable[Dict]],
+    max_concurrent: int = MAX_CONCURRENT,
+    completed: Optional[Iterable[int]] = None,
+    on_step_done: Optional[Callable[[int, Dict], Awaitable[None]]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    dag: Optional[Dict[int, Set[int]]] = None,
+) -> Dict[int, Dict]:
+    """Run plan steps as soon as the steps they depend on are written.
+
+    Args:
+        steps: Plan steps
+        implement_fn: Implements one step, returns its result dict
+        max_concurrent: Global cap on steps in flight
+        completed: Step indices already done (resume); they are not re-run
+        on_step_done: Awaited with (index, result) after each step, in completion
+            order and never concurrently (deps/context updates, git commit)
+        should_stop: Checked before starting each step; when it returns True no
+            new step starts and the in-flight ones are awaited
+        dag: Result of ``build_step_dag(steps)`` if the caller already built it
+
+    Returns:
+        Results of the steps run by this call, keyed by step index. A failed
+        step counts as done, so its dependents still run (as with layers).
+    """
+    deps = dag if dag is not None else build_step_dag(steps)
+    done: Set[int] = set(completed or ())
+    pending = {idx for idx in deps if idx not in done}
+    # Ready steps start lowest layer first, then in plan order
+    priority = {idx: (get_layer_priority(steps[idx].get("file_path", "")), idx) for idx in deps}
+    ready: List[tuple] = []
+    queued: Set[int] = set()
+    running: Dict[asyncio.Task, int] = {}
+    results: Dict[int, Dict] = {}
+
+    def enqueue_ready() -> None:
+        for idx in pending:
+            if idx not in queued and deps[idx] <= done:
+                heapq.heappush(ready, (priority[idx], idx))
+                queued.add(idx)
+
+    enqueue_ready()
+    try:
+        while pending:
+            stopping = should_stop is not None and ready and len(running) < max_concurrent and should_stop()
+            while ready and len(running) < max_concurrent and not stopping:
+                _, idx = heapq.heappop(ready)
+                running[asyncio.ensure_future(implement_fn(steps[idx]))] = idx
+            if not running:
+                break
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                idx = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"[dag] Step {idx} ({steps[idx].get('file_path')}) failed: {e}")
+                    result = {"file_path": steps[idx].get("file_path"), "success": False, "error": str(e)}
+                results[idx] = result
+                if on_step_done:
+                    await on_step_done(idx, result)
+                done.add(idx)
+                pending.discard(idx)
+            enqueue_ready()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    return results
+
+
 def merge_parallel_results(results: List[Dict], base_state: Dict) -> Dict:
     """Merge results from parallel execution into state."""
     merged = {**base_state}
@@ -5,6 +5,7 @@ from pathlib import Path
 from langchain_core.messages import SystemMessage, HumanMessage
 from app.agents.developer.src.state import DeveloperState
 from app.agents.developer.src.utils.llm_utils import get_langfuse_config as _cfg, flush_langfuse, track_node
+from app.agents.developer.src.utils.workspace_index import get_workspace_index, is_developer_important
 from app.agents.developer.src.nodes._llm import  fast_llm
 from app.agents.developer.src.schemas import SimplePlanOutput
 from app.agents.developer.src.skills.registry import SkillRegistry
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 BOILERPLATE_FILES = {"src/lib/prisma.ts", "src/lib/utils.ts", "src/auth.ts"}
 
 class FileRepository:
-    """Pre-computed workspace context for zero-shot planning."""
+    """Pre-computed workspace context for zero-shot planning (view over the shared workspace index)."""
     
     def __init__(self, workspace_path: str):
         self.workspace_path = workspace_path
@@ -23,36 +24,12 @@ class FileRepository:
         self.file_tree = []
         self.components = {}
         self.api_routes = []
-        self._scan()
-    
-    def _scan(self):
-        if not self.workspace_path or not os.path.exists(self.workspace_path):
-            return
-        exclude_dirs = {'node_modules', '.next', '.git', '__pycache__', '.prisma'}
-        for root, dirs, files in os.walk(self.workspace_path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            for f in files:
-                if f.endswith(('.ts', '.tsx', '.prisma', '.json', '.md')):
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, self.workspace_path).replace('\\', '/')
-                    self.file_tree.append(rel_path)
-                    if self._is_important(rel_path):
-                        self.files[rel_path] = self._read_file(full_path)
-                    if '/components/' in rel_path and rel_path.endswith('.tsx') and '/ui/' not in rel_path:
-                        name = os.path.basename(rel_path).replace('.tsx', '')
-                        self.components[name] = '@/' + rel_path.replace('.tsx', '')
-                    if '/api/' in rel_path and rel_path.endswith('route.ts'):
-                        self.api_routes.append(rel_path)
-    
-    def _is_important(self, path: str) -> bool:
-        return any(path.endswith(p) for p in ['prisma/schema.prisma', 'src/types/index.ts', 'package.json', 'src/app/layout.tsx', 'src/lib/prisma.ts'])
-    
-    def _read_file(self, full_path: str) -> str:
-        try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except:
-            return ""
+        if workspace_path and os.path.exists(workspace_path):
+            index = get_workspace_index(workspace_path)
+            self.files = index.files_for(is_developer_important)
+            self.file_tree = index.file_tree
+            self.components = index.components
+            self.api_routes = index.api_routes
     
     def to_context(self) -> str:
         parts = ["## Project Files (COMPLETE)", "```", "\n".join(sorted(self.file_tree)), "```"]
@@ -254,7 +231,7 @@ Create implementation plan."""
         if steps:
             await story_logger.message(f"Kế hoạch: {len(steps)} files, {len(layers)} layers")
         
-        return {**state, "implementation_plan": steps, "total_steps": len(steps), "dependencies_content": deps_content, "current_step": 0, "parallel_layers": {float(k): [s.get("file_path") for s in v] for k, v in layers.items()}, "can_parallel": can_parallel, "action": "IMPLEMENT", "message": f"Plan: {len(steps)} steps ({len(layers)} layers)" + (" [PARALLEL]" if can_parallel else "")}
+        return {**state, "implementation_plan": steps, "total_steps": len(steps), "dependencies_content": deps_content, "current_step": 0, "completed_steps": [], "parallel_layers": {float(k): [s.get("file_path") for s in v] for k, v in layers.items()}, "can_parallel": can_parallel, "action": "IMPLEMENT", "message": f"Plan: {len(steps)} steps ({len(layers)} layers)" + (" [PARALLEL]" if can_parallel else "")}
     except Exception as e:
         from langgraph.errors import GraphInterrupt
         if isinstance(e, GraphInterrupt):
@@ -4,12 +4,17 @@ import concurrent.futures
 import hashlib
 import json
 import logging
+import os
+import re
 import shutil
 import socket
+from functools import partial
 from pathlib import Path
 from typing import Tuple, Optional, List
 from app.agents.developer.src.state import DeveloperState
 from app.agents.developer.src.utils.shell_utils import run_shell
+from app.agents.developer.src.utils.validation_cache import get_validation_cache
+from app.agents.developer.src.utils.lint_daemon import LintDaemon, get_lint_daemon
 from app.agents.developer.src.utils.llm_utils import get_langfuse_span, track_node
 
 from langgraph.types import interrupt
@@ -31,6 +36,75 @@ def _clear_next_types_cache(workspace_path: str) -> None:
             logger.warning(f"[run_code] Failed to clear .next/types: {e}")
 
 
+# Route file set per workspace when .next/types was last validated
+_next_route_sets: dict = {}
+
+
+def _clear_stale_next_types(workspace_path: str) -> bool:
+    """Clear .next/types only when routes were added/removed since the last check.
+
+    Generated route types go stale (tsc errors on deleted pages) only when the
+    set of route files changes; otherwise they, and the rest of .next, stay
+    for the incremental typecheck and build. Returns True if cleared.
+    """
+    routes = []
+    for base in ("src/app", "app", "src/pages", "pages"):
+        for root, _, files in os.walk(Path(workspace_path) / base):
+            routes.extend(os.path.join(root, name) for name in files)
+    route_set = hashlib.sha256("\n".join(sorted(routes)).encode()).hexdigest()
+    if _next_route_sets.get(workspace_path) == route_set:
+        return False
+    _next_route_sets[workspace_path] = route_set
+    if not (Path(workspace_path) / ".next" / "types").exists():
+        return False
+    _clear_next_types_cache(workspace_path)
+    return True
+
+
+def _incremental_typecheck_cmd(workspace_path: str, cmd: str) -> str:
+    """Make a `tsc` typecheck script incremental, with .tsbuildinfo persisted in the worktree."""
+    if not cmd.startswith("pnpm run typecheck"):
+        return cmd
+    try:
+        script = json.loads((Path(workspace_path) / "package.json").read_text(encoding="utf-8"))["scripts"]["typecheck"]
+        tsconfig = (Path(workspace_path) / "tsconfig.json").read_text(encoding="utf-8")
+    except Exception:
+        return cmd
+    if not script.startswith("tsc") or "incremental" in script or re.search(r'"incremental"\s*:\s*true', tsconfig):
+        return cmd  # Not tsc, or already incremental (tsconfig.tsbuildinfo)
+    return f"{cmd} --incremental --tsBuildInfoFile .tsbuildinfo"
+
+
+def _is_plain_tsc_typecheck(workspace_path: str, cmd: str) -> bool:
+    """Whether ``cmd`` runs a typecheck script that is just ``tsc --noEmit`` (what the lint daemon checks)."""
+    if not cmd.startswith("pnpm run typecheck"):
+        return False
+    try:
+        script = json.loads((Path(workspace_path) / "package.json").read_text(encoding="utf-8"))["scripts"]["typecheck"]
+    except Exception:
+        return False
+    return re.fullmatch(r"tsc(\s+--(noEmit|pretty|incremental))*\s*", script) is not None
+
+
+# Scripts the lint daemon does the same job as: Prettier / ESLint fixes over the whole service
+_DAEMON_SCRIPTS = {
+    "format_cmd": re.compile(r"prettier\s+(--write\s+\.|\.\s+--write)\s*"),
+    "lint_fix_cmd": re.compile(r"((pnpm\s+exec|npx)\s+)?eslint\s+(--fix\s+\.|\.\s+--fix)\s*"),
+}
+
+
+def _is_daemon_script(workspace_path: str, key: str, cmd: str) -> bool:
+    """Whether ``cmd`` (a service's ``format_cmd``/``lint_fix_cmd``) runs a script the lint daemon can replace."""
+    match = re.fullmatch(r"pnpm run ([\w:.-]+)\s*", cmd)
+    if not match:
+        return False
+    try:
+        script = json.loads((Path(workspace_path) / "package.json").read_text(encoding="utf-8"))["scripts"][match.group(1)]
+    except Exception:
+        return False
+    return _DAEMON_SCRIPTS[key].fullmatch(script) is not None
+
+
 def _validate_null_safety(workspace_path: str) -> List[str]:
     """Quick scan for unsafe array operations on API data.
     
@@ -139,14 +213,25 @@ def _run_step(
     cwd: str,
     svc_name: str,
     timeout: int = 120,
-    allow_fail: bool = False
+    allow_fail: bool = False,
+    cache_key: Optional[str] = None,
 ) -> Tuple[bool, str, str]:
     """
     Run a build/test step with consistent logging.
     
+    With ``cache_key`` (source tree hash + command), the result of an
+    identical earlier run is returned without running the command.
+    
     Returns:
         (success, stdout, stderr)
     """
+    cache = get_validation_cache() if cache_key else None
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"[run_code] [{svc_name}] {step_name} cached: {'PASS' if cached[0] else 'FAIL'} (tree unchanged)")
+            return cached
+    
     logger.debug(f"[run_code] [{svc_name}] {step_name}: {cmd}")
     
     try:
@@ -154,6 +239,8 @@ def _run_step(
         stdout = result.get("stdout", "")
         stderr = result.get("stderr", "")
         exit_code = result.get("exit_code", 0)
+        if cache and exit_code != -1:  # -1: timeout/blocked/spawn error, not a verdict on the tree
+            cache.put(cache_key, (exit_code == 0 or allow_fail, stdout, stderr))
         
         if exit_code != 0:
             if allow_fail:
@@ -178,17 +265,85 @@ def _run_step(
             return False, "", error_msg
 
 
-async def _run_format_lint_parallel(services: List[dict], workspace_path: str) -> None:
+async def _format_lint_via_daemon(daemon: LintDaemon, svc: dict, svc_path: str, svc_name: str) -> None:
+    """Format, then lint-fix, the files changed since the last pass in the workspace's lint daemon.
+
+    A command that runs something else, or a tool the daemon can't
+    provide, runs the service's command instead.
+    """
+    loop = asyncio.get_event_loop()
+    for step_name, key, run in (("Format", "format_cmd", daemon.format), ("Lint Fix", "lint_fix_cmd", daemon.lint_fix)):
+        if not svc.get(key):
+            continue
+        result = await run(timeout=60) if _is_daemon_script(svc_path, key, svc[key]) else None
+        if result is None:
+            await loop.run_in_executor(_executor, _run_step, step_name, svc[key], svc_path, svc_name, 60, True)
+        elif not result.ok:
+            logger.warning(f"[run_code] [{svc_name}] {step_name} warning (daemon): {result.output[:500]}")
+        else:
+            logger.debug(f"[run_code] [{svc_name}] {step_name} completed (daemon, {len(result.changed)} files changed)")
+
+
+async def _typecheck_via_daemon(
+    daemon: LintDaemon, cmd: str, workspace_path: str, svc_name: str, cache_key: Optional[str]
+) -> Tuple[bool, str, str]:
+    """Typecheck in the workspace's lint daemon; same contract and caching as ``_run_step``."""
+    cache = get_validation_cache() if cache_key else None
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"[run_code] [{svc_name}] Typecheck cached: {'PASS' if cached[0] else 'FAIL'} (tree unchanged)")
+            return cached
+    
+    result = await daemon.typecheck(timeout=60)
+    if result is None:
+        return await asyncio.get_event_loop().run_in_executor(
+            _executor, partial(_run_step, "Typecheck", cmd, workspace_path, svc_name, 60, False, cache_key)
+        )
+    if result.timed_out:
+        return False, "", result.output
+    if cache:
+        cache.put(cache_key, (result.ok, result.output, ""))
+    if not result.ok:
+        logger.error(f"[run_code] [{svc_name}] Typecheck FAILED (daemon)")
+        logger.error(f"[run_code] stdout: {result.output[:2000]}")
+    return result.ok, result.output, ""
+
+
+async def _run_format_lint_parallel(services: List[dict], workspace_path: str) -> bool:
     """
     Run format and lint commands in parallel for all services.
+    
+    Skipped (returns False) when the tree is exactly one these commands
+    already produced: formatting and lint fixes are idempotent.
     """
     loop = asyncio.get_event_loop()
     tasks = []
     
+    cache = get_validation_cache()
+    commands = "\0".join(
+        f"{svc.get('path', '.')}:{svc.get('format_cmd', '')}:{svc.get('lint_fix_cmd', '')}" for svc in services
+    )
+    if cache:
+        tree_hash = await loop.run_in_executor(_executor, cache.tree_hash, workspace_path)
+        if cache.get(cache.key(tree_hash, workspace_path, f"format+lint\0{commands}")) is not None:
+            logger.debug("[run_code] Format/lint skipped (tree unchanged since last format)")
+            return False
+    
     for svc in services:
         svc_name = svc.get("name", "app")
         svc_path = str(Path(workspace_path) / svc.get("path", "."))
         
+        # Node services whose scripts are plain Prettier/ESLint: warm daemon, changed files only
+        daemon = (
+            get_lint_daemon(svc_path)
+            if any(svc.get(key) and _is_daemon_script(svc_path, key, svc[key]) for key in _DAEMON_SCRIPTS)
+            else None
+        )
+        if daemon is not None:
+            tasks.append(_format_lint_via_daemon(daemon, svc, svc_path, svc_name))
+            continue
+        
         # Add format task
         if svc.get("format_cmd"):
             task = loop.run_in_executor(
@@ -209,6 +364,11 @@ async def _run_format_lint_parallel(services: List[dict], workspace_path: str) -
         logger.debug(f"[run_code] Running {len(tasks)} format/lint tasks in parallel...")
         await asyncio.gather(*tasks, return_exceptions=True)
         logger.debug("[run_code] Format/lint parallel execution completed")
+    
+    if cache:
+        tree_hash = await loop.run_in_executor(_executor, cache.tree_hash, workspace_path)
+        cache.put(cache.key(tree_hash, workspace_path, f"format+lint\0{commands}"), (True, "", ""))
+    return True
 
 
 async def _run_service_build(
@@ -226,7 +386,7 @@ async def _run_service_build(
     """
     svc_name = svc_config.get("name", "app")
     build_cmd = svc_config.get("build_cmd", "")
-    typecheck_cmd = svc_config.get("typecheck_cmd", "pnpm run typecheck")
+    typecheck_cmd = _incremental_typecheck_cmd(workspace_path, svc_config.get("typecheck_cmd", "pnpm run typecheck"))
     
     svc_span = None
     if parent_span:
@@ -237,7 +397,7 @@ async def _run_service_build(
     
     try:
         # Clear stale Next.js types cache before typecheck/build
-        _clear_next_types_cache(workspace_path)
+        _clear_stale_next_types(workspace_path)
         
         # Quick null safety validation
         null_warnings = _validate_null_safety(workspace_path)
@@ -248,11 +408,23 @@ async def _run_service_build(
         tasks = []
         task_names = []
         
+        # Results are cached per source tree: an unchanged tree re-uses the last verdict
+        cache = get_validation_cache()
+        tree_hash = await loop.run_in_executor(_executor, cache.tree_hash, workspace_path) if cache else None
+        
+        def cache_key(cmd: str) -> Optional[str]:
+            return cache.key(tree_hash, workspace_path, cmd) if cache else None
+        
         # Prepare typecheck task
         if typecheck_cmd and _has_script(workspace_path, "typecheck"):
-            tasks.append(loop.run_in_executor(
-                _executor, _run_step, "Typecheck", typecheck_cmd, workspace_path, svc_name, 60, False
-            ))
+            daemon = get_lint_daemon(workspace_path) if _is_plain_tsc_typecheck(workspace_path, typecheck_cmd) else None
+            if daemon is not None:
+                tasks.append(_typecheck_via_daemon(daemon, typecheck_cmd, workspace_path, svc_name, cache_key(typecheck_cmd)))
+            else:
+                tasks.append(loop.run_in_executor(
+                    _executor,
+                    partial(_run_step, "Typecheck", typecheck_cmd, workspace_path, svc_name, 60, False, cache_key(typecheck_cmd)),
+                ))
             task_names.append("typecheck")
         elif typecheck_cmd:
             logger.debug(f"[run_code] [{svc_name}] Skipping typecheck (script not found)")
@@ -260,7 +432,8 @@ async def _run_service_build(
         # Prepare build task
         if build_cmd:
             tasks.append(loop.run_in_executor(
-                _executor, _run_step, "Build", build_cmd, workspace_path, svc_name, 180, False
+                _executor,
+                partial(_run_step, "Build", build_cmd, workspace_path, svc_name, 180, False, cache_key(build_cmd)),
             ))
             task_names.append("build")
         
@@ -430,16 +603,16 @@ async def run_code(state: DeveloperState, agent=None) -> DeveloperState:
             if svc.get("lint_fix_cmd"):
                 await log(f"[{svc_name}] Running lint fix: {svc['lint_fix_cmd']}", "debug")
         
-        await _run_format_lint_parallel(services, workspace_path)
-        await log("Format and lint completed", "success")
+        if await _run_format_lint_parallel(services, workspace_path):
+            await log("Format and lint completed", "success")
+        else:
+            await log("Format and lint skipped (no changes since last run)", "debug")
         
         # =====================================================================
-        # Step 3: Clear Next.js cache (if applicable)
+        # Step 3: Clear stale Next.js route types (rest of .next stays for incremental builds)
         # =====================================================================
-        next_types = Path(workspace_path) / ".next" / "types"
-        if next_types.exists():
-            await log("Clearing .next/types cache...", "debug")
-            _clear_next_types_cache(workspace_path)
+        if _clear_stale_next_types(workspace_path):
+            await log("Routes changed, cleared .next/types cache", "debug")
         
         # =====================================================================
         # Step 4: Null Safety Validation
@@ -0,0 +1,184 @@
+"""
+Implement scheduler makespan benchmark.
+
+Replays implementation plans through the previous layer-barrier schedule
+(``group_steps_by_layer`` + ``run_layer_parallel``, layers below 4
+sequential) and through ``run_dag_parallel``, with every step simulated as
+a sleep of its LLM generation time. Both use the same ``MAX_CONCURRENT``.
+
+Plans come from ``--plans`` (a JSON list of ``implementation_plan`` lists,
+e.g. dumped from developer checkpoints; a step may carry a recorded
+``duration`` in seconds) or from the built-in sample plans. Steps without a
+duration get one from their file type with seeded jitter, so a few files
+are slow, as in real runs.
+
+Usage::
+
+    python -m app.agents.developer.src.nodes.scheduler_benchmark
+    python -m app.agents.developer.src.nodes.scheduler_benchmark --plans plans.json --scale 0.005
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.agents.developer.src.nodes.parallel_utils import (
+    MAX_CONCURRENT,
+    build_step_dag,
+    dag_depth,
+    get_layer_priority,
+    group_steps_by_layer,
+    run_dag_parallel,
+    run_layer_parallel,
+)
+
+# Typical generation seconds by file kind (used when a step has no recorded duration)
+BASE_SECONDS = {"schema": 40, "seed": 35, "types": 20, "lib": 15, "api": 30, "actions": 25, "components": 25, "page": 35}
+
+
+def _step(path: str, *deps: str) -> Dict:
+    return {"file_path": path, "action": "create", "task": f"Create {path}", "dependencies": list(deps)}
+
+
+SAMPLE_PLANS: Dict[str, List[Dict]] = {
+    "shop": [
+        _step("prisma/schema.prisma"),
+        _step("prisma/seed.ts", "prisma/schema.prisma"),
+        _step("src/types/index.ts", "prisma/schema.prisma"),
+        _step("src/lib/prisma.ts"),
+        _step("src/lib/format.ts"),
+        _step("src/app/api/products/route.ts", "src/lib/prisma.ts", "src/types/index.ts"),
+        _step("src/app/api/cart/route.ts", "src/lib/prisma.ts", "src/types/index.ts"),
+        _step("src/app/actions/cart.ts", "src/lib/prisma.ts"),
+        _step("src/components/product/ProductCard.tsx", "src/types/index.ts", "src/lib/format.ts"),
+        _step("src/components/cart/CartItem.tsx", "src/types/index.ts", "src/lib/format.ts"),
+        _step("src/components/product/ProductSection.tsx", "src/components/product/ProductCard.tsx"),
+        _step("src/app/page.tsx", "src/components/product/ProductSection.tsx"),
+        _step("src/app/cart/page.tsx", "src/components/cart/CartItem.tsx", "src/app/actions/cart.ts"),
+        _step("src/app/products/[id]/page.tsx", "src/app/api/products/route.ts"),
+    ],
+    "blog": [
+        _step("src/types/post.ts"),
+        _step("src/lib/posts.ts", "src/types/post.ts"),
+        _step("src/lib/markdown.ts"),
+        _step("src/app/api/posts/route.ts", "src/lib/posts.ts"),
+        _step("src/components/blog/PostCard.tsx", "src/types/post.ts"),
+        _step("src/components/blog/PostBody.tsx", "src/lib/markdown.ts"),
+        _step("src/components/blog/PostListSection.tsx", "src/components/blog/PostCard.tsx"),
+        _step("src/app/blog/page.tsx", "src/components/blog/PostListSection.tsx", "src/lib/posts.ts"),
+        _step("src/app/blog/[slug]/page.tsx", "src/components/blog/PostBody.tsx", "src/lib/posts.ts"),
+    ],
+    "dashboard": [
+        _step("src/types/metrics.ts"),
+        _step("src/lib/metrics.ts", "src/types/metrics.ts"),
+        _step("src/lib/utils.ts"),
+        _step("src/components/dashboard/StatCard.tsx", "src/lib/utils.ts"),
+        _step("src/components/dashboard/ChartCard.tsx", "src/lib/utils.ts"),
+        _step("src/components/dashboard/ActivityItem.tsx", "src/types/metrics.ts"),
+        _step("src/components/dashboard/Sidebar.tsx"),
+        _step("src/components/dashboard/Header.tsx"),
+        _step("src/app/dashboard/page.tsx", "src/components/dashboard/StatCard.tsx",
+              "src/components/dashboard/ChartCard.tsx", "src/lib/metrics.ts"),
+        _step("src/app/dashboard/activity/page.tsx", "src/components/dashboard/ActivityItem.tsx"),
+    ],
+}
+
+
+@dataclass
+class BenchmarkResult:
+    plan: str
+    steps: int
+    depth: int
+    layers_seconds: float
+    dag_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.layers_seconds / self.dag_seconds if self.dag_seconds else 0.0
+
+
+def _kind(file_path: str) -> str:
+    fp = file_path.lower()
+    for kind in ("schema", "seed", "types", "lib", "api", "actions", "components"):
+        if kind in fp:
+            return kind
+    return "page"
+
+
+def assign_durations(steps: List[Dict], seed: int = 7) -> Dict[str, float]:
+    """Recorded ``duration`` per step, else a jittered estimate from its file kind."""
+    rng = random.Random(seed)
+    return {
+        step["file_path"]: float(step.get("duration") or BASE_SECONDS[_kind(step["file_path"])] * rng.uniform(0.5, 2.0))
+        for step in steps
+    }
+
+
+async def _layers(steps: List[Dict], implement_fn, max_concurrent: int) -> None:
+    """The layer-barrier schedule implement_parallel used before the DAG scheduler."""
+    layers = group_steps_by_layer(steps)
+    for layer_num in sorted(layers):
+        layer_steps = layers[layer_num]
+        if len(layer_steps) > 1 and layer_num >= 4:
+            await run_layer_parallel(layer_steps, implement_fn, {}, max_concurrent)
+        else:
+            for step in layer_steps:
+                await implement_fn(step)
+
+
+def run(name: str, steps: List[Dict], max_concurrent: int = MAX_CONCURRENT, scale: float = 0.01) -> BenchmarkResult:
+    """Makespan (in simulated seconds) of both schedules for one plan."""
+    durations = assign_durations(steps)
+
+    async def implement_fn(step: Dict) -> Dict:
+        await asyncio.sleep(durations[step["file_path"]] * scale)
+        return {"file_path": step["file_path"], "success": True, "modified_files": [step["file_path"]]}
+
+    def timed(coro) -> float:
+        started = time.perf_counter()
+        asyncio.run(coro)
+        return (time.perf_counter() - started) / scale
+
+    return BenchmarkResult(
+        plan=name,
+        steps=len(steps),
+        depth=dag_depth(build_step_dag(steps)),
+        layers_seconds=timed(_layers(steps, implement_fn, max_concurrent)),
+        dag_seconds=timed(run_dag_parallel(steps, implement_fn, max_concurrent)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare layer-barrier and DAG implement schedules")
+    parser.add_argument("--plans", help="JSON file with a list of implementation plans")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT)
+    parser.add_argument("--scale", type=float, default=0.01, help="Wall seconds per simulated second")
+    args = parser.parse_args()
+
+    if args.plans:
+        with open(args.plans, encoding="utf-8") as f:
+            plans = {f"plan_{i}": steps for i, steps in enumerate(json.load(f), 1)}
+    else:
+        plans = SAMPLE_PLANS
+
+    total_layers = total_dag = 0.0
+    for name, steps in plans.items():
+        steps = [s for s in steps if s.get("file_path")]
+        result = run(name, steps, args.max_concurrent, args.scale)
+        total_layers += result.layers_seconds
+        total_dag += result.dag_seconds
+        layer_count = len({get_layer_priority(s["file_path"]) for s in steps})
+        print(  # noqa: T201
+            f"{name}: {result.steps} steps, {layer_count} layers, depth {result.depth}: "
+            f"layers {result.layers_seconds:.0f}s -> dag {result.dag_seconds:.0f}s ({result.speedup:.2f}x)"
+        )
+    if total_dag:
+        print(f"total: layers {total_layers:.0f}s -> dag {total_dag:.0f}s ({total_layers / total_dag:.2f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,16 @@ import hashlib
 import logging
 import os
 import subprocess
+import time
+from functools import partial
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
 from app.agents.developer.src.state import DeveloperState
 from app.agents.developer.src.skills import SkillRegistry
 from app.agents.developer.src.utils.db_container import (
-    start_postgres_container,
+    acquire_story_database,
+    publish_story_template,
     update_env_file,
     get_database_url,
 )
@@ -23,6 +26,13 @@ from app.utils.workspace_utils import (
     _should_skip_prisma_generate,
     _update_prisma_generate_cache,
 )
+from app.utils.worktree_pool import get_worktree_pool
+from app.utils.node_modules_cache import (
+    restore_node_modules,
+    snapshot_node_modules,
+    restore_prisma_client,
+    snapshot_prisma_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,18 +53,25 @@ def _run_pnpm_install(workspace_path: str) -> bool:
     if _should_skip_pnpm_install(workspace_path):
         return True
     
+    # Fresh worktree: materialize node_modules from the node-wide snapshot of this lockfile
+    if not os.path.exists(os.path.join(workspace_path, "node_modules")) and restore_node_modules(workspace_path):
+        _update_pnpm_install_cache(workspace_path)
+        return True
+    
     lockfile = Path(workspace_path) / "pnpm-lock.yaml"
     try:
         if lockfile.exists():
             result = subprocess.run("pnpm install --frozen-lockfile", cwd=workspace_path, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=60, shell=True)
             if result.returncode == 0:
                 _update_pnpm_install_cache(workspace_path)
+                snapshot_node_modules(workspace_path)
                 return True
             logger.warning(f"[setup_workspace] --frozen-lockfile failed: {result.stderr[:200] if result.stderr else ''}")
         
         result = subprocess.run("pnpm install", cwd=workspace_path, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=120, shell=True)
         if result.returncode == 0:
             _update_pnpm_install_cache(workspace_path)
+            snapshot_node_modules(workspace_path)
             return True
         logger.warning(f"[setup_workspace] pnpm install FAILED: {result.stderr[:200] if result.stderr else ''}")
         return False
@@ -75,6 +92,10 @@ def _run_prisma_generate(workspace_path: str) -> bool:
     if _should_skip_prisma_generate(workspace_path):
         return True
     
+    if restore_prisma_client(workspace_path):
+        _update_prisma_generate_cache(workspace_path)
+        return True
+    
     try:
         result = subprocess.run(
             "pnpm exec prisma generate",
@@ -88,6 +109,7 @@ def _run_prisma_generate(workspace_path: str) -> bool:
         )
         if result.returncode == 0:
             _update_prisma_generate_cache(workspace_path)
+            snapshot_prisma_client(workspace_path)
             return True
         else:
             logger.warning(f"[setup_workspace] prisma generate failed")
@@ -100,6 +122,28 @@ def _run_prisma_generate(workspace_path: str) -> bool:
         return False
 
 
+def _install_dependencies(workspace_path: str) -> tuple:
+    """pnpm install, then prisma generate (the client is generated into node_modules)."""
+    pnpm_success = _run_pnpm_install(workspace_path)
+    gen_success = _run_prisma_generate(workspace_path) if pnpm_success else False
+    return pnpm_success, gen_success
+
+
+def _prepare_pooled_worktree(workspace_path: str) -> None:
+    """Install dependencies in a spare pool worktree ahead of any story."""
+    if os.path.exists(os.path.join(workspace_path, "package.json")):
+        _install_dependencies(workspace_path)
+
+
+def warm_worktree_pool(main_workspace) -> None:
+    """Start filling the project's worktree pool in the background."""
+    if not main_workspace or not (Path(main_workspace) / ".git").exists():
+        return
+    pool = get_worktree_pool(main_workspace, prepare=_prepare_pooled_worktree)
+    if pool is not None:
+        pool.refill_async()
+
+
 def _run_prisma_db_push(workspace_path: str) -> bool:
     """Run prisma db push (blocking). Returns True if successful."""
     schema_path = os.path.join(workspace_path, "prisma", "schema.prisma")
@@ -168,9 +212,9 @@ async def _setup_prisma(workspace_path: str, database_ready: bool, story_logger)
 
 
 def _start_database(workspace_path: str, story_id: str = None) -> dict:
-    """Start postgres container (blocking). Returns db_info dict."""
+    """Allocate the story database (blocking). Returns db_info dict."""
     try:
-        db_info = start_postgres_container(story_id)
+        db_info = acquire_story_database(story_id, workspace_path)
         if db_info:
             update_env_file(workspace_path, story_id)
             database_url = get_database_url(story_id)
@@ -180,10 +224,10 @@ def _start_database(workspace_path: str, story_id: str = None) -> dict:
                 from app.agents.developer.src.utils.db_container import update_story_db_info
                 update_story_db_info(story_id, workspace_path, None)
             
-            return {"ready": True, "url": database_url, "info": db_info}
+            return {"ready": True, "url": database_url, "info": db_info, "schema_ready": db_info.get("schema_ready", False)}
     except Exception as db_err:
         logger.warning(f"[setup_workspace] Database setup failed: {db_err}")
-    return {"ready": False, "url": "", "info": None}
+    return {"ready": False, "url": "", "info": None, "schema_ready": False}
 
 
 def _build_project_config(tech_stack: str = "nextjs") -> dict:
@@ -257,6 +301,7 @@ async def setup_workspace(state: DeveloperState, agent=None) -> DeveloperState:
             interrupt({"reason": signal, "story_id": story_id, "node": "setup_workspace"})
     
     await story_logger.info("🔧 Starting workspace setup...")
+    setup_started = time.monotonic()
     try:
         story_id = state.get("story_id", state.get("task_id", "unknown"))
         story_code = state.get("story_code", f"STORY-{story_id[:8]}")
@@ -286,12 +331,21 @@ async def setup_workspace(state: DeveloperState, agent=None) -> DeveloperState:
                 await story_logger.error("Agent has no workspace path attribute")
                 return {**state, "workspace_ready": False}
             
-            workspace_info = setup_git_worktree(
-                story_code=story_code,
-                main_workspace=main_workspace,
-                worktree_type="story",
-                agent_name=agent.name if agent else "Developer"
+            # Blocking git work runs off the event loop; a pooled worktree is claimed when available
+            warm_worktree_pool(main_workspace)
+            started = time.monotonic()
+            workspace_info = await asyncio.get_event_loop().run_in_executor(
+                _executor,
+                partial(
+                    setup_git_worktree,
+                    story_code=story_code,
+                    main_workspace=main_workspace,
+                    worktree_type="story",
+                    agent_name=agent.name if agent else "Developer",
+                ),
             )
+            source = "pooled" if workspace_info.get("pooled") else "new"
+            await story_logger.debug(f"Worktree ready in {time.monotonic() - started:.2f}s ({source})")
         
         workspace_path = workspace_info.get("workspace_path", "")
         branch_name = workspace_info.get("branch_name", "")
@@ -329,17 +383,12 @@ async def setup_workspace(state: DeveloperState, agent=None) -> DeveloperState:
             # Phase 1 Optimization: Run DB + pnpm + prisma generate in PARALLEL
             await story_logger.info("⚡ Starting parallel setup: DB + pnpm + Prisma...")
             loop = asyncio.get_event_loop()
-            from functools import partial
             
-            # Launch all 3 in parallel (prisma generate doesn't need DB)
+            # DB in parallel with dependencies (prisma generate doesn't need DB, but needs node_modules)
             db_future = loop.run_in_executor(_executor, partial(_start_database, workspace_path, story_id))
-            pnpm_future = loop.run_in_executor(_executor, _run_pnpm_install, workspace_path)
-            prisma_gen_future = loop.run_in_executor(_executor, _run_prisma_generate, workspace_path)
+            deps_future = loop.run_in_executor(_executor, _install_dependencies, workspace_path)
             
-            # Wait for all 3 to complete
-            db_result, pnpm_success, gen_success = await asyncio.gather(
-                db_future, pnpm_future, prisma_gen_future
-            )
+            db_result, (pnpm_success, gen_success) = await asyncio.gather(db_future, deps_future)
             
             database_ready = db_result.get("ready", False)
             
@@ -349,11 +398,15 @@ async def setup_workspace(state: DeveloperState, agent=None) -> DeveloperState:
                 await story_logger.warning("prisma generate failed")
             
             # Only db push needs database ready (sequential after parallel)
-            if database_ready and gen_success:
+            if database_ready and db_result.get("schema_ready"):
+                await story_logger.debug("Database cloned from schema template, skipping db push")
+            elif database_ready and gen_success:
                 await story_logger.info("🗄️ Syncing database schema...")
                 push_success = await loop.run_in_executor(_executor, _run_prisma_db_push, workspace_path)
                 if not push_success:
                     await story_logger.warning("prisma db push failed")
+                elif story_id:
+                    await loop.run_in_executor(_executor, publish_story_template, story_id, workspace_path)
         
         # Build project config with tech stack
         project_config = _build_project_config(tech_stack)
@@ -361,7 +414,8 @@ async def setup_workspace(state: DeveloperState, agent=None) -> DeveloperState:
         # Notify user workspace is ready (milestone message - saved to DB)
         if workspace_info.get("workspace_ready"):
             db_status = "DB ready" if database_ready else "No DB"
-            await story_logger.info(f"Workspace ready | Branch: {workspace_info.get('branch_name')} | {db_status}")
+            setup_seconds = time.monotonic() - setup_started
+            await story_logger.info(f"Workspace ready in {setup_seconds:.1f}s | Branch: {workspace_info.get('branch_name')} | {db_status}")
             
             # Set PROCESSING state now that workspace is ready
             # This was moved from _handle_story_processing to here for accurate state tracking
@@ -41,6 +41,7 @@ class DeveloperState(TypedDict, total=False):
 
     # Implementation
     files_modified: List[str]
+    completed_steps: List[int]  # Plan step indices done by implement_parallel (pause/resume)
 
     # Workspace
     workspace_path: str
@@ -1,8 +1,12 @@
-"""Database container management using testcontainers."""
+"""Story databases: a shared Postgres server or a container per story (testcontainers)."""
+import hashlib
 import os
 import re
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Set
 from uuid import UUID
 from testcontainers.postgres import PostgresContainer
 from sqlmodel import Session
@@ -15,6 +19,9 @@ os.environ["TESTCONTAINERS_RYUK_DISABLED"] = "true"
 # Container registry: story_id -> container
 _containers: Dict[str, any] = {}
 
+# Databases acquired through a StoryDatabaseProvider: story_id -> connection info
+_databases: Dict[str, Dict[str, Any]] = {}
+
 
 def start_postgres_container(story_id: Optional[str] = None) -> Dict[str, str]:
     """
@@ -33,6 +40,8 @@ def start_postgres_container(story_id: Optional[str] = None) -> Dict[str, str]:
 
 def get_connection_info(story_id: Optional[str] = None, container=None) -> Dict[str, str]:
     """Get connection info"""
+    if container is None and story_id in _databases:
+        return _databases[story_id]
     if container is None and story_id:
         container = _containers.get(story_id)
     
@@ -155,7 +164,7 @@ def update_story_db_info(story_id: str, worktree_path: str, branch_name: str = N
                 if branch_name:
                     story.branch_name = branch_name
                 if info:
-                    story.db_container_id = info.get("container_id")
+                    story.db_container_id = info.get("container_id") or None  # None on the shared server
                     story.db_port = int(info.get("port", 0))
                 session.add(story)
                 session.commit()
@@ -166,3 +175,302 @@ def update_story_db_info(story_id: str, worktree_path: str, branch_name: str = N
     except Exception as e:
         logger.error(f"[db_container] Failed to update story {story_id}: {e}")
     return False
+
+
+# =============================================================================
+# STORY DATABASE PROVIDERS
+# =============================================================================
+
+def schema_hash(workspace_path: str) -> Optional[str]:
+    """Hash of the workspace's prisma/schema.prisma (template key), None without a schema."""
+    try:
+        with open(os.path.join(workspace_path, "prisma", "schema.prisma"), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def _story_db_name(story_id: str) -> str:
+    return "story_" + re.sub(r"[^a-z0-9]", "", story_id.lower())[:40]
+
+
+def _template_db_name(schema: str) -> str:
+    return f"tpl_{schema}"
+
+
+# Self-managed shared server: outlives the process so story databases survive restarts
+SHARED_SERVER_CONTAINER = "vibesdlc-story-db"
+
+
+def _shared_server_url() -> str:
+    """Admin URL of the self-managed shared server, reattached by container name.
+
+    The container is never stopped on exit; a later process (or another
+    worker) finds it by name and starts it again if it was stopped.
+    """
+    import docker
+    from testcontainers.core.docker_client import DockerClient
+
+    client = DockerClient()
+    try:
+        container = client.client.containers.get(SHARED_SERVER_CONTAINER)
+    except docker.errors.NotFound:
+        server = PostgresContainer("postgres:16").with_name(SHARED_SERVER_CONTAINER)
+        try:
+            server.start()
+        except docker.errors.APIError as e:
+            if e.status_code != 409:
+                raise
+            container = client.client.containers.get(SHARED_SERVER_CONTAINER)  # Started by another process
+        else:
+            logger.info(f"[db_container] Shared story database server started on port {server.get_exposed_port(5432)}")
+            return (
+                f"postgresql+psycopg://{server.username}:{server.password}@"
+                f"{server.get_container_host_ip()}:{server.get_exposed_port(5432)}/{server.dbname}"
+            )
+
+    env = dict(item.split("=", 1) for item in container.attrs["Config"]["Env"])
+    if container.status != "running":
+        container.start()
+        deadline = time.monotonic() + 30
+        while container.exec_run(["pg_isready", "-U", env["POSTGRES_USER"]]).exit_code != 0:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{SHARED_SERVER_CONTAINER} not ready after restart")
+            time.sleep(0.5)
+    logger.info(f"[db_container] Reattached to shared story database server {SHARED_SERVER_CONTAINER}")
+    return (
+        f"postgresql+psycopg://{env['POSTGRES_USER']}:{env['POSTGRES_PASSWORD']}@"
+        f"{client.host()}:{client.port(container.id, 5432)}/{env['POSTGRES_DB']}"
+    )
+
+
+def _shared_server_exists() -> bool:
+    """Whether the self-managed shared server container exists (running or stopped)."""
+    import docker
+    from testcontainers.core.docker_client import DockerClient
+
+    try:
+        DockerClient().client.containers.get(SHARED_SERVER_CONTAINER)
+    except docker.errors.NotFound:
+        return False
+    return True
+
+
+class StoryDatabaseProvider(ABC):
+    """Allocates the Postgres database a story workspace runs against."""
+
+    name = "base"
+
+    @abstractmethod
+    def acquire(self, story_id: str, schema: Optional[str] = None) -> Dict[str, Any]:
+        """Connection info (host, port, user, password, database, container_id).
+
+        ``schema_ready`` is True when the database already has the tables of
+        ``schema`` (cloned from a template), so ``prisma db push`` can be skipped.
+        ``template_candidate`` is True for a new, empty database: once the schema
+        is pushed it may become the template for ``schema``.
+        """
+
+    @abstractmethod
+    def release(self, story_id: str) -> bool:
+        """Drop the story's database (or stop its container)."""
+
+    def publish_template(self, story_id: str, schema: str) -> bool:
+        """Offer the story's freshly pushed database as the template for ``schema``."""
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"provider": self.name}
+
+
+class ContainerDatabaseProvider(StoryDatabaseProvider):
+    """A new postgres:16 container per story (schema pushed from scratch)."""
+
+    name = "container"
+
+    def acquire(self, story_id: str, schema: Optional[str] = None) -> Dict[str, Any]:
+        return {**start_postgres_container(story_id), "schema_ready": False, "template_candidate": False}
+
+    def release(self, story_id: str) -> bool:
+        return stop_container(story_id)
+
+
+class SharedServerDatabaseProvider(StoryDatabaseProvider):
+    """Per-story databases on one long-lived Postgres server.
+
+    The first story with a given schema creates an empty database and pushes
+    the schema; its database is then copied to ``tpl_<schema hash>``. Later
+    stories get ``CREATE DATABASE story_x TEMPLATE tpl_<hash>``, a file-level
+    copy that takes well under a second, with the tables already in place.
+
+    Without ``admin_url`` the server is the ``SHARED_SERVER_CONTAINER``
+    container, kept running across restarts so paused/handed-off stories
+    find their databases again.
+    """
+
+    name = "shared"
+
+    def __init__(self, admin_url: Optional[str] = None):
+        self.admin_url = admin_url or None  # None: attach to (or start) SHARED_SERVER_CONTAINER on first use
+        self._engine = None
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "template_clones": 0, "templates_published": 0, "released": 0}
+
+    def _server(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.engine import make_url
+
+        with self._lock:
+            if self._engine is None:
+                if self.admin_url is None:
+                    self.admin_url = _shared_server_url()
+                url = make_url(self.admin_url)
+                if url.drivername == "postgresql":
+                    url = url.set(drivername="postgresql+psycopg")
+                # CREATE/DROP DATABASE cannot run inside a transaction
+                self._engine = create_engine(url, isolation_level="AUTOCOMMIT", pool_size=2, pool_pre_ping=True)
+            return self._engine
+
+    def _execute(self, sql: str) -> None:
+        from sqlalchemy import text
+
+        with self._server().connect() as conn:
+            conn.execute(text(sql))
+
+    def _list_databases(self) -> Set[str]:
+        from sqlalchemy import text
+
+        with self._server().connect() as conn:
+            return {row[0] for row in conn.execute(text("SELECT datname FROM pg_database"))}
+
+    def _connection_info(self, database: str) -> Dict[str, Any]:
+        from sqlalchemy.engine import make_url
+
+        url = make_url(self.admin_url)
+        return {
+            "host": url.host or "localhost",
+            "port": str(url.port or 5432),
+            "user": url.username,
+            "password": url.password,
+            "database": database,
+            "container_id": "",  # Never stop the shared server on story cleanup
+        }
+
+    def acquire(self, story_id: str, schema: Optional[str] = None) -> Dict[str, Any]:
+        name = _story_db_name(story_id)
+        template = _template_db_name(schema) if schema else None
+        with self._lock:
+            self.stats["acquired"] += 1
+        existing = self._list_databases()
+        schema_ready = created_empty = False
+        if name in existing:
+            pass  # Resumed story: keep its data, db push brings the schema up to date
+        elif template and template in existing:
+            self._execute(f'CREATE DATABASE "{name}" TEMPLATE "{template}"')
+            schema_ready = True
+            with self._lock:
+                self.stats["template_clones"] += 1
+        else:
+            self._execute(f'CREATE DATABASE "{name}"')
+            created_empty = True
+        return {**self._connection_info(name), "schema_ready": schema_ready, "template_candidate": created_empty}
+
+    def publish_template(self, story_id: str, schema: str) -> bool:
+        template = _template_db_name(schema)
+        if template in self._list_databases():
+            return False
+        try:
+            # Fails if another story published the same schema first
+            self._execute(f'CREATE DATABASE "{template}" TEMPLATE "{_story_db_name(story_id)}"')
+            self._execute(f'ALTER DATABASE "{template}" WITH IS_TEMPLATE true ALLOW_CONNECTIONS false')
+        except Exception as e:
+            logger.debug(f"[db_container] Template {template} not published: {e}")
+            return False
+        with self._lock:
+            self.stats["templates_published"] += 1
+        logger.info(f"[db_container] Published schema template {template}")
+        return True
+
+    def release(self, story_id: str) -> bool:
+        try:
+            if self._engine is None and self.admin_url is None and not _shared_server_exists():
+                return False  # No self-managed server yet: no story database to drop
+            # Reattaches to the server when another process (or a previous run) created the database
+            self._execute(f'DROP DATABASE IF EXISTS "{_story_db_name(story_id)}" WITH (FORCE)')
+        except Exception as e:
+            logger.error(f"[db_container] Failed to drop database for story {story_id}: {e}")
+            return False
+        with self._lock:
+            self.stats["released"] += 1
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"provider": self.name, "server_started": self._engine is not None, **self.stats}
+
+
+_provider: Optional[StoryDatabaseProvider] = None
+_provider_lock = threading.Lock()
+_fallback_provider = ContainerDatabaseProvider()
+_story_providers: Dict[str, StoryDatabaseProvider] = {}  # story_id -> provider holding its database
+
+
+def get_story_db_provider() -> StoryDatabaseProvider:
+    """Process-wide provider chosen by STORY_DB_MODE."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            from app.core.config import settings
+
+            if settings.STORY_DB_MODE == "shared":
+                _provider = SharedServerDatabaseProvider(settings.STORY_DB_SERVER_URL)
+            else:
+                _provider = _fallback_provider
+        return _provider
+
+
+def set_story_db_provider(provider: Optional[StoryDatabaseProvider]) -> None:
+    """Override the provider (tests, alternative backends); None restores STORY_DB_MODE."""
+    global _provider
+    _provider = provider
+
+
+def acquire_story_database(story_id: str, workspace_path: str) -> Dict[str, Any]:
+    """Allocate the story's database; a failing shared server falls back to a container."""
+    provider = get_story_db_provider()
+    schema = schema_hash(workspace_path)
+    try:
+        info = provider.acquire(story_id, schema)
+    except Exception as e:
+        if provider is _fallback_provider:
+            raise
+        logger.warning(f"[db_container] {provider.name} provider failed ({e}), using a container for story {story_id}")
+        provider = _fallback_provider
+        info = provider.acquire(story_id, schema)
+    _story_providers[story_id] = provider
+    _databases[story_id] = info
+    return info
+
+
+def publish_story_template(story_id: str, workspace_path: str) -> bool:
+    """After ``prisma db push`` on a fresh database, make it the template for its schema."""
+    provider = _story_providers.get(story_id)
+    schema = schema_hash(workspace_path)
+    if provider is None or schema is None or not _databases.get(story_id, {}).get("template_candidate"):
+        return False
+    return provider.publish_template(story_id, schema)
+
+
+def release_story_database(story_id: str) -> bool:
+    """Drop the story's database (story cancel, restart, delete or merge)."""
+    provider = _story_providers.pop(story_id, None) or get_story_db_provider()
+    _databases.pop(story_id, None)
+    try:
+        return provider.release(story_id)
+    except Exception as e:
+        logger.warning(f"[db_container] Releasing database of story {story_id} failed: {e}")
+        return False
+
+
+def get_story_db_stats() -> Dict[str, Any]:
+    return {**get_story_db_provider().get_stats(), "active": len(_databases)}
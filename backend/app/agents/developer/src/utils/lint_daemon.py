@@ -0,0 +1,309 @@
+"""Persistent format / lint-fix / typecheck daemon per workspace.
+
+run_code's format+lint pass and try_auto_fix shell out to ``pnpm run
+format`` (prettier), ``pnpm run lint:fix`` (ESLint) and ``tsc`` on every
+debug iteration. Each run boots node, loads the plugins and the project
+config, and tsc rebuilds the whole program.
+
+A ``LintDaemon`` keeps Prettier, ESLint (one ``ESLint`` instance with
+``fix: true``) and the TypeScript compiler loaded in a node process per
+workspace (a ``NodeDaemon``, tsserver/eslint_d-style):
+
+- format and lint-fix only touch files changed since their previous pass
+  (all source files on the first one)
+- typecheck reuses parsed source files (including the lib ``.d.ts``) and
+  a semantic-diagnostics builder program, so only files affected by a
+  change are re-checked; output is tsc's ``file(line,col): error TS...``
+
+A change to the ESLint, Prettier or TypeScript config, or package.json,
+restarts the daemon. Tools missing from the workspace (or a daemon that
+can't start) make the call return None and the caller runs the pnpm
+script. At most ``LINT_DAEMON_MAX_LIVE`` daemons stay alive in this
+process; the least recently used one is stopped first. Each also exits
+after ``LINT_DAEMON_IDLE_SECONDS`` without a request.
+"""
+
+import asyncio
+import atexit
+import logging
+import re
+import shutil
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.agents.developer.src.utils.node_daemon import NodeDaemon, Snapshot, changed_files, scan_files, touches
+
+logger = logging.getLogger(__name__)
+
+LINT_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+FORMAT_SUFFIXES = LINT_SUFFIXES + (".json", ".css", ".scss", ".md", ".mdx", ".yaml", ".yml")
+CONFIG_FILE = re.compile(
+    r"^(eslint\.config\.|\.eslintrc|\.eslintignore|\.prettierrc|prettier\.config\.|\.prettierignore"
+    r"|tsconfig.*\.json$|package\.json$)"
+)
+
+# Daemon body (see node_daemon.PRELUDE_JS); runs in the workspace
+DAEMON_JS = r"""
+const fs = require("fs");
+const path = require("path");
+const tryLoad = (name) => { try { return load(name); } catch (e) { return null; } };
+const prettier = tryLoad("prettier");
+const eslintModule = tryLoad("eslint");
+const ts = tryLoad("typescript");
+const cwd = process.cwd();
+
+let eslint = null;
+async function getESLint() {
+  if (!eslint) {
+    const ESLint = eslintModule.loadESLint ? await eslintModule.loadESLint({ cwd }) : eslintModule.ESLint;
+    eslint = new ESLint({ cwd, fix: true, errorOnUnmatchedPattern: false });
+  }
+  return eslint;
+}
+
+async function format(files) {
+  const changed = [], errors = [];
+  for (const file of files) {
+    const abs = path.resolve(cwd, file);
+    try {
+      const info = await prettier.getFileInfo(abs, { ignorePath: path.join(cwd, ".prettierignore") });
+      if (info.ignored || !info.inferredParser) continue;
+      const src = fs.readFileSync(abs, "utf8");
+      const options = (await prettier.resolveConfig(abs)) || {};
+      const out = await prettier.format(src, { ...options, filepath: abs });
+      if (out !== src) { fs.writeFileSync(abs, out); changed.push(file); }
+    } catch (e) {
+      errors.push(`${file}: ${String((e && e.message) || e).split("\n")[0]}`);
+    }
+  }
+  return { ok: errors.length === 0, changed, output: errors.join("\n") };
+}
+
+async function lintFix(files) {
+  const linter = await getESLint();
+  const targets = [];
+  for (const file of files) {
+    if (fs.existsSync(path.resolve(cwd, file)) && !(await linter.isPathIgnored(path.resolve(cwd, file)))) targets.push(file);
+  }
+  if (!targets.length) return { ok: true, changed: [], output: "" };
+  const results = await linter.lintFiles(targets);
+  await eslintModule.ESLint.outputFixes(results);
+  const lines = [];
+  let errorCount = 0;
+  for (const r of results) {
+    errorCount += r.errorCount;
+    for (const m of r.messages) {
+      lines.push(`${path.relative(cwd, r.filePath)}:${m.line || 0}:${m.column || 0} ${m.severity === 2 ? "error" : "warning"} ${m.message} ${m.ruleId || ""}`.trim());
+    }
+  }
+  const changed = results.filter((r) => r.output !== undefined).map((r) => path.relative(cwd, r.filePath));
+  return { ok: errorCount === 0, changed, output: lines.join("\n") };
+}
+
+// Parsed source files survive between checks (keyed by path + mtime)
+const sourceFiles = new Map();
+let builder;
+function typecheck() {
+  const configPath = ts.findConfigFile(cwd, ts.sys.fileExists, "tsconfig.json");
+  if (!configPath) return { ok: true, output: "" };
+  const parsed = ts.getParsedCommandLineOfConfigFile(configPath, { noEmit: true }, {
+    ...ts.sys, onUnRecoverableConfigFileDiagnostic: (d) => { throw new Error(ts.flattenDiagnosticMessageText(d.messageText, "\n")); },
+  });
+  const options = { ...parsed.options, noEmit: true, incremental: false, tsBuildInfoFile: undefined };
+  const host = ts.createCompilerHost(options);
+  const readSourceFile = host.getSourceFile;
+  host.getSourceFile = (fileName, languageVersion, onError, shouldCreate) => {
+    let stamp;
+    try { const st = fs.statSync(fileName); stamp = `${st.mtimeMs}:${st.size}`; } catch (e) { return undefined; }
+    const hit = sourceFiles.get(fileName);
+    if (hit && hit.stamp === stamp) return hit.sourceFile;
+    const sourceFile = readSourceFile(fileName, languageVersion, onError, shouldCreate);
+    if (sourceFile) {
+      sourceFile.version = stamp;  // The builder re-checks files whose version changed (and their dependents)
+      sourceFiles.set(fileName, { stamp, sourceFile });
+    }
+    return sourceFile;
+  };
+  builder = ts.createSemanticDiagnosticsBuilderProgram(parsed.fileNames, options, host, builder, parsed.errors);
+  const diagnostics = [
+    ...builder.getConfigFileParsingDiagnostics(),
+    ...builder.getOptionsDiagnostics(),
+    ...builder.getGlobalDiagnostics(),
+    ...builder.getSyntacticDiagnostics(),
+    ...builder.getSemanticDiagnostics(),
+  ];
+  const output = ts.formatDiagnostics(diagnostics, {
+    getCanonicalFileName: (f) => f, getCurrentDirectory: () => cwd, getNewLine: () => "\n",
+  });
+  return { ok: !diagnostics.some((d) => d.category === ts.DiagnosticCategory.Error), output };
+}
+
+serve({
+  prettier: prettier ? prettier.version : null,
+  eslint: eslintModule ? eslintModule.ESLint.version : null,
+  typescript: ts ? ts.version : null,
+}, async (req) => {
+  const tool = { format: prettier, lint_fix: eslintModule, typecheck: ts }[req.op];
+  if (!tool) return { unavailable: true };
+  if (req.op === "format") return format(req.files);
+  if (req.op === "lint_fix") return lintFix(req.files);
+  return typecheck();
+});
+"""
+
+
+@dataclass
+class DaemonResult:
+    ok: bool
+    output: str = ""
+    changed: List[str] = field(default_factory=list)  # Files rewritten by format / lint-fix
+    duration: float = 0.0
+    timed_out: bool = False
+
+
+class LintDaemon:
+    """Format / lint-fix / typecheck daemon of one workspace."""
+
+    def __init__(self, workspace: Path, idle_seconds: int):
+        self.workspace = Path(workspace).resolve()
+        self._daemon = NodeDaemon(self.workspace, DAEMON_JS, "LintDaemon", idle_seconds)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._snapshots: Dict[str, Optional[Snapshot]] = {}  # op -> tree after its last pass
+        self._config: Optional[Snapshot] = None
+        self.stats = {"requests": 0, "files": 0, "restarts": 0, "errors": 0, "seconds": 0.0}
+
+    @property
+    def busy(self) -> bool:
+        return self._lock is not None and self._lock.locked()
+
+    def _scan(self) -> Snapshot:
+        return scan_files(self.workspace, FORMAT_SUFFIXES, CONFIG_FILE)
+
+    async def _check_config(self, snapshot: Snapshot) -> None:
+        config = {p: v for p, v in snapshot.items() if touches([p], CONFIG_FILE)}
+        if self._config is not None and config != self._config:
+            logger.info(f"[LintDaemon] Config changed in {self.workspace}, restarting")
+            self.stats["restarts"] += 1
+            self._snapshots.clear()
+            await self._daemon.aclose()
+        self._config = config
+
+    async def _request(self, op: str, timeout: float, **payload: Any) -> Optional[DaemonResult]:
+        started = time.monotonic()
+        try:
+            reply = await self._daemon.request({"op": op, **payload}, timeout)
+        except asyncio.TimeoutError:
+            return DaemonResult(False, f"{op} timed out after {timeout}s", timed_out=True,
+                                duration=time.monotonic() - started)
+        if reply is None or reply.get("unavailable"):
+            return None
+        if "error" in reply:
+            # Crashed handler (e.g. a broken config): not a verdict on the code, use the CLI
+            self.stats["errors"] += 1
+            logger.warning(f"[LintDaemon] {op} failed in {self.workspace}: {reply['error'][:300]}")
+            return None
+        result = DaemonResult(reply["ok"], reply.get("output", ""), reply.get("changed", []), time.monotonic() - started)
+        self.stats["requests"] += 1
+        self.stats["seconds"] += result.duration
+        return result
+
+    def _locked(self) -> asyncio.Lock:
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._loop = asyncio.get_running_loop()
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _pass(self, op: str, suffixes: tuple, timeout: float) -> Optional[DaemonResult]:
+        snapshot = await asyncio.to_thread(self._scan)
+        await self._check_config(snapshot)
+        previous = self._snapshots.get(op)
+        files = sorted(snapshot) if previous is None else sorted(changed_files(previous, snapshot) & snapshot.keys())
+        files = [f for f in files if f.endswith(suffixes)]
+        if not files:
+            return DaemonResult(True)
+        result = await self._request(op, timeout, files=files)
+        if result is None:
+            return None
+        self.stats["files"] += len(files)
+        if result.timed_out:
+            self._snapshots[op] = None  # Unknown how far it got: next pass covers everything
+        else:
+            # Files this pass rewrote are not changes for its next pass
+            self._snapshots[op] = await asyncio.to_thread(self._scan)
+        return result
+
+    async def format(self, timeout: float = 120) -> Optional[DaemonResult]:
+        """``prettier --write`` over files changed since the last format; None if Prettier isn't installed."""
+        async with self._locked():
+            return await self._pass("format", FORMAT_SUFFIXES, timeout)
+
+    async def lint_fix(self, timeout: float = 120) -> Optional[DaemonResult]:
+        """``eslint --fix`` over files changed since the last lint-fix; None if ESLint isn't installed."""
+        async with self._locked():
+            return await self._pass("lint_fix", LINT_SUFFIXES, timeout)
+
+    async def typecheck(self, timeout: float = 120) -> Optional[DaemonResult]:
+        """``tsc --noEmit`` against the workspace tsconfig; None if TypeScript isn't installed."""
+        async with self._locked():
+            await self._check_config(await asyncio.to_thread(self._scan))
+            return await self._request("typecheck", timeout)
+
+    def stop(self) -> None:
+        self._daemon.stop()
+
+    async def aclose(self) -> None:
+        await self._daemon.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workspace": str(self.workspace),
+            "alive": self._daemon.alive,
+            "starts": self._daemon.starts,
+            "tools": self._daemon.info,
+            **self.stats,
+            "seconds": round(self.stats["seconds"], 1),
+        }
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_daemons: "OrderedDict[Path, LintDaemon]" = OrderedDict()
+
+
+def get_lint_daemon(workspace: Path | str) -> Optional[LintDaemon]:
+    """Daemon of a workspace, or None when disabled (LINT_DAEMON_ENABLED), node is missing
+    or the workspace is not a node project. Starting one beyond LINT_DAEMON_MAX_LIVE stops
+    the least recently used idle daemon."""
+    from app.core.config import settings
+
+    key = Path(workspace).resolve()
+    if not settings.LINT_DAEMON_ENABLED or shutil.which("node") is None or not (key / "package.json").exists():
+        return None
+    daemon = _daemons.get(key)
+    if daemon is None:
+        daemon = _daemons[key] = LintDaemon(key, settings.LINT_DAEMON_IDLE_SECONDS)
+    _daemons.move_to_end(key)
+    for old_key, old in list(_daemons.items()):
+        if len(_daemons) <= max(1, settings.LINT_DAEMON_MAX_LIVE):
+            break
+        if old is not daemon and not old.busy:
+            logger.info(f"[LintDaemon] Live daemon cap reached, stopping {old_key}")
+            old.stop()
+            del _daemons[old_key]
+    return daemon
+
+
+@atexit.register
+def _stop_all() -> None:
+    for daemon in list(_daemons.values()):
+        daemon.stop()
+
+
+def get_lint_daemon_stats() -> List[Dict[str, Any]]:
+    return [daemon.get_stats() for daemon in list(_daemons.values())]
@@ -0,0 +1,196 @@
+"""Long-lived node helper processes driven over stdio.
+
+Tools such as jest, ESLint, Prettier and the TypeScript compiler spend
+most of a short CLI run loading themselves, their plugins and the project
+config. A daemon loads them once in a workspace and then serves requests:
+newline-delimited JSON on stdin, replies on stdout prefixed with ``MARK``
+(tests and plugins may print to stdout too; those lines are ignored).
+
+The daemon script is ``PRELUDE_JS`` plus a body that loads its tools with
+``load(name)`` (resolved from the workspace's node_modules) and calls
+``serve(info, handle)``, or sends ``{ready: false, error}`` and exits if
+they are missing. ``handle(req)`` returns the reply payload. The daemon
+exits on its own after ``idle_seconds`` without a request.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Pattern, Set, Tuple
+
+from app.agents.developer.src.utils.validation_cache import EXCLUDED_DIRS
+
+logger = logging.getLogger(__name__)
+
+MARK = "@@node-daemon@@ "
+
+PRELUDE_JS = r"""
+const readline = require("readline");
+const MARK = "@@node-daemon@@ ";
+const out = process.stdout.write.bind(process.stdout);
+const send = (msg) => out(MARK + JSON.stringify(msg) + "\n");
+// Tools and tests must not write protocol noise to stdout
+console.log = console.info = console.debug = (...a) => process.stderr.write(a.join(" ") + "\n");
+const load = (name) => require(require.resolve(name, { paths: [process.cwd()] }));
+const idleMs = Number(process.argv[1] || 600) * 1000;
+let idle = setTimeout(() => process.exit(0), idleMs);
+
+function serve(info, handle) {
+  let queue = Promise.resolve();
+  send({ ready: true, ...info });
+  readline.createInterface({ input: process.stdin })
+    .on("line", (line) => {
+      const req = JSON.parse(line);
+      queue = queue.then(async () => {
+        clearTimeout(idle);
+        try {
+          send({ id: req.id, ...(await handle(req)) });
+        } catch (e) {
+          send({ id: req.id, error: String((e && e.stack) || e) });
+        }
+        idle = setTimeout(() => process.exit(0), idleMs);
+      });
+    })
+    .on("close", () => queue.then(() => process.exit(0)));
+}
+"""
+
+
+class NodeDaemon:
+    """One node process running ``PRELUDE_JS + body`` in ``cwd``."""
+
+    def __init__(self, cwd: Path, body: str, name: str, idle_seconds: int = 600, env: Optional[Dict[str, str]] = None):
+        self.cwd = Path(cwd).resolve()
+        self.script = PRELUDE_JS + body
+        self.name = name
+        self.idle_seconds = idle_seconds
+        self.env = env or {}
+        self.info: Dict[str, Any] = {}
+        self.starts = 0
+
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def _start(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if self.alive and self._loop is loop:
+            return True
+        if self._loop is loop:
+            await self.aclose()
+        else:
+            self.stop()  # Started on an earlier event loop; can't be awaited here
+        self._loop = loop
+        self._proc = await asyncio.create_subprocess_exec(
+            "node", "-e", self.script, str(self.idle_seconds),
+            cwd=str(self.cwd),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={**os.environ, "FORCE_COLOR": "0", **self.env},
+            start_new_session=True,
+            limit=1 << 24,  # A reply with many diagnostics is one long JSON line
+        )
+        self.starts += 1
+        ready = await self._read(timeout=60)
+        if not ready or not ready.get("ready"):
+            logger.info(f"[{self.name}] Not available in {self.cwd}: {(ready or {}).get('error', 'no response')[:200]}")
+            await self.aclose()
+            return False
+        self.info = {k: v for k, v in ready.items() if k != "ready"}
+        logger.info(f"[{self.name}] Started in {self.cwd}: {self.info}")
+        return True
+
+    async def _read(self, timeout: float) -> Optional[Dict[str, Any]]:
+        while True:
+            line = await asyncio.wait_for(self._proc.stdout.readline(), timeout)
+            if not line:
+                return None
+            text = line.decode("utf-8", errors="replace")
+            if text.startswith(MARK):
+                return json.loads(text[len(MARK):])
+
+    async def request(self, payload: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+        """Send one request (callers serialize them) and wait for its reply.
+
+        Returns:
+            The reply (with ``error`` if the handler threw), or None if the
+            daemon can't start here or died twice
+
+        Raises:
+            asyncio.TimeoutError: no reply in time (the daemon is killed)
+        """
+        self._next_id += 1
+        line = (json.dumps({**payload, "id": self._next_id}) + "\n").encode()
+        for _ in range(2):
+            try:
+                if not await self._start():
+                    return None
+                self._proc.stdin.write(line)
+                await self._proc.stdin.drain()
+                reply = await self._read(timeout)
+            except asyncio.TimeoutError:
+                await self.aclose()
+                raise
+            except OSError as e:
+                reply = None
+                logger.debug(f"[{self.name}] Pipe closed: {e}")
+            if reply is not None:
+                return reply
+            await self.aclose()  # Exited while idle or crashed: one fresh start
+        return None
+
+    def stop(self) -> Optional[asyncio.subprocess.Process]:
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)  # node + any workers it spawned
+            except (ProcessLookupError, PermissionError, AttributeError):
+                proc.kill()
+        return proc
+
+    async def aclose(self) -> None:
+        """Stop the daemon and reap it (from the loop it was started on)."""
+        proc = self.stop()
+        if proc is not None:
+            await proc.wait()
+
+
+# =============================================================================
+# CHANGE TRACKING
+# =============================================================================
+
+Snapshot = Dict[str, Tuple[int, int]]  # workspace-relative path -> (size, mtime_ns)
+
+
+def scan_files(root: Path, suffixes: Tuple[str, ...], also: Optional[Pattern] = None) -> Snapshot:
+    """Stat files under ``root`` ending in ``suffixes`` (or whose name matches ``also``)."""
+    files = {}
+    for dirpath, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        for name in names:
+            if name.endswith(suffixes) or (also is not None and also.match(name)):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def changed_files(previous: Snapshot, current: Snapshot) -> Set[str]:
+    """Paths added, removed or modified between two snapshots."""
+    return {p for p in previous.keys() | current.keys() if previous.get(p) != current.get(p)}
+
+
+def touches(paths: Iterable[str], pattern: Pattern) -> bool:
+    """Whether any path's file name matches ``pattern`` (e.g. a config file)."""
+    return any(pattern.match(p.rsplit("/", 1)[-1]) for p in paths)
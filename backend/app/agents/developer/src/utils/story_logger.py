@@ -269,6 +269,27 @@ class StoryLogger:
         except Exception as e:
             logger.debug(f"[StoryLogger] task() failed: {e}")
     
+    async def stream(self, file_path: str, delta: str = "", done: bool = False) -> None:
+        """Push partial LLM output for a file via WebSocket - NOT saved to DB.
+        
+        Deltas are coalesced per project room into ``story_stream`` frames
+        (see app.websocket.stream_buffer).
+        
+        Args:
+            file_path: File being generated
+            delta: Text appended since the previous call
+            done: Content is complete (file written)
+        """
+        try:
+            from app.websocket.stream_buffer import stream_buffer
+            
+            project_id = self._get_project_id()
+            if not project_id:
+                return
+            stream_buffer.push(project_id, str(self.story_id), file_path, delta, node=self.node_name, done=done)
+        except Exception as e:
+            logger.debug(f"[StoryLogger] stream() failed: {e}")
+    
     async def message(self, message: str) -> None:
         """Send milestone message via WebSocket (NOT saved to DB).
         
@@ -328,6 +349,9 @@ class NoOpLogger(StoryLogger):
         formatted_msg = f"[{self.node_name}] {message}" if self.node_name else message
         logger.info(formatted_msg)
     
+    async def stream(self, file_path: str, delta: str = "", done: bool = False) -> None:
+        pass
+    
     def with_node(self, node_name: str) -> "NoOpLogger":
         noop = NoOpLogger()
         noop.node_name = node_name
@@ -827,7 +851,14 @@ async def try_auto_fix(
     Returns:
         True if auto-fix was attempted and likely succeeded
     """
+    from app.agents.developer.src.utils.lint_daemon import get_lint_daemon
+    from app.utils.subprocess_utils import run_process
+
     log = story_logger or StoryLogger.noop()
+
+    def run(cmd: str, timeout: int):
+        # Async + output streamed to the story; a timeout kills the command and returns exit -1
+        return run_process(cmd, cwd=workspace_path, timeout=timeout, node="auto_fix", story_logger=story_logger)
     
     if not error_analysis.get("auto_fixable"):
         return False
@@ -868,29 +899,23 @@ async def try_auto_fix(
         elif strategy == "eslint_fix":
             await log.info("Auto-fix: Running ESLint --fix...")
             
+            # Warm ESLint in the workspace's lint daemon (files changed since its last pass)
+            daemon = get_lint_daemon(workspace_path)
+            fixed = await daemon.lint_fix() if daemon else None
+            if fixed is not None and fixed.changed:
+                await log.success(f"Auto-fix: ESLint fixes applied ({len(fixed.changed)} files changed)")
+                return True
+            # Nothing rewritten (no file changed since run_code's pass, or unfixable): full script
+            
             # Try pnpm lint:fix first (common script name)
-            result = subprocess.run(
-                "pnpm run lint:fix",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = await run("pnpm run lint:fix", 120)
             
             if result.returncode == 0:
                 await log.success("Auto-fix: ESLint fixes applied")
                 return True
             
             # Fallback to direct eslint command
-            result = subprocess.run(
-                "pnpm exec eslint . --fix --ext .ts,.tsx,.js,.jsx",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = await run("pnpm exec eslint . --fix --ext .ts,.tsx,.js,.jsx", 120)
             
             if result.returncode == 0 or "problems" in result.stdout.lower():
                 await log.success("Auto-fix: ESLint fixes applied")
@@ -905,27 +930,22 @@ async def try_auto_fix(
         elif strategy == "prettier_fix":
             await log.info("Auto-fix: Running Prettier...")
             
+            daemon = get_lint_daemon(workspace_path)
+            formatted = await daemon.format() if daemon else None
+            if formatted is not None and formatted.ok and formatted.changed:
+                await log.success(f"Auto-fix: Prettier formatting applied ({len(formatted.changed)} files changed)")
+                return True
+            # Nothing rewritten (no file changed since run_code's pass): full script
+            
             # Try pnpm format first
-            result = subprocess.run(
-                "pnpm run format",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=60
-            )
+            result = await run("pnpm run format", 60)
             
             if result.returncode == 0:
                 await log.success("Auto-fix: Prettier formatting applied")
                 return True
             
             # Fallback to direct prettier
-            result = subprocess.run(
-                "pnpm exec prettier --write .",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=60
-            )
+            result = await run("pnpm exec prettier --write .", 60)
             
             if result.returncode == 0:
                 await log.success("Auto-fix: Prettier formatting applied")
@@ -941,13 +961,7 @@ async def try_auto_fix(
             await log.info("Auto-fix: Organizing imports...")
             
             # Use eslint with specific rule
-            result = subprocess.run(
-                "pnpm exec eslint . --fix --rule '@typescript-eslint/no-unused-vars: error'",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=60
-            )
+            result = await run("pnpm exec eslint . --fix --rule '@typescript-eslint/no-unused-vars: error'", 60)
             
             if result.returncode == 0:
                 await log.success("Auto-fix: Imports organized")
@@ -990,20 +1004,8 @@ async def try_auto_fix(
         # =====================================================================
         elif strategy == "prisma_regenerate":
             await log.info("Auto-fix: Regenerating Prisma client...")
-            subprocess.run(
-                "pnpm exec prisma generate",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=60
-            )
-            subprocess.run(
-                "pnpm exec prisma db push --accept-data-loss",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=60
-            )
+            await run("pnpm exec prisma generate", 60)
+            await run("pnpm exec prisma db push --accept-data-loss", 60)
             await log.success("Auto-fix: Prisma regenerated")
             return True
         
@@ -1014,26 +1016,16 @@ async def try_auto_fix(
                 return False
             
             await log.info(f"Auto-fix: Running pnpm add {missing_package}...")
-            result = subprocess.run(
-                f"pnpm add {missing_package}",
-                cwd=workspace_path,
-                shell=True,
-                capture_output=True,
-                timeout=120
-            )
+            result = await run(f"pnpm add {missing_package}", 120)
             if result.returncode == 0:
                 await log.success(f"Auto-fix: Installed {missing_package}")
                 return True
             else:
-                stderr = result.stderr.decode() if result.stderr else ""
-                await log.warning(f"Auto-fix: pnpm add failed - {stderr[:200]}")
+                await log.warning(f"Auto-fix: pnpm add failed - {result.stderr[:200]}")
                 return False
         
         return False
         
-    except subprocess.TimeoutExpired:
-        await log.error("Auto-fix: Command timed out")
-        return False
     except Exception as e:
         await log.error(f"Auto-fix failed: {e}", exc=e)
         return False
@@ -0,0 +1,130 @@
+"""Validation result cache keyed by a Merkle hash of the workspace source tree.
+
+The debug loop re-runs format, lint:fix, typecheck and build after every
+fix, often with one file changed or none. Results are cached under
+(tree hash, command): an identical tree returns the previous PASS/FAIL and
+its output without running anything.
+
+The tree hash covers every file outside build output and dependency
+directories (``node_modules``, ``.next``, ...). Each directory hashes the
+sorted (name, hash) list of its entries, so the root hash changes iff some
+source file's content changes. File digests are memoized by
+(size, mtime_ns), so re-hashing an unchanged tree only stats it.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXCLUDED_DIRS = {
+    "node_modules", ".next", ".git", ".worktrees", ".swc", ".turbo", "coverage", "out",
+    "__pycache__", ".venv", ".pytest_cache", ".mypy_cache", ".ruff_cache",
+}
+EXCLUDED_FILES = {".pnpm_install_cache", ".prisma_generate_cache", ".seed_cache"}
+EXCLUDED_SUFFIXES = (".tsbuildinfo", ".log")
+
+
+class TreeHasher:
+    """Merkle hash of a directory tree with per-file digest memoization."""
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[int, int, str]] = {}  # path -> (size, mtime_ns, digest)
+        self._lock = threading.Lock()
+
+    def _hash_file(self, entry: os.DirEntry) -> str:
+        st = entry.stat()
+        with self._lock:
+            memo = self._files.get(entry.path)
+        if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+        digest = hashlib.sha256()
+        with open(entry.path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._files[entry.path] = (st.st_size, st.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def hash_tree(self, path: str) -> str:
+        lines = []
+        with os.scandir(path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                name = entry.name
+                if entry.is_symlink():
+                    lines.append(f"l {name} {os.readlink(entry.path)}")
+                elif entry.is_dir():
+                    if name not in EXCLUDED_DIRS:
+                        lines.append(f"d {name} {self.hash_tree(entry.path)}")
+                elif name not in EXCLUDED_FILES and not name.endswith(EXCLUDED_SUFFIXES):
+                    try:
+                        lines.append(f"f {name} {self._hash_file(entry)}")
+                    except OSError:
+                        continue  # Deleted while walking
+        return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+class ValidationCache:
+    """LRU of command results per (tree hash, cwd, command)."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hasher = TreeHasher()
+        self._results: "OrderedDict[str, Tuple[bool, str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def tree_hash(self, workspace_path: str) -> str:
+        return self.hasher.hash_tree(workspace_path)
+
+    @staticmethod
+    def key(tree_hash: str, cwd: str, cmd: str) -> str:
+        return hashlib.sha256(f"{tree_hash}\0{os.path.realpath(cwd)}\0{cmd}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bool, str, str]]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.stats["misses"] += 1
+                return None
+            self._results.move_to_end(key)
+            self.stats["hits"] += 1
+            return result
+
+    def put(self, key: str, result: Tuple[bool, str, str]) -> None:
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._results), "max_entries": self.max_entries, **self.stats}
+
+
+_cache: Optional[ValidationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> Optional[ValidationCache]:
+    """Process-wide cache, or None when VALIDATION_CACHE_ENABLED is off."""
+    global _cache
+    from app.core.config import settings
+
+    if not settings.VALIDATION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ValidationCache(settings.VALIDATION_CACHE_MAX_ENTRIES)
+        return _cache
+
+
+def get_validation_cache_stats() -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        cache = _cache
+    return cache.get_stats() if cache else None
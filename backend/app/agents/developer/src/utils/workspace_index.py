@@ -0,0 +1,269 @@
+"""Incremental in-memory index of a workspace, shared by Developer and Tester planning.
+
+Planning needs the file tree, the component and API route files, the
+Prisma schema, the types and the existing tests of a worktree. Walking the
+worktree, reading those files and regex-analyzing every component on each
+plan (and again on resume, debug re-plan and when the Tester starts on the
+same worktree) is repeated work.
+
+One ``WorkspaceIndex`` per worktree path keeps all of it in memory. A
+``refresh()`` still walks the tree (excluded directories pruned) but only
+stats files: a file whose size and mtime are unchanged since the previous
+refresh keeps its cached content and component analysis, so only added
+or modified files are read and parsed again.
+
+Both agents' ``FileRepository`` classes are views over the index and
+build their own ``to_context()`` from it. The index caches the content of
+every file either agent reads; each agent keeps its own selection of
+"important" files (``files_for``).
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.agents.developer.src.utils.node_daemon import Snapshot, changed_files
+from app.agents.developer.src.utils.validation_cache import EXCLUDED_DIRS
+
+logger = logging.getLogger(__name__)
+
+INDEX_EXCLUDED_DIRS = EXCLUDED_DIRS | {".prisma", "dist", "build"}
+INDEX_SUFFIXES = (".ts", ".tsx", ".prisma", ".json", ".md")
+
+# Files whose content Developer planning reads (suffix of the workspace-relative path)
+DEVELOPER_IMPORTANT_FILES = (
+    "prisma/schema.prisma",
+    "src/types/index.ts",
+    "package.json",
+    "src/app/layout.tsx",
+    "src/lib/prisma.ts",
+)
+
+# Files whose content Tester planning reads (substring of the workspace-relative path)
+TESTER_IMPORTANT_PATTERNS = (
+    "prisma/schema.prisma",
+    "src/types/index.ts",
+    "src/types/",
+    "package.json",
+    "src/app/layout.tsx",
+    "src/lib/prisma.ts",
+    "jest.config.ts",
+    "jest.setup.ts",
+    "tsconfig.json",
+)
+
+
+def is_developer_important(path: str) -> bool:
+    return path.endswith(DEVELOPER_IMPORTANT_FILES)
+
+
+def is_tester_important(path: str) -> bool:
+    return any(p in path for p in TESTER_IMPORTANT_PATTERNS)
+
+
+def is_important(path: str) -> bool:
+    """Content cached by the index (read by either agent)."""
+    return is_developer_important(path) or is_tester_important(path)
+
+
+def is_component(path: str) -> bool:
+    """Component file (UI primitives under /ui/ excluded)."""
+    return "/components/" in path and path.endswith(".tsx") and "/ui/" not in path
+
+
+def is_api_route(path: str) -> bool:
+    return "/api/" in path and path.endswith("route.ts")
+
+
+def is_test_file(path: str) -> bool:
+    return ".test." in path or "__tests__" in path
+
+
+def analyze_component(file_path: str, content: str) -> Dict[str, Any]:
+    """Extract name, props, data attributes, exports and async/loading hints of a component."""
+    info = {
+        "name": file_path.split("/")[-1].replace(".tsx", "").replace(".ts", ""),
+        "path": file_path,
+        "props": [],
+        "data_attributes": [],
+        "exports": [],
+        "has_skeleton": False,
+        "has_fetch": False,
+        "has_use_effect": False,
+    }
+
+    for pattern in (r'export\s+(?:function|const)\s+(\w+)', r'export\s+default\s+(?:function\s+)?(\w+)'):
+        for match in re.findall(pattern, content):
+            if match and match not in info["exports"]:
+                info["exports"].append(match)
+
+    props_match = re.search(r'(?:interface|type)\s+\w*Props\w*\s*(?:=\s*)?\{([^}]+)\}', content, re.DOTALL)
+    if props_match:
+        info["props"] = sorted(set(re.findall(r'(\w+)\s*[?:]', props_match.group(1))))[:10]
+
+    info["data_attributes"] = sorted(set(re.findall(r'data-(\w+)(?:=|["\'])', content)))
+
+    content_lower = content.lower()
+    info["has_skeleton"] = "skeleton" in content_lower or "loading" in content_lower
+    info["has_use_effect"] = "useeffect" in content_lower
+    info["has_fetch"] = "fetch(" in content_lower or "usefetch" in content_lower
+    return info
+
+
+@dataclass
+class IndexedFile:
+    """Cached content (important files, components, API routes only) and component analysis."""
+
+    content: Optional[str] = None
+    component: Optional[Dict[str, Any]] = None
+
+
+class WorkspaceIndex:
+    """File tree, components, API routes, schema and tests of one worktree."""
+
+    def __init__(self, workspace: Path | str):
+        self.workspace = Path(workspace).resolve()
+        self._lock = threading.Lock()
+        self._snapshot: Snapshot = {}
+        self._entries: Dict[str, IndexedFile] = {}
+        self.stats = {
+            "refreshes": 0,
+            "files_read": 0,
+            "last_changed": 0,
+            "seconds": 0.0,
+        }
+
+    # ----- refresh -----
+
+    def _walk(self) -> Snapshot:
+        files = {}
+        for dirpath, dirs, names in os.walk(self.workspace):
+            dirs[:] = [d for d in dirs if d not in INDEX_EXCLUDED_DIRS]
+            for name in names:
+                if name.endswith(INDEX_SUFFIXES):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue  # Deleted while walking
+                    files[os.path.relpath(path, self.workspace).replace(os.sep, "/")] = (st.st_size, st.st_mtime_ns)
+        return files
+
+    def _load(self, rel_path: str) -> IndexedFile:
+        entry = IndexedFile()
+        if not (is_important(rel_path) or is_component(rel_path) or is_api_route(rel_path)):
+            return entry
+        try:
+            entry.content = (self.workspace / rel_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            entry.content = ""
+        self.stats["files_read"] += 1
+        if is_component(rel_path) and entry.content:
+            entry.component = analyze_component(rel_path, entry.content)
+        return entry
+
+    def refresh(self) -> "WorkspaceIndex":
+        """Bring the index up to date with the worktree; re-reads only added or modified files."""
+        with self._lock:
+            started = time.monotonic()
+            snapshot = self._walk() if self.workspace.is_dir() else {}
+            changed = changed_files(self._snapshot, snapshot)
+            entries = dict(self._entries)  # Swapped in whole so readers never see a half-applied refresh
+            for path in changed:
+                if path in snapshot:
+                    entries[path] = self._load(path)
+                else:
+                    entries.pop(path, None)
+            self._entries, self._snapshot = entries, snapshot
+            self.stats["refreshes"] += 1
+            self.stats["last_changed"] = len(changed)
+            self.stats["seconds"] += time.monotonic() - started
+            if changed:
+                logger.debug(f"[WorkspaceIndex] {self.workspace}: {len(changed)} changed of {len(snapshot)} files")
+        return self
+
+    # ----- views (sorted by path) -----
+
+    @property
+    def file_tree(self) -> List[str]:
+        return sorted(self._entries)
+
+    def files_for(self, is_wanted: Callable[[str], bool]) -> Dict[str, str]:
+        """Content of the cached files an agent treats as important (e.g. ``is_tester_important``)."""
+        return {p: e.content for p, e in sorted(self._entries.items()) if is_wanted(p) and e.content is not None}
+
+    @property
+    def components(self) -> Dict[str, str]:
+        """Component name -> ``@/`` import path."""
+        return {
+            os.path.basename(p).replace(".tsx", ""): "@/" + p.replace(".tsx", "")
+            for p in sorted(self._entries) if is_component(p)
+        }
+
+    @property
+    def component_analysis(self) -> Dict[str, Dict[str, Any]]:
+        return {p: dict(e.component) for p, e in sorted(self._entries.items()) if e.component}
+
+    @property
+    def api_routes(self) -> List[str]:
+        return [p for p in sorted(self._entries) if is_api_route(p)]
+
+    @property
+    def test_files(self) -> List[str]:
+        return [p for p in sorted(self._entries) if is_test_file(p)]
+
+    def read(self, rel_path: str) -> str:
+        """Content of a file; served from the index when it is cached there."""
+        entry = self._entries.get(rel_path)
+        if entry is not None and entry.content is not None:
+            return entry.content
+        try:
+            return (self.workspace / rel_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return ""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workspace": str(self.workspace),
+            "files": len(self._snapshot),
+            **self.stats,
+            "seconds": round(self.stats["seconds"], 3),
+        }
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_indexes: "OrderedDict[Path, WorkspaceIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_workspace_index(workspace: Path | str) -> WorkspaceIndex:
+    """Up-to-date index of a worktree (least recently used dropped beyond WORKSPACE_INDEX_MAX_ENTRIES)."""
+    from app.core.config import settings
+
+    key = Path(workspace).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = WorkspaceIndex(key)
+        _indexes.move_to_end(key)
+        while len(_indexes) > max(1, settings.WORKSPACE_INDEX_MAX_ENTRIES):
+            _indexes.popitem(last=False)
+    return index.refresh()
+
+
+def drop_workspace_index(workspace: Path | str) -> None:
+    with _indexes_lock:
+        _indexes.pop(Path(workspace).resolve(), None)
+
+
+def get_workspace_index_stats() -> List[Dict[str, Any]]:
+    return [index.get_stats() for index in list(_indexes.values())]
@@ -30,7 +30,7 @@ VÍ DỤ: "Website bán sách" + "tạo website quản lý công việc" = KHÁC
 
 Trả lời CHỈ một từ: SAME hoặc DIFFERENT"""
 
-        response = await get_llm("router").ainvoke(
+        response = await get_llm("classify").ainvoke(
             [HumanMessage(content=prompt)],
             config=get_callback_config(state, "check_domain_change")
         )
@@ -71,7 +71,7 @@ async def router(state: TeamLeaderState, agent=None) -> TeamLeaderState:
             ))
         ]
 
-        structured_llm = get_llm("router").with_structured_output(RoutingDecision)
+        structured_llm = get_llm("classify").with_structured_output(RoutingDecision)
         decision = await structured_llm.ainvoke(messages, config=get_callback_config(state, "router"))
         logger.info(f"[router] Decision: action={decision.action}, target={decision.target_role}")
         result = decision.model_dump()
@@ -102,7 +102,7 @@ class TeamLeader(BaseAgent):
         
         try:
             # 1. Add user message to shared memory
-            self.context.add_message("user", task.content)
+            self.context.add_message("user", task.content, message_id=task.message_id)
             
             langfuse_handler = None
             langfuse_ctx = None
@@ -170,7 +170,10 @@ class TeamLeader(BaseAgent):
             
             # 6. Add response to shared memory
             if response_msg:
-                self.context.add_message("assistant", response_msg)
+                self.context.add_message("assistant", response_msg, message_id=self._last_saved_message_id)
+            
+            # Summarize in the background; this turn already used summary + raw tail
+            self.context.maybe_summarize()
             
             logger.info(
                 f"[{self.name}] Graph completed: action={action}, "
@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 from typing import Dict, List
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
 from app.agents.tester.src.prompts import get_system_prompt, get_user_prompt
 from app.agents.tester.src.skills import SkillRegistry
@@ -15,6 +15,8 @@ from app.agents.tester.src.nodes.helpers import send_message, generate_user_mess
 from app.agents.tester.src.schemas import TestFileOutput
 from app.utils.token_utils import truncate_to_tokens
 from app.core.agent.llm_factory import get_llm
+from app.core.agent.prompt_utils import cached_system_message
+from app.core.agent.response_cache import bypass_response_cache
 from app.agents.tester.src.config import (
     MAX_RETRIES,
     RETRY_WAIT_MIN as RETRY_DELAY,
@@ -91,7 +93,8 @@ def _preload_skills(registry: SkillRegistry, skill_ids: list[str]) -> str:
         return ""
     
     parts = []
-    for skill_id in skill_ids:
+    # Sorted so steps with the same skills share a byte-identical (cacheable) system prompt
+    for skill_id in sorted(set(skill_ids)):
         skill = registry.get_skill(skill_id)
         if not skill:
             logger.warning(f"[_preload_skills] Skill not found: {skill_id}")
@@ -286,9 +289,12 @@ async def _invoke_with_retry(
     messages: list,
     config: dict,
     max_retries: int = MAX_RETRIES,
+    bypass_cache: bool = False,
 ) -> TestFileOutput:
     """Invoke structured LLM with retry logic.
     
+    The response cache is skipped when ``bypass_cache`` is set and on retries.
+    
     Retries on:
     - Timeout errors
     - Connection errors
@@ -298,7 +304,8 @@ async def _invoke_with_retry(
     
     for attempt in range(1, max_retries + 1):
         try:
-            result = await structured_llm.ainvoke(messages, config=config)
+            with bypass_response_cache(bypass_cache or attempt > 1):
+                result = await structured_llm.ainvoke(messages, config=config)
             
             # Validate result
             if not result.content or len(result.content) < 50:
@@ -512,7 +519,7 @@ Scan the source code above and list what you found:
     
     try:
         messages = [
-            SystemMessage(content=system_prompt),
+            cached_system_message(system_prompt),
             HumanMessage(content=user_prompt),
         ]
         
@@ -526,6 +533,7 @@ Scan the source code above and list what you found:
             structured_llm,
             messages,
             config=_cfg(config, f"implement_step_{step_index + 1}"),
+            bypass_cache=file_path in failed_files,  # LBTM re-implementation
         )
         
         # Direct file write
@@ -1,15 +1,15 @@
 """Run Tests node - Execute tests and capture results."""
 
 import logging
-import os
 import re
-import subprocess
 from pathlib import Path
 from uuid import UUID
 
 from app.agents.tester.src.state import TesterState
 from app.agents.tester.src.nodes.helpers import send_message, generate_user_message
+from app.agents.tester.src.utils.jest_worker import get_jest_worker
 from app.agents.developer.src.utils.story_logger import StoryLogger
+from app.utils.subprocess_utils import run_process
 from langgraph.types import interrupt
 from app.agents.tester.src.utils.interrupt import check_interrupt_signal
     
@@ -118,7 +118,7 @@ def _parse_test_output(stdout: str, stderr: str, test_type: str) -> dict:
     return result
 
 
-def _run_typecheck(project_path: Path, test_files: list[str]) -> dict | None:
+async def _run_typecheck(project_path: Path, test_files: list[str]) -> dict | None:
     """Run TypeScript type checking using Jest's compiler.
     
     Uses Jest with --passWithNoTests to leverage moduleNameMapper config
@@ -146,19 +146,18 @@ def _run_typecheck(project_path: Path, test_files: list[str]) -> dict | None:
         
         logger.info(f"[_run_typecheck] Running: {cmd}")
         
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            cwd=str(project_path),
-            capture_output=True,
-            text=True,
-            timeout=120,
-            encoding="utf-8",
-            errors="replace",
-        )
+        worker = get_jest_worker(project_path)
+        run = await worker.run(valid_test_files, timeout=120) if worker else None
+        if run is None:
+            result = await run_process(cmd, cwd=project_path, timeout=120, node="run_tests")
+            timed_out, failed, output = result.timed_out, result.returncode != 0, result.output
+        else:
+            timed_out, failed, output = run.timed_out, not run.success, run.output
+        if timed_out:
+            logger.warning("[_run_typecheck] TypeCheck timeout")
+            return None
         
-        if result.returncode != 0:
-            output = (result.stdout or "") + (result.stderr or "")
+        if failed:
             
             # Check for TypeScript/compilation errors
             if "error TS" in output or "Cannot find module" in output or "SyntaxError" in output:
@@ -175,9 +174,6 @@ def _run_typecheck(project_path: Path, test_files: list[str]) -> dict | None:
         
         return None  # Pass
         
-    except subprocess.TimeoutExpired:
-        logger.warning("[_run_typecheck] TypeCheck timeout")
-        return None
     except Exception as e:
         logger.warning(f"[_run_typecheck] Error: {e}")
         return None
@@ -248,7 +244,7 @@ async def run_tests(state: TesterState, agent=None) -> dict:
     
     # Step 1: Run TypeCheck first
     await story_logger.task("🔍 Running TypeScript check...")
-    typecheck_result = _run_typecheck(project_path, all_test_files)
+    typecheck_result = await _run_typecheck(project_path, all_test_files)
     
     if typecheck_result:
         # TypeScript errors found (persona intro + technical details)
@@ -312,26 +308,39 @@ async def run_tests(state: TesterState, agent=None) -> dict:
         await story_logger.task(f"🧪 Running {test_type} tests...")
         
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=str(project_path),
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minutes
-                env={**os.environ, "CI": "true", "FORCE_COLOR": "0"},
-                encoding="utf-8",
-                errors="replace",
-            )
-            
-            stdout = result.stdout or ""
-            stderr = result.stderr or ""
+            worker = get_jest_worker(project_path)
+            run = await worker.run(files) if worker else None
+            if run is not None:
+                # Warm worker: usually nothing changed since the typecheck run, so results are reused
+                await story_logger.info(f"Jest worker: {run.ran} test files run, {run.cached} unchanged ({run.duration:.1f}s)")
+                stdout, stderr, timed_out = run.output, "", run.timed_out
+                parsed = run.summary()
+                exit_ok = run.success
+            else:
+                result = await run_process(
+                    command,
+                    cwd=project_path,
+                    timeout=300,  # 5 minutes
+                    env={"CI": "true", "FORCE_COLOR": "0"},
+                    node="run_tests",
+                    story_logger=story_logger,
+                )
+                stdout, stderr, timed_out = result.stdout, result.stderr, result.timed_out
+                parsed = _parse_test_output(stdout, stderr, test_type)
+                exit_ok = result.returncode == 0
+            if timed_out:
+                all_stderr.append(f"[{test_type}] Timeout (300s)")
+                all_results.append({
+                    "type": test_type,
+                    "success": False,
+                    "error": "Timeout",
+                })
+                continue
             
             all_stdout.append(f"=== {test_type.upper()} ===\n{stdout}")
             all_stderr.append(stderr)
             
             # Parse results
-            parsed = _parse_test_output(stdout, stderr, test_type)
             parsed["type"] = test_type
             parsed["command"] = command
             
@@ -341,19 +350,12 @@ async def run_tests(state: TesterState, agent=None) -> dict:
                 parsed["error"] = parsed["setup_error"]
                 await story_logger.error(f"Setup error: {parsed['setup_error']}")
             else:
-                parsed["success"] = result.returncode == 0
+                parsed["success"] = exit_ok
             
             all_results.append(parsed)
             overall_passed += parsed["passed"]
             overall_failed += parsed["failed"]
             
-        except subprocess.TimeoutExpired:
-            all_stderr.append(f"[{test_type}] Timeout (300s)")
-            all_results.append({
-                "type": test_type,
-                "success": False,
-                "error": "Timeout",
-            })
         except Exception as e:
             all_stderr.append(f"[{test_type}] Error: {str(e)}")
             all_results.append({
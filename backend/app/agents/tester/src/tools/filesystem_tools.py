@@ -2,12 +2,13 @@
 
 import fnmatch
 import logging
-import re
 from pathlib import Path
 from uuid import UUID
 
 from langchain_core.tools import tool
 
+from app.agents.tester.src.utils import code_search
+
 logger = logging.getLogger(__name__)
 
 # Config files that should not be overwritten if they exist
@@ -84,24 +85,14 @@ def glob_files(
         if not project_path:
             return "Project path not configured."
 
-        exclude_patterns = exclude_patterns or [
-            "node_modules/**",
-            ".next/**",
-            "__pycache__/**",
-            ".git/**",
-        ]
+        exclude_patterns = exclude_patterns or []
 
-        matched_files = []
-        for pattern in patterns:
-            for file_path in project_path.glob(pattern):
-                if file_path.is_file():
-                    rel_path = file_path.relative_to(project_path)
-                    # Check excludes
-                    excluded = any(
-                        fnmatch.fnmatch(str(rel_path), exc) for exc in exclude_patterns
-                    )
-                    if not excluded:
-                        matched_files.append(str(rel_path))
+        # Excluded and .gitignored directories are pruned during the walk
+        matched_files = [
+            rel_path
+            for rel_path in code_search.glob_paths(project_path, patterns)
+            if not any(fnmatch.fnmatch(rel_path, exc) for exc in exclude_patterns)
+        ]
 
         # Deduplicate and sort
         matched_files = sorted(set(matched_files))
@@ -153,50 +144,15 @@ def grep_files(
         if not project_path:
             return "Project path not configured."
 
-        exclude_dirs = {"node_modules", ".next", "__pycache__", ".git", "dist", "build"}
-        flags = re.IGNORECASE if case_insensitive else 0
-        regex = re.compile(pattern, flags)
-
         matches = []
-
-        for file_path in project_path.glob(file_pattern):
-            if not file_path.is_file():
-                continue
-
-            # Skip excluded directories
-            if any(exc in file_path.parts for exc in exclude_dirs):
-                continue
-
-            # Skip binary files
-            if file_path.suffix in {".png", ".jpg", ".ico", ".woff", ".ttf", ".lock"}:
-                continue
-
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
-                lines = content.split("\n")
-                rel_path = file_path.relative_to(project_path)
-
-                for i, line in enumerate(lines):
-                    if regex.search(line):
-                        # Get context
-                        start = max(0, i - context_lines)
-                        end = min(len(lines), i + context_lines + 1)
-
-                        if context_lines > 0:
-                            context = "\n".join(
-                                f"    {j + 1}: {lines[j]}" for j in range(start, end)
-                            )
-                            matches.append(f"{rel_path}:{i + 1}\n{context}")
-                        else:
-                            matches.append(f"{rel_path}:{i + 1}: {line.strip()[:100]}")
-
-                        if len(matches) >= 30:
-                            break
-            except Exception:
-                continue
-
-            if len(matches) >= 30:
-                break
+        for match in code_search.grep(
+            project_path, pattern, file_pattern, case_insensitive, context_lines, max_matches=30
+        ):
+            if context_lines > 0:
+                context = "\n".join(f"    {line_no}: {line}" for line_no, line in match.context)
+                matches.append(f"{match.path}:{match.line_no}\n{context}")
+            else:
+                matches.append(f"{match.path}:{match.line_no}: {match.line.strip()[:100]}")
 
         if not matches:
             return f"No matches found for pattern: {pattern}"
@@ -512,8 +468,7 @@ def get_project_structure(project_id: str, max_depth: int = 3) -> str:
         result.append("\n--- Summary ---")
         
         # Count test files (integration only - no e2e)
-        test_files = list(project_path.glob("**/*.test.ts")) + list(project_path.glob("**/*.test.js"))
-        test_files = [f for f in test_files if "node_modules" not in str(f)]
+        test_files = list(code_search.glob_paths(project_path, ["**/*.test.ts", "**/*.test.js"]))
         
         result.append(f"Integration tests (*.test.ts): {len(test_files)}")
         
@@ -12,6 +12,8 @@ import shutil
 import subprocess
 from pathlib import Path
 
+from app.agents.developer.src.utils.workspace_index import drop_workspace_index
+
 # Import shared utilities from central location
 from app.utils.workspace_utils import (
     setup_git_worktree,
@@ -53,6 +55,8 @@ def cleanup_worktree(main_workspace: str, branch_name: str) -> bool:
         if not worktree_path.exists():
             return True  # Already cleaned up
         
+        drop_workspace_index(worktree_path)
+        
         # Remove worktree
         result = subprocess.run(
             ["git", "worktree", "remove", str(worktree_path), "--force"],
@@ -0,0 +1,408 @@
+"""Pruned, streaming file search behind the glob_files/grep_files agent tools.
+
+``Path.glob("**/*")`` descends into ``node_modules`` and ``.next`` and
+only then lets the caller drop those paths, so one tool call on a Next.js
+worktree touches tens of thousands of files. Here the walk never enters
+excluded directories or anything ignored by a ``.gitignore`` (nested
+files included), starts below the literal prefix of a glob pattern
+(``src/**/*.ts`` walks ``src`` only) and yields paths as it goes.
+
+``grep`` streams matches and stops at ``max_matches``: it reads one
+candidate file at a time and rejects files without a match with a single
+regex search over the whole content before splitting lines. When
+ripgrep is on PATH (and CODE_SEARCH_RIPGREP is on) it lists the candidate
+files instead, in parallel native code; the lines are still matched with
+Python ``re`` so both backends give the same output, and a regex ripgrep
+can't parse falls back to the walk.
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+from app.agents.developer.src.utils.validation_cache import EXCLUDED_DIRS
+
+logger = logging.getLogger(__name__)
+
+SEARCH_EXCLUDED_DIRS = EXCLUDED_DIRS | {"dist", "build"}
+BINARY_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2", ".ttf", ".otf",
+    ".lock", ".zip", ".gz", ".pdf", ".db", ".sqlite",
+}
+MAX_FILE_BYTES = 1024 * 1024  # Larger files are generated or data, not code to search
+
+_GLOB_CHARS = re.compile(r"[*?\[{]")
+
+
+# =============================================================================
+# PATTERNS
+# =============================================================================
+
+def glob_regex(pattern: str) -> Pattern:
+    """Compile a glob to a regex over ``/``-separated relative paths.
+
+    ``*`` and ``?`` stay inside one path segment, ``**/`` matches zero or
+    more directories, ``[...]`` is a character class and ``{a,b}`` an
+    alternation.
+    """
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = end
+        elif c == "{" and "}" in pattern[i + 1:]:
+            end = pattern.index("}", i + 1)
+            out.append("(?:" + "|".join(glob_regex(p).pattern[:-2] for p in pattern[i + 1:end].split(",")) + ")")
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def literal_prefix(pattern: str) -> str:
+    """Leading directories of a glob without wildcards (where its walk can start)."""
+    parts = pattern.replace("\\", "/").lstrip("/").split("/")[:-1]
+    prefix = []
+    for part in parts:
+        if _GLOB_CHARS.search(part) or part in ("", ".", ".."):
+            break
+        prefix.append(part)
+    return "/".join(prefix)
+
+
+@dataclass
+class _IgnoreRule:
+    regex: Pattern
+    negated: bool
+    dir_only: bool
+
+
+@dataclass
+class _IgnoreFile:
+    """Rules of one .gitignore, merged into one regex per run of same-polarity rules."""
+
+    base: str  # Directory of the .gitignore, relative to the search root ("" for the root)
+    runs: List[Tuple[bool, Optional[Pattern], Optional[Pattern]]]  # (negated, any entry, files only)
+
+    @classmethod
+    def build(cls, base: str, rules: List[_IgnoreRule]) -> "_IgnoreFile":
+        runs, i = [], 0
+        while i < len(rules):
+            j = i
+            while j < len(rules) and rules[j].negated == rules[i].negated:
+                j += 1
+            run = rules[i:j]
+            runs.append((rules[i].negated, _union(run), _union([r for r in run if not r.dir_only])))
+            i = j
+        return cls(base, runs)
+
+    def apply(self, ignored: bool, path: str, is_dir: bool) -> bool:
+        for negated, any_entry, files_only in self.runs:  # Last matching rule wins
+            regex = any_entry if is_dir else files_only
+            if regex is not None and regex.match(path):
+                ignored = not negated
+        return ignored
+
+
+def _union(rules: List[_IgnoreRule]) -> Optional[Pattern]:
+    return re.compile("|".join(f"(?:{r.regex.pattern})" for r in rules)) if rules else None
+
+
+_gitignore_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], Optional[_IgnoreFile]]] = {}
+
+
+def _load_gitignore(root: Path, rel_dir: str) -> Optional[_IgnoreFile]:
+    path = os.path.join(root, rel_dir, ".gitignore")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_size, st.st_mtime_ns)
+    cached = _gitignore_cache.get((path, rel_dir))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash before the end anchors the pattern to the .gitignore's directory
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(_IgnoreRule(glob_regex(line if anchored else "**/" + line), negated, dir_only))
+    ignore_file = _IgnoreFile.build(rel_dir, rules) if rules else None
+    if len(_gitignore_cache) > 1024:
+        _gitignore_cache.clear()
+    _gitignore_cache[(path, rel_dir)] = (key, ignore_file)
+    return ignore_file
+
+
+def _ignored(files: List[_IgnoreFile], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for ignore_file in files:  # Deeper .gitignore files come later and override
+        base = ignore_file.base
+        if base:
+            if not rel_path.startswith(base + "/"):
+                continue
+            path = rel_path[len(base) + 1:]
+        else:
+            path = rel_path
+        ignored = ignore_file.apply(ignored, path, is_dir)
+    return ignored
+
+
+# =============================================================================
+# WALK
+# =============================================================================
+
+_stats = {
+    "globs": 0,
+    "greps": 0,
+    "ripgrep_greps": 0,
+    "files_walked": 0,
+    "files_read": 0,
+    "dirs_pruned": 0,
+    "seconds": 0.0,
+}
+
+
+def walk_files(root: Path | str, start: str = "", gitignore: bool = True) -> Iterator[str]:
+    """Yield files under ``root/start`` (paths relative to ``root``), pruning excluded and ignored dirs.
+
+    Sorted by name per directory: files first, then subdirectories.
+    """
+    root = Path(root)
+    rules: List[_IgnoreFile] = []
+    if gitignore:
+        # .gitignore files of the directories above the start directory apply too
+        parts = [p for p in start.split("/") if p]
+        for depth in range(len(parts)):
+            ignore_file = _load_gitignore(root, "/".join(parts[:depth]))
+            if ignore_file is not None:
+                rules.append(ignore_file)
+            if _ignored(rules, "/".join(parts[:depth + 1]), True):
+                return
+    yield from _walk(root, start.strip("/"), rules, gitignore)
+
+
+def _walk(root: Path, rel_dir: str, rules: List[_IgnoreFile], gitignore: bool) -> Iterator[str]:
+    if gitignore:
+        ignore_file = _load_gitignore(root, rel_dir)
+        if ignore_file is not None:
+            rules = rules + [ignore_file]
+    try:
+        with os.scandir(root / rel_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.name in SEARCH_EXCLUDED_DIRS:  # Also the .git file of a worktree
+            _stats["dirs_pruned"] += 1
+            continue
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if gitignore and _ignored(rules, rel, True):
+                _stats["dirs_pruned"] += 1
+            else:
+                subdirs.append(rel)
+        elif not (gitignore and _ignored(rules, rel, False)):
+            _stats["files_walked"] += 1
+            yield rel
+    for rel in subdirs:
+        yield from _walk(root, rel, rules, gitignore)
+
+
+def glob_paths(root: Path | str, patterns: Iterable[str], gitignore: bool = True) -> Iterator[str]:
+    """Yield files matching any of the glob ``patterns`` (each path once)."""
+    _stats["globs"] += 1
+    started = time.monotonic()
+    seen = set()
+    try:
+        for pattern in patterns:
+            pattern = pattern.replace("\\", "/").lstrip("/")
+            regex = glob_regex(pattern)
+            for rel in walk_files(root, literal_prefix(pattern), gitignore):
+                if rel not in seen and regex.match(rel):
+                    seen.add(rel)
+                    yield rel
+    finally:
+        _stats["seconds"] += time.monotonic() - started
+
+
+# =============================================================================
+# GREP
+# =============================================================================
+
+@dataclass
+class GrepMatch:
+    path: str
+    line_no: int  # 1-based
+    line: str
+    context: List[Tuple[int, str]] = field(default_factory=list)  # (line_no, line) incl. the match
+
+
+def _whole_file_regex(regex: Pattern) -> Optional[Pattern]:
+    """Regex that finds a match in a whole file whenever one line of it matches.
+
+    None when the pattern uses constructs that could behave differently
+    across a line break (negative lookaround, string anchors).
+    """
+    if any(token in regex.pattern for token in ("(?!", "(?<!", "\\A", "\\Z")):
+        return None
+    return re.compile(regex.pattern, regex.flags | re.MULTILINE)
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        if path.stat().st_size > MAX_FILE_BYTES:
+            return None
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:1024]:
+        return None  # Binary
+    _stats["files_read"] += 1
+    return data.decode("utf-8", errors="ignore")
+
+
+def _scan_file(root: Path, rel: str, regex: Pattern, whole: Optional[Pattern], context_lines: int) -> Iterator[GrepMatch]:
+    text = _read_text(root / rel)
+    if text is None or (whole is not None and not whole.search(text)):
+        return
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if regex.search(line):
+            start, end = max(0, i - context_lines), min(len(lines), i + context_lines + 1)
+            context = [(j + 1, lines[j]) for j in range(start, end)] if context_lines > 0 else []
+            yield GrepMatch(rel, i + 1, line, context)
+
+
+def _ripgrep_candidates(root: Path, pattern: str, file_pattern: str, case_insensitive: bool) -> Optional[Iterator[str]]:
+    """Files ripgrep finds a match in (streamed), or None if ripgrep is not in use."""
+    from app.core.config import settings
+
+    rg = shutil.which("rg") if settings.CODE_SEARCH_RIPGREP else None
+    if rg is None:
+        return None
+    cmd = [rg, "--files-with-matches", "--no-messages", "--hidden", "--no-require-git", "--sort", "path",
+           "--max-filesize", str(MAX_FILE_BYTES)]
+    file_pattern = file_pattern.replace("\\", "/").lstrip("/")
+    # rg globs use gitignore semantics (``*.tsx`` matches at any depth): narrow
+    # with them, then filter exactly as the walk does
+    file_regex = glob_regex(file_pattern)
+    cmd += ["--glob", file_pattern]
+    cmd += [arg for d in sorted(SEARCH_EXCLUDED_DIRS) for arg in ("--glob", f"!{d}/")]  # Later globs win
+    if case_insensitive:
+        cmd.append("--ignore-case")
+    cmd += ["--regexp", pattern, "--", "."]
+
+    def stream() -> Iterator[str]:
+        proc = subprocess.Popen(cmd, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        found = False
+        try:
+            for line in proc.stdout:
+                rel = line.rstrip("\n").replace("\\", "/").removeprefix("./")
+                if rel:
+                    found = True
+                    if file_regex.match(rel) and os.path.splitext(rel)[1].lower() not in BINARY_SUFFIXES:
+                        yield rel
+            if proc.wait() == 2 and not found:
+                # Not a pattern ripgrep understands (e.g. lookaround): walk instead
+                logger.debug(f"[code_search] ripgrep rejected {pattern!r}, using the Python walk")
+                yield from _walk_candidates(root, file_pattern)
+        finally:
+            if proc.poll() is None:
+                proc.kill()  # Stopped early at the match cap
+            proc.stdout.close()
+            proc.wait()
+
+    return stream()
+
+
+def _walk_candidates(root: Path, file_pattern: str) -> Iterator[str]:
+    file_pattern = file_pattern.replace("\\", "/").lstrip("/")
+    file_regex = glob_regex(file_pattern)
+    for rel in walk_files(root, literal_prefix(file_pattern)):
+        if file_regex.match(rel) and os.path.splitext(rel)[1].lower() not in BINARY_SUFFIXES:
+            yield rel
+
+
+def grep(
+    root: Path | str,
+    pattern: str,
+    file_pattern: str = "**/*",
+    case_insensitive: bool = False,
+    context_lines: int = 0,
+    max_matches: int = 30,
+) -> Iterator[GrepMatch]:
+    """Yield lines matching ``pattern`` in files matching ``file_pattern``; stops after ``max_matches``.
+
+    Raises:
+        re.error: invalid ``pattern``
+    """
+    root = Path(root)
+    regex = re.compile(pattern, re.IGNORECASE if case_insensitive else 0)
+    whole = _whole_file_regex(regex)
+    _stats["greps"] += 1
+    started = time.monotonic()
+
+    candidates = _ripgrep_candidates(root, pattern, file_pattern, case_insensitive)
+    if candidates is not None:
+        _stats["ripgrep_greps"] += 1
+    else:
+        candidates = _walk_candidates(root, file_pattern)
+    count = 0
+    try:
+        for rel in candidates:
+            for match in _scan_file(root, rel, regex, whole, context_lines):
+                yield match
+                count += 1
+                if count >= max_matches:
+                    return
+    finally:
+        close = getattr(candidates, "close", None)
+        if close is not None:
+            close()
+        _stats["seconds"] += time.monotonic() - started
+
+
+def get_code_search_stats() -> Dict[str, Any]:
+    return {**_stats, "seconds": round(_stats["seconds"], 3), "ripgrep": shutil.which("rg") is not None}
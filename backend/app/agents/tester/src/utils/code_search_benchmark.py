@@ -0,0 +1,141 @@
+"""
+Code search benchmark: grep_files/glob_files on a Next.js workspace, old walk vs pruned search.
+
+- legacy: the previous tool bodies (``Path.glob`` over the whole tree,
+  excluded directories dropped afterwards, every file read line by line)
+- pruned: ``code_search`` (excluded and .gitignored dirs never entered,
+  streaming with early stop, ripgrep for candidates when on PATH)
+
+Defaults to the Next.js boilerplate template. Point ``--workspace`` at a
+worktree with ``node_modules`` installed; for a tree without them,
+``--synthetic-node-modules N`` benchmarks a temporary copy with N fake
+packages (50 files each) under ``node_modules`` plus a ``.next`` build
+directory, roughly the file count of an installed Next.js app.
+
+Usage::
+
+    python -m app.agents.tester.src.utils.code_search_benchmark --workspace /path/to/worktree
+    python -m app.agents.tester.src.utils.code_search_benchmark --synthetic-node-modules 600
+"""
+
+import argparse
+import fnmatch
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from app.agents.tester.src.utils import code_search
+
+TEMPLATE = Path(__file__).resolve().parents[3] / "templates" / "boilerplate" / "nextjs-boilerplate"
+CAP = 30
+
+
+# Previous tool implementations, for comparison
+
+def legacy_glob(root: Path, patterns: List[str]) -> List[str]:
+    exclude_patterns = ["node_modules/**", ".next/**", "__pycache__/**", ".git/**"]
+    matched = []
+    for pattern in patterns:
+        for file_path in root.glob(pattern):
+            if file_path.is_file():
+                rel_path = file_path.relative_to(root)
+                if not any(fnmatch.fnmatch(str(rel_path), exc) for exc in exclude_patterns):
+                    matched.append(str(rel_path))
+    return sorted(set(matched))
+
+
+def legacy_grep(root: Path, pattern: str, file_pattern: str = "**/*") -> List[str]:
+    exclude_dirs = {"node_modules", ".next", "__pycache__", ".git", "dist", "build"}
+    regex = re.compile(pattern)
+    matches = []
+    for file_path in root.glob(file_pattern):
+        if not file_path.is_file() or any(exc in file_path.parts for exc in exclude_dirs):
+            continue
+        if file_path.suffix in {".png", ".jpg", ".ico", ".woff", ".ttf", ".lock"}:
+            continue
+        try:
+            lines = file_path.read_text(encoding="utf-8", errors="ignore").split("\n")
+        except Exception:
+            continue
+        for i, line in enumerate(lines):
+            if regex.search(line):
+                matches.append(f"{file_path.relative_to(root)}:{i + 1}")
+                if len(matches) >= CAP:
+                    return matches
+    return matches
+
+
+def pruned_glob(root: Path, patterns: List[str]) -> List[str]:
+    return sorted(code_search.glob_paths(root, patterns))
+
+
+def pruned_grep(root: Path, pattern: str, file_pattern: str = "**/*") -> List[str]:
+    return [f"{m.path}:{m.line_no}" for m in code_search.grep(root, pattern, file_pattern, max_matches=CAP)]
+
+
+def synthesize(template: Path, packages: int) -> Path:
+    """Copy ``template`` to a temp dir and add fake node_modules and .next trees."""
+    root = Path(tempfile.mkdtemp(prefix="code-search-bench-")) / "app"
+    shutil.copytree(template, root, ignore=shutil.ignore_patterns("node_modules", ".next"))
+    body = "export function helper(value) {\n  return value == null ? undefined : String(value);\n}\n" * 40
+    for p in range(packages):
+        for f in range(50):
+            path = root / "node_modules" / f"pkg-{p}" / ("dist" if f % 2 else "src") / f"module{f}.js"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body)
+    for f in range(packages * 5):
+        path = root / ".next" / "server" / "chunks" / f"chunk{f}.js"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+    return root
+
+
+def _time(fn: Callable[[], List[str]], repeat: int):
+    timings, result = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="grep_files/glob_files: Path.glob walk vs pruned code search")
+    parser.add_argument("--workspace", default=str(TEMPLATE), help="Next.js workspace (default: boilerplate template)")
+    parser.add_argument("--synthetic-node-modules", type=int, default=0, metavar="N",
+                        help="Benchmark a temp copy with N fake packages in node_modules")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = Path(args.workspace).resolve()
+    if args.synthetic_node_modules:
+        root = synthesize(root, args.synthetic_node_modules)
+    try:
+        total = sum(1 for p in root.rglob("*") if p.is_file())
+        print(f"workspace: {root} ({total} files, ripgrep: {shutil.which('rg') is not None})")  # noqa: T201
+        cases = [
+            ("glob **/*.tsx", lambda f: f(root, ["**/*.tsx"]), legacy_glob, pruned_glob),
+            ("glob src/**/*.ts", lambda f: f(root, ["src/**/*.ts"]), legacy_glob, pruned_glob),
+            ("grep useEffect", lambda f: f(root, "useEffect"), legacy_grep, pruned_grep),
+            ("grep no match", lambda f: f(root, "zz_no_such_symbol_zz"), legacy_grep, pruned_grep),
+            ("grep in **/*.ts", lambda f: f(root, r"export\s+(async\s+)?function", "**/*.ts"), legacy_grep, pruned_grep),
+        ]
+        for name, call, legacy, pruned in cases:
+            old, old_result = _time(lambda call=call, legacy=legacy: call(legacy), args.repeat)
+            new, new_result = _time(lambda call=call, pruned=pruned: call(pruned), args.repeat)
+            same = "same" if sorted(old_result) == sorted(new_result) else "differs"
+            print(  # noqa: T201
+                f"{name:<20} legacy {old * 1000:8.1f} ms  pruned {new * 1000:7.1f} ms  "
+                f"{old / max(new, 1e-9):6.1f}x  ({len(new_result)} results, {same})"
+            )
+    finally:
+        if args.synthetic_node_modules:
+            shutil.rmtree(root.parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 """FileRepository for zero-shot test planning. Pre-computes workspace context for instant planning."""
 import logging
 import os
-import re
-from pathlib import Path
 from typing import Dict, List, Optional
 
+from app.agents.developer.src.utils.workspace_index import WorkspaceIndex, get_workspace_index, is_tester_important
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,135 +19,25 @@ class FileRepository:
         self.api_routes: List[str] = []
         self.test_files: List[str] = []
         self.component_analysis: Dict[str, Dict] = {}
+        self._index: Optional[WorkspaceIndex] = None
         
         if workspace_path and os.path.exists(workspace_path):
-            self._scan()
-    
-    def _scan(self):
-        """Scan workspace to build context."""
-        exclude_dirs = {'node_modules', '.next', '.git', '__pycache__', '.prisma', 'dist', 'build'}
-        
-        for root, dirs, files in os.walk(self.workspace_path):
-            # Filter excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for f in files:
-                if f.endswith(('.ts', '.tsx', '.prisma', '.json', '.md')):
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, self.workspace_path).replace('\\', '/')
-                    
-                    self.file_tree.append(rel_path)
-                    
-                    # Load important files
-                    if self._is_important(rel_path):
-                        self.files[rel_path] = self._read_file(full_path)
-                    
-                    # Track components (exclude UI primitives)
-                    if '/components/' in rel_path and rel_path.endswith('.tsx') and '/ui/' not in rel_path:
-                        name = os.path.basename(rel_path).replace('.tsx', '')
-                        import_path = '@/' + rel_path.replace('.tsx', '')
-                        self.components[name] = import_path
-                        
-                        # Analyze component for unit tests
-                        content = self._read_file(full_path)
-                        if content:
-                            self.component_analysis[rel_path] = self._analyze_component(rel_path, content)
-                    
-                    # Track API routes
-                    if '/api/' in rel_path and rel_path.endswith('route.ts'):
-                        self.api_routes.append(rel_path)
-                    
-                    # Track existing test files
-                    if '.test.' in rel_path or '__tests__' in rel_path:
-                        self.test_files.append(rel_path)
-        
-        logger.info(f"[FileRepository] Scanned: {len(self.file_tree)} files, "
-                   f"{len(self.components)} components, {len(self.api_routes)} routes")
+            self._index = get_workspace_index(workspace_path)
+            self.files = self._index.files_for(is_tester_important)
+            self.file_tree = self._index.file_tree
+            self.components = self._index.components
+            self.api_routes = self._index.api_routes
+            self.test_files = self._index.test_files
+            self.component_analysis = self._index.component_analysis
+            logger.info(f"[FileRepository] Indexed: {len(self.file_tree)} files, "
+                       f"{len(self.components)} components, {len(self.api_routes)} routes "
+                       f"({self._index.stats['last_changed']} changed since last scan)")
     
-    def _is_important(self, path: str) -> bool:
-        """Check if file should be pre-loaded."""
-        important_patterns = [
-            'prisma/schema.prisma',
-            'src/types/index.ts',
-            'src/types/',
-            'package.json',
-            'src/app/layout.tsx',
-            'src/lib/prisma.ts',
-            'jest.config.ts',
-            'jest.setup.ts',
-            'tsconfig.json',
-        ]
-        return any(p in path for p in important_patterns)
-    
-    def _read_file(self, full_path: str) -> str:
-        """Read file content safely."""
-        try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception:
-            return ""
-    
-    def _analyze_component(self, file_path: str, content: str) -> Dict:
-        """Analyze component for unit test generation.
-        
-        Extracts:
-        - Component name
-        - Props interface
-        - Data attributes
-        - Exports
-        - Has loading/skeleton state
-        - Uses fetch/useEffect
-        """
-        info = {
-            "name": "",
-            "path": file_path,
-            "props": [],
-            "data_attributes": [],
-            "exports": [],
-            "has_skeleton": False,
-            "has_fetch": False,
-            "has_use_effect": False,
-        }
-        
-        # Extract component name
-        filename = file_path.split("/")[-1].replace(".tsx", "").replace(".ts", "")
-        info["name"] = filename
-        
-        # Extract exports
-        export_patterns = [
-            r'export\s+(?:function|const)\s+(\w+)',
-            r'export\s+default\s+(?:function\s+)?(\w+)',
-        ]
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                if match and match not in info["exports"]:
-                    info["exports"].append(match)
-        
-        # Extract props from interface/type
-        props_pattern = r'(?:interface|type)\s+\w*Props\w*\s*(?:=\s*)?\{([^}]+)\}'
-        props_match = re.search(props_pattern, content, re.DOTALL)
-        if props_match:
-            props_content = props_match.group(1)
-            prop_names = re.findall(r'(\w+)\s*[?:]', props_content)
-            info["props"] = list(set(prop_names))[:10]
-        
-        # Extract data attributes
-        data_attrs = re.findall(r'data-(\w+)(?:=|["\'])', content)
-        info["data_attributes"] = list(set(data_attrs))
-        
-        # Check for skeleton/loading patterns
-        content_lower = content.lower()
-        if "skeleton" in content_lower or "loading" in content_lower:
-            info["has_skeleton"] = True
-        
-        # Check for fetch/useEffect (async component)
-        if "useeffect" in content_lower:
-            info["has_use_effect"] = True
-        if "fetch(" in content_lower or "usefetch" in content_lower:
-            info["has_fetch"] = True
-        
-        return info
+    def _read(self, rel_path: str) -> str:
+        """Read a workspace file (from the index when cached there)."""
+        if self._index is not None:
+            return self._index.read(rel_path)
+        return ""
     
     def get_api_source_code(self, max_routes: int = 10) -> str:
         """Get source code of API routes for context."""
@@ -156,22 +46,17 @@ class FileRepository:
         
         parts = []
         for route in self.api_routes[:max_routes]:
-            full_path = os.path.join(self.workspace_path, route)
-            if os.path.exists(full_path):
-                try:
-                    content = self._read_file(full_path)
-                    if len(content) > 2000:
-                        content = content[:2000] + "\n// ... (truncated)"
-                    
-                    # Extract route URL from path
-                    route_url = route.replace("src/app", "").replace("app", "")
-                    route_url = route_url.replace("/route.ts", "").replace("\\", "/")
-                    if not route_url.startswith("/"):
-                        route_url = "/" + route_url
-                    
-                    parts.append(f"### {route_url}\nFile: {route}\n```typescript\n{content}\n```")
-                except Exception:
-                    pass
+            content = self._read(route)
+            if len(content) > 2000:
+                content = content[:2000] + "\n// ... (truncated)"
+            
+            # Extract route URL from path
+            route_url = route.replace("src/app", "").replace("app", "")
+            route_url = route_url.replace("/route.ts", "").replace("\\", "/")
+            if not route_url.startswith("/"):
+                route_url = "/" + route_url
+            
+            parts.append(f"### {route_url}\nFile: {route}\n```typescript\n{content}\n```")
         
         return "\n\n".join(parts) if parts else "No API source code available."
     
@@ -312,7 +197,7 @@ class FileRepository:
             else:
                 full_path = os.path.join(self.workspace_path, file_path)
                 if os.path.exists(full_path):
-                    dependencies[file_path] = self._read_file(full_path)
+                    dependencies[file_path] = self._read(file_path)
         
         # 2. Collect dependencies from steps
         for step in steps:
@@ -322,27 +207,23 @@ class FileRepository:
                     if isinstance(dep, str) and dep not in dependencies:
                         full_path = os.path.join(self.workspace_path, dep)
                         if os.path.exists(full_path):
-                            content = self._read_file(full_path)
+                            content = self._read(dep)
                             if content:
                                 dependencies[dep] = content[:5000]  # Limit size
         
         # 3. Add API route source code
         for route in self.api_routes[:10]:
             if route not in dependencies:
-                full_path = os.path.join(self.workspace_path, route)
-                if os.path.exists(full_path):
-                    content = self._read_file(full_path)
-                    if content:
-                        dependencies[route] = content[:3000]
+                content = self._read(route)
+                if content:
+                    dependencies[route] = content[:3000]
         
         # 4. Add component source code (for unit tests)
         for path in list(self.component_analysis.keys())[:10]:
             if path not in dependencies:
-                full_path = os.path.join(self.workspace_path, path)
-                if os.path.exists(full_path):
-                    content = self._read_file(full_path)
-                    if content:
-                        dependencies[path] = content[:3000]
+                content = self._read(path)
+                if content:
+                    dependencies[path] = content[:3000]
         
         logger.info(f"[FileRepository] Pre-loaded {len(dependencies)} dependency files")
         return dependencies
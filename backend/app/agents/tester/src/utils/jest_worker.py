@@ -0,0 +1,270 @@
+"""Persistent warm jest worker per workspace.
+
+Every ``pnpm exec jest <files>`` pays a cold start: node boot, jest and
+ts-jest/babel loading, config resolution and the haste map crawl. The
+Tester runs jest twice per iteration (typecheck, then tests) and iterates
+several times per story.
+
+A worker is one long-lived node process per workspace (a ``NodeDaemon``)
+that keeps jest loaded and calls its programmatic ``runCLI`` for each
+request. Transforms stay memoized in
+the process between runs. On top of that the worker only re-runs what a
+change can affect: files changed since the previous run are passed to
+jest's ``findRelatedTests``, and the other requested tests reuse their last
+result. Suites are spread over ``TESTER_JEST_MAX_WORKERS`` jest workers
+(in band for a single file, where worker startup would dominate).
+
+A change to jest/TypeScript/babel config or package.json restarts the
+worker and re-runs everything. If node or jest is not available the
+caller falls back to ``pnpm exec jest``.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.agents.developer.src.utils.node_daemon import NodeDaemon, Snapshot, changed_files, scan_files, touches
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".json", ".css", ".prisma")
+CONFIG_FILE = re.compile(r"^(jest\.(config|setup)\.|babel\.config\.|\.babelrc|tsconfig.*\.json$|package\.json$|next\.config\.)")
+
+# Daemon body (see node_daemon.PRELUDE_JS); runs in the workspace
+WORKER_JS = r"""
+let jest;
+try {
+  jest = load("jest");
+} catch (e) {
+  send({ ready: false, error: String((e && e.message) || e) });
+  process.exit(1);
+}
+
+serve({ version: jest.getVersion ? jest.getVersion() : null }, async (req) => {
+  const argv = {
+    _: req.paths, $0: "jest", ci: true, watchman: false, passWithNoTests: true,
+    coverage: false, silent: true, reporters: [],
+    runInBand: req.maxWorkers <= 1, maxWorkers: Math.max(1, req.maxWorkers),
+  };
+  if (req.related) {
+    argv.findRelatedTests = true;
+    argv.testPathPattern = req.restrict;   // jest <= 29
+    argv.testPathPatterns = req.restrict;  // jest >= 30
+  }
+  const { results } = await jest.runCLI(argv, [process.cwd()]);
+  return { files: results.testResults.map((r) => ({
+    path: r.testFilePath,
+    passed: r.numPassingTests,
+    failed: r.numFailingTests + (r.testExecError ? 1 : 0),
+    failed_tests: r.testResults.filter((t) => t.status === "failed").map((t) => t.title),
+    message: r.failureMessage || (r.testExecError && r.testExecError.message) || "",
+  })) };
+});
+"""
+
+
+@dataclass
+class JestRun:
+    """Results of the requested test files (run now or reused from the last run)."""
+
+    files: Dict[str, Optional[Dict[str, Any]]]  # test file -> result; None if jest found no tests in it
+    ran: int = 0
+    cached: int = 0
+    duration: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def passed(self) -> int:
+        return sum(r["passed"] for r in self.files.values() if r)
+
+    @property
+    def failed(self) -> int:
+        return sum(r["failed"] for r in self.files.values() if r)
+
+    @property
+    def success(self) -> bool:
+        return not self.timed_out and self.failed == 0
+
+    @property
+    def output(self) -> str:
+        """Failure messages plus a jest-style summary line."""
+        parts = [r["message"] for r in self.files.values() if r and r["message"]]
+        if self.timed_out:
+            parts.append("Jest worker timed out")
+        summary = f"{self.failed} failed, " if self.failed else ""
+        parts.append(f"Tests:       {summary}{self.passed} passed, {self.passed + self.failed} total")
+        return "\n".join(parts)
+
+    def summary(self) -> Dict[str, Any]:
+        """Same structure as run_tests._parse_test_output."""
+        output = self.output
+        setup_error = None
+        if not any(self.files.values()):
+            setup_error = "No tests found in file"
+        return {
+            "passed": self.passed,
+            "failed": self.failed,
+            "failed_tests": [t for r in self.files.values() if r for t in r["failed_tests"]][:10],
+            "error_messages": re.findall(r"Error:\s*(.+?)(?:\n|$)", output)[:5],
+            "setup_error": setup_error,
+        }
+
+
+class JestWorker:
+    """Warm jest process of one workspace plus the last result per test file."""
+
+    def __init__(self, workspace: Path, max_workers: int, idle_seconds: int):
+        self.workspace = Path(workspace).resolve()
+        self.max_workers = max_workers
+        self.idle_seconds = idle_seconds
+
+        self._daemon = NodeDaemon(
+            self.workspace, WORKER_JS, "JestWorker", idle_seconds, env={"CI": "true", "NODE_ENV": "test"}
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._results: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.stats = {
+            "runs": 0,
+            "restarts": 0,
+            "files_run": 0,
+            "files_cached": 0,
+            "errors": 0,
+            "seconds": 0.0,
+        }
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(os.path.realpath(path), self.workspace).replace(os.sep, "/")
+
+    def stop(self) -> None:
+        self._daemon.stop()
+
+    async def aclose(self) -> None:
+        await self._daemon.aclose()
+
+    # ----- run -----
+
+    async def run(self, test_files: List[str], timeout: float = 300) -> Optional[JestRun]:
+        """Run ``test_files`` (workspace-relative), re-running only what changed.
+
+        Returns:
+            JestRun, or None if the worker can't run here or jest itself failed
+            (use ``pnpm exec jest``)
+        """
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._loop = asyncio.get_running_loop()
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            started = time.monotonic()
+            snapshot = await asyncio.to_thread(scan_files, self.workspace, SOURCE_SUFFIXES, CONFIG_FILE)
+            previous = self._snapshot
+            changed = changed_files(previous, snapshot) if previous is not None else set()
+            if touches(changed, CONFIG_FILE):
+                logger.info(f"[JestWorker] Config changed in {self.workspace}, restarting")
+                self.stats["restarts"] += 1
+                await self.aclose()
+                previous = None
+
+            wanted = [f.replace("\\", "/") for f in test_files]
+            if previous is None or any(p not in snapshot for p in changed):
+                # First run, config change or deleted files: run everything requested
+                self._results.clear()
+                request = {"paths": wanted, "related": False}
+            else:
+                targets = sorted(changed | {f for f in wanted if f not in self._results})
+                request = {"paths": targets, "related": True, "restrict": [re.escape(f) for f in wanted]} if targets else None
+
+            ran = 0
+            if request is not None:
+                request["maxWorkers"] = 1 if len(wanted) == 1 else self.max_workers
+                try:
+                    reply = await self._daemon.request(request, timeout)
+                except asyncio.TimeoutError:
+                    self._snapshot = None
+                    return JestRun({f: self._results.get(f) for f in wanted}, timed_out=True,
+                                   duration=time.monotonic() - started)
+                if reply is None:
+                    self._snapshot = None
+                    return None  # No jest here (or it keeps dying): the caller runs the jest CLI
+                if "error" in reply:
+                    # Not a test failure (those are per-file results): let the caller run the jest CLI
+                    self.stats["errors"] += 1
+                    await self.aclose()
+                    self._snapshot = None
+                    logger.warning(f"[JestWorker] Run failed in {self.workspace}: {reply['error'][:300]}")
+                    return None
+
+                for r in reply["files"]:
+                    path = self._rel(r.pop("path"))
+                    self._results[path] = r
+                    ran += path in wanted
+                if not request["related"]:
+                    for f in wanted:
+                        self._results.setdefault(f, None)
+            self._snapshot = snapshot
+
+            run = JestRun(
+                {f: self._results.get(f) for f in wanted},
+                ran=ran,
+                cached=len(wanted) - ran,
+                duration=time.monotonic() - started,
+            )
+            self.stats["runs"] += 1
+            self.stats["files_run"] += run.ran
+            self.stats["files_cached"] += run.cached
+            self.stats["seconds"] += run.duration
+            return run
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workspace": str(self.workspace),
+            "alive": self._daemon.alive,
+            "starts": self._daemon.starts,
+            **self.stats,
+            "seconds": round(self.stats["seconds"], 1),
+        }
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_workers: Dict[Path, JestWorker] = {}
+
+
+def get_jest_worker(workspace: Path | str) -> Optional[JestWorker]:
+    """Worker of a workspace, or None when disabled (TESTER_JEST_WORKER_ENABLED) or node is missing."""
+    from app.core.config import settings
+
+    if not settings.TESTER_JEST_WORKER_ENABLED or shutil.which("node") is None:
+        return None
+    key = Path(workspace).resolve()
+    worker = _workers.get(key)
+    if worker is None:
+        max_workers = settings.TESTER_JEST_MAX_WORKERS or max(1, (os.cpu_count() or 2) - 1)
+        worker = _workers[key] = JestWorker(key, max_workers, settings.TESTER_JEST_WORKER_IDLE_SECONDS)
+    return worker
+
+
+def stop_jest_worker(workspace: Path | str) -> None:
+    worker = _workers.pop(Path(workspace).resolve(), None)
+    if worker is not None:
+        worker.stop()
+
+
+@atexit.register
+def _stop_all() -> None:
+    for worker in list(_workers.values()):
+        worker.stop()
+
+
+def get_jest_worker_stats() -> List[Dict[str, Any]]:
+    return [worker.get_stats() for worker in list(_workers.values())]
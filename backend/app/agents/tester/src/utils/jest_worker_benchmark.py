@@ -0,0 +1,175 @@
+"""
+Jest worker benchmark: wall time of a Tester fix loop, cold CLI vs warm worker.
+
+Each iteration simulates one fix (rewrites ``--touch`` with a trailing
+comment) and then does what ``run_tests`` does: a typecheck jest run and
+the test run over the same files.
+
+- cold: two ``pnpm exec jest <files>`` processes per iteration
+- warm: two ``JestWorker.run`` calls; the worker stays up across
+  iterations, re-runs only tests related to the touched file and reuses
+  the first call's results for the second
+
+Needs a workspace with dependencies installed (jest + its TS transform).
+``--synthetic N`` instead benchmarks a temporary workspace with N test
+files and a stand-in jest package that models jest's costs: a fixed boot
+(jest/ts-jest loading, config) per process, a crawl of the tree, and a
+per-file transform memoized within the process. It measures the worker's
+protocol and affected-test selection, not jest itself.
+
+Usage::
+
+    python -m app.agents.tester.src.utils.jest_worker_benchmark --workspace /path/to/worktree \\
+        --touch src/lib/utils.ts src/__tests__/utils.test.ts src/__tests__/api.test.ts
+    python -m app.agents.tester.src.utils.jest_worker_benchmark --synthetic 40
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.agents.tester.src.utils.jest_worker import JestWorker
+from app.utils.subprocess_utils import run_process
+
+
+# Stand-in for the jest package: runCLI for the worker, bin/jest.js for the CLI
+STAND_IN_JEST = r"""
+const fs = require("fs"), path = require("path");
+const BOOT_MS = 1200, TRANSFORM_MS = 25, TEST_MS = 5;
+const busy = (ms) => { const end = Date.now() + ms; while (Date.now() < end); };
+busy(BOOT_MS);
+const transformed = new Map();
+const transform = (file) => {
+  const key = file + ":" + fs.statSync(file).mtimeMs;
+  if (!transformed.has(key)) { busy(TRANSFORM_MS); transformed.set(key, fs.readFileSync(file, "utf8")); }
+  return transformed.get(key);
+};
+const crawl = (dir) => fs.readdirSync(dir, { withFileTypes: true }).flatMap((e) =>
+  e.isDirectory() ? (e.name === "node_modules" ? [] : crawl(path.join(dir, e.name))) : [path.join(dir, e.name)]);
+exports.getVersion = () => "stand-in";
+exports.runCLI = async (argv, [root]) => {
+  crawl(root);
+  let tests = argv._;
+  if (argv.findRelatedTests) {
+    const names = argv._.map((p) => path.basename(p).split(".")[0]);
+    tests = argv.testPathPattern.map((p) => p.replace(/\\/g, "")).filter((t) =>
+      argv._.includes(t) || names.some((n) => fs.readFileSync(path.join(root, t), "utf8").includes(`/${n}'`)));
+  }
+  return { results: { testResults: tests.map((t) => {
+    const src = transform(path.join(root, t));
+    const lib = src.match(/from '\.\.\/lib\/([\w-]+)'/);
+    if (lib) transform(path.join(root, "src/lib", lib[1] + ".ts"));
+    busy(TEST_MS);
+    return { testFilePath: path.join(root, t), numPassingTests: 1, numFailingTests: 0, testExecError: null,
+             failureMessage: "", testResults: [] };
+  }) } };
+};
+"""
+
+STAND_IN_BIN = r"""
+const jest = require("..");
+const paths = process.argv.slice(2).filter((a) => !a.startsWith("--"));
+jest.runCLI({ _: paths }, [process.cwd()]).then(({ results }) => {
+  console.log(`Tests:       ${results.testResults.length} passed, ${results.testResults.length} total`);
+});
+"""
+
+
+def synthesize(tests: int) -> tuple:
+    """Temp workspace with ``tests`` test files over 10 lib modules; returns (root, touch, tests)."""
+    root = Path(tempfile.mkdtemp(prefix="jest-bench-"))
+    jest = root / "node_modules" / "jest"
+    (jest / "bin").mkdir(parents=True)
+    (jest / "index.js").write_text(STAND_IN_JEST, encoding="utf-8")
+    (jest / "bin" / "jest.js").write_text(STAND_IN_BIN, encoding="utf-8")
+    (root / "src" / "lib").mkdir(parents=True)
+    (root / "src" / "__tests__").mkdir()
+    for m in range(10):
+        (root / "src" / "lib" / f"mod-{m}.ts").write_text(f"export const value{m} = {m};\n", encoding="utf-8")
+    names = []
+    for t in range(tests):
+        name = f"src/__tests__/case-{t}.test.ts"
+        (root / name).write_text(f"import {{ value{t % 10} }} from '../lib/mod-{t % 10}';\n", encoding="utf-8")
+        names.append(name)
+    return root, "src/lib/mod-0.ts", names
+
+
+def _touch(path: Path, iteration: int) -> None:
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.rstrip("\n").rsplit("\n// fix ", 1)[0] + f"\n// fix {iteration}\n", encoding="utf-8")
+
+
+async def cold_loop(workspace: Path, touch: Path, tests: List[str], iterations: int, jest_cmd: str) -> List[float]:
+    cmd = jest_cmd + " " + " ".join(f'"{t}"' for t in tests) + " --passWithNoTests"
+    timings = []
+    for i in range(iterations):
+        _touch(touch, i)
+        started = time.perf_counter()
+        for _ in range(2):  # typecheck + tests
+            await run_process(cmd, cwd=workspace, timeout=600, env={"CI": "true"}, node="benchmark")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def warm_loop(worker: JestWorker, touch: Path, tests: List[str], iterations: int) -> List[float]:
+    timings = []
+    for i in range(iterations):
+        _touch(touch, i)
+        started = time.perf_counter()
+        for _ in range(2):
+            if await worker.run(tests, timeout=600) is None:
+                raise SystemExit("Jest worker could not run in this workspace")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def run(args) -> None:
+    jest_cmd = "pnpm exec jest"
+    if args.synthetic:
+        root, args.touch, args.tests = synthesize(args.synthetic)
+        args.workspace = str(root)
+        jest_cmd = "node node_modules/jest/bin/jest.js"
+    workspace = Path(args.workspace).resolve()
+    touch = workspace / args.touch
+    original = touch.read_text(encoding="utf-8")
+    worker = JestWorker(workspace, args.max_workers, idle_seconds=600)
+    try:
+        cold = await cold_loop(workspace, touch, args.tests, args.iterations, jest_cmd)
+        warm = await warm_loop(worker, touch, args.tests, args.iterations)
+    finally:
+        touch.write_text(original, encoding="utf-8")
+        await worker.aclose()
+        if args.synthetic:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    for name, timings in (("cold", cold), ("warm", warm)):
+        print(  # noqa: T201
+            f"{name}: total {sum(timings):.1f}s, per iteration median {statistics.median(timings):.2f}s "
+            f"(first {timings[0]:.2f}s)"
+        )
+    print(f"speedup: {sum(cold) / sum(warm):.1f}x over {args.iterations} iterations")  # noqa: T201
+    print(f"worker: {worker.get_stats()}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tester fix loop wall time: jest CLI vs warm jest worker")
+    parser.add_argument("--workspace", help="Worktree with node_modules installed")
+    parser.add_argument("--touch", help="Source file rewritten each iteration (workspace-relative)")
+    parser.add_argument("tests", nargs="*", help="Test files (workspace-relative)")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Benchmark a temp workspace with N test files and a stand-in jest")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=2)
+    args = parser.parse_args()
+    if not args.synthetic and not (args.workspace and args.touch and args.tests):
+        parser.error("--workspace, --touch and test files are required without --synthetic")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
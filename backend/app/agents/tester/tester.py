@@ -8,7 +8,7 @@ from uuid import UUID
 
 from sqlmodel import Session
 
-from app.core.agent.base_agent import BaseAgent, TaskContext, TaskResult
+from app.core.agent.base_agent import BaseAgent, TaskContext, TaskResult, _task_state_property
 from app.core.agent.mixins import PausableAgentMixin, StoryStoppedException
 from app.core.agent.graph_helpers import get_or_create_thread_id
 from app.agents.tester.src.graph import TesterGraph
@@ -24,12 +24,14 @@ logger = logging.getLogger(__name__)
 class Tester(BaseAgent, PausableAgentMixin):
     """Tester agent with LangGraph workflow. Supports pause/resume/cancel via PostgresSaver."""
 
+    # Per-task, so a chat task running during an auto review keeps its events
+    _is_auto_task = _task_state_property("is_auto_task")
+    _current_story_ids = _task_state_property("story_ids")
+
     def __init__(self, agent_model: AgentModel, **kwargs):
         super().__init__(agent_model, **kwargs)
         self.graph_engine = TesterGraph(agent=self)
         
-        self._is_auto_task = False
-        self._current_story_ids: list[str] = []
         # Initialize PausableAgentMixin (provides pause/resume/cancel functionality)
         self.init_pausable_mixin()
         logger.info(f"[{self.name}] Tester initialized")
@@ -233,8 +235,6 @@ class Tester(BaseAgent, PausableAgentMixin):
                 return TaskResult(success=False, output="", error_message=error)
             
             self._running_tasks.pop(story_id, None)
-            self._is_auto_task = False
-            self._current_story_ids = []
             
             return TaskResult(
                 success=True,
@@ -290,8 +290,6 @@ class Tester(BaseAgent, PausableAgentMixin):
             )
             
         except Exception as e:
-            self._is_auto_task = False
-            self._current_story_ids = []
             self._running_tasks.pop(story_id, None)
             logger.error(f"[{self.name}] Error: {e}", exc_info=True)
             
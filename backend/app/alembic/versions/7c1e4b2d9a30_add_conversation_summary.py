@@ -0,0 +1,26 @@
+"""add conversation summary to project preferences
+
+Revision ID: 7c1e4b2d9a30
+Revises: 0f17288ce81a
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b2d9a30'
+down_revision = '0f17288ce81a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('project_preferences', sa.Column('conversation_summary', sa.Text(), nullable=True))
+    op.add_column('project_preferences', sa.Column('summary_through', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('project_preferences', 'summary_through')
+    op.drop_column('project_preferences', 'conversation_summary')
@@ -340,7 +340,12 @@ async def _restore_role_agents(logger, manager, role_type: str, role_class_map)
 
     from app.core.db import engine
 
+    from app.core.agent.sharding import owned_project_ids
+
     with Session(engine) as db_session:
+        # Sharded runtime: only this worker's projects
+        owned = owned_project_ids(db_session)
+
         # Reset transient states for this role
         reset_states = [
             AgentStatus.starting,
@@ -354,6 +359,8 @@ async def _restore_role_agents(logger, manager, role_type: str, role_class_map)
             .where(Agent.status.in_(reset_states), Agent.role_type == role_type)
             .values(status=AgentStatus.idle)
         )
+        if owned is not None:
+            reset_stmt = reset_stmt.where(Agent.project_id.in_(owned))
         reset_result = db_session.exec(reset_stmt)
         db_session.commit()
 
@@ -365,6 +372,8 @@ async def _restore_role_agents(logger, manager, role_type: str, role_class_map)
             Agent.role_type == role_type,
             Agent.status.in_([AgentStatus.idle, AgentStatus.stopped])
         )
+        if owned is not None:
+            agents_query = agents_query.where(Agent.project_id.in_(owned))
         db_agents = db_session.exec(agents_query).all()
 
         if not db_agents:
@@ -378,21 +387,16 @@ async def _restore_role_agents(logger, manager, role_type: str, role_class_map)
             logger.warning(f"No role class found for '{role_type}'")
             return
 
-        restored = 0
-        for db_agent in db_agents:
-            try:
-                success = await manager.spawn_agent(
-                    agent_id=db_agent.id,
-                    role_class=role_class,
-                    heartbeat_interval=30,
-                    max_idle_time=300,
-                )
-                if success:
-                    restored += 1
-            except Exception as e:
-                logger.error(f"Error restoring {db_agent.human_name}: {e}")
+        result = await manager.spawn_many(
+            [(db_agent.id, role_class) for db_agent in db_agents],
+            heartbeat_interval=30,
+            max_idle_time=300,
+        )
 
-        logger.info(f"📊 Restored {restored}/{len(db_agents)} {role_type} agents")
+        logger.info(
+            f"📊 Restored {len(result['spawned'])}/{len(db_agents)} {role_type} agents "
+            f"in {result['timings_ms']['total']:.0f}ms"
+        )
 
 
 async def _restore_agents(logger, manager, role_class_map) -> None:
@@ -401,7 +405,12 @@ async def _restore_agents(logger, manager, role_class_map) -> None:
 
     from app.core.db import engine
 
+    from app.core.agent.sharding import owned_project_ids
+
     with Session(engine) as db_session:
+        # Sharded runtime: only this worker's projects
+        owned = owned_project_ids(db_session)
+
         # Reset transient states
         reset_states = [
             AgentStatus.starting,
@@ -415,6 +424,8 @@ async def _restore_agents(logger, manager, role_class_map) -> None:
             .where(Agent.status.in_(reset_states))
             .values(status=AgentStatus.idle)
         )
+        if owned is not None:
+            reset_stmt = reset_stmt.where(Agent.project_id.in_(owned))
         reset_result = db_session.exec(reset_stmt)
         db_session.commit()
 
@@ -425,34 +436,30 @@ async def _restore_agents(logger, manager, role_class_map) -> None:
         agents_query = select(Agent).where(
             Agent.status.in_([AgentStatus.idle, AgentStatus.stopped])
         )
+        if owned is not None:
+            agents_query = agents_query.where(Agent.project_id.in_(owned))
         db_agents = db_session.exec(agents_query).all()
 
         logger.info(f"Restoring {len(db_agents)} agents...")
 
         # Spawn agents
+        to_spawn = []
         for db_agent in db_agents:
-            try:
-                role_class = role_class_map.get(db_agent.role_type)
-                if not role_class:
-                    logger.warning(f"  ✗ Unknown role_type '{db_agent.role_type}' for agent {db_agent.human_name}")
-                    continue
-
-                success = await manager.spawn_agent(
-                    agent_id=db_agent.id,
-                    role_class=role_class,
-                    heartbeat_interval=30,
-                    max_idle_time=300,
-                )
+            role_class = role_class_map.get(db_agent.role_type)
+            if not role_class:
+                logger.warning(f"  ✗ Unknown role_type '{db_agent.role_type}' for agent {db_agent.human_name}")
+                continue
+            to_spawn.append((db_agent.id, role_class))
 
-                if success:
-                    logger.debug(f"  ✓ Restored: {db_agent.human_name} [{db_agent.role_type}]")
-                else:
-                    logger.warning(f"  ✗ Failed: {db_agent.human_name}")
+        result = await manager.spawn_many(to_spawn, heartbeat_interval=30, max_idle_time=300)
 
-            except Exception as e:
-                logger.error(f"Error restoring {db_agent.human_name}: {e}")
+        for agent_id, reason in result["failed"].items():
+            logger.warning(f"  ✗ Failed: {agent_id} ({reason})")
 
-        logger.info(f"📊 Restored {len(db_agents)} agents in agent pool")
+        logger.info(
+            f"📊 Restored {len(result['spawned'])}/{len(db_agents)} agents in agent pool "
+            f"in {result['timings_ms']['total']:.0f}ms"
+        )
 
 
 def get_manager(pool_name: str) -> AgentPoolManager:
@@ -909,6 +916,18 @@ async def get_dashboard_data(
     """Get comprehensive dashboard data for monitoring agent pools."""
     from datetime import datetime, timezone
 
+    from app.agents.developer.src.utils.db_container import get_story_db_stats
+    from app.agents.developer.src.utils.lint_daemon import get_lint_daemon_stats
+    from app.agents.developer.src.utils.validation_cache import get_validation_cache_stats
+    from app.agents.developer.src.utils.workspace_index import get_workspace_index_stats
+    from app.agents.tester.src.utils.code_search import get_code_search_stats
+    from app.agents.tester.src.utils.jest_worker import get_jest_worker_stats
+    from app.core.agent.rate_limiter import get_rate_limiter_stats
+    from app.core.agent.response_cache import get_response_cache_stats
+    from app.utils.node_modules_cache import get_node_modules_cache_stats
+    from app.utils.subprocess_utils import get_process_runner_stats
+    from app.utils.worktree_pool import get_worktree_pool_stats
+
     # Get stats from all managers
     pools_data = {}
     for pool_name, manager in _manager_registry.items():
@@ -916,6 +935,17 @@ async def get_dashboard_data(
 
     return {
         "pools": pools_data,
+        "llm_response_cache": get_response_cache_stats(),
+        "llm_rate_limits": get_rate_limiter_stats(),
+        "worktree_pools": get_worktree_pool_stats(),
+        "node_modules_cache": get_node_modules_cache_stats(),
+        "story_databases": get_story_db_stats(),
+        "validation_cache": get_validation_cache_stats(),
+        "agent_processes": get_process_runner_stats(),
+        "jest_workers": get_jest_worker_stats(),
+        "lint_daemons": get_lint_daemon_stats(),
+        "workspace_indexes": get_workspace_index_stats(),
+        "code_search": get_code_search_stats(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "mode": "in-memory",  # In-memory architecture
     }
@@ -1825,19 +1855,12 @@ async def restart_pool(
     await asyncio.sleep(1)
 
     # Respawn agents
-    respawned = 0
-    for info in agents_info:
-        try:
-            success = await manager.spawn_agent(
-                agent_id=info['agent_id'],
-                role_class=info['role_class'],
-                heartbeat_interval=30,
-                max_idle_time=300,
-            )
-            if success:
-                respawned += 1
-        except Exception as e:
-            logger.error(f"Error respawning agent {info['agent_id']}: {e}")
+    result = await manager.spawn_many(
+        [(info['agent_id'], info['role_class']) for info in agents_info],
+        heartbeat_interval=30,
+        max_idle_time=300,
+    )
+    respawned = len(result["spawned"])
 
     logger.info(
         f"Pool '{pool_name}' restarted by {current_user.email}. "
@@ -2420,6 +2443,7 @@ async def bulk_spawn_agents(
     ).all()
     used_persona_ids = [a.persona_template_id for a in existing_agents if a.persona_template_id]
 
+    created: list[tuple[int, Agent]] = []
     for i in range(request.count):
         try:
             # Get persona template
@@ -2448,37 +2472,12 @@ async def bulk_spawn_agents(
                 project_id=project_id,
                 persona_template=persona
             )
+            created.append((i, db_agent))
 
             # Track used persona
             if persona.id not in used_persona_ids:
                 used_persona_ids.append(persona.id)
 
-            # Spawn agent
-            success = await manager.spawn_agent(
-                agent_id=db_agent.id,
-                role_class=role_class,
-                heartbeat_interval=30,
-                max_idle_time=300,
-            )
-
-            if success:
-                success_count += 1
-                results.append({
-                    "index": i,
-                    "agent_id": str(db_agent.id),
-                    "agent_name": db_agent.human_name,
-                    "status": "spawned",
-                })
-            else:
-                # Rollback DB entry
-                session.delete(db_agent)
-                failed_count += 1
-                results.append({
-                    "index": i,
-                    "status": "spawn_failed",
-                    "error": "Failed to spawn agent",
-                })
-
         except Exception as e:
             failed_count += 1
             results.append({
@@ -2487,11 +2486,40 @@ async def bulk_spawn_agents(
                 "error": str(e),
             })
 
+    # Spawn all created agents in parallel
+    spawn_result = await manager.spawn_many(
+        [(db_agent.id, role_class) for _, db_agent in created],
+        heartbeat_interval=30,
+        max_idle_time=300,
+    )
+    spawned_ids = set(spawn_result["spawned"])
+
+    for i, db_agent in created:
+        if db_agent.id in spawned_ids:
+            success_count += 1
+            results.append({
+                "index": i,
+                "agent_id": str(db_agent.id),
+                "agent_name": db_agent.human_name,
+                "status": "spawned",
+            })
+        else:
+            # Rollback DB entry
+            session.delete(db_agent)
+            failed_count += 1
+            results.append({
+                "index": i,
+                "status": "spawn_failed",
+                "error": spawn_result["failed"].get(db_agent.id, "Failed to spawn agent"),
+            })
+
+    results.sort(key=lambda r: r["index"])
     session.commit()
 
     logger.info(
         f"Bulk spawn by {current_user.email}: "
-        f"{success_count} {request.role_type} agents spawned, {failed_count} failed"
+        f"{success_count} {request.role_type} agents spawned, {failed_count} failed "
+        f"(timings_ms={spawn_result['timings_ms']})"
     )
 
     return BulkOperationResponse(
@@ -2566,7 +2594,7 @@ class AutoScalingRuleCreate(BaseModel):
     role_type: str | None = None
 
 
-# In-memory storage for auto-scaling rules (in production, use database)
+# In-memory storage for auto-scaling rules (evaluated by the autoscaler in AgentMonitor)
 _auto_scaling_rules: dict[str, AutoScalingRule] = {}
 _rule_id_counter = 0
 
@@ -2752,67 +2780,16 @@ async def trigger_auto_scaling_rule(
         raise HTTPException(status_code=404, detail="Rule not found")
 
     rule = _auto_scaling_rules[rule_id]
-    manager = _manager_registry.get(rule.pool_name)
 
-    if not manager:
+    if rule.pool_name not in _manager_registry:
         raise HTTPException(
             status_code=404,
             detail=f"Pool '{rule.pool_name}' not found"
         )
 
-    current_count = len(manager.agents)
-    target_count = current_count
-
-    # Calculate target based on action
-    if rule.action == ScalingAction.SCALE_UP:
-        target_count = min(current_count + rule.scale_amount, rule.max_agents)
-    elif rule.action == ScalingAction.SCALE_DOWN:
-        target_count = max(current_count - rule.scale_amount, rule.min_agents)
-    elif rule.action == ScalingAction.SET_COUNT:
-        target_count = max(rule.min_agents, min(rule.target_count or current_count, rule.max_agents))
-
-    delta = target_count - current_count
-
-    if delta == 0:
-        return {
-            "message": "No scaling needed",
-            "current_count": current_count,
-            "target_count": target_count,
-            "action_taken": "none",
-        }
-
-    # Update last triggered
-    rule.last_triggered = datetime.utcnow()
-
-    if delta > 0:
-        # Scale up - spawn agents
-        # Note: In production, this would use bulk spawn with proper role handling
-        return {
-            "message": f"Would spawn {delta} agents (manual trigger)",
-            "current_count": current_count,
-            "target_count": target_count,
-            "action_taken": "scale_up_requested",
-            "agents_to_spawn": delta,
-        }
-    else:
-        # Scale down - terminate agents
-        agents_to_terminate = list(manager.agents.keys())[:abs(delta)]
-        terminated = 0
+    from app.core.agent.autoscaler import agent_autoscaler
 
-        for agent_id in agents_to_terminate:
-            try:
-                await manager.terminate_agent(agent_id)
-                terminated += 1
-            except Exception as e:
-                logger.error(f"Failed to terminate agent {agent_id}: {e}")
-
-        return {
-            "message": f"Terminated {terminated} agents",
-            "current_count": current_count,
-            "target_count": target_count,
-            "action_taken": "scale_down",
-            "agents_terminated": terminated,
-        }
+    return await agent_autoscaler.evaluate_rule(rule, _manager_registry, force=True)
 
 
 # ===== Token Usage Statistics Endpoints =====
@@ -5,6 +5,7 @@ import logging
 import json
 from datetime import datetime, timezone
 from app.websocket.connection_manager import connection_manager
+from app.websocket.presence import presence_registry
 from app.core.security import decode_access_token
 from app.models import User, Message as MessageModel, Project, AuthorType, MessageVisibility
 from app.kafka import get_kafka_producer, KafkaTopics, UserMessageEvent
@@ -14,22 +15,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-async def update_websocket_activity(project_id: UUID):
-    """Update WebSocket last_seen timestamp on user activity."""
-    try:
-        from app.core.db import engine
-        from sqlmodel import Session as DBSession
-        
-        with DBSession(engine) as session:
-            project = session.get(Project, project_id)
-            if project:
-                project.websocket_last_seen = datetime.now(timezone.utc)
-                session.add(project)
-                session.commit()
-    except Exception as e:
-        logger.debug(f"Failed to update WebSocket activity: {e}")
-
-
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -90,8 +75,8 @@ async def websocket_endpoint(
                     message = json.loads(data)
                     message_type = message.get("type")
                     
-                    # Update WebSocket activity timestamp
-                    await update_websocket_activity(project_id)
+                    # Update WebSocket activity timestamp (persisted by presence registry)
+                    presence_registry.touch(project_id)
 
                     # Handle user message
                     if message_type == "message":
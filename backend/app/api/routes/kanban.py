@@ -46,13 +46,17 @@ def update_wip_limit(
     kanban_service: KanbanService = Depends(get_kanban_service)
 ) -> Any:
     """Update WIP limit for a column."""
+    from app.websocket.kanban_projection import kanban_projection
+
     try:
-        return kanban_service.update_wip_limit(
+        result = kanban_service.update_wip_limit(
             project_id=project_id,
             column_name=column_name,
             wip_limit=limit_update.wip_limit,
             limit_type=limit_update.limit_type or "hard"
         )
+        kanban_projection.invalidate(project_id)
+        return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -253,12 +253,19 @@ async def create_project(
             f"with {len(created_agents)} agents"
         )
         
+        # Sharded runtime: the owning agent worker spawns them on its next reconcile
+        from app.core.agent.sharding import hosts_agents
+        if not hosts_agents():
+            logger.info(f"Agents for project {project.code} will be spawned by their agent worker")
+            return ProjectPublic.model_validate(project)
+        
         # Auto-spawn agents after project creation
         from app.api.routes.agent_management import get_available_pool, get_role_class_map
         
         role_class_map = get_role_class_map()
-        spawned_count = 0
         
+        # Group agents by pool, then spawn each pool's batch in parallel
+        batches = {}
         for agent in created_agents:
             # Get pool for this agent's role (role-specific > universal > any)
             pool_manager = get_available_pool(role_type=agent.role_type)
@@ -271,20 +278,26 @@ async def create_project(
                 logger.warning(f"No role class found for {agent.role_type}, skipping spawn")
                 continue
             
-            try:
-                success = await pool_manager.spawn_agent(
-                    agent_id=agent.id,
-                    role_class=role_class,
-                    heartbeat_interval=30,
-                    max_idle_time=300,
-                )
-                if success:
-                    spawned_count += 1
-                    logger.info(f"✓ Spawned agent {agent.human_name} ({agent.role_type}) in {pool_manager.pool_name}")
-                else:
-                    logger.warning(f"Failed to spawn agent {agent.human_name}")
-            except Exception as e:
-                logger.error(f"Error spawning agent {agent.human_name}: {e}")
+            batches.setdefault(pool_manager.pool_name, (pool_manager, []))[1].append(
+                (agent.id, role_class)
+            )
+        
+        spawn_results = await asyncio.gather(
+            *(
+                pool_manager.spawn_many(batch, heartbeat_interval=30, max_idle_time=300)
+                for pool_manager, batch in batches.values()
+            ),
+            return_exceptions=True,
+        )
+        
+        spawned_count = 0
+        for (pool_manager, _), result in zip(batches.values(), spawn_results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Error spawning agents in {pool_manager.pool_name}: {result}")
+                continue
+            spawned_count += len(result["spawned"])
+            for agent_id, reason in result["failed"].items():
+                logger.warning(f"Failed to spawn agent {agent_id}: {reason}")
         
         logger.info(f"Auto-spawned {spawned_count}/{len(created_agents)} agents for project {project.code}")
         
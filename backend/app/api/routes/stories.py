@@ -30,8 +30,8 @@ def check_agent_busy(agent_id: uuid.UUID) -> tuple[bool, str]:
         return False, ""
     if agent.state == AgentStatus.busy:
         return True, "Agent đang xử lý task. Vui lòng đợi hoặc stop task hiện tại trước."
-    if hasattr(agent, '_task_queue') and agent._task_queue.qsize() > 0:
-        return True, f"Agent có {agent._task_queue.qsize()} task đang chờ trong queue."
+    if agent.queue_depth > 0:
+        return True, f"Agent có {agent.queue_depth} task đang chờ trong queue."
     return False, ""
 
 
@@ -115,29 +115,31 @@ def bulk_update_ranks(
             story.rank = item.rank
             session.add(story)
             updated_count += 1
-    session.commit()
+    session.commit()  # Board patched by the projection's story write hook
     return {"updated": updated_count}
 
 
 # ===== Kanban Board =====
 @router.get("/kanban/{project_id}")
-def get_kanban_board(
-    session: SessionDep,
+async def get_kanban_board(
     current_user: CurrentUser,
     project_id: uuid.UUID
 ) -> Any:
-    """Get Kanban board grouped by columns with WIP limits."""
-    story_service = StoryService(session)
-    
+    """Get Kanban board grouped by columns with WIP limits.
+
+    Served from the in-memory projection; kept current by `kanban_patch` deltas.
+    """
+    from app.websocket.kanban_projection import kanban_projection
+
     try:
-        return story_service.get_kanban_board(project_id)
+        return await kanban_projection.get_board(project_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 # ===== Assignment =====
 @router.put("/{story_id}/assign", response_model=StoryPublic)
-def assign_story(
+async def assign_story(
     *,
     session: SessionDep,
     current_user: CurrentUser,
@@ -146,10 +148,12 @@ def assign_story(
     reviewer_id: Optional[uuid.UUID] = None
 ) -> Any:
     """Assign story to Dev/Tester (TeamLeader role)."""
+    from app.kafka import get_kafka_producer, KafkaTopics, StoryEvent
+
     story_service = StoryService(session)
     
     try:
-        return story_service.assign(
+        story = story_service.assign(
             story_id=story_id,
             assignee_id=assignee_id,
             user_id=current_user.id,
@@ -159,6 +163,25 @@ def assign_story(
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    try:
+        producer = await get_kafka_producer()
+        await producer.publish(
+            topic=KafkaTopics.STORY_EVENTS,
+            event=StoryEvent(
+                event_type="story.assigned",
+                project_id=str(story.project_id),
+                user_id=str(current_user.id),
+                story_id=str(story.id),
+                assignee_id=str(assignee_id),
+                reviewer_id=str(reviewer_id) if reviewer_id else None,
+                assigned_by=str(current_user.id),
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish story.assigned for {story_id}: {e}")
+
+    return story
+
 
 # ===== Status Update =====
 @router.put("/{story_id}/status", response_model=StoryPublic)
@@ -355,6 +378,10 @@ def delete_story(
         except (ProcessLookupError, OSError) as e:
             logger.warning(f"[delete_story] Dev server process not found or already stopped: {e}")
     
+    # Drop the story database
+    from app.agents.developer.src.utils.db_container import release_story_database
+    release_story_database(str(story_id))
+    
     # Cleanup worktree and branch if exists
     worktree_path = story.worktree_path
     branch_name = story.branch_name
@@ -375,6 +402,8 @@ def delete_story(
                 main_repo = str(Path(git_common_dir).parent)
             
             # Remove worktree
+            from app.agents.developer.src.utils.workspace_index import drop_workspace_index
+            drop_workspace_index(worktree_path)
             if main_repo:
                 subprocess.run(
                     ["git", "worktree", "remove", worktree_path, "--force"],
@@ -410,7 +439,7 @@ def delete_story(
         except Exception as e:
             logger.warning(f"[delete_story] Failed to delete branch: {e}")
     
-    # Delete story from DB
+    # Delete story from DB (board patched by the projection's story write hook)
     if not story_service.delete(story_id):
         raise HTTPException(status_code=404, detail="Story not found")
     
@@ -567,9 +596,10 @@ async def cancel_story_task(
         story.db_container_id = None
         story.db_port = None
     
-    # Clear container from in-memory registry
-    from app.agents.developer.src.utils.db_container import clear_container_from_registry
+    # Clear container from in-memory registry and drop the story database
+    from app.agents.developer.src.utils.db_container import clear_container_from_registry, release_story_database
     clear_container_from_registry(str(story_id))
+    await asyncio.to_thread(release_story_database, str(story_id))
     
     # Update state to canceled and clear checkpoint (cancel = permanent stop)
     story.agent_state = StoryAgentState.CANCELED
@@ -984,9 +1014,10 @@ async def restart_story_task(
         except Exception as e:
             logger.warning(f"[restart] Failed to stop docker container: {e}")
     
-    # Clear container from in-memory registry to ensure fresh start
-    from app.agents.developer.src.utils.db_container import clear_container_from_registry
+    # Clear container from in-memory registry and drop the story database to ensure fresh start
+    from app.agents.developer.src.utils.db_container import clear_container_from_registry, release_story_database
     clear_container_from_registry(str(story_id))
+    await asyncio.to_thread(release_story_database, str(story_id))
     
     # Clear agent's in-memory cache for this story (critical for restart after cancel)
     from app.api.routes.agent_management import _manager_registry
@@ -0,0 +1,143 @@
+"""
+Agent Directory
+
+In-process index of live agents by ``(project_id, role_type)``, fed by
+``AgentPoolManager`` on spawn/terminate. Routers pick a target agent from
+live in-memory load instead of querying ``Agent`` rows, whose ``status``
+column lags the real ``BaseAgent.state``.
+"""
+
+import logging
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.models import AgentStatus
+
+if TYPE_CHECKING:
+    from app.core.agent.base_agent import BaseAgent
+
+
+logger = logging.getLogger(__name__)
+
+
+UNAVAILABLE_STATES = (AgentStatus.stopped, AgentStatus.terminated, AgentStatus.error)
+
+
+class AgentDirectory:
+    """
+    Index live agents and select the least-loaded one for a role.
+
+    Load is ``queued + running + in-flight dispatches``, with recent
+    task latency as a tie-breaker; hibernated stubs pay a small rehydration
+    penalty so an equally idle live agent is preferred. With more than two candidates selection
+    uses power-of-two-choices, so concurrent routers do not all pile onto the
+    same "best" agent between load updates.
+    """
+
+    def __init__(self, latency_weight_ms: float = 60_000.0, hibernated_penalty: float = 0.5):
+        """
+        Initialize directory.
+
+        Args:
+            latency_weight_ms: Latency (ms) counted as one extra queued task
+                when comparing candidates
+            hibernated_penalty: Load added for agents that must be rehydrated
+        """
+        self.latency_weight_ms = latency_weight_ms
+        self.hibernated_penalty = hibernated_penalty
+
+        # (project_id, role_type) -> {agent_id: agent}
+        self._index: Dict[Tuple[UUID, str], Dict[UUID, "BaseAgent"]] = {}
+        # agent_id -> tasks dispatched but not yet received by the agent
+        self._inflight: Dict[UUID, int] = {}
+
+        # Statistics
+        self.total_selections = 0
+        self.total_misses = 0
+
+    # =========================================================================
+    # Registration
+    # =========================================================================
+
+    def register(self, agent: "BaseAgent") -> None:
+        """Add a started (or hibernated) agent to the directory, replacing any entry with its id."""
+        key = (agent.project_id, agent.role_type)
+        self._index.setdefault(key, {})[agent.agent_id] = agent
+
+    def unregister(self, agent: "BaseAgent") -> None:
+        """Remove an agent from the directory."""
+        key = (agent.project_id, agent.role_type)
+        agents = self._index.get(key)
+        if agents is not None:
+            agents.pop(agent.agent_id, None)
+            if not agents:
+                del self._index[key]
+        self._inflight.pop(agent.agent_id, None)
+
+    def acknowledge(self, agent_id: UUID) -> None:
+        """Release one slot reserved by ``select``: the task was received, or never dispatched."""
+        pending = self._inflight.get(agent_id)
+        if pending:
+            if pending > 1:
+                self._inflight[agent_id] = pending - 1
+            else:
+                del self._inflight[agent_id]
+
+    # =========================================================================
+    # Selection
+    # =========================================================================
+
+    def get_agents(self, project_id: UUID, role_type: str) -> List["BaseAgent"]:
+        """Get available agents for a role in a project."""
+        agents = self._index.get((project_id, role_type), {})
+        return [a for a in agents.values() if a.state not in UNAVAILABLE_STATES]
+
+    def groups(self) -> List[Tuple[UUID, str]]:
+        """Get all indexed (project_id, role_type) keys."""
+        return list(self._index)
+
+    def inflight(self, agent_id: UUID) -> int:
+        """Tasks dispatched to an agent but not yet received."""
+        return self._inflight.get(agent_id, 0)
+
+    def load_of(self, agent: "BaseAgent") -> float:
+        """Load score used for selection (lower is better)."""
+        load = agent.queue_depth + agent.active_task_count + self._inflight.get(agent.agent_id, 0)
+        latency = agent._latency_ewma_ms or 0.0
+        if getattr(agent, "hibernated", False):
+            load += self.hibernated_penalty
+        return load + latency / self.latency_weight_ms
+
+    def select(self, project_id: UUID, role_type: str) -> Optional["BaseAgent"]:
+        """
+        Pick the least-loaded available agent and reserve a dispatch slot on it.
+
+        Returns:
+            Selected agent or None if no live agent has the role
+        """
+        candidates = self.get_agents(project_id, role_type)
+        if not candidates:
+            self.total_misses += 1
+            return None
+
+        if len(candidates) > 2:
+            candidates = random.sample(candidates, 2)
+        selected = min(candidates, key=self.load_of)
+
+        self._inflight[selected.agent_id] = self._inflight.get(selected.agent_id, 0) + 1
+        self.total_selections += 1
+        return selected
+
+    def get_stats(self) -> dict:
+        """Get directory statistics."""
+        return {
+            "indexed_roles": len(self._index),
+            "indexed_agents": sum(len(a) for a in self._index.values()),
+            "inflight_dispatches": sum(self._inflight.values()),
+            "total_selections": self.total_selections,
+            "total_misses": self.total_misses,
+        }
+
+
+agent_directory = AgentDirectory()
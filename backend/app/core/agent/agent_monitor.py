@@ -109,6 +109,8 @@ class AgentMonitor:
         
         uptime_seconds = (datetime.now(timezone.utc) - self.started_at).total_seconds()
         
+        from app.core.agent.response_cache import get_response_cache_stats
+        
         return {
             "uptime_seconds": uptime_seconds,
             "total_pools": len(self.manager_registry),
@@ -122,6 +124,7 @@ class AgentMonitor:
             "success_rate": successful_executions / total_executions if total_executions > 0 else 0.0,
             "utilization": total_busy / total_agents if total_agents > 0 else 0.0,
             "pools": pool_stats,
+            "llm_response_cache": get_response_cache_stats(),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
@@ -180,6 +183,7 @@ class AgentMonitor:
         This handles:
         - System-wide observability and logging
         - Auto-scaling when pool load exceeds threshold
+        - Resuming tasks handed off by drained agents
         """
         logger.info("AgentMonitor loop started")
         
@@ -203,6 +207,10 @@ class AgentMonitor:
                 if settings.AGENT_POOL_AUTO_SCALE_ENABLED:
                     await self._check_auto_scaling(stats)
                 
+                # Pick up tasks handed off by agents drained elsewhere (e.g. rolling restart)
+                if self.manager_registry:
+                    await self._resume_handoffs()
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -210,12 +218,36 @@ class AgentMonitor:
         
         logger.info("AgentMonitor loop stopped")
 
+    async def _resume_handoffs(self) -> None:
+        """Redeliver drain handoffs for projects hosted by this process."""
+        from app.core.agent.drain import resume_handoffs
+
+        try:
+            resumed = await resume_handoffs()
+            if resumed:
+                logger.info(f"[MONITOR] Resumed {resumed} handed-off tasks")
+        except Exception as e:
+            logger.error(f"[MONITOR] Failed to resume handed-off tasks: {e}")
+
     async def _check_auto_scaling(self, stats: Dict[str, Any]) -> None:
-        """Check if auto-scaling is needed based on pool loads.
+        """Run the agent autoscaler and check pool capacity.
         
-        Creates overflow pools when universal pool exceeds threshold.
+        Scales agents per project role from queue depth / wait / LLM
+        concurrency, evaluates stored scaling rules, and creates overflow
+        pools when a pool's capacity exceeds threshold.
         """
+        from app.core.agent.autoscaler import agent_autoscaler
         from app.core.agent.pool_helpers import get_pool_load, should_create_new_pool
+        from app.api.routes.agent_management import _auto_scaling_rules
+        
+        try:
+            actions = await agent_autoscaler.run_once(
+                self.manager_registry, list(_auto_scaling_rules.values())
+            )
+            if actions:
+                logger.info(f"[AUTO-SCALE] {len(actions)} scaling actions: {actions}")
+        except Exception as e:
+            logger.error(f"[AUTO-SCALE] Autoscaler run failed: {e}", exc_info=True)
         
         threshold = settings.AGENT_POOL_AUTO_SCALE_THRESHOLD
         
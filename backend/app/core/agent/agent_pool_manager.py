@@ -1,13 +1,23 @@
 import asyncio
+import gc
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 from uuid import UUID
 
 from sqlmodel import Session, select, update
 
+from app.core.agent.agent_directory import agent_directory
 from app.core.agent.base_agent import BaseAgent
-from app.models import Agent as AgentModel, AgentStatus, AgentPool, PoolType
+from app.core.agent.hibernation import (
+    HibernatedAgent,
+    HibernationWakeConsumer,
+    current_rss_bytes,
+    is_hibernatable,
+)
+from app.models import Agent as AgentModel, AgentStatus, AgentPool, PoolType, Project
 from app.core.db import engine
 from app.services.pool_service import PoolService
 
@@ -35,6 +45,17 @@ class AgentPoolManager:
         # Direct in-memory agent storage
         self.agents: Dict[UUID, BaseAgent] = {}
 
+        # Hibernated agents (stubs) and rehydrations in progress
+        self.hibernated: Dict[UUID, HibernatedAgent] = {}
+        self._rehydrating: Dict[UUID, asyncio.Future] = {}
+        self._wake_consumer: Optional[HibernationWakeConsumer] = None
+
+        # Agents being started by spawn_many (guards concurrent spawns of the same id)
+        self._spawning: set = set()
+
+        # Set by drain(): no hibernation, wake-ups or new tasks
+        self._draining = False
+
         # Background tasks
         self._monitor_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
@@ -43,6 +64,11 @@ class AgentPoolManager:
         self.created_at = datetime.now(timezone.utc)
         self.total_spawned = 0
         self.total_terminated = 0
+        self.total_hibernated = 0
+        self.total_rehydrated = 0
+        self.total_handed_off = 0
+        self.rss_released_bytes = 0
+        self._rehydration_ms: deque = deque(maxlen=100)
         self._is_running = False
 
         logger.info(
@@ -92,14 +118,18 @@ class AgentPoolManager:
                 except asyncio.CancelledError:
                     pass
 
-            # Stop all agents
-            agent_ids = list(self.agents.keys())
+            # Stop all agents (live and hibernated)
+            agent_ids = list(self.agents.keys()) + list(self.hibernated.keys())
             for agent_id in agent_ids:
                 try:
                     await self.terminate_agent(agent_id, graceful=graceful)
                 except (Exception, asyncio.CancelledError) as e:
                     logger.error(f"Error terminating agent {agent_id}: {e}")
 
+            if self._wake_consumer:
+                await self._wake_consumer.stop()
+                self._wake_consumer = None
+
             # Update DB: mark pool as stopped
             if self.pool_id:
                 with Session(engine) as session:
@@ -130,12 +160,12 @@ class AgentPoolManager:
         Spawn an agent directly in memory.
         """
         # 1. Check capacity
-        if len(self.agents) >= self.max_agents:
+        if len(self.agents) + len(self.hibernated) >= self.max_agents:
             logger.warning(f"Pool '{self.pool_name}' at max capacity ({self.max_agents})")
             return False
 
         # 2. Check if already spawned
-        if agent_id in self.agents:
+        if self.has_agent(agent_id):
             logger.warning(f"Agent {agent_id} already exists in pool")
             return False
 
@@ -159,6 +189,7 @@ class AgentPoolManager:
                 if await agent.start():
                     # 6. Store in memory
                     self.agents[agent_id] = agent
+                    agent_directory.register(agent)
                     self.total_spawned += 1
 
                     # 7. Update DB status
@@ -189,6 +220,132 @@ class AgentPoolManager:
             logger.error(f"Failed to spawn agent {agent_id}: {e}", exc_info=True)
             return False
 
+    async def spawn_many(
+        self,
+        agents: Sequence[Tuple[UUID, Type[BaseAgent]]],
+        heartbeat_interval: int = 30,
+        max_idle_time: int = 300,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Spawn many agents with one prefetch query, parallel start and one commit.
+
+        Args:
+            agents: (agent_id, role_class) pairs
+            heartbeat_interval: Heartbeat interval passed to each agent
+            max_idle_time: Max idle time passed to each agent
+            concurrency: Max agents started at once (default: settings)
+
+        Returns:
+            Dict with ``spawned`` (agent ids), ``failed`` (agent id -> reason)
+            and ``timings_ms`` per phase (prefetch, start, persist, total)
+        """
+        from app.core.config import settings
+
+        concurrency = concurrency or settings.AGENT_POOL_SPAWN_CONCURRENCY
+        started_at = time.perf_counter()
+        timings: Dict[str, float] = {}
+        failed: Dict[UUID, str] = {}
+
+        # 1. Filter duplicates / already spawned and apply capacity
+        role_classes: Dict[UUID, Type[BaseAgent]] = {}
+        for agent_id, role_class in agents:
+            if self.has_agent(agent_id) or agent_id in self._spawning:
+                failed[agent_id] = "already_spawned"
+            elif agent_id not in role_classes:
+                role_classes[agent_id] = role_class
+
+        available = max(0, self.max_agents - len(self.agents) - len(self.hibernated))
+        for agent_id in list(role_classes)[available:]:
+            del role_classes[agent_id]
+            failed[agent_id] = "pool_at_capacity"
+
+        # 2. Prefetch agent rows and project tech stacks in one query
+        phase_start = time.perf_counter()
+        rows: Dict[UUID, Tuple[AgentModel, Optional[str]]] = {}
+        if role_classes:
+            with Session(engine) as db_session:
+                results = db_session.exec(
+                    select(AgentModel, Project.tech_stack)
+                    .outerjoin(Project, Project.id == AgentModel.project_id)
+                    .where(AgentModel.id.in_(list(role_classes)))
+                ).all()
+                for agent_model, tech_stack in results:
+                    rows[agent_model.id] = (agent_model, tech_stack)
+        timings["prefetch"] = (time.perf_counter() - phase_start) * 1000
+
+        for agent_id in list(role_classes):
+            if agent_id not in rows:
+                del role_classes[agent_id]
+                failed[agent_id] = "not_found"
+
+        # 3. Construct and start agents concurrently
+        phase_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _start(agent_id: UUID) -> Optional[BaseAgent]:
+            agent_model, tech_stack = rows[agent_id]
+            async with semaphore:
+                try:
+                    agent = role_classes[agent_id](
+                        agent_model=agent_model,
+                        heartbeat_interval=heartbeat_interval,
+                        max_idle_time=max_idle_time,
+                        tech_stack=tech_stack,
+                    )
+                    if await agent.start():
+                        return agent
+                    failed[agent_id] = "start_failed"
+                except Exception as e:
+                    logger.error(f"Failed to spawn agent {agent_id}: {e}", exc_info=True)
+                    failed[agent_id] = str(e)
+                return None
+
+        self._spawning.update(role_classes)
+        try:
+            started = await asyncio.gather(*(_start(agent_id) for agent_id in role_classes))
+        finally:
+            self._spawning.difference_update(role_classes)
+        started = [agent for agent in started if agent is not None]
+        timings["start"] = (time.perf_counter() - phase_start) * 1000
+
+        for agent in started:
+            self.agents[agent.agent_id] = agent
+            agent_directory.register(agent)
+        self.total_spawned += len(started)
+
+        # 4. Persist status, pool_id and pool counters in one transaction
+        phase_start = time.perf_counter()
+        spawned_ids = [agent.agent_id for agent in started]
+        if spawned_ids:
+            try:
+                with Session(engine) as db_session:
+                    db_session.exec(
+                        update(AgentModel)
+                        .where(AgentModel.id.in_(spawned_ids))
+                        .values(status=AgentStatus.idle, pool_id=self.pool_id)
+                    )
+                    if self.pool_id:
+                        PoolService(db_session).increment_spawn_count(
+                            self.pool_id, count=len(spawned_ids), commit=False
+                        )
+                    db_session.commit()
+            except Exception as e:
+                logger.error(f"Failed to persist spawned agents for pool '{self.pool_name}': {e}", exc_info=True)
+        timings["persist"] = (time.perf_counter() - phase_start) * 1000
+        timings["total"] = (time.perf_counter() - started_at) * 1000
+
+        logger.info(
+            f"✓ Spawned {len(spawned_ids)}/{len(spawned_ids) + len(failed)} agents in pool "
+            f"'{self.pool_name}' (prefetch={timings['prefetch']:.0f}ms, start={timings['start']:.0f}ms, "
+            f"persist={timings['persist']:.0f}ms, total={timings['total']:.0f}ms)"
+        )
+
+        return {
+            "spawned": spawned_ids,
+            "failed": failed,
+            "timings_ms": timings,
+        }
+
     async def terminate_agent(self, agent_id: UUID, graceful: bool = True) -> bool:
         """Terminate an agent.
 
@@ -199,17 +356,20 @@ class AgentPoolManager:
         Returns:
             True if terminated successfully
         """
-        agent = self.agents.get(agent_id)
+        agent = self.agents.get(agent_id) or self.hibernated.get(agent_id)
         if not agent:
             logger.warning(f"Agent {agent_id} not found in pool '{self.pool_name}'")
             return False
 
         try:
-            # 1. Stop agent (stops Kafka consumer)
-            await agent.stop()
-
-            # 2. Remove from memory
-            del self.agents[agent_id]
+            # 1. Stop routing new work to the agent, then stop it (stops Kafka consumer)
+            agent_directory.unregister(agent)
+            if agent_id in self.agents:
+                await agent.stop()
+
+            # 2. Remove from memory (hibernated stubs have nothing to stop)
+            self.agents.pop(agent_id, None)
+            self.hibernated.pop(agent_id, None)
             self.total_terminated += 1
 
             # 3. Update DB status and pool counters
@@ -237,18 +397,18 @@ class AgentPoolManager:
             agent_id: Agent UUID
 
         Returns:
-            True if agent exists, False otherwise
+            True if agent exists (live or hibernated), False otherwise
         """
-        return agent_id in self.agents
+        return agent_id in self.agents or agent_id in self.hibernated
 
     def get_agent(self, agent_id: UUID) -> Optional[BaseAgent]:
-        """Get agent by ID.
+        """Get live agent by ID.
 
         Args:
             agent_id: Agent UUID
 
         Returns:
-            Agent instance or None if not found
+            Agent instance or None if not found or hibernated
         """
         return self.agents.get(agent_id)
 
@@ -295,6 +455,185 @@ class AgentPoolManager:
         
         return True
 
+    # ===== Drain =====
+
+    async def drain(self, timeout: float) -> int:
+        """Stop all agents from taking tasks and hand off their in-flight work.
+
+        Called before ``stop()`` on shutdown so running stories pause at a node
+        boundary and resume on another process (see ``app.core.agent.drain``).
+
+        Args:
+            timeout: Seconds each agent waits for its running tasks
+
+        Returns:
+            Number of tasks handed off
+        """
+        self._draining = True
+        if self._wake_consumer:
+            await self._wake_consumer.stop()
+            self._wake_consumer = None
+
+        agents = list(self.agents.values())
+        logger.info(f"Draining {len(agents)} agents in pool '{self.pool_name}' (timeout={timeout}s)...")
+        results = await asyncio.gather(*(agent.drain(timeout) for agent in agents), return_exceptions=True)
+
+        handed_off = 0
+        for agent, result in zip(agents, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Error draining agent {agent.name}: {result}")
+            else:
+                handed_off += result
+        self.total_handed_off += handed_off
+        logger.info(f"✓ Pool '{self.pool_name}' drained: {handed_off} tasks handed off")
+        return handed_off
+
+    # ===== Hibernation =====
+
+    def is_hibernated(self, agent_id: UUID) -> bool:
+        """Check if agent is hibernated or being rehydrated."""
+        return agent_id in self.hibernated or agent_id in self._rehydrating
+
+    async def hibernate_agent(self, agent_id: UUID) -> bool:
+        """Release an idle agent, keeping a stub that is rehydrated on its next task.
+
+        Args:
+            agent_id: Agent UUID
+
+        Returns:
+            True if the agent was hibernated
+        """
+        agent = self.agents.get(agent_id)
+        if not agent:
+            return False
+
+        try:
+            # Wake consumer must be listening before the agent's consumer stops
+            await self._ensure_wake_consumer()
+
+            stub = HibernatedAgent.from_agent(agent)
+            self.hibernated[agent_id] = stub
+            del self.agents[agent_id]
+            agent_directory.register(stub)
+
+            await agent.stop()
+            self.total_hibernated += 1
+            logger.info(f"[HIBERNATION] Hibernated agent {agent.name} ({agent_id}) in pool '{self.pool_name}'")
+            return True
+
+        except Exception as e:
+            logger.error(f"[HIBERNATION] Failed to hibernate agent {agent_id}: {e}", exc_info=True)
+            return False
+
+    async def rehydrate_agent(self, agent_id: UUID) -> Optional[BaseAgent]:
+        """Rebuild and start a hibernated agent.
+
+        Concurrent calls for the same agent wait for one rehydration.
+
+        Args:
+            agent_id: Agent UUID
+
+        Returns:
+            Live agent, or None if the agent is unknown or failed to start
+        """
+        if agent_id in self.agents:
+            return self.agents[agent_id]
+        if agent_id in self._rehydrating:
+            return await asyncio.shield(self._rehydrating[agent_id])
+
+        stub = self.hibernated.get(agent_id)
+        if not stub:
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._rehydrating[agent_id] = future
+        started_at = time.perf_counter()
+        agent: Optional[BaseAgent] = None
+
+        try:
+            with Session(engine) as db_session:
+                agent_model = db_session.get(AgentModel, agent_id)
+
+            if not agent_model:
+                logger.error(f"[HIBERNATION] Agent {agent_id} not found in database")
+            else:
+                candidate = stub.role_class(
+                    agent_model=agent_model,
+                    heartbeat_interval=stub.heartbeat_interval,
+                    max_idle_time=stub.max_idle_time,
+                    tech_stack=stub.tech_stack,
+                )
+                if await candidate.start():
+                    candidate._latency_ewma_ms = stub._latency_ewma_ms
+                    self.hibernated.pop(agent_id, None)
+                    self.agents[agent_id] = candidate
+                    agent_directory.register(candidate)
+                    agent = candidate
+
+                    elapsed_ms = (time.perf_counter() - started_at) * 1000
+                    self._rehydration_ms.append(elapsed_ms)
+                    self.total_rehydrated += 1
+                    logger.info(
+                        f"[HIBERNATION] Rehydrated agent {stub.name} ({agent_id}) in {elapsed_ms:.0f}ms"
+                    )
+                else:
+                    logger.error(f"[HIBERNATION] Failed to start rehydrated agent {agent_id}")
+
+        except Exception as e:
+            logger.error(f"[HIBERNATION] Failed to rehydrate agent {agent_id}: {e}", exc_info=True)
+
+        finally:
+            self._rehydrating.pop(agent_id, None)
+            future.set_result(agent)
+
+        return agent
+
+    async def _ensure_wake_consumer(self) -> None:
+        """Start the pool's wake consumer on first hibernation."""
+        if self._wake_consumer is None:
+            consumer = HibernationWakeConsumer(self)
+            await consumer.start(seek_to_end=True)
+            self._wake_consumer = consumer
+
+    async def _hibernate_idle_agents(self) -> int:
+        """Hibernate every agent idle past its ``max_idle_time``.
+
+        Returns:
+            Number of agents hibernated
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        idle_ids = [agent_id for agent_id, agent in self.agents.items() if is_hibernatable(agent, now)]
+        if not idle_ids:
+            return 0
+
+        rss_before = current_rss_bytes()
+        hibernated = 0
+        for agent_id in idle_ids:
+            if await self.hibernate_agent(agent_id):
+                hibernated += 1
+        gc.collect()
+        released = max(0, rss_before - current_rss_bytes())
+        self.rss_released_bytes += released
+
+        logger.info(
+            f"[HIBERNATION] Pool '{self.pool_name}': hibernated {hibernated} idle agents, "
+            f"RSS -{released / 1024 / 1024:.1f}MB ({len(self.agents)} live, {len(self.hibernated)} hibernated)"
+        )
+        return hibernated
+
+    def get_hibernation_stats(self) -> Dict[str, Any]:
+        """Hibernation counters, RSS released and rehydration latency."""
+        from app.core.agent.autoscaler import percentile
+
+        return {
+            "hibernated_agents": len(self.hibernated),
+            "total_hibernated": self.total_hibernated,
+            "total_rehydrated": self.total_rehydrated,
+            "rss_released_mb": round(self.rss_released_bytes / 1024 / 1024, 1),
+            "rehydration_p50_ms": round(percentile(self._rehydration_ms, 50), 1),
+            "rehydration_p95_ms": round(percentile(self._rehydration_ms, 95), 1),
+        }
+
     @property
     def is_running(self) -> bool:
         """Check if pool manager is running.
@@ -393,6 +732,9 @@ class AgentPoolManager:
             "created_at": self.created_at.isoformat(),
             "manager_uptime_seconds": (datetime.now(timezone.utc) - self.created_at).total_seconds(),
             "agents": agents_list,
+            "hibernation": self.get_hibernation_stats(),
+            "draining": self._draining,
+            "total_handed_off": self.total_handed_off,
         }
 
     async def get_all_agent_health(self) -> List[Dict]:
@@ -412,6 +754,8 @@ class AgentPoolManager:
         Periodically checks agent health and terminates unhealthy agents.
         Also detects and resets agents stuck in busy state with no tasks.
         """
+        from app.core.config import settings
+
         logger.info(f"Health monitor started for pool '{self.pool_name}'")
 
         while not self._shutdown_event.is_set():
@@ -453,8 +797,8 @@ class AgentPoolManager:
 
                         # Check for stale busy state (agent stuck as busy with no tasks)
                         if agent.state == AgentStatus.busy:
-                            has_queue_tasks = hasattr(agent, '_task_queue') and agent._task_queue.qsize() > 0
-                            has_current_task = getattr(agent, '_current_task_id', None) is not None
+                            has_queue_tasks = agent.queue_depth > 0
+                            has_current_task = agent.active_task_count > 0
                             
                             if not has_queue_tasks and not has_current_task:
                                 logger.warning(
@@ -466,6 +810,10 @@ class AgentPoolManager:
                     except Exception as e:
                         logger.error(f"[HEALTH] Error checking health of agent {agent_id}: {e}")
 
+                # Release agents idle past their max_idle_time
+                if settings.AGENT_HIBERNATION_ENABLED and not self._draining:
+                    await self._hibernate_idle_agents()
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -0,0 +1,579 @@
+"""
+Agent Autoscaler
+
+Control loop that scales agents per ``(project_id, role_type)`` from queue
+depth, p95 queue wait and LLM concurrency, with hysteresis and cooldowns.
+It also evaluates the admin auto-scaling rules stored by the agent
+management API.
+
+Agents added by the autoscaler are flagged in ``persona_metadata`` and are
+the only ones it ever removes, so a project's original team is never
+scaled away.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Protocol, Tuple
+from uuid import UUID
+
+from app.core.agent.agent_directory import agent_directory
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.core.agent.base_agent import BaseAgent
+
+
+logger = logging.getLogger(__name__)
+
+
+AUTOSCALED_FLAG = "autoscaled"
+
+GroupKey = Tuple[UUID, str]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for no values)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _cron_field_matches(expression: str, value: int, low: int, high: int) -> bool:
+    for part in expression.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if value in range(start, end + 1, step):
+            return True
+    return False
+
+
+def cron_matches(expression: str, moment: datetime) -> bool:
+    """Check a 5-field cron expression (minute hour day month weekday).
+
+    Supports ``*``, ``*/n``, ``a-b``, ``a-b/n`` and comma lists. Weekday
+    0 and 7 are Sunday. All fields must match.
+
+    Raises:
+        ValueError: If the expression does not have 5 fields
+    """
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"Invalid cron expression: {expression!r}")
+
+    weekday = moment.isoweekday() % 7
+    checks = (
+        (fields[0], moment.minute, 0, 59),
+        (fields[1], moment.hour, 0, 23),
+        (fields[2], moment.day, 1, 31),
+        (fields[3], moment.month, 1, 12),
+    )
+    if not all(_cron_field_matches(*check) for check in checks):
+        return False
+    return (
+        _cron_field_matches(fields[4], weekday, 0, 7)
+        or (weekday == 0 and _cron_field_matches(fields[4], 7, 0, 7))
+    )
+
+
+def is_autoscaled(agent: "BaseAgent") -> bool:
+    """Check if the agent was added by the autoscaler."""
+    return bool((getattr(agent, "persona_metadata", None) or {}).get(AUTOSCALED_FLAG))
+
+
+def is_removable(agent: "BaseAgent") -> bool:
+    """Autoscaled agent with no queued, running or in-flight work."""
+    return (
+        is_autoscaled(agent)
+        and agent.active_task_count == 0
+        and agent.queue_depth == 0
+        and agent_directory.inflight(agent.agent_id) == 0
+    )
+
+
+# =============================================================================
+# Policy and Signals
+# =============================================================================
+
+@dataclass
+class ScalingPolicy:
+    """Thresholds, hysteresis and cooldowns for per-role agent scaling."""
+
+    # Scale up when either is exceeded
+    scale_up_queue_per_agent: float = 2.0
+    scale_up_wait_seconds: float = 30.0
+    # Scale down only when all hold
+    scale_down_queue_per_agent: float = 0.0
+    scale_down_wait_seconds: float = 5.0
+    scale_down_busy_ratio: float = 0.5
+
+    wait_window_seconds: float = 300.0
+    # No scale-up while this many LLM calls are in flight (agents would only wait on the LLM)
+    llm_concurrency_limit: int = 20
+
+    # Hysteresis: consecutive evaluations a condition must hold
+    scale_up_stable_ticks: int = 2
+    scale_down_stable_ticks: int = 6
+    scale_up_cooldown_seconds: float = 60.0
+    scale_down_cooldown_seconds: float = 300.0
+
+    scale_up_step: int = 1
+    min_agents: int = 1
+    max_agents: int = 3
+    roles: Tuple[str, ...] = ("developer", "tester")
+
+    @classmethod
+    def from_settings(cls) -> "ScalingPolicy":
+        return cls(
+            llm_concurrency_limit=settings.AGENT_AUTOSCALE_LLM_CONCURRENCY_LIMIT,
+            max_agents=settings.AGENT_AUTOSCALE_MAX_AGENTS_PER_ROLE,
+            roles=tuple(settings.AGENT_AUTOSCALE_ROLES),
+        )
+
+
+@dataclass
+class GroupSignals:
+    """Load signals for one (project_id, role_type) group."""
+
+    agents: int
+    busy_agents: int
+    queue_depth: int
+    p95_wait_seconds: float
+    removable_agents: int = 0
+
+    @property
+    def queue_per_agent(self) -> float:
+        return self.queue_depth / max(self.agents, 1)
+
+    @property
+    def busy_ratio(self) -> float:
+        return self.busy_agents / max(self.agents, 1)
+
+
+@dataclass
+class _GroupState:
+    up_streak: int = 0
+    down_streak: int = 0
+    last_scaled_at: float = field(default=-math.inf)
+
+
+class ScalingExecutor(Protocol):
+    """Carries out scaling decisions (real pools or a simulation)."""
+
+    async def scale_up(self, project_id: UUID, role_type: str, count: int) -> int: ...
+
+    async def scale_down(self, project_id: UUID, role_type: str, count: int) -> int: ...
+
+
+# =============================================================================
+# Pool Executor
+# =============================================================================
+
+class PoolScalingExecutor:
+    """Spawn/terminate agents in the running agent pools."""
+
+    async def scale_up(self, project_id: UUID, role_type: str, count: int) -> int:
+        from app.api.routes.agent_management import ensure_role_class_map, get_available_pool
+        from app.core.async_db import DB
+
+        role_class = ensure_role_class_map().get(role_type)
+        manager = get_available_pool(role_type=role_type)
+        if not role_class or not manager:
+            logger.warning(f"[AUTO-SCALE] No pool or role class for '{role_type}', cannot scale up")
+            return 0
+
+        running = {a.agent_id for a in agent_directory.get_agents(project_id, role_type)}
+        agent_ids = await DB.execute(
+            lambda session: self._prepare_agents(session, project_id, role_type, count, running)
+        )
+        if not agent_ids:
+            return 0
+
+        result = await manager.spawn_many([(agent_id, role_class) for agent_id in agent_ids])
+        return len(result["spawned"])
+
+    @staticmethod
+    def _prepare_agents(session, project_id: UUID, role_type: str, count: int, running: set) -> List[UUID]:
+        """Reuse stopped autoscaled agents, create new ones from personas for the rest."""
+        from sqlmodel import select
+
+        from app.models import Agent, AgentStatus
+        from app.services.agent_service import AgentService
+        from app.services.persona_service import PersonaService
+
+        existing = session.exec(
+            select(Agent).where(Agent.project_id == project_id, Agent.role_type == role_type)
+        ).all()
+
+        agent_ids = [
+            agent.id for agent in existing
+            if agent.status == AgentStatus.stopped
+            and agent.id not in running
+            and (agent.persona_metadata or {}).get(AUTOSCALED_FLAG)
+        ][:count]
+
+        persona_service = PersonaService(session)
+        agent_service = AgentService(session)
+        used_persona_ids = [a.persona_template_id for a in existing if a.persona_template_id]
+
+        while len(agent_ids) < count:
+            persona = (
+                persona_service.get_random_persona_for_role(role_type=role_type, exclude_ids=used_persona_ids)
+                or persona_service.get_random_persona_for_role(role_type=role_type, exclude_ids=[])
+            )
+            if not persona:
+                logger.warning(f"[AUTO-SCALE] No persona template found for {role_type}")
+                break
+
+            agent = agent_service.create_from_template(project_id=project_id, persona_template=persona)
+            agent.persona_metadata = {**(agent.persona_metadata or {}), AUTOSCALED_FLAG: True}
+            session.add(agent)
+            session.commit()
+
+            used_persona_ids.append(persona.id)
+            agent_ids.append(agent.id)
+
+        return agent_ids
+
+    async def scale_down(self, project_id: UUID, role_type: str, count: int) -> int:
+        from app.api.routes.agent_management import _manager_registry
+
+        candidates = [a for a in agent_directory.get_agents(project_id, role_type) if is_removable(a)]
+        candidates.sort(key=agent_directory.load_of)
+
+        removed = 0
+        for agent in candidates[:count]:
+            for manager in list(_manager_registry.values()):
+                if manager.has_agent(agent.agent_id):
+                    if await manager.terminate_agent(agent.agent_id, graceful=True):
+                        removed += 1
+                    break
+        return removed
+
+
+# =============================================================================
+# Autoscaler
+# =============================================================================
+
+class AgentAutoscaler:
+    """
+    Per-role agent autoscaler.
+
+    ``decide`` is a pure control step (signals in, delta out) with
+    hysteresis: a condition must hold for several consecutive evaluations
+    and the group must be out of its cooldown before it scales. ``run_once``
+    feeds it live signals from the agent directory and applies the result.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[ScalingPolicy] = None,
+        executor: Optional[ScalingExecutor] = None,
+    ):
+        self.policy = policy or ScalingPolicy.from_settings()
+        self.executor = executor or PoolScalingExecutor()
+
+        self._groups: Dict[GroupKey, _GroupState] = {}
+
+        # Statistics
+        self.total_scale_ups = 0
+        self.total_scale_downs = 0
+        self.total_suppressed = 0
+
+    # =========================================================================
+    # Control Step
+    # =========================================================================
+
+    def decide(
+        self,
+        key: GroupKey,
+        signals: GroupSignals,
+        llm_inflight: int = 0,
+        now: Optional[float] = None,
+    ) -> int:
+        """Decide how many agents to add (positive) or remove (negative)."""
+        policy = self.policy
+        now = time.monotonic() if now is None else now
+        state = self._groups.setdefault(key, _GroupState())
+
+        wants_up = (
+            signals.queue_per_agent >= policy.scale_up_queue_per_agent
+            or signals.p95_wait_seconds >= policy.scale_up_wait_seconds
+        )
+        wants_down = (
+            signals.queue_per_agent <= policy.scale_down_queue_per_agent
+            and signals.p95_wait_seconds <= policy.scale_down_wait_seconds
+            and signals.busy_ratio <= policy.scale_down_busy_ratio
+        )
+        state.up_streak = state.up_streak + 1 if wants_up else 0
+        state.down_streak = state.down_streak + 1 if wants_down else 0
+        since_last = now - state.last_scaled_at
+
+        delta = 0
+        if (
+            wants_up
+            and state.up_streak >= policy.scale_up_stable_ticks
+            and since_last >= policy.scale_up_cooldown_seconds
+            and signals.agents < policy.max_agents
+        ):
+            if llm_inflight >= policy.llm_concurrency_limit:
+                self.total_suppressed += 1
+                logger.debug(f"[AUTO-SCALE] Scale-up of {key} suppressed: {llm_inflight} LLM calls in flight")
+                return 0
+            delta = min(policy.scale_up_step, policy.max_agents - signals.agents)
+        elif (
+            wants_down
+            and state.down_streak >= policy.scale_down_stable_ticks
+            and since_last >= policy.scale_down_cooldown_seconds
+            and signals.agents > policy.min_agents
+            and signals.removable_agents > 0
+        ):
+            delta = -1
+
+        if delta:
+            state.last_scaled_at = now
+            state.up_streak = 0
+            state.down_streak = 0
+        return delta
+
+    def collect_signals(self, project_id: UUID, role_type: str) -> GroupSignals:
+        """Read live load signals for a group from the agent directory."""
+        agents = agent_directory.get_agents(project_id, role_type)
+        waits = [
+            wait
+            for agent in agents
+            for wait in agent.recent_queue_waits(self.policy.wait_window_seconds)
+        ]
+        return GroupSignals(
+            agents=len(agents),
+            busy_agents=sum(1 for a in agents if a.active_task_count > 0),
+            queue_depth=sum(a.queue_depth + agent_directory.inflight(a.agent_id) for a in agents),
+            p95_wait_seconds=percentile(waits, 95),
+            removable_agents=sum(1 for a in agents if is_removable(a)),
+        )
+
+    async def run_once(
+        self,
+        manager_registry: Optional[Dict[str, Any]] = None,
+        rules: Iterable[Any] = (),
+    ) -> List[Dict[str, Any]]:
+        """Evaluate all groups and stored rules once.
+
+        Returns:
+            List of actions taken
+        """
+        from app.core.agent.llm_factory import get_llm_inflight
+
+        actions = []
+        llm_inflight = get_llm_inflight()
+        now = time.monotonic()
+
+        groups = [key for key in agent_directory.groups() if key[1] in self.policy.roles]
+        for key in groups:
+            signals = self.collect_signals(*key)
+            delta = self.decide(key, signals, llm_inflight, now)
+            if delta:
+                changed = await self._apply(key, delta)
+                actions.append({
+                    "project_id": str(key[0]),
+                    "role_type": key[1],
+                    "requested": delta,
+                    "changed": changed,
+                    "queue_depth": signals.queue_depth,
+                    "p95_wait_seconds": round(signals.p95_wait_seconds, 1),
+                })
+
+        # Drop state of groups that no longer exist
+        for key in set(self._groups) - set(groups):
+            del self._groups[key]
+
+        if manager_registry is not None:
+            for rule in rules:
+                if not rule.enabled:
+                    continue
+                result = await self.evaluate_rule(rule, manager_registry)
+                if result["action_taken"] != "none":
+                    actions.append({"rule_id": rule.id, **result})
+
+        return actions
+
+    async def _apply(self, key: GroupKey, delta: int) -> int:
+        project_id, role_type = key
+        try:
+            if delta > 0:
+                changed = await self.executor.scale_up(project_id, role_type, delta)
+                self.total_scale_ups += changed
+            else:
+                changed = -await self.executor.scale_down(project_id, role_type, -delta)
+                self.total_scale_downs -= changed
+        except Exception as e:
+            logger.error(f"[AUTO-SCALE] Failed to scale {role_type} in project {project_id}: {e}", exc_info=True)
+            return 0
+
+        logger.info(f"[AUTO-SCALE] {role_type} in project {project_id}: {changed:+d} agents (requested {delta:+d})")
+        return changed
+
+    # =========================================================================
+    # Stored Rules
+    # =========================================================================
+
+    def _rule_metric(self, rule: Any, agents: List["BaseAgent"]) -> Optional[float]:
+        trigger = getattr(rule.trigger_type, "value", rule.trigger_type)
+        queue_depth = sum(a.queue_depth + agent_directory.inflight(a.agent_id) for a in agents)
+        if trigger == "queue_depth":
+            return float(queue_depth)
+
+        metric = rule.metric or "active_ratio"
+        if metric == "active_ratio":
+            return sum(1 for a in agents if a.active_task_count > 0) / max(len(agents), 1)
+        if metric == "queue_per_agent":
+            return queue_depth / max(len(agents), 1)
+        if metric == "p95_wait_seconds":
+            waits = [w for a in agents for w in a.recent_queue_waits(self.policy.wait_window_seconds)]
+            return percentile(waits, 95)
+
+        logger.debug(f"[AUTO-SCALE] Rule '{rule.name}': unsupported metric '{metric}'")
+        return None
+
+    def _rule_fires(self, rule: Any, agents: List["BaseAgent"], now: datetime) -> bool:
+        trigger = getattr(rule.trigger_type, "value", rule.trigger_type)
+        if trigger == "schedule":
+            from zoneinfo import ZoneInfo
+
+            local_now = now.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(rule.timezone or "UTC"))
+            try:
+                return cron_matches(rule.cron_expression or "", local_now)
+            except ValueError as e:
+                logger.warning(f"[AUTO-SCALE] Rule '{rule.name}': {e}")
+                return False
+
+        value = self._rule_metric(rule, agents)
+        if value is None:
+            return False
+
+        action = getattr(rule.action, "value", rule.action)
+        above = rule.threshold_high is not None and value >= rule.threshold_high
+        below = rule.threshold_low is not None and value <= rule.threshold_low
+        if action == "scale_up":
+            return above
+        if action == "scale_down":
+            return below
+        return above or below
+
+    async def evaluate_rule(
+        self,
+        rule: Any,
+        manager_registry: Dict[str, Any],
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """Evaluate a stored AutoScalingRule and apply it if it fires.
+
+        Args:
+            rule: AutoScalingRule
+            manager_registry: Pool name -> AgentPoolManager
+            force: Skip trigger and cooldown checks (manual trigger)
+
+        Returns:
+            Dict describing the outcome (``action_taken`` is "none" if nothing changed)
+        """
+        manager = manager_registry.get(rule.pool_name)
+        if not manager:
+            return {"message": f"Pool '{rule.pool_name}' not found", "action_taken": "none"}
+
+        agents = [
+            a for a in manager.agents.values()
+            if not rule.role_type or a.role_type == rule.role_type
+        ]
+        now = datetime.utcnow()
+
+        if not force:
+            if rule.last_triggered and (now - rule.last_triggered).total_seconds() < max(rule.cooldown_seconds, 60):
+                return {"message": "Cooling down", "action_taken": "none"}
+            if not self._rule_fires(rule, agents, now):
+                return {"message": "Trigger not met", "action_taken": "none"}
+
+        current_count = len(agents)
+        action = getattr(rule.action, "value", rule.action)
+        if action == "scale_up":
+            target_count = min(current_count + rule.scale_amount, rule.max_agents)
+        elif action == "scale_down":
+            target_count = max(current_count - rule.scale_amount, rule.min_agents)
+        else:
+            target_count = max(rule.min_agents, min(rule.target_count or current_count, rule.max_agents))
+
+        delta = target_count - current_count
+        if delta == 0:
+            return {
+                "message": "No scaling needed",
+                "current_count": current_count,
+                "target_count": target_count,
+                "action_taken": "none",
+            }
+
+        rule.last_triggered = now
+
+        # Group the pool's agents by (project, role), most loaded first
+        groups: Dict[GroupKey, List["BaseAgent"]] = {}
+        for agent in agents:
+            groups.setdefault((agent.project_id, agent.role_type), []).append(agent)
+        ranked = sorted(
+            groups,
+            key=lambda k: sum(agent_directory.load_of(a) for a in groups[k]) / len(groups[k]),
+            reverse=True,
+        )
+
+        changed = 0
+        try:
+            if delta > 0:
+                if ranked:
+                    project_id, role_type = ranked[0]
+                    changed = await self.executor.scale_up(project_id, role_type, delta)
+            else:
+                remaining = -delta
+                for project_id, role_type in reversed(ranked):
+                    if remaining <= 0:
+                        break
+                    removed = await self.executor.scale_down(project_id, role_type, remaining)
+                    remaining -= removed
+                    changed -= removed
+        except Exception as e:
+            logger.error(f"[AUTO-SCALE] Rule '{rule.name}' failed: {e}", exc_info=True)
+
+        logger.info(f"[AUTO-SCALE] Rule '{rule.name}' on '{rule.pool_name}': {changed:+d} agents")
+
+        return {
+            "message": f"{'Spawned' if delta > 0 else 'Terminated'} {abs(changed)} agents",
+            "current_count": current_count,
+            "target_count": target_count,
+            "action_taken": "scale_up" if delta > 0 else "scale_down",
+            "agents_changed": changed,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_groups": len(self._groups),
+            "total_scale_ups": self.total_scale_ups,
+            "total_scale_downs": self.total_scale_downs,
+            "total_suppressed": self.total_suppressed,
+        }
+
+
+agent_autoscaler = AgentAutoscaler()
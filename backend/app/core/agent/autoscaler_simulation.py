@@ -0,0 +1,220 @@
+"""
+Autoscaler simulation harness.
+
+Replays a recorded task arrival trace against ``AgentAutoscaler.decide``
+with a simple queueing model (FIFO queue, one task per agent at a time,
+spawn delay for new agents) and reports queue wait, agent-seconds and
+scaling events. Use it to tune ``ScalingPolicy`` before changing
+production thresholds.
+
+Trace format (JSON list or JSON lines, ``t`` in seconds from trace start)::
+
+    {"t": 12.5, "service_seconds": 240}
+
+Usage::
+
+    python -m app.core.agent.autoscaler_simulation trace.json --static 1 --static 3
+    python -m app.core.agent.autoscaler_simulation --synthetic
+"""
+
+import argparse
+import json
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.core.agent.autoscaler import AgentAutoscaler, GroupSignals, ScalingPolicy, percentile
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying one trace."""
+
+    tasks: int
+    duration_seconds: int
+    p50_wait_seconds: float
+    p95_wait_seconds: float
+    max_wait_seconds: float
+    agent_seconds: int
+    peak_agents: int
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "tasks": self.tasks,
+            "duration_s": self.duration_seconds,
+            "p50_wait_s": round(self.p50_wait_seconds, 1),
+            "p95_wait_s": round(self.p95_wait_seconds, 1),
+            "max_wait_s": round(self.max_wait_seconds, 1),
+            "agent_seconds": self.agent_seconds,
+            "peak_agents": self.peak_agents,
+            "scale_events": len(self.events),
+        }
+
+
+def load_trace(path: Path) -> List[Dict[str, float]]:
+    """Load a JSON list or JSON-lines arrival trace, sorted by time."""
+    text = path.read_text().strip()
+    if text.startswith("["):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return sorted(
+        ({"t": float(r["t"]), "service_seconds": float(r["service_seconds"])} for r in records),
+        key=lambda r: r["t"],
+    )
+
+
+def synthetic_trace(seed: int = 7, duration: int = 3600) -> List[Dict[str, float]]:
+    """Quiet period, a 10-minute burst of story work, then quiet again."""
+    rng = random.Random(seed)
+    trace = []
+    t = 0.0
+    while t < duration:
+        in_burst = 900 <= t < 1500
+        t += rng.expovariate(1 / (20 if in_burst else 300))
+        trace.append({"t": round(t, 1), "service_seconds": round(rng.uniform(60, 240), 1)})
+    return trace
+
+
+def simulate(
+    trace: List[Dict[str, float]],
+    policy: ScalingPolicy,
+    tick_seconds: int = 30,
+    spawn_delay_seconds: int = 5,
+    initial_agents: Optional[int] = None,
+    tail_seconds: int = 1800,
+) -> SimulationResult:
+    """Replay an arrival trace through the autoscaler control step."""
+    autoscaler = AgentAutoscaler(policy=policy, executor=_NoopExecutor())
+    key = (UUID(int=0), "simulated")
+
+    # Agents: busy_until timestamp and whether the autoscaler may remove them
+    base_agents = initial_agents if initial_agents is not None else policy.min_agents
+    agents: List[Dict[str, Any]] = [{"busy_until": 0, "removable": False} for _ in range(base_agents)]
+    pending_spawns: List[int] = []
+
+    arrivals = deque(trace)
+    queue: deque = deque()
+    waits: List[float] = []
+    recent_waits: deque = deque()
+    events: List[Dict[str, Any]] = []
+
+    agent_seconds = 0
+    peak_agents = len(agents)
+    last_arrival = trace[-1]["t"] if trace else 0
+    t = 0
+
+    while True:
+        if t > last_arrival and not queue and all(a["busy_until"] <= t for a in agents):
+            if t > last_arrival + tail_seconds:
+                break
+
+        # Spawned agents become available
+        ready = [s for s in pending_spawns if s <= t]
+        for _ in ready:
+            agents.append({"busy_until": t, "removable": True})
+        pending_spawns = [s for s in pending_spawns if s > t]
+
+        while arrivals and arrivals[0]["t"] <= t:
+            arrival = arrivals.popleft()
+            queue.append((arrival["t"], arrival["service_seconds"]))
+
+        # Dispatch FIFO to idle agents
+        for agent in agents:
+            if not queue:
+                break
+            if agent["busy_until"] <= t:
+                arrived_at, service = queue.popleft()
+                wait = t - arrived_at
+                waits.append(wait)
+                recent_waits.append((t, wait))
+                agent["busy_until"] = t + math.ceil(service)
+
+        if t % tick_seconds == 0:
+            while recent_waits and recent_waits[0][0] < t - policy.wait_window_seconds:
+                recent_waits.popleft()
+            busy = sum(1 for a in agents if a["busy_until"] > t)
+            signals = GroupSignals(
+                agents=len(agents) + len(pending_spawns),
+                busy_agents=busy,
+                queue_depth=len(queue),
+                p95_wait_seconds=percentile((w for _, w in recent_waits), 95),
+                removable_agents=sum(1 for a in agents if a["removable"] and a["busy_until"] <= t),
+            )
+            delta = autoscaler.decide(key, signals, llm_inflight=busy, now=float(t))
+            if delta > 0:
+                pending_spawns.extend([t + spawn_delay_seconds] * delta)
+            elif delta < 0:
+                for agent in agents:
+                    if agent["removable"] and agent["busy_until"] <= t:
+                        agents.remove(agent)
+                        break
+            if delta:
+                events.append({
+                    "t": t,
+                    "delta": delta,
+                    "agents": len(agents) + len(pending_spawns),
+                    "queue_depth": signals.queue_depth,
+                    "p95_wait_s": round(signals.p95_wait_seconds, 1),
+                })
+
+        agent_seconds += len(agents)
+        peak_agents = max(peak_agents, len(agents))
+        t += 1
+
+    return SimulationResult(
+        tasks=len(waits),
+        duration_seconds=t,
+        p50_wait_seconds=percentile(waits, 50),
+        p95_wait_seconds=percentile(waits, 95),
+        max_wait_seconds=max(waits, default=0.0),
+        agent_seconds=agent_seconds,
+        peak_agents=peak_agents,
+        events=events,
+    )
+
+
+class _NoopExecutor:
+    async def scale_up(self, project_id, role_type, count) -> int:
+        return count
+
+    async def scale_down(self, project_id, role_type, count) -> int:
+        return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a task arrival trace through the agent autoscaler")
+    parser.add_argument("trace", nargs="?", type=Path, help="JSON / JSON-lines trace of {t, service_seconds}")
+    parser.add_argument("--synthetic", action="store_true", help="Use a built-in burst trace")
+    parser.add_argument("--tick", type=int, default=30, help="Autoscaler evaluation interval (s)")
+    parser.add_argument("--spawn-delay", type=int, default=5, help="Seconds until a new agent accepts work")
+    parser.add_argument("--max-agents", type=int, default=ScalingPolicy.max_agents)
+    parser.add_argument("--static", type=int, action="append", default=[], help="Also run a fixed-size baseline")
+    parser.add_argument("--events", action="store_true", help="Print scaling events")
+    args = parser.parse_args()
+
+    if args.synthetic or not args.trace:
+        trace = synthetic_trace()
+    else:
+        trace = load_trace(args.trace)
+
+    policy = ScalingPolicy(max_agents=args.max_agents)
+    runs = {"autoscaled": simulate(trace, policy, args.tick, args.spawn_delay)}
+    for size in args.static:
+        static_policy = replace(policy, min_agents=size, max_agents=size)
+        runs[f"static-{size}"] = simulate(trace, static_policy, args.tick, args.spawn_delay, initial_agents=size)
+
+    for name, result in runs.items():
+        print(f"{name:>12}: {json.dumps(result.summary())}")  # noqa: T201
+        if args.events and result.events:
+            for event in result.events:
+                print(f"{'':>14}{json.dumps(event)}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,12 @@ This is the new simplified agent architecture where:
 
 import asyncio
 import logging
+import time
 import traceback
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
@@ -38,6 +41,7 @@ from app.core.langfuse_client import (
     format_chat_messages,
     get_langchain_callback,
 )
+from app.core.agent.rate_limiter import BACKGROUND, INTERACTIVE, reset_llm_priority, set_llm_priority
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +76,47 @@ class TaskResult:
     error_message: Optional[str] = None
 
 
+@dataclass
+class TaskExecutionState:
+    """Per-task execution state (one per running task, not per agent)."""
+
+    agent_id: Optional[UUID] = None
+    task_id: Optional[UUID] = None
+    execution_id: Optional[UUID] = None
+    trace_id: Optional[str] = None
+    trace: Optional[Any] = None  # Current Langfuse trace object
+    task_type: Optional[str] = None
+    task_content: Optional[str] = None
+    routing_reason: Optional[str] = None
+    user_id: Optional[UUID] = None
+    execution_mode: str = "interactive"
+    start_time: Optional[datetime] = None
+    events: list = field(default_factory=list)
+    total_tokens: int = 0
+    llm_call_count: int = 0
+    task_data: Optional[Dict[str, Any]] = None  # Router task being executed (for drain handoff)
+    is_auto_task: bool = False  # Triggered by a story status change, not a user
+    story_ids: list = field(default_factory=list)  # Stories the task works on
+    last_saved_message_id: Optional[UUID] = None  # Latest Message row the task persisted
+
+
+# State of the task running in the current asyncio context
+_task_state: ContextVar[Optional[TaskExecutionState]] = ContextVar("agent_task_state", default=None)
+
+
+def _task_state_property(name: str) -> property:
+    """Expose a TaskExecutionState field as an agent attribute."""
+    return property(
+        lambda self: getattr(self._get_task_state(), name),
+        lambda self, value: setattr(self._get_task_state(), name, value),
+    )
+
+
+# Task classes with separate concurrency limits
+CHAT_TASK_TYPES = {AgentTaskType.MESSAGE.value, AgentTaskType.COLLABORATION_REQUEST.value}
+INLINE_TASK_TYPES = {AgentTaskType.COLLABORATION_RESPONSE.value}
+
+
 # Cross-agent collaboration exceptions
 class CollaborationError(Exception):
     """Base exception for collaboration failures."""
@@ -90,8 +135,28 @@ class BaseAgent(ABC):
     - Kafka consumer/producer logic hidden from subclasses
     - Agents only implement handle_task()
     - Helpers for progress tracking and publishing
+
+    Task state (``_current_task_id``, ``_total_tokens``, ...) lives in a
+    per-task ``TaskExecutionState`` bound to the running asyncio context, so
+    a chat task and a story task can run on the same agent concurrently.
     """
 
+    # Per-task state (resolved from the current task context)
+    _current_task_id = _task_state_property("task_id")
+    _current_execution_id = _task_state_property("execution_id")
+    _current_trace_id = _task_state_property("trace_id")
+    _current_trace = _task_state_property("trace")
+    _current_task_type = _task_state_property("task_type")
+    _current_task_content = _task_state_property("task_content")
+    _current_routing_reason = _task_state_property("routing_reason")
+    _current_user_id = _task_state_property("user_id")
+    _current_execution_mode = _task_state_property("execution_mode")
+    _execution_start_time = _task_state_property("start_time")
+    _execution_events = _task_state_property("events")
+    _total_tokens = _task_state_property("total_tokens")
+    _llm_call_count = _task_state_property("llm_call_count")
+    _last_saved_message_id = _task_state_property("last_saved_message_id")
+
     def __init__(self, agent_model: AgentModel, **kwargs):
         """Initialize base agent with persona attributes.
         """
@@ -101,8 +166,8 @@ class BaseAgent(ABC):
         self.role_type = agent_model.role_type
         self.agent_model = agent_model
         
-        # Load tech_stack from project
-        self.tech_stack = self._load_tech_stack()
+        # Load tech_stack from project (bulk spawn passes it prefetched)
+        self.tech_stack = kwargs.get("tech_stack") or self._load_tech_stack()
         
         # Name (short and display)
         self.name = agent_model.human_name  # "Sarah"
@@ -129,24 +194,8 @@ class BaseAgent(ABC):
         self.on_execution_complete = None
         self.on_heartbeat = None
 
-        # Current task being processed (for progress tracking)
-        self._current_task_id: Optional[UUID] = None
-        self._current_execution_id: Optional[UUID] = None
-        
-        # Task context tracking (for clarification questions)
-        self._current_task_type: Optional[str] = None
-        self._current_task_content: Optional[str] = None
-        self._current_routing_reason: Optional[str] = None
-        self._current_user_id: Optional[UUID] = None
-        self._current_execution_mode: str = "interactive"  # NEW: Track execution mode
-        
-        # Execution tracking
-        self._execution_start_time: Optional[Any] = None  # datetime object
-        self._execution_events: list = []  # List of events for current execution
-        
-        # Token usage tracking (per execution)
-        self._total_tokens: int = 0
-        self._llm_call_count: int = 0
+        # Task state used outside of any task (e.g. calls from API routes)
+        self._idle_task_state = TaskExecutionState(agent_id=self.agent_id)
 
         # Kafka producer (lazy init)
         self._producer: Optional[KafkaProducer] = None
@@ -154,15 +203,23 @@ class BaseAgent(ABC):
         # Consumer will be created by start()
         self._consumer = None
 
-        # Task queue for sequential processing
-        self._task_queue: asyncio.Queue = asyncio.Queue(maxsize=10)
+        # Task queues per task class; each class has its own worker count
+        from app.core.config import settings
+        self._concurrency_limits: Dict[str, int] = {
+            "chat": max(1, kwargs.get("max_concurrent_chat", settings.AGENT_MAX_CONCURRENT_CHAT_TASKS)),
+            "story": max(1, kwargs.get("max_concurrent_story", settings.AGENT_MAX_CONCURRENT_STORY_TASKS)),
+        }
+        self._task_queues: Dict[str, asyncio.Queue] = {
+            task_class: asyncio.Queue(maxsize=10) for task_class in self._concurrency_limits
+        }
         self._queue_running: bool = False
-        self._queue_worker_task: Optional[asyncio.Task] = None
+        self._queue_worker_tasks: List[asyncio.Task] = []
+        self._active_task_count: int = 0
+        self._inflight_tasks: Dict[int, Dict[str, Any]] = {}  # id(task_data) -> task_data
+        self._draining: bool = False
 
         # Langfuse tracing
         self.langfuse_client = get_langfuse_client()
-        self._current_trace_id: Optional[str] = None
-        self._current_trace: Optional[Any] = None  # Current Langfuse trace object
 
         # Cross-agent collaboration
         self._pending_collaborations: Dict[UUID, asyncio.Future] = {}
@@ -173,12 +230,36 @@ class BaseAgent(ABC):
         # Health tracking
         self._consecutive_failures: int = 0
         self._last_activity_at: datetime = datetime.now(timezone.utc)
+        self._latency_ewma_ms: Optional[float] = None  # Recent task latency (for routing)
+        self._queue_waits: deque = deque(maxlen=100)  # (dequeued_at, wait_seconds) for autoscaling
 
         logger.info(
             f"Initialized {self.role_type} agent: {self.name} "
             f"(tech_stack: {self.tech_stack}, style: {self.communication_style or 'N/A'}, traits: {', '.join(self.personality_traits[:2]) if self.personality_traits else 'N/A'})"
         )
 
+    def _get_task_state(self) -> TaskExecutionState:
+        """Get state of this agent's task running in the current context."""
+        state = _task_state.get()
+        if state is None or state.agent_id != self.agent_id:
+            return self._idle_task_state
+        return state
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of tasks waiting in all task queues."""
+        return sum(queue.qsize() for queue in self._task_queues.values())
+
+    @property
+    def active_task_count(self) -> int:
+        """Number of tasks currently executing."""
+        return self._active_task_count
+
+    def recent_queue_waits(self, window_seconds: float) -> List[float]:
+        """Queue wait times (seconds) of tasks dequeued within the window."""
+        cutoff = time.monotonic() - window_seconds
+        return [wait for dequeued_at, wait in self._queue_waits if dequeued_at >= cutoff]
+
     def _load_tech_stack(self) -> str:
         """Load tech stack from project (called once during init)."""
         try:
@@ -642,6 +723,7 @@ class BaseAgent(ABC):
             session.add(message)
             session.commit()
         
+        self._last_saved_message_id = message_id
         return message_id
     
     async def start_execution(self) -> None:
@@ -1603,9 +1685,13 @@ class BaseAgent(ABC):
         from app.core.agent.base_agent_consumer import BaseAgentInstanceConsumer
 
         try:
-            # Start task queue worker
+            # Start task queue workers (one per concurrency slot per task class)
             self._queue_running = True
-            self._queue_worker_task = asyncio.create_task(self._task_queue_worker())
+            self._queue_worker_tasks = [
+                asyncio.create_task(self._task_queue_worker(task_class))
+                for task_class, limit in self._concurrency_limits.items()
+                for _ in range(limit)
+            ]
             
             # Create consumer with wrapper that calls our handle_task
             # Skip old messages to start fresh on each restart
@@ -1623,19 +1709,82 @@ class BaseAgent(ABC):
 
         Called during shutdown.
         """
-        # Stop queue worker
+        # Stop queue workers
         self._queue_running = False
-        if self._queue_worker_task:
-            self._queue_worker_task.cancel()
+        for worker in self._queue_worker_tasks:
+            worker.cancel()
+        for worker in self._queue_worker_tasks:
             try:
-                await self._queue_worker_task
+                await worker
             except asyncio.CancelledError:
                 pass
+        self._queue_worker_tasks = []
         
         # Stop consumer
         if self._consumer:
             await self._consumer.stop()
 
+    async def drain(self, timeout: float) -> int:
+        """Stop accepting tasks and hand off in-flight work (see ``app.core.agent.drain``).
+
+        Queued tasks are handed off immediately. Running story graphs hand
+        themselves off at their next node boundary; tasks still running after
+        ``timeout`` seconds are handed off here and cancelled by ``stop()``.
+
+        Args:
+            timeout: Seconds to wait for running tasks to reach a node boundary
+
+        Returns:
+            Number of tasks handed off
+        """
+        from app.core.agent.drain import record_handoff, set_story_state, story_id_of
+        from app.models import StoryAgentState
+
+        self._draining = True
+        if self._consumer:
+            await self._consumer.stop()
+
+        handed_off = 0
+        for queue in self._task_queues.values():
+            while not queue.empty():
+                task_data = queue.get_nowait()
+                queue.task_done()
+                handed_off += record_handoff(self, task_data, resume=False)
+
+        deadline = time.monotonic() + timeout
+        while self._active_task_count > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+
+        for task_data in list(self._inflight_tasks.values()):
+            story_id = story_id_of(task_data)
+            if story_id:
+                set_story_state(story_id, StoryAgentState.PAUSED)
+            handed_off += record_handoff(self, task_data, resume=story_id is not None)
+
+        logger.info(f"[{self.name}] Drained ({handed_off} tasks handed off)")
+        return handed_off
+
+    def _handoff_on_drain(self) -> bool:
+        """Record the current task for resumption elsewhere if the agent is draining.
+
+        Called by story graphs at a node boundary, where the checkpoint is current.
+        """
+        from app.core.agent.drain import record_handoff
+
+        task_data = self._get_task_state().task_data
+        if not self._draining or task_data is None:
+            return False
+        self._inflight_tasks.pop(id(task_data), None)
+        record_handoff(self, task_data, resume=True)
+        return True
+
+    async def deliver_task(self, task_data: Dict[str, Any]) -> None:
+        """Hand a router task to this agent as if its consumer had received it.
+
+        Used when a task was consumed on the agent's behalf (e.g. while it was
+        hibernated).
+        """
+        await self._consumer.deliver(task_data)
 
     async def health_check(self) -> dict:
         """Enhanced health check with multiple signals.
@@ -1712,85 +1861,127 @@ class BaseAgent(ABC):
             self._producer = await get_kafka_producer()
         return self._producer
 
-    async def _task_queue_worker(self) -> None:
-        """Worker loop that processes tasks from queue one by one.
+    async def _task_queue_worker(self, task_class: str) -> None:
+        """Worker loop that processes tasks of one class from its queue.
         
-        This ensures:
-        - Tasks are processed sequentially (no concurrent execution)
-        - No state overwrite (task_id, execution_id)
-        - Proper busy status management
+        Each worker runs one task at a time; the number of workers per class
+        is the agent's concurrency limit for that class. Every task runs with
+        its own TaskExecutionState so concurrent tasks never share task_id,
+        execution_id or token counters.
         """
-
+        queue = self._task_queues[task_class]
         
         while self._queue_running:
             try:
                 # Wait for next task (with timeout to check _queue_running)
                 try:
-                    task_data = await asyncio.wait_for(
-                        self._task_queue.get(), 
-                        timeout=1.0
-                    )
+                    task_data = await asyncio.wait_for(queue.get(), timeout=1.0)
                 except asyncio.TimeoutError:
                     continue  # Check if still running
                 
                 # Process task with guaranteed cleanup
                 try:
-                    await self._execute_task(task_data)
+                    await self._run_task(task_data)
                 finally:
-                    # ALWAYS mark task as done and reset state
-                    self._task_queue.task_done()
-                    if self.state == AgentStatus.busy:
-                        self.state = AgentStatus.idle
+                    queue.task_done()
                 
             except asyncio.CancelledError:
-                logger.info(f"[{self.name}] Task queue worker cancelled")
-                # Ensure state is reset before exiting
-                if self.state == AgentStatus.busy:
-                    logger.info(f"[{self.name}] Resetting state to idle on worker cancel")
-                    self.state = AgentStatus.idle
+                logger.info(f"[{self.name}] Task queue worker ({task_class}) cancelled")
                 break
             except Exception as e:
                 logger.error(f"[{self.name}] Task queue worker error: {e}", exc_info=True)
-                # Reset state on error too
-                if self.state == AgentStatus.busy:
-                    self.state = AgentStatus.idle
-        
 
+    async def _run_task(self, task_data: Dict[str, Any]) -> None:
+        """Execute a task in a fresh per-task context and track busy state."""
+        enqueued_at = task_data.pop("_enqueued_at", None)
+        if enqueued_at is not None:
+            now = time.monotonic()
+            self._queue_waits.append((now, now - enqueued_at))
+        
+        token = _task_state.set(TaskExecutionState(agent_id=self.agent_id, task_data=task_data))
+        # Chat is served before story work when LLM calls queue at the rate limiter
+        priority_token = set_llm_priority(
+            INTERACTIVE if self._get_task_class(task_data) == "chat" else BACKGROUND
+        )
+        self._active_task_count += 1
+        self._inflight_tasks[id(task_data)] = task_data
+        self.state = AgentStatus.busy
+        try:
+            await self._execute_task(task_data)
+        finally:
+            reset_llm_priority(priority_token)
+            _task_state.reset(token)
+            self._inflight_tasks.pop(id(task_data), None)
+            self._active_task_count -= 1
+            if self._active_task_count == 0 and self.state == AgentStatus.busy:
+                self.state = AgentStatus.idle
+
+    @staticmethod
+    def _get_task_class(task_data: Dict[str, Any]) -> str:
+        """Classify task for concurrency limits: chat vs. story work."""
+        task_type = task_data.get("task_type", AgentTaskType.MESSAGE.value)
+        if isinstance(task_type, AgentTaskType):
+            task_type = task_type.value
+        return "chat" if task_type in CHAT_TASK_TYPES else "story"
+
+    def has_queue_room(self, task_data: Dict[str, Any]) -> bool:
+        """Whether ``_process_router_task`` would enqueue the task instead of rejecting it."""
+        return not self._task_queues[self._get_task_class(task_data)].full()
 
     async def _process_router_task(self, task_data: Dict[str, Any]) -> None:
         """Enqueue task from router for processing.
 
         This is called by the Kafka consumer. It:
-        1. Checks if queue has space
-        2. Enqueues task for sequential processing
+        1. Checks if the task class queue has space
+        2. Enqueues task for that class's workers
         3. Worker loop will process it
 
+        Collaboration responses only resume a waiting task, so they run
+        immediately instead of waiting behind the task that is blocked on them.
+
         Args:
             task_data: RouterTaskEvent as dict
         """
         task_id = task_data.get("task_id", "unknown")
         
+        if task_data.get("reserved"):
+            # Dispatched via AgentDirectory.select: free its in-flight slot
+            from app.core.agent.agent_directory import agent_directory
+            agent_directory.acknowledge(self.agent_id)
+        
+        task_type = task_data.get("task_type")
+        if getattr(task_type, "value", task_type) in INLINE_TASK_TYPES:
+            token = _task_state.set(TaskExecutionState(agent_id=self.agent_id))
+            try:
+                await self._execute_task(task_data)
+            finally:
+                _task_state.reset(token)
+            return
+        
+        task_class = self._get_task_class(task_data)
+        queue = self._task_queues[task_class]
+        
         try:
             # Try to add to queue (non-blocking)
-            self._task_queue.put_nowait(task_data)
+            task_data["_enqueued_at"] = time.monotonic()
+            queue.put_nowait(task_data)
             
-            queue_size = self._task_queue.qsize()
             logger.info(
                 f"[{self.name}] Task {task_id} enqueued "
-                f"(queue: {queue_size}/{self._task_queue.maxsize})"
+                f"({task_class} queue: {queue.qsize()}/{queue.maxsize})"
             )
             
         except asyncio.QueueFull:
             logger.error(
                 f"[{self.name}] Task queue FULL! Rejecting task {task_id}. "
-                f"Agent is overloaded ({self._task_queue.maxsize} tasks pending)"
+                f"Agent is overloaded ({queue.maxsize} {task_class} tasks pending)"
             )
             # Publish task rejection event back to router
             await self._publish_task_rejection(
                 task_id=task_id,
                 reason="queue_full",
-                queue_size=self._task_queue.qsize(),
-                max_queue_size=self._task_queue.maxsize
+                queue_size=queue.qsize(),
+                max_queue_size=queue.maxsize
             )
 
     async def _execute_task(self, task_data: Dict[str, Any]) -> None:
@@ -1899,9 +2090,6 @@ class BaseAgent(ABC):
                 f"type={task.task_type}, reason={task.routing_reason}"
             )
 
-            # Update state to busy
-            self.state = AgentStatus.busy
-            
             # CHECK TOKEN BUDGET BEFORE PROCESSING
             estimated_tokens = self._estimate_task_tokens(task)
             budget_allowed, budget_reason = await self._check_token_budget(estimated_tokens)
@@ -1924,9 +2112,6 @@ class BaseAgent(ABC):
                     error=budget_reason,
                     success=False
                 )
-                
-                # Return to idle
-                self.state = AgentStatus.idle
                 return
             
             # Emit "thinking" status ONCE - agents can send custom thinking messages in handle_task
@@ -1935,15 +2120,20 @@ class BaseAgent(ABC):
             task_failed = False
             try:
                 # Reset token tracking before handle_task
-                from app.core.agent.llm_factory import reset_token_count, get_token_count, get_llm_call_count
-                reset_token_count()
+                from app.core.agent.llm_factory import reset_token_count
+                usage = reset_token_count()
                 
                 # Call agent's implementation
                 result = await self.handle_task(task)
                 
-                # Get token counts after task completion
-                self._total_tokens = get_token_count()
-                self._llm_call_count = get_llm_call_count()
+                # Get token counts after task completion (this task only)
+                self._total_tokens = usage.tokens
+                self._llm_call_count = usage.llm_calls
+                if usage.cache_read_tokens or usage.cache_creation_tokens:
+                    logger.info(
+                        f"[{self.name}] Prompt cache: {usage.cache_read_tokens} tokens read, "
+                        f"{usage.cache_creation_tokens} written"
+                    )
                 
                 # Update execution record with success (also records tokens to budget)
                 await self._complete_execution_record(result=result, success=True)
@@ -1991,9 +2181,6 @@ class BaseAgent(ABC):
                 raise  # Re-raise to let outer handler deal with it
             
             finally:
-                # Return to idle
-                self.state = AgentStatus.idle
-                
                 # Emit "idle" status to clear frontend indicator (only if no error)
                 if not task_failed:
                     await self.message_user("idle", "Task completed")
@@ -2008,9 +2195,8 @@ class BaseAgent(ABC):
                     )
 
         except asyncio.CancelledError:
-            # Task was cancelled - ensure we reset state
+            # Task was cancelled (busy state is reset by _run_task)
             logger.info(f"[{self.name}] Task {task_id} was cancelled")
-            self.state = AgentStatus.idle
             # Don't re-raise - let the task complete gracefully
             
         except Exception as e:
@@ -2019,10 +2205,13 @@ class BaseAgent(ABC):
                 exc_info=True
             )
         finally:
-            # ALWAYS reset state to idle (defensive - in case inner finally didn't run)
-            if self.state == AgentStatus.busy:
-                logger.debug(f"[{self.name}] Resetting state to idle in outer finally")
-                self.state = AgentStatus.idle
+            # Track recent latency for least-loaded routing
+            if self._execution_start_time:
+                elapsed_ms = (datetime.now(timezone.utc) - self._execution_start_time).total_seconds() * 1000
+                if self._latency_ewma_ms is None:
+                    self._latency_ewma_ms = elapsed_ms
+                else:
+                    self._latency_ewma_ms = 0.3 * elapsed_ms + 0.7 * self._latency_ewma_ms
             
             # Score task completion (v3 API - non-blocking)
             try:
@@ -2306,12 +2495,20 @@ class AgentTaskConsumer:
                 """Delegate to BaseAgent's _process_router_task."""
                 await inner_self.base_agent._process_router_task(task_data)
 
+            def process_signal(inner_self, story_id: str, signal: str) -> None:
+                """Delegate to BaseAgent's receive_signal."""
+                inner_self.base_agent.receive_signal(story_id, signal)
+
         # Create consumer instance
         self._consumer_instance = DynamicConsumer(self.agent.agent_model, self.agent)
 
         # Start consumer
         await self._consumer_instance.start(seek_to_end=seek_to_end)
 
+    async def deliver(self, task_data: Dict[str, Any]) -> None:
+        """Run a task through the consumer's handler (filter, conversation record, process)."""
+        await self._consumer_instance._handle_router_task(task_data)
+
     async def stop(self) -> None:
         """Stop consuming tasks."""
         if self._consumer_instance:
@@ -63,6 +63,7 @@ class BaseAgentInstanceConsumer(EventHandlerConsumer):
 
         # Register handler for router tasks
         self.register_handler("router.task.dispatched", self._handle_router_task)
+        self.register_handler("agent.signal", self._handle_agent_signal)
 
         logger.info(
             f"Initialized consumer for agent {self.human_name} "
@@ -141,6 +142,26 @@ class BaseAgentInstanceConsumer(EventHandlerConsumer):
                 exc_info=True
             )
 
+    async def _handle_agent_signal(self, event: BaseKafkaEvent | Dict[str, Any]) -> None:
+        """Handle a cancel/pause signal forwarded from another process.
+
+        Args:
+            event: AgentSignalEvent or dict
+        """
+        event_data = event.model_dump(mode='json') if hasattr(event, 'model_dump') else event
+        if str(event_data.get("agent_id")) != str(self.agent_id):
+            return
+
+        logger.info(
+            f"[SIGNAL] Agent {self.human_name}: '{event_data.get('signal')}' "
+            f"for story {event_data.get('story_id')}"
+        )
+        self.process_signal(str(event_data.get("story_id")), event_data.get("signal"))
+
+    def process_signal(self, story_id: str, signal: str) -> None:
+        """Apply a forwarded signal. Agents that track stories override this."""
+        pass
+
     def _save_conversation(
         self,
         message_id: Optional[str],
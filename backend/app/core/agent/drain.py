@@ -0,0 +1,241 @@
+"""
+Agent Drain and Handoff
+
+Draining an agent stops its Kafka consumer so it accepts no new tasks, then
+lets in-flight work reach a safe point:
+
+- Story graphs (``PausableAgentMixin``) stop at the next node boundary; the
+  story is marked PAUSED and its LangGraph checkpoint is kept.
+- Tasks still queued are handed off untouched.
+- Tasks still running when the drain timeout expires are cancelled; their
+  story resumes from the last checkpoint written at a node boundary.
+
+Each interrupted task is recorded in Redis as a handoff. On startup, and on
+every agent monitor pass, the process hosting the project claims the handoff
+and redelivers the task to an agent of the same role, with
+``context["resume"] = True`` for stories so they continue from the Postgres
+checkpointer instead of restarting. ``cleanup_stale_story_states`` leaves
+handed-off stories and their checkpoints alone.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.redis_client import redis_client
+from app.models import Story
+from app.models.base import StoryAgentState
+
+if TYPE_CHECKING:
+    from app.core.agent.base_agent import BaseAgent
+
+
+logger = logging.getLogger(__name__)
+
+HANDOFF_KEY_PREFIX = "agent_handoff:"
+
+
+def story_id_of(task_data: Dict[str, Any]) -> Optional[str]:
+    """Story a task works on (developer ``story_id``, tester ``story_ids``)."""
+    context = task_data.get("context") or {}
+    story_ids = context.get("story_ids") or []
+    story_id = context.get("story_id") or (story_ids[0] if story_ids else None)
+    return str(story_id) if story_id else None
+
+
+def record_handoff(agent: "BaseAgent", task_data: Dict[str, Any], resume: bool) -> bool:
+    """Store an interrupted task so another agent of the same role picks it up.
+
+    Args:
+        agent: Draining agent
+        task_data: Router task as received by the agent
+        resume: Resume the story from its checkpoint instead of starting over
+
+    Returns:
+        True if the handoff was stored
+    """
+    task = {key: value for key, value in task_data.items() if not key.startswith("_")}
+    record = {
+        "task": json.loads(json.dumps(task, default=str)),
+        "resume": resume,
+        "agent_id": str(agent.agent_id),
+        "project_id": str(agent.project_id),
+        "role_type": agent.role_type,
+        "drained_at": time.time(),
+    }
+    stored = redis_client.set(
+        f"{HANDOFF_KEY_PREFIX}{task.get('task_id')}", record, ttl=settings.AGENT_DRAIN_HANDOFF_TTL_SECONDS
+    )
+    if stored:
+        logger.info(
+            f"[DRAIN] {agent.name}: handed off task {task.get('task_id')} "
+            f"(story={story_id_of(task)}, resume={resume})"
+        )
+    else:
+        logger.warning(
+            f"[DRAIN] {agent.name}: could not store handoff for task {task.get('task_id')}; "
+            f"story {story_id_of(task)} must be resumed manually"
+        )
+    return stored
+
+
+def list_handoffs() -> List[Dict[str, Any]]:
+    """All pending handoffs, each with its Redis ``key``."""
+    records = []
+    for key in redis_client.scan_keys(f"{HANDOFF_KEY_PREFIX}*"):
+        record = redis_client.get(key)
+        if isinstance(record, dict):
+            records.append({**record, "key": key})
+    return records
+
+
+def handed_off_story_ids() -> Set[str]:
+    """Stories waiting to be resumed by another agent."""
+    return {story_id for record in list_handoffs() if (story_id := story_id_of(record["task"]))}
+
+
+def set_story_state(story_id: str, state: StoryAgentState, only_from: Optional[Set[StoryAgentState]] = None) -> bool:
+    """Set a story's agent_state, optionally only when it is currently in ``only_from``."""
+    try:
+        with Session(engine) as session:
+            story = session.get(Story, UUID(story_id))
+            if not story or (only_from is not None and story.agent_state not in only_from):
+                return False
+            story.agent_state = state
+            session.commit()
+            return True
+    except Exception as e:
+        logger.error(f"[DRAIN] Failed to set story {story_id} to {state}: {e}")
+        return False
+
+
+def get_story_state(story_id: str) -> Optional[StoryAgentState]:
+    try:
+        with Session(engine) as session:
+            story = session.get(Story, UUID(story_id))
+            return story.agent_state if story else None
+    except Exception:
+        return None
+
+
+def _prepare_task(record: Dict[str, Any], agent_id: UUID) -> Optional[Dict[str, Any]]:
+    """Task to redeliver for a claimed handoff, or None if the story moved on meanwhile."""
+    task = dict(record["task"])
+    story_id = story_id_of(task)
+
+    if record.get("resume") and story_id:
+        # Anything but PAUSED means the story was resumed or cancelled by hand
+        if not set_story_state(story_id, StoryAgentState.PROCESSING, only_from={StoryAgentState.PAUSED}):
+            logger.info(f"[DRAIN] Story {story_id} no longer paused, dropping handoff")
+            return None
+        task["context"] = {**(task.get("context") or {}), "resume": True}
+    elif story_id and get_story_state(story_id) in (StoryAgentState.CANCEL_REQUESTED, StoryAgentState.CANCELED):
+        logger.info(f"[DRAIN] Story {story_id} was cancelled, dropping handoff")
+        return None
+
+    task["agent_id"] = str(agent_id)
+    task["routing_reason"] = "drain_handoff"
+    return task
+
+
+def _restore_handoff(record: Dict[str, Any]) -> bool:
+    """Put back a claimed handoff whose redelivery failed, for the next pass."""
+    stored = {key: value for key, value in record.items() if key != "key"}
+    story_id = story_id_of(stored["task"])
+    if stored.get("resume") and story_id:
+        # _prepare_task moved it to PROCESSING
+        set_story_state(story_id, StoryAgentState.PAUSED, only_from={StoryAgentState.PROCESSING})
+    restored = redis_client.set(record["key"], stored, ttl=settings.AGENT_DRAIN_HANDOFF_TTL_SECONDS)
+    if not restored:
+        logger.warning(
+            f"[DRAIN] Could not restore handoff {record['key']}; story {story_id} must be resumed manually"
+        )
+    return restored
+
+
+async def _select_agent(project_id: UUID, role_type: str) -> Optional["BaseAgent"]:
+    """Live agent of the role, rehydrating it if it is hibernated."""
+    from app.api.routes.agent_management import _manager_registry
+    from app.core.agent.agent_directory import agent_directory
+
+    agent = agent_directory.select(project_id, role_type)
+    if agent is None or not getattr(agent, "hibernated", False):
+        return agent
+    for manager in _manager_registry.values():
+        if manager.is_hibernated(agent.agent_id):
+            return await manager.rehydrate_agent(agent.agent_id)
+    return None
+
+
+async def resume_handoffs() -> int:
+    """Claim handoffs for projects hosted here and redeliver them.
+
+    Handoffs whose role has no agent here yet, or whose agent's queue is
+    full, are left for the next pass; a failed redelivery puts the claimed
+    handoff back.
+
+    Returns:
+        Number of tasks redelivered
+    """
+    from app.core.agent.agent_directory import agent_directory
+    from app.core.agent.sharding import owns_project
+
+    resumed = 0
+    for record in list_handoffs():
+        project_id = UUID(record["project_id"])
+        if not owns_project(project_id):
+            continue
+        agent = await _select_agent(project_id, record["role_type"])
+        if agent is None:
+            continue
+        if getattr(agent, "_draining", False) or not agent.has_queue_room(record["task"]):
+            agent_directory.acknowledge(agent.agent_id)
+            continue
+        # Deleting the key is the claim; only one process gets True
+        task = _prepare_task(record, agent.agent_id) if redis_client.delete(record["key"]) else None
+        if task is None:
+            agent_directory.acknowledge(agent.agent_id)
+            continue
+        task["reserved"] = True  # _select_agent reserved a dispatch slot
+        # The conversation record was saved on first delivery, so skip the consumer
+        try:
+            await agent._process_router_task(task)
+        except Exception as e:
+            logger.error(f"[DRAIN] Redelivering task {task.get('task_id')} failed ({e}), keeping the handoff")
+            _restore_handoff(record)
+            continue
+        resumed += 1
+        logger.info(
+            f"[DRAIN] Resumed task {task.get('task_id')} from {record['agent_id']} on {agent.name} "
+            f"(story={story_id_of(task)}, resume={record.get('resume')})"
+        )
+    return resumed
+
+
+async def drain_all_pools(timeout: Optional[float] = None) -> int:
+    """Drain every local agent pool concurrently.
+
+    Returns:
+        Number of tasks handed off
+    """
+    from app.api.routes.agent_management import _manager_registry
+
+    timeout = settings.AGENT_DRAIN_TIMEOUT_SECONDS if timeout is None else timeout
+    results = await asyncio.gather(
+        *(manager.drain(timeout) for manager in _manager_registry.values()),
+        return_exceptions=True,
+    )
+    handed_off = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"[DRAIN] Pool drain failed: {result}")
+        else:
+            handed_off += result
+    return handed_off
@@ -0,0 +1,134 @@
+"""
+Agent Hibernation
+
+Agents idle past ``max_idle_time`` are swapped for a ``HibernatedAgent``
+stub: the per-agent Kafka consumer, queue workers and role-specific members
+(graphs, project context, workspaces) are released. The stub stays in the
+agent directory so routers keep selecting it, and one
+``HibernationWakeConsumer`` per pool watches ``AGENT_TASKS`` for tasks
+addressed to hibernated agents. The first such task rehydrates the agent
+and is handed to it directly.
+"""
+
+import logging
+import os
+import resource
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+from uuid import UUID
+
+from app.kafka.consumer import EventHandlerConsumer
+from app.kafka.event_schemas import KafkaTopics, RouterTaskEvent
+from app.models import AgentStatus
+
+if TYPE_CHECKING:
+    from app.core.agent.agent_pool_manager import AgentPoolManager
+    from app.core.agent.base_agent import BaseAgent
+
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def is_hibernatable(agent: "BaseAgent", now: float) -> bool:
+    """Idle agent with no queued/running work, collaborations or signals past ``max_idle_time``.
+
+    Args:
+        agent: Live agent
+        now: Current UTC timestamp (seconds)
+    """
+    return (
+        agent.state == AgentStatus.idle
+        and agent.active_task_count == 0
+        and agent.queue_depth == 0
+        and not agent._pending_collaborations
+        and not agent._pending_signals
+        and now - agent._last_activity_at.timestamp() >= agent.max_idle_time
+    )
+
+
+@dataclass
+class HibernatedAgent:
+    """Stub kept in place of a hibernated agent.
+
+    Exposes the attributes the agent directory, routers and autoscaler read
+    from live agents, plus what is needed to rebuild the agent.
+    """
+
+    agent_id: UUID
+    project_id: UUID
+    role_type: str
+    name: str
+    role_class: Type["BaseAgent"]
+    tech_stack: Optional[str] = None
+    heartbeat_interval: int = 30
+    max_idle_time: int = 300
+    persona_metadata: Dict[str, Any] = field(default_factory=dict)
+    _latency_ewma_ms: Optional[float] = None
+    state: AgentStatus = AgentStatus.idle
+    hibernated_at: float = field(default_factory=time.time)
+    queue_depth: int = 0
+    active_task_count: int = 0
+    hibernated: bool = True
+
+    @classmethod
+    def from_agent(cls, agent: "BaseAgent") -> "HibernatedAgent":
+        return cls(
+            agent_id=agent.agent_id,
+            project_id=agent.project_id,
+            role_type=agent.role_type,
+            name=agent.name,
+            role_class=type(agent),
+            tech_stack=agent.tech_stack,
+            heartbeat_interval=agent.heartbeat_interval,
+            max_idle_time=agent.max_idle_time,
+            persona_metadata=agent.persona_metadata,
+            _latency_ewma_ms=agent._latency_ewma_ms,
+        )
+
+    def recent_queue_waits(self, window_seconds: float) -> List[float]:
+        return []
+
+
+class HibernationWakeConsumer(EventHandlerConsumer):
+    """Pool-wide consumer that rehydrates hibernated agents on dispatch.
+
+    Live agents consume their own tasks; this consumer ignores every task
+    whose target is not hibernated (or currently rehydrating) in its pool.
+    """
+
+    def __init__(self, manager: "AgentPoolManager"):
+        self.manager = manager
+        super().__init__(
+            topics=[KafkaTopics.AGENT_TASKS.value],
+            group_id=f"pool_{manager.pool_id or manager.pool_name}_wake_tasks",
+        )
+        self.register_handler("router.task.dispatched", self._handle_router_task)
+        # Hibernated agents run no stories, so forwarded signals have nothing to stop
+        self.register_handler("agent.signal", lambda event: None)
+
+    async def _handle_router_task(self, event: RouterTaskEvent | Dict[str, Any]) -> None:
+        event_data = event.model_dump(mode="json") if hasattr(event, "model_dump") else event
+        try:
+            agent_id = UUID(str(event_data.get("agent_id")))
+        except ValueError:
+            return
+        if not self.manager.is_hibernated(agent_id):
+            return
+
+        agent = await self.manager.rehydrate_agent(agent_id)
+        if agent is None:
+            logger.error(
+                f"[HIBERNATION] Could not rehydrate agent {agent_id} for task {event_data.get('task_id')}"
+            )
+            return
+        await agent.deliver_task(event_data)
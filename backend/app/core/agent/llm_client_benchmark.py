@@ -0,0 +1,143 @@
+"""
+LLM client per-call overhead benchmark.
+
+Serves a minimal Anthropic Messages API on localhost and sends the same
+sequence of calls through
+
+- ``per_call``: a new ``ChatAnthropic`` per call (the previous factory), and
+- ``shared``: ``llm_factory.create_llm`` (registry + shared keep-alive client),
+
+cycling through the step configs so several models and timeouts are in use.
+Reports mean latency per call and how many TCP connections the server saw.
+
+Usage::
+
+    python -m app.core.agent.llm_client_benchmark
+    python -m app.core.agent.llm_client_benchmark --calls 500 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import HumanMessage
+
+from app.core.agent import llm_factory
+
+RESPONSE = {
+    "id": "msg_benchmark",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-haiku-4-5-20251001",
+    "content": [{"type": "text", "text": "ok"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 10, "output_tokens": 1},
+}
+
+
+class MockAnthropicHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = 0
+    _lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with MockAnthropicHandler._lock:
+            MockAnthropicHandler.connections += 1
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        body = json.dumps(RESPONSE).encode()
+        # Headers and body in one write (avoids Nagle/delayed-ACK stalls on keep-alive)
+        head = f"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: {len(body)}\r\n\r\n"
+        self.wfile.write(head.encode() + body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_mock_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAnthropicHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _per_call_llm(config: Dict) -> ChatAnthropic:
+    from app.core.config import settings
+
+    return ChatAnthropic(
+        model=config["model"],
+        temperature=config["temperature"],
+        max_tokens=config["max_tokens"],
+        timeout=config["timeout"],
+        max_retries=llm_factory.MAX_RETRIES,
+        base_url=settings.ANTHROPIC_API_BASE,
+        api_key="benchmark",
+        callbacks=[llm_factory._token_callback],
+    )
+
+
+def _shared_llm(config: Dict):
+    return llm_factory.create_llm(
+        model=config["model"],
+        temperature=config["temperature"],
+        max_tokens=config["max_tokens"],
+        timeout=config["timeout"],
+    )
+
+
+async def run(mode: str, calls: int, concurrency: int) -> Dict[str, float]:
+    configs: List[Dict] = list(llm_factory.STEP_CONFIG.values())
+    make = _per_call_llm if mode == "per_call" else _shared_llm
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            llm = make(configs[i % len(configs)])
+            await llm.ainvoke([HumanMessage(content="ping")])
+            latencies.append(time.perf_counter() - started)
+
+    MockAnthropicHandler.connections = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    await llm_factory.reset_llm_clients()
+    return {
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "calls_per_second": calls / elapsed,
+        "connections": MockAnthropicHandler.connections,
+    }
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Compare per-call and shared LLM client overhead")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server = start_mock_server()
+    settings.ANTHROPIC_API_BASE = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.ANTHROPIC_API_KEY = "benchmark"
+
+    for mode in ("per_call", "shared"):
+        result = asyncio.run(run(mode, args.calls, args.concurrency))
+        print(  # noqa: T201
+            f"{mode:>8}: {result['mean_ms']:.2f} ms/call, {result['calls_per_second']:.0f} calls/s, "
+            f"{result['connections']} connections"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,26 @@
 """Centralized LLM factory with LangChain callback-based token tracking.
+
+LLM clients are shared process-wide: one instance per (model, temperature,
+max_tokens, timeout) and one keep-alive HTTP client for all of them, so
+connections and TLS sessions are reused across calls and agents.
 """
 
 import logging
+import threading
 from contextvars import ContextVar
-from typing import Any
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List
 
+import anthropic
+import httpx
 from langchain_anthropic import ChatAnthropic
-from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, BaseCallbackHandler
 from langchain_core.language_models import BaseChatModel
-from langchain_core.outputs import LLMResult
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult, LLMResult
+
+from app.core.agent.rate_limiter import on_llm_response, rate_limited
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +34,13 @@ MODELS = {
     "complex": "claude-opus-4-5-20251101",
 }
 
+# Rate limiter tier per model (LLM_RATE_LIMITS)
+TIER_BY_MODEL = {model: tier for tier, model in MODELS.items()}
+
+# "cache_ttl" (seconds) opts a step into the response cache (LLM_RESPONSE_CACHE_ENABLED)
 STEP_CONFIG = {
     # Fast tier
+    "classify": {"model": MODELS["fast"], "temperature": 0, "timeout": 30, "max_tokens": 4096, "cache_ttl": 3600},
     "router": {"model": MODELS["fast"], "temperature": 0.1, "timeout": 30, "max_tokens": 4096},
     "clarify": {"model": MODELS["fast"], "temperature": 0.1, "timeout": 30, "max_tokens": 4096},
     "respond": {"model": MODELS["fast"], "temperature": 0.1, "timeout": 30, "max_tokens": 4096},
@@ -32,11 +49,11 @@ STEP_CONFIG = {
     # Medium tier
     "analyze": {"model": MODELS["medium"], "temperature": 0.1, "timeout": 60, "max_tokens": 8192},
     "plan": {"model": MODELS["medium"], "temperature": 0.1, "timeout": 90, "max_tokens": 8192},
-    "implement": {"model": MODELS["medium"], "temperature": 0, "timeout": 120, "max_tokens": 16384},
+    "implement": {"model": MODELS["medium"], "temperature": 0, "timeout": 120, "max_tokens": 16384, "cache_ttl": 86400},
     "debug": {"model": MODELS["medium"], "temperature": 0.2, "timeout": 90, "max_tokens": 16384},
     
     # Complex tier
-    "complex": {"model": MODELS["complex"], "temperature": 0, "timeout": 180, "max_tokens": 16384},
+    "complex": {"model": MODELS["complex"], "temperature": 0, "timeout": 180, "max_tokens": 16384, "cache_ttl": 86400},
     
     # Default
     "default": {"model": MODELS["medium"], "temperature": 0.2, "timeout": 60, "max_tokens": 8192},
@@ -45,64 +62,273 @@ STEP_CONFIG = {
 MAX_RETRIES = 3
 
 # =============================================================================
-# TOKEN TRACKING (thread-safe with ContextVar)
+# TOKEN TRACKING (per task with ContextVar)
 # =============================================================================
 
-_token_count: ContextVar[int] = ContextVar('token_count', default=0)
-_llm_call_count: ContextVar[int] = ContextVar('llm_call_count', default=0)
+@dataclass
+class TokenUsage:
+    """Mutable token counter shared by everything running inside one task."""
+    tokens: int = 0
+    llm_calls: int = 0
+    cache_read_tokens: int = 0  # Prompt prefix served from the Anthropic prompt cache
+    cache_creation_tokens: int = 0  # Prompt prefix written to the cache
+
+
+# Holds a mutable TokenUsage rather than ints: callbacks may run in a copied
+# context (executor threads, child asyncio tasks), so they mutate the task's
+# counter instead of setting a value that would be lost. Concurrent tasks each
+# call reset_token_count() in their own context and get their own counter.
+_token_usage: ContextVar[TokenUsage | None] = ContextVar('token_usage', default=None)
 
 
 def get_token_count() -> int:
     """Get total tokens used in current context."""
-    return _token_count.get()
+    usage = _token_usage.get()
+    return usage.tokens if usage else 0
 
 
 def get_llm_call_count() -> int:
     """Get total LLM calls in current context."""
-    return _llm_call_count.get()
+    usage = _token_usage.get()
+    return usage.llm_calls if usage else 0
+
+
+def get_cache_token_counts() -> tuple[int, int]:
+    """Get (cache_read, cache_creation) prompt tokens in current context."""
+    usage = _token_usage.get()
+    return (usage.cache_read_tokens, usage.cache_creation_tokens) if usage else (0, 0)
+
+
+def reset_token_count() -> TokenUsage:
+    """Start a fresh token counter for the current task."""
+    usage = TokenUsage()
+    _token_usage.set(usage)
+    return usage
+
+
+# Process-wide count of LLM calls in flight (autoscaler input)
+_llm_inflight = 0
+_llm_inflight_lock = threading.Lock()
+
+
+def get_llm_inflight() -> int:
+    """Get number of LLM calls currently in flight in this process."""
+    return _llm_inflight
 
 
-def reset_token_count() -> None:
-    """Reset token counter for new task."""
-    _token_count.set(0)
-    _llm_call_count.set(0)
+def _add_llm_inflight(delta: int) -> None:
+    global _llm_inflight
+    with _llm_inflight_lock:
+        _llm_inflight = max(0, _llm_inflight + delta)
 
 
 class TokenTrackingCallback(BaseCallbackHandler):
     """LangChain callback to track token usage from all LLM calls."""
     
+    def on_llm_start(self, serialized: dict, prompts: list, **kwargs: Any) -> None:
+        _add_llm_inflight(1)
+    
+    def on_chat_model_start(self, serialized: dict, messages: list, **kwargs: Any) -> None:
+        _add_llm_inflight(1)
+    
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        _add_llm_inflight(-1)
+    
     def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         """Called when LLM call ends - extract and track tokens."""
-        tokens = 0
+        _add_llm_inflight(-1)
+        tokens = cache_read = cache_creation = 0
+        
+        def add(usage: dict) -> None:
+            nonlocal tokens, cache_read, cache_creation
+            tokens += (usage.get('input_tokens') or 0) + (usage.get('output_tokens') or 0)
+            cache_read += usage.get('cache_read_input_tokens') or 0
+            cache_creation += usage.get('cache_creation_input_tokens') or 0
         
         # Try to get tokens from llm_output (standard location)
         if response.llm_output:
-            usage = response.llm_output.get('usage', {})
-            tokens = usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+            add(response.llm_output.get('usage') or {})
         
         # Fallback: try to get from generations metadata
         if tokens == 0 and response.generations:
             for gen_list in response.generations:
                 for gen in gen_list:
                     if hasattr(gen, 'generation_info') and gen.generation_info:
-                        usage = gen.generation_info.get('usage', {})
-                        tokens += usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+                        add(gen.generation_info.get('usage') or {})
+        
+        # Streamed calls: no llm_output, usage only on the aggregated message.
+        # Its input_tokens include cache reads/writes; count them as above.
+        if tokens == 0 and response.generations:
+            for gen_list in response.generations:
+                for gen in gen_list:
+                    usage_metadata = getattr(getattr(gen, 'message', None), 'usage_metadata', None)
+                    if usage_metadata:
+                        details = usage_metadata.get('input_token_details') or {}
+                        read, creation = details.get('cache_read') or 0, details.get('cache_creation') or 0
+                        add({
+                            'input_tokens': (usage_metadata.get('input_tokens') or 0) - read - creation,
+                            'output_tokens': usage_metadata.get('output_tokens'),
+                            'cache_read_input_tokens': read,
+                            'cache_creation_input_tokens': creation,
+                        })
         
         # Update counters
-        if tokens > 0:
-            current = _token_count.get()
-            _token_count.set(current + tokens)
+        usage = _token_usage.get()
+        if usage is None:
+            logger.debug(f"[TOKEN] LLM call outside task context: +{tokens} tokens (cache read {cache_read})")
+            return
         
-        current_calls = _llm_call_count.get()
-        _llm_call_count.set(current_calls + 1)
+        usage.tokens += tokens
+        usage.llm_calls += 1
+        usage.cache_read_tokens += cache_read
+        usage.cache_creation_tokens += cache_creation
         
-        logger.debug(f"[TOKEN] LLM call tracked: +{tokens} tokens (total: {_token_count.get()})")
+        logger.debug(
+            f"[TOKEN] LLM call tracked: +{tokens} tokens, cache read {cache_read}, "
+            f"cache write {cache_creation} (total: {usage.tokens})"
+        )
 
 
 # Singleton callback instance
 _token_callback = TokenTrackingCallback()
 
 
+# =============================================================================
+# SHARED LLM CLIENTS
+# =============================================================================
+
+_http_client: httpx.Client | None = None
+_async_http_client: httpx.AsyncClient | None = None
+_llm_registry: Dict[Hashable, BaseChatModel] = {}
+_registry_lock = threading.Lock()
+_registry_stats = {"hits": 0, "misses": 0}
+
+
+def _http_limits() -> httpx.Limits:
+    from app.core.config import settings
+
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide keep-alive HTTP client for synchronous LLM calls."""
+    global _http_client
+    with _registry_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = anthropic.DefaultHttpxClient(limits=_http_limits())
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide keep-alive HTTP client for async LLM calls.
+
+    Request timeouts are set per call by the provider SDKs, so one client
+    serves every model and timeout. 429/529 responses are reported to the
+    rate limiter of the call in flight.
+    """
+    global _async_http_client
+    with _registry_lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = anthropic.DefaultAsyncHttpxClient(
+                limits=_http_limits(),
+                event_hooks={"response": [on_llm_response]},
+            )
+        return _async_http_client
+
+
+def _model_tier(model: str) -> str:
+    return TIER_BY_MODEL.get(model, "default")
+
+
+def _estimate_input_tokens(messages: List[BaseMessage]) -> int:
+    """Rough pre-call estimate (~4 chars/token) for the tokens/min bucket."""
+    return sum(len(m.content if isinstance(m.content, str) else str(m.content)) for m in messages) // 4
+
+
+class SharedChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose SDK clients use the shared keep-alive HTTP clients.
+
+    The stock implementation keeps one HTTP client per (base_url, timeout).
+    Async calls go through the process-wide rate limiter of the model tier.
+    """
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: List[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async with rate_limited(_model_tier(self.model), _estimate_input_tokens(messages)) as permit:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                usage = chunk.message.usage_metadata or {}
+                permit.tokens += usage.get("total_tokens") or 0
+                yield chunk
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: List[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async with rate_limited(_model_tier(self.model), _estimate_input_tokens(messages)) as permit:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            for gen in result.generations:
+                usage = getattr(gen.message, "usage_metadata", None) or {}
+                permit.tokens += usage.get("total_tokens") or 0
+            return result
+
+    @cached_property
+    def _client(self) -> anthropic.Client:
+        return anthropic.Client(**self._client_params, http_client=get_http_client())
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncClient:
+        return anthropic.AsyncClient(**self._client_params, http_client=get_async_http_client())
+
+
+def _get_or_create(key: Hashable, build: Callable[[], BaseChatModel]) -> BaseChatModel:
+    """Return the registered client for ``key``, building it on first use."""
+    with _registry_lock:
+        llm = _llm_registry.get(key)
+        if llm is not None:
+            _registry_stats["hits"] += 1
+            return llm
+    llm = build()
+    with _registry_lock:
+        _registry_stats["misses"] += 1
+        return _llm_registry.setdefault(key, llm)
+
+
+def get_llm_registry_stats() -> dict:
+    """Registry size and hit/miss counters."""
+    with _registry_lock:
+        return {"clients": len(_llm_registry), **_registry_stats}
+
+
+async def reset_llm_clients() -> None:
+    """Drop registered clients and close the shared HTTP clients.
+
+    For shutdown, and for tests/benchmarks that run several event loops
+    (async connections belong to the loop that opened them).
+    """
+    global _http_client, _async_http_client
+    with _registry_lock:
+        http_client, async_http_client = _http_client, _async_http_client
+        _http_client = _async_http_client = None
+        _llm_registry.clear()
+        _registry_stats.update(hits=0, misses=0)
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        await async_http_client.aclose()
+
+
 # =============================================================================
 # LLM CREATION FUNCTIONS
 # =============================================================================
@@ -114,8 +340,10 @@ def create_llm(
     timeout: int = 60,
     max_retries: int = MAX_RETRIES,
     track_tokens: bool = True,
+    cache_ttl: int | None = None,
+    **overrides: Any,
 ) -> BaseChatModel:
-    """Create ChatAnthropic instance.
+    """Get the shared ChatAnthropic client for these settings.
     
     Args:
         model: Model name
@@ -124,21 +352,52 @@ def create_llm(
         timeout: Request timeout
         max_retries: Retry attempts
         track_tokens: Whether to inject token tracking callback
+        cache_ttl: Response cache TTL in seconds; None = no response cache.
+            Ignored unless LLM_RESPONSE_CACHE_ENABLED
+        **overrides: Per-call request parameters (e.g. ``stop``, ``top_k``),
+            applied with ``.bind()`` on top of the shared client
     """
     from app.core.config import settings
     
-    callbacks = [_token_callback] if track_tokens else None
+    if not settings.LLM_RESPONSE_CACHE_ENABLED:
+        cache_ttl = None
     
-    return ChatAnthropic(
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        timeout=timeout,
-        max_retries=max_retries,
-        base_url=settings.ANTHROPIC_API_BASE,
-        api_key=settings.ANTHROPIC_API_KEY,
-        callbacks=callbacks,
-    )
+    def build() -> BaseChatModel:
+        cache = None
+        if cache_ttl is not None:
+            from app.core.agent.response_cache import get_step_cache
+            cache = get_step_cache(cache_ttl)
+        return SharedChatAnthropic(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            max_retries=max_retries,
+            base_url=settings.ANTHROPIC_API_BASE,
+            api_key=settings.ANTHROPIC_API_KEY,
+            callbacks=[_token_callback] if track_tokens else None,
+            cache=cache,
+        )
+    
+    key = ("anthropic", model, temperature, max_tokens, timeout, max_retries, track_tokens, cache_ttl)
+    llm = _get_or_create(key, build)
+    return llm.bind(**overrides) if overrides else llm
+
+
+def create_openai_llm(model: str, temperature: float = 0.2, timeout: int = 30) -> BaseChatModel:
+    """Get the shared ChatOpenAI client for these settings (no token tracking)."""
+    def build() -> BaseChatModel:
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            timeout=timeout,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+        )
+    
+    return _get_or_create(("openai", model, temperature, timeout), build)
 
 
 def get_llm(step: str) -> BaseChatModel:
@@ -146,6 +405,9 @@ def get_llm(step: str) -> BaseChatModel:
     
     Args:
         step: Step name (router, plan, implement, etc.)
+    
+    Steps with a ``cache_ttl`` serve repeated identical requests from the
+    response cache; wrap retries in ``bypass_response_cache()``.
     """
     config = STEP_CONFIG.get(step, STEP_CONFIG["default"])
     return create_llm(
@@ -153,6 +415,7 @@ def get_llm(step: str) -> BaseChatModel:
         temperature=config["temperature"],
         max_tokens=config["max_tokens"],
         timeout=config["timeout"],
+        cache_ttl=config.get("cache_ttl"),
     )
 
 
@@ -165,6 +428,7 @@ def get_raw_llm(step: str) -> BaseChatModel:
         max_tokens=config["max_tokens"],
         timeout=config["timeout"],
         track_tokens=False,
+        cache_ttl=config.get("cache_ttl"),
     )
 
 
@@ -369,6 +369,12 @@ class PausableAgentMixin:
                 except Exception as e:
                     logger.error(f"[{self.name}] Checkpoint check failed on pause: {e}")
                 raise StoryStoppedException(story_id, db_state, "Paused (DB check)")
+            
+            # Draining: stop at this node boundary and hand the story off
+            if getattr(self, "_draining", False):
+                await self._update_story_state(story_id, StoryAgentState.PAUSED)
+                self._handoff_on_drain()
+                raise StoryStoppedException(story_id, StoryAgentState.PAUSED, "Drained (checkpoint kept for handoff)")
         
         logger.info(f"[{self.name}] Graph completed after {node_count} nodes")
         return final_state
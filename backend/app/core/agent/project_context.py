@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
@@ -24,6 +25,7 @@ KANBAN_CACHE_TTL = 30
 
 # Summarization settings
 SUMMARY_THRESHOLD = 5  # Summarize when memory has N messages, then clear them
+SUMMARY_DEBOUNCE = 2.0  # Seconds to wait for a burst of messages before summarizing
 
 
 class ProjectContext:
@@ -31,8 +33,10 @@ class ProjectContext:
     
     Summarization flow:
     1. Messages accumulate in self.memory
-    2. When len(memory) >= SUMMARY_THRESHOLD, summarize and CLEAR those messages
-    3. format_memory() returns: summary + remaining messages
+    2. maybe_summarize() schedules a debounced background task (never awaited
+       on the request path); it summarizes the oldest SUMMARY_THRESHOLD
+       messages, then CLEARS them and persists the summary
+    3. format_memory() returns: last committed summary + remaining messages
     """
     
     _instances: Dict[UUID, "ProjectContext"] = {}
@@ -46,7 +50,9 @@ class ProjectContext:
         
         # Rolling summarization - summary of older messages (cleared from memory)
         self._summary: str = ""
-        self._summary_lock = asyncio.Lock()
+        self._summary_through: Optional[datetime] = None  # created_at of the last summarized message
+        self._summary_task: Optional[asyncio.Task] = None
+        self._generation = 0  # Bumped by invalidate() so in-flight summaries are dropped
         
         # Kanban context cache (lazy loaded, with TTL)
         self._kanban_board_state: Optional[dict] = None
@@ -77,25 +83,34 @@ class ProjectContext:
             self._loaded = True
     
     async def _load_memory(self):
-        """Load recent messages from DB (only used for initial context)."""
+        """Load the persisted summary and the messages after it (initial context)."""
         try:
             from sqlmodel import Session, select
             from app.core.db import engine
-            from app.models import Message, AuthorType, MessageVisibility
+            from app.models import Message, AuthorType, MessageVisibility, ProjectPreference
             
-            # Load last 10 messages for initial context (will be summarized if needed)
             with Session(engine) as session:
-                messages = session.exec(
+                pref = session.exec(
+                    select(ProjectPreference).where(ProjectPreference.project_id == self.project_id)
+                ).first()
+                if pref and pref.conversation_summary:
+                    self._summary = pref.conversation_summary
+                    self._summary_through = pref.summary_through
+                
+                # Load last 10 unsummarized messages (will be summarized if needed)
+                query = (
                     select(Message)
                     .where(Message.project_id == self.project_id)
                     .where(Message.visibility == MessageVisibility.USER_MESSAGE)
-                    .order_by(Message.created_at.desc())
-                    .limit(10)
-                ).all()
+                )
+                if self._summary_through:
+                    query = query.where(Message.created_at > self._summary_through)
+                messages = session.exec(query.order_by(Message.created_at.desc()).limit(10)).all()
             
             self.memory = [
                 {"role": "user" if m.author_type == AuthorType.USER else "assistant",
-                 "content": (m.content or "")[:500]}
+                 "content": (m.content or "")[:500],
+                 "id": m.id}
                 for m in reversed(messages)
             ]
         except Exception as e:
@@ -116,29 +131,55 @@ class ProjectContext:
         except Exception as e:
             logger.warning(f"[ProjectContext] Load preferences failed: {e}")
     
-    def add_message(self, role: str, content: str):
-        """Add message to memory (unsummarized messages only)."""
-        self.memory.append({"role": role, "content": content[:500]})
+    def add_message(self, role: str, content: str, message_id: Optional[UUID] = None):
+        """Add message to memory (unsummarized messages only).
+        
+        ``message_id`` is the persisted Message row; once summarized, its
+        ``created_at`` becomes the summary watermark.
+        """
+        self.memory.append({"role": role, "content": content[:500], "id": message_id})
     
-    async def maybe_summarize(self):
-        """Check and create summary if enough messages, then clear them."""
-        if len(self.memory) >= SUMMARY_THRESHOLD:
-            async with self._summary_lock:
-                # Double-check after acquiring lock
-                if len(self.memory) >= SUMMARY_THRESHOLD:
-                    await self._create_summary()
+    def maybe_summarize(self):
+        """Schedule a background summary if enough messages piled up.
+        
+        Returns immediately; the current turn keeps using the last committed
+        summary plus the raw tail. Calls during the debounce window or while a
+        summary runs are coalesced into that task.
+        """
+        if len(self.memory) < SUMMARY_THRESHOLD:
+            return
+        if self._summary_task and not self._summary_task.done():
+            return
+        try:
+            self._summary_task = asyncio.get_running_loop().create_task(self._summarize_in_background())
+        except RuntimeError:
+            pass  # No running loop (sync caller): summarize on a later turn
+    
+    async def _summarize_in_background(self):
+        try:
+            await asyncio.sleep(SUMMARY_DEBOUNCE)
+            while len(self.memory) >= SUMMARY_THRESHOLD:
+                if not await self._create_summary():
+                    break
+        except Exception as e:
+            logger.warning(f"[ProjectContext] Background summarization failed: {e}")
     
-    async def _create_summary(self):
-        """Summarize messages and CLEAR them from memory."""
+    async def _create_summary(self) -> bool:
+        """Summarize the oldest messages, then CLEAR them from memory and persist.
+        
+        Returns:
+            True if a summary was committed
+        """
         try:
-            from langchain_openai import ChatOpenAI
             from langchain_core.messages import HumanMessage, SystemMessage
+            from app.core.agent.llm_factory import create_openai_llm
             
             # Take first SUMMARY_THRESHOLD messages to summarize
             messages_to_summarize = self.memory[:SUMMARY_THRESHOLD]
+            generation = self._generation
             
             if not messages_to_summarize:
-                return
+                return False
             
             # Format messages for summarization
             messages_text = "\n".join(
@@ -164,21 +205,65 @@ Create an updated summary that merges the previous context with the new conversa
 Keep IDs (like US-017, EPIC-001) and important decisions.
 Write 2-4 sentences maximum."""
 
-            llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, timeout=30)
+            llm = create_openai_llm("gpt-4o-mini", temperature=0.3, timeout=30)
             response = await llm.ainvoke([
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=prompt)
             ])
             
+            if generation != self._generation:
+                return False  # Context was invalidated meanwhile
+            
+            # Messages kept arriving during the call; only the summarized prefix is cleared
             self._summary = response.content.strip()
+            self.memory = self.memory[len(messages_to_summarize):]
             
-            # CLEAR summarized messages from memory
-            self.memory = self.memory[SUMMARY_THRESHOLD:]
+            logger.info(f"[ProjectContext] Created summary, cleared {len(messages_to_summarize)} messages. Summary: {self._summary[:100]}...")
             
-            logger.info(f"[ProjectContext] Created summary, cleared {SUMMARY_THRESHOLD} messages. Summary: {self._summary[:100]}...")
+            message_ids = [m["id"] for m in messages_to_summarize if m.get("id")]
+            through = await asyncio.to_thread(self._persist_summary, self._summary, message_ids)
+            self._summary_through = through or self._summary_through
+            return True
             
         except Exception as e:
             logger.warning(f"[ProjectContext] Summarization failed: {e}")
+            return False
+    
+    def _persist_summary(self, summary: str, message_ids: List[UUID]) -> Optional[datetime]:
+        """Store the committed summary so a restart doesn't re-summarize.
+        
+        The watermark is the newest ``created_at`` of the summarized messages'
+        rows, not the time they entered memory (agents add a reply before or
+        after persisting it).
+        
+        Returns:
+            The stored watermark
+        """
+        try:
+            from sqlalchemy import func
+            from sqlmodel import Session, select
+            from app.core.db import engine
+            from app.models import Message, ProjectPreference
+            
+            with Session(engine) as session:
+                pref = session.exec(
+                    select(ProjectPreference).where(ProjectPreference.project_id == self.project_id)
+                ).first()
+                if not pref:
+                    pref = ProjectPreference(project_id=self.project_id, preferences={})
+                through = None
+                if message_ids:
+                    through = session.exec(
+                        select(func.max(Message.created_at)).where(Message.id.in_(message_ids))
+                    ).first()
+                pref.conversation_summary = summary
+                pref.summary_through = through or pref.summary_through
+                session.add(pref)
+                session.commit()
+                return pref.summary_through
+        except Exception as e:
+            logger.warning(f"[ProjectContext] Persist summary failed: {e}")
+            return None
     
     def update_preference(self, key: str, value):
         self.preferences[key] = value
@@ -187,6 +272,8 @@ Write 2-4 sentences maximum."""
         """Reset context - used when project changes significantly."""
         self._loaded = False
         self._summary = ""
+        self._summary_through = None
+        self._generation += 1
         self.memory = []
     
     def invalidate_kanban(self):
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 import yaml
+from langchain_core.messages import SystemMessage
 
 logger = logging.getLogger(__name__)
 
@@ -152,3 +153,23 @@ def build_user_prompt(
     
     format_kwargs = {"user_message": user_message, **kwargs}
     return template.format(**format_kwargs)
+
+
+def cached_system_message(*stable_parts: str, suffix: str = "") -> SystemMessage:
+    """
+    Build a system message whose stable prefix is cached by Anthropic.
+    
+    The prefix (persona/instructions, skills, project context) is marked with
+    ``cache_control`` so repeated calls only pay the cache-read rate for it.
+    It must be byte-identical between calls to hit the cache; anything that
+    changes per call goes in ``suffix`` or the human message.
+    
+    Args:
+        *stable_parts: Prefix sections, joined with blank lines (empty ones skipped)
+        suffix: Volatile system content after the cache breakpoint
+    """
+    prefix = "\n\n".join(part for part in stable_parts if part)
+    blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+    if suffix:
+        blocks.append({"type": "text", "text": suffix})
+    return SystemMessage(content=blocks)
@@ -0,0 +1,387 @@
+"""Process-wide adaptive LLM rate limiter.
+
+One limiter per model tier (fast / medium / complex) gates every Anthropic
+call made through ``llm_factory`` (``SharedChatAnthropic._agenerate`` and
+``_astream``):
+
+- Token buckets for requests/min and tokens/min (input tokens are estimated
+  up front and reconciled with the reported usage afterwards)
+- A concurrency window shaped by AIMD: +1/window per success, halved on a
+  429/529 response (seen by a hook on the shared HTTP client, so SDK retries
+  count too), and new calls held back for the server's ``retry-after``
+- Waiters are served by priority: chat tasks (INTERACTIVE) before story
+  work (BACKGROUND); ``BaseAgent._run_task`` sets the priority per task
+
+With ``LLM_RATE_LIMIT_SHARED`` the per-minute budgets and 429 backoff are
+also coordinated across processes through Redis (fixed one-minute windows,
+Redis calls made in worker threads); the concurrency window stays per process.
+
+The window gates admission only. SDK retries of a call already holding a
+permit are not re-gated (they wait out ``retry-after`` themselves), so a call
+admitted just before a burst of 429s can still exhaust its ``max_retries``.
+This is accepted: the window shrinks on the first 429, ``retry-after`` holds
+new calls back, and callers already handle a failed LLM call.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# PRIORITY
+# =============================================================================
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: ContextVar[int] = ContextVar("llm_priority", default=INTERACTIVE)
+
+# Limiter whose permit the current call holds (read by the HTTP response hook)
+_active_limiter: ContextVar[Optional["TierLimiter"]] = ContextVar("llm_active_limiter", default=None)
+
+OVERLOAD_STATUS_CODES = {429, 529}
+SHARED_KEY_PREFIX = "llm_rate:"
+
+
+def set_llm_priority(priority: int) -> Token:
+    """Set the LLM priority for the current task; returns a token for reset."""
+    return _priority.set(priority)
+
+
+def reset_llm_priority(token: Token) -> None:
+    _priority.reset(token)
+
+
+def get_llm_priority() -> int:
+    return _priority.get()
+
+
+# =============================================================================
+# TIER LIMITER
+# =============================================================================
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    event: asyncio.Event = field(compare=False)
+
+    def wake(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass  # Loop closed
+
+
+@dataclass
+class Permit:
+    """Held for the duration of one LLM call."""
+    limiter: Optional["TierLimiter"]
+    estimated_tokens: int = 0
+    tokens: int = 0  # Actual usage, filled in by the caller
+
+
+class TierLimiter:
+    """Token buckets + AIMD concurrency window + priority queue for one tier."""
+
+    def __init__(
+        self,
+        tier: str,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        shared: bool = False,
+    ):
+        self.tier = tier
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.shared = shared
+
+        self.limit = float(max_concurrency)
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._inflight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._backoff_until = 0.0
+        self._last_decrease = 0.0
+        self.stats = {"granted": 0, "throttled": 0, "overloads": 0, "wait_seconds": 0.0}
+
+    # ----- buckets -----
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _try_grant(self, waiter: _Waiter, estimated_tokens: int) -> Optional[float]:
+        """Grant if possible (returns 0); else seconds to wait, or None until woken."""
+        now = time.monotonic()
+        self._refill(now)
+        if self._waiters[0] is not waiter:
+            return None
+        if now < self._backoff_until:
+            return self._backoff_until - now
+        if self._inflight >= max(self.min_concurrency, int(self.limit)):
+            return None
+        if self._requests < 1:
+            return (1 - self._requests) * 60 / self.rpm
+        needed = min(estimated_tokens, self.tpm)
+        if self._tokens < needed:
+            return (needed - self._tokens) * 60 / self.tpm
+
+        heapq.heappop(self._waiters)
+        self._inflight += 1
+        self._requests -= 1
+        self._tokens -= estimated_tokens
+        self.stats["granted"] += 1
+        self._wake_head()
+        return 0
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            self._waiters[0].wake()
+
+    # ----- permits -----
+
+    async def acquire(self, estimated_tokens: int = 0, priority: Optional[int] = None) -> Permit:
+        """Wait for a permit; higher-priority (lower value) waiters go first."""
+        waiter = _Waiter(
+            priority=get_llm_priority() if priority is None else priority,
+            seq=next(self._seq),
+            loop=asyncio.get_running_loop(),
+            event=asyncio.Event(),
+        )
+        started = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        try:
+            while True:
+                waiter.event.clear()
+                with self._lock:
+                    delay = self._try_grant(waiter, estimated_tokens)
+                if delay == 0:
+                    break
+                try:
+                    # Capped so shared-tier backoff and bucket refills are re-checked
+                    await asyncio.wait_for(waiter.event.wait(), timeout=min(delay or 1.0, 1.0))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    heapq.heapify(self._waiters)
+                self._wake_head()
+            raise
+
+        permit = Permit(limiter=self, estimated_tokens=estimated_tokens)
+        if self.shared:
+            try:
+                await self._acquire_shared(estimated_tokens)
+            except BaseException:
+                self.release(permit)
+                raise
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            with self._lock:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += waited
+        return permit
+
+    def release(self, permit: Permit) -> None:
+        with self._lock:
+            self._inflight = max(0, self._inflight - 1)
+            if permit.tokens:
+                self._tokens -= permit.tokens - permit.estimated_tokens
+            self._wake_head()
+        if self.shared and permit.tokens:
+            self._shared_add_tokens(permit.tokens - permit.estimated_tokens)
+
+    # ----- AIMD -----
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._wake_head()
+
+    def on_overload(self, retry_after: Optional[float] = None) -> None:
+        """Halve the window (at most once per second) and hold new calls back."""
+        now = time.monotonic()
+        with self._lock:
+            self.stats["overloads"] += 1
+            if now - self._last_decrease >= 1.0:
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+                self._last_decrease = now
+                logger.warning(
+                    f"[RateLimiter] {self.tier}: overloaded, concurrency window -> {self.limit:.1f}"
+                )
+            if retry_after:
+                self._backoff_until = max(self._backoff_until, now + retry_after)
+        if self.shared and retry_after:
+            self._shared_backoff(retry_after)
+
+    # ----- shared (Redis) tier -----
+
+    def _shared_key(self, name: str, window: Optional[int] = None) -> str:
+        suffix = f":{window}" if window is not None else ""
+        return f"{SHARED_KEY_PREFIX}{self.tier}:{name}{suffix}"
+
+    async def _acquire_shared(self, estimated_tokens: int) -> None:
+        while True:
+            delay = await asyncio.to_thread(self._shared_reserve, estimated_tokens)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def _shared_reserve(self, estimated_tokens: int) -> float:
+        """Reserve a request in the current window (worker thread); 0 if reserved, else seconds to wait."""
+        from app.core.redis_client import redis_client
+
+        backoff_until = redis_client.get(self._shared_key("backoff"))
+        if backoff_until and float(backoff_until) > time.time():
+            return max(float(backoff_until) - time.time(), 0.01)
+        window = int(time.time() // 60)
+        requests = redis_client.incr_window(self._shared_key("rpm", window), 1, ttl=120)
+        tokens = redis_client.incr_window(self._shared_key("tpm", window), estimated_tokens, ttl=120)
+        if requests is None or tokens is None:
+            return 0  # Redis unavailable: local limits only
+        if requests <= self.rpm and tokens - estimated_tokens < self.tpm:
+            return 0
+        return max((window + 1) * 60 - time.time(), 0.01)
+
+    def _shared_add_tokens(self, delta: int) -> None:
+        from app.core.redis_client import redis_client
+
+        _off_loop(redis_client.incr_window, self._shared_key("tpm", int(time.time() // 60)), delta, 120)
+
+    def _shared_backoff(self, retry_after: float) -> None:
+        from app.core.redis_client import redis_client
+
+        _off_loop(redis_client.set, self._shared_key("backoff"), time.time() + retry_after, math.ceil(retry_after) + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "tier": self.tier,
+                "concurrency_limit": round(self.limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "inflight": self._inflight,
+                "waiting": len(self._waiters),
+                "requests_available": int(self._requests),
+                "tokens_available": int(self._tokens),
+                **self.stats,
+            }
+
+
+def _off_loop(fn, *args) -> None:
+    """Run a fire-and-forget Redis write in a worker thread when called on an event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        fn(*args)
+        return
+    loop.run_in_executor(None, fn, *args)
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_limiters: Dict[str, TierLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(tier: str) -> TierLimiter:
+    """Process-wide limiter for a model tier, configured from LLM_RATE_LIMITS."""
+    with _limiters_lock:
+        limiter = _limiters.get(tier)
+        if limiter is None:
+            from app.core.config import settings
+
+            limits = settings.LLM_RATE_LIMITS.get(tier) or settings.LLM_RATE_LIMITS["default"]
+            limiter = _limiters[tier] = TierLimiter(
+                tier,
+                rpm=limits["rpm"],
+                tpm=limits["tpm"],
+                max_concurrency=limits["max_concurrency"],
+                min_concurrency=settings.LLM_RATE_LIMIT_MIN_CONCURRENCY,
+                shared=settings.LLM_RATE_LIMIT_SHARED,
+            )
+        return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.tier: limiter.get_stats() for limiter in limiters}
+
+
+def reset_rate_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
+
+
+@asynccontextmanager
+async def rate_limited(tier: str, estimated_tokens: int = 0) -> AsyncIterator[Permit]:
+    """Hold a permit of ``tier``'s limiter for one LLM call.
+
+    Nested calls (e.g. a streaming fallback inside a limited call) pass
+    through on the outer permit.
+    """
+    from app.core.config import settings
+
+    if not settings.LLM_RATE_LIMIT_ENABLED or _active_limiter.get() is not None:
+        yield Permit(limiter=None)
+        return
+
+    limiter = get_limiter(tier)
+    permit = await limiter.acquire(estimated_tokens)
+    token = _active_limiter.set(limiter)
+    try:
+        yield permit
+        limiter.on_success()
+    finally:
+        try:
+            _active_limiter.reset(token)
+        except ValueError:
+            pass  # Streamed call closed from another context (e.g. async generator finalizer)
+        limiter.release(permit)
+
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    for name, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        try:
+            return float(headers[name]) / scale
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+async def on_llm_response(response: httpx.Response) -> None:
+    """Shared async HTTP client hook: feed 429/529 responses (incl. SDK retries) to AIMD."""
+    if response.status_code not in OVERLOAD_STATUS_CODES:
+        return
+    limiter = _active_limiter.get()
+    if limiter is not None:
+        limiter.on_overload(_retry_after(response.headers))
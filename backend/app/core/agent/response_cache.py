@@ -0,0 +1,302 @@
+"""Content-addressed LLM response cache for deterministic steps.
+
+Steps that declare a ``cache_ttl`` in ``STEP_CONFIG`` get a LangChain cache on
+their shared client (see ``llm_factory.create_llm``). Entries are keyed by a
+hash of LangChain's ``llm_string`` (model, params, bound tools / structured
+output schema) and the serialized messages, so any change to the request is a
+miss.
+
+Tiers:
+- In-memory LRU (always, per process)
+- Optional shared tier: ``redis`` or ``disk`` (``LLM_RESPONSE_CACHE_BACKEND``)
+
+Async lookups/updates touch only the memory tier on the event loop; Redis and
+disk I/O runs in a worker thread.
+
+Retries that must reach the model (LBTM re-implementation, debug loops,
+structured-output validation retries) run inside ``bypass_response_cache()``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "llm_response:"
+_ALLOWED_OBJECTS = [ChatGeneration, Generation, AIMessage]
+
+_bypass: ContextVar[bool] = ContextVar("llm_response_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_response_cache(active: bool = True) -> Iterator[None]:
+    """Skip cache lookups for LLM calls in this block (responses are still stored)."""
+    if not active:
+        yield
+        return
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _usage_tokens(generations: Sequence) -> int:
+    tokens = 0
+    for gen in generations:
+        usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+        tokens += usage.get("total_tokens") or 0
+    return tokens
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class ResponseStore:
+    """Process-wide LRU with an optional Redis or disk tier behind it."""
+
+    def __init__(self, max_entries: int = 1000, backend: str = "memory", cache_dir: str = ".llm_cache"):
+        self.max_entries = max_entries
+        self.backend = backend
+        self.cache_dir = Path(cache_dir)
+        self._entries: "OrderedDict[str, tuple[float | None, list, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "saved_tokens": 0, "shared_hits": 0}
+
+    # ----- memory tier -----
+
+    def _get_local(self, key: str) -> Optional[tuple[list, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, generations, tokens = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return generations, tokens
+
+    def _put_local(self, key: str, generations: list, tokens: int, expires_at: float | None) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, generations, tokens)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ----- shared tier -----
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _get_shared(self, key: str) -> Optional[tuple[list, int, float | None]]:
+        try:
+            if self.backend == "redis":
+                from app.core.redis_client import redis_client
+
+                record = redis_client.get(f"{CACHE_KEY_PREFIX}{key}")
+            elif self.backend == "disk":
+                path = self._disk_path(key)
+                if not path.exists():
+                    return None
+                record = json.loads(path.read_text(encoding="utf-8"))
+            else:
+                return None
+            if not record:
+                return None
+            expires_at = record.get("expires_at")
+            if expires_at is not None and expires_at <= time.time():
+                return None
+            # Shared tier is shared with other processes: revive responses only
+            generations = loads(record["generations"], allowed_objects=_ALLOWED_OBJECTS)
+            return generations, record.get("tokens", 0), expires_at
+        except Exception as e:
+            logger.warning(f"[ResponseCache] Shared tier read failed ({self.backend}): {e}")
+            return None
+
+    def _put_shared(self, key: str, generations: list, tokens: int, ttl: int | None, expires_at: float | None) -> None:
+        if self.backend not in ("redis", "disk"):
+            return
+        record = {"generations": dumps(generations), "tokens": tokens, "expires_at": expires_at}
+        try:
+            if self.backend == "redis":
+                from app.core.redis_client import redis_client
+
+                redis_client.set(f"{CACHE_KEY_PREFIX}{key}", record, ttl=ttl)
+            else:
+                path = self._disk_path(key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(record), encoding="utf-8")
+                tmp.replace(path)
+        except Exception as e:
+            logger.warning(f"[ResponseCache] Shared tier write failed ({self.backend}): {e}")
+
+    @property
+    def has_shared_tier(self) -> bool:
+        return self.backend in ("redis", "disk")
+
+    # ----- public -----
+
+    def get(self, key: str) -> Optional[list]:
+        if self._bypassed():
+            return None
+        found = self._get_local(key)
+        if found is None and self.has_shared_tier:
+            return self._finish_get(key, None, self._get_shared(key))
+        return self._finish_get(key, found, None)
+
+    async def aget(self, key: str) -> Optional[list]:
+        """Like ``get``, with the shared tier read in a worker thread."""
+        if self._bypassed():
+            return None
+        found = self._get_local(key)
+        if found is None and self.has_shared_tier:
+            return self._finish_get(key, None, await asyncio.to_thread(self._get_shared, key))
+        return self._finish_get(key, found, None)
+
+    def _bypassed(self) -> bool:
+        if not _bypass.get():
+            return False
+        with self._lock:
+            self.stats["bypassed"] += 1
+        return True
+
+    def _finish_get(
+        self,
+        key: str,
+        found: Optional[tuple[list, int]],
+        record: Optional[tuple[list, int, float | None]],
+    ) -> Optional[list]:
+        shared = False
+        if record is not None:
+            generations, tokens, expires_at = record
+            self._put_local(key, generations, tokens, expires_at)
+            found, shared = (generations, tokens), True
+        with self._lock:
+            if found is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["shared_hits"] += int(shared)
+            self.stats["saved_tokens"] += found[1]
+        # Copies: LangChain post-processes the returned messages
+        return [gen.model_copy(deep=True) for gen in found[0]]
+
+    def put(self, key: str, generations: list, ttl: int | None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        tokens = _usage_tokens(generations)
+        self._put_local(key, list(generations), tokens, expires_at)
+        self._put_shared(key, list(generations), tokens, ttl, expires_at)
+
+    async def aput(self, key: str, generations: list, ttl: int | None) -> None:
+        """Like ``put``, with the shared tier written in a worker thread."""
+        expires_at = time.time() + ttl if ttl else None
+        tokens = _usage_tokens(generations)
+        self._put_local(key, list(generations), tokens, expires_at)
+        if self.has_shared_tier:
+            await asyncio.to_thread(self._put_shared, key, list(generations), tokens, ttl, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+                "backend": self.backend,
+            }
+
+
+_store: ResponseStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_response_store() -> ResponseStore:
+    """Process-wide response store, configured from settings on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from app.core.config import settings
+
+            _store = ResponseStore(
+                max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+                backend=settings.LLM_RESPONSE_CACHE_BACKEND,
+                cache_dir=settings.LLM_RESPONSE_CACHE_DIR,
+            )
+        return _store
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Hit ratio, saved tokens and size of the response cache."""
+    from app.core.config import settings
+
+    return {"enabled": settings.LLM_RESPONSE_CACHE_ENABLED, **get_response_store().get_stats()}
+
+
+# =============================================================================
+# LANGCHAIN CACHE
+# =============================================================================
+
+class StepResponseCache(BaseCache):
+    """LangChain cache for one step TTL, backed by the shared response store."""
+
+    def __init__(self, ttl: int | None = None, store: ResponseStore | None = None):
+        self.ttl = ttl
+        self._store = store
+
+    @property
+    def store(self) -> ResponseStore:
+        return self._store or get_response_store()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.store.get(self.make_key(prompt, llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.put(self.make_key(prompt, llm_string), return_val, self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    # Memory tier inline (bypass ContextVar is the caller's); Redis/disk off the loop
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return await self.store.aget(self.make_key(prompt, llm_string))
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        await self.store.aput(self.make_key(prompt, llm_string), return_val, self.ttl)
+
+
+_step_caches: Dict[Optional[int], StepResponseCache] = {}
+
+
+def get_step_cache(ttl: int | None) -> StepResponseCache:
+    """Shared StepResponseCache per TTL."""
+    with _store_lock:
+        if ttl not in _step_caches:
+            _step_caches[ttl] = StepResponseCache(ttl=ttl)
+        return _step_caches[ttl]
@@ -6,10 +6,10 @@ import logging
 import re
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from uuid import UUID, uuid4
 
-from sqlmodel import Session, select
+from sqlmodel import Session
 
 from app.kafka.event_schemas import (
     AgentTaskType,
@@ -22,10 +22,35 @@ from app.kafka.producer import KafkaProducer, get_kafka_producer
 from app.kafka.consumer import BaseKafkaConsumer
 from app.models import Agent, Project
 from app.core.db import engine
+from app.websocket.presence import presence_registry
+
+if TYPE_CHECKING:
+    from app.core.agent.base_agent import BaseAgent
+    from app.core.agent.sharding import RemoteAgent
 
 
 logger = logging.getLogger(__name__)
 
+def holds_reservation(agent: Union["BaseAgent", "RemoteAgent"]) -> bool:
+    """Whether ``select_agent`` reserved a dispatch slot on the agent (hosted in this process)."""
+    from app.core.agent.sharding import RemoteAgent
+
+    return not isinstance(agent, RemoteAgent)
+
+
+async def publish_reserved_task(producer: KafkaProducer, task: RouterTaskEvent) -> bool:
+    """Publish a task to AGENT_TASKS; a reserved dispatch slot is released if that fails."""
+    published = False
+    try:
+        published = await producer.publish(topic=KafkaTopics.AGENT_TASKS, event=task)
+    finally:
+        if task.reserved and not published:
+            from app.core.agent.agent_directory import agent_directory
+
+            agent_directory.acknowledge(task.agent_id)
+    return published
+
+
 class BaseEventRouter(ABC):
     """Abstract base class for event routers."""
 
@@ -53,8 +78,13 @@ class BaseEventRouter(ABC):
         routing_reason: str,
         priority: str = "medium",
         additional_context: Optional[Dict[str, Any]] = None,
+        reserved: bool = False,
     ) -> None:
-        """Publish a RouterTaskEvent to AGENT_TASKS topic."""
+        """Publish a RouterTaskEvent to AGENT_TASKS topic.
+
+        ``reserved``: the agent was picked by ``AgentDirectory.select`` in this
+        process; its dispatch slot is released if the publish fails.
+        """
         event_dict = source_event if isinstance(source_event, dict) else source_event.model_dump()
 
         context = {
@@ -73,12 +103,10 @@ class BaseEventRouter(ABC):
             project_id=event_dict.get("project_id"),
             user_id=event_dict.get("user_id"),
             context=context,
+            reserved=reserved,
         )
 
-        await self.producer.publish(
-            topic=KafkaTopics.AGENT_TASKS,
-            event=task,
-        )
+        await publish_reserved_task(self.producer, task)
 
         self.logger.info(
             f"Published task {task.task_id} to agent {agent_id} "
@@ -170,14 +198,14 @@ class UserMessageRouter(BaseEventRouter):
                     active_updated_at = active_updated_at.replace(tzinfo=timezone.utc)
                 
                 time_since_update = datetime.now(timezone.utc) - active_updated_at
-                timeout_minutes = self._get_timeout_for_project(project)
+                timeout_minutes = self._get_timeout_for_project(project.id)
                 timeout_seconds = timeout_minutes * 60
                 
                 if time_since_update.total_seconds() < timeout_seconds:
                     agent = session.get(Agent, active_agent_id)
                     
                     if agent:
-                        connection_status = "online" if project.websocket_connected else "offline"
+                        connection_status = "online" if presence_registry.is_connected(project.id) else "offline"
                         self.logger.info(
                             f"[CONTEXT_ROUTING] Routing to active agent: {agent.human_name} "
                             f"(last active {int(time_since_update.total_seconds())}s ago, "
@@ -195,7 +223,7 @@ class UserMessageRouter(BaseEventRouter):
                         )
                         return
                 else:
-                    connection_status = "online" if project.websocket_connected else "offline"
+                    connection_status = "online" if presence_registry.is_connected(project.id) else "offline"
                     self.logger.info(
                         f"[CONTEXT_ROUTING] Context expired after {timeout_minutes}min "
                         f"(user {connection_status}), clearing context"
@@ -204,22 +232,19 @@ class UserMessageRouter(BaseEventRouter):
             
             await self._route_to_team_leader(event_dict, project_id)
 
-    def _get_timeout_for_project(self, project: Project) -> int:
-        """Get appropriate timeout based on WebSocket connection status.
+    def _get_timeout_for_project(self, project_id: UUID) -> int:
+        """Get appropriate timeout based on WebSocket presence.
         
         Returns timeout in minutes:
         - 7 minutes if user is online (WebSocket connected)
         - 15 minutes if user is offline
         - Grace period: Uses online timeout if disconnected < 2 minutes ago
         """
-        if project.websocket_connected:
+        if presence_registry.is_connected(project_id):
             return self.CONTEXT_TIMEOUT_ONLINE_MINUTES
         
-        if project.websocket_last_seen:
-            websocket_last_seen = project.websocket_last_seen
-            if websocket_last_seen.tzinfo is None:
-                websocket_last_seen = websocket_last_seen.replace(tzinfo=timezone.utc)
-            
+        websocket_last_seen = presence_registry.get_last_seen(project_id)
+        if websocket_last_seen:
             offline_duration = datetime.now(timezone.utc) - websocket_last_seen
             
             if offline_duration.total_seconds() < self.GRACE_PERIOD_SECONDS:
@@ -838,21 +863,21 @@ class StoryEventRouter(BaseEventRouter):
         story_id = event_dict.get("story_id")
         self.logger.info(f"Story cancel event received for: {story_id}")
         
-        # Get assigned_agent_id from DB and signal via pool
+        # Get assigned_agent_id from DB and signal via pool (or the owning worker)
         from app.models import Story
-        from app.api.routes.agent_management import find_pool_for_agent
+        from app.core.agent.sharding import signal_agent
         
         with Session(engine) as session:
             story = session.get(Story, UUID(story_id) if isinstance(story_id, str) else story_id)
-            if story and story.assigned_agent_id:
-                pool = find_pool_for_agent(story.assigned_agent_id)
-                if pool:
-                    pool.signal_agent(story.assigned_agent_id, story_id, "cancel")
-                    self.logger.info(f"[cancel] Signal sent to agent {story.assigned_agent_id}")
-                else:
-                    self.logger.warning(f"[cancel] Agent {story.assigned_agent_id} not found in any pool")
+            assigned_agent_id = story.assigned_agent_id if story else None
+
+        if assigned_agent_id:
+            if await signal_agent(assigned_agent_id, story_id, "cancel", project_id):
+                self.logger.info(f"[cancel] Signal sent to agent {assigned_agent_id}")
             else:
-                self.logger.warning(f"[cancel] No assigned_agent_id for story {story_id}")
+                self.logger.warning(f"[cancel] Agent {assigned_agent_id} not found in any pool")
+        else:
+            self.logger.warning(f"[cancel] No assigned_agent_id for story {story_id}")
 
     async def _pause_story_task(self, event_dict: Dict[str, Any], project_id: str | UUID) -> None:
         """Pause a running story task.
@@ -862,21 +887,21 @@ class StoryEventRouter(BaseEventRouter):
         story_id = event_dict.get("story_id")
         self.logger.info(f"Story pause event received for: {story_id}")
         
-        # Get assigned_agent_id from DB and signal via pool
+        # Get assigned_agent_id from DB and signal via pool (or the owning worker)
         from app.models import Story
-        from app.api.routes.agent_management import find_pool_for_agent
+        from app.core.agent.sharding import signal_agent
         
         with Session(engine) as session:
             story = session.get(Story, UUID(story_id) if isinstance(story_id, str) else story_id)
-            if story and story.assigned_agent_id:
-                pool = find_pool_for_agent(story.assigned_agent_id)
-                if pool:
-                    pool.signal_agent(story.assigned_agent_id, story_id, "pause")
-                    self.logger.info(f"[pause] Signal sent to agent {story.assigned_agent_id}")
-                else:
-                    self.logger.warning(f"[pause] Agent {story.assigned_agent_id} not found in any pool")
+            assigned_agent_id = story.assigned_agent_id if story else None
+
+        if assigned_agent_id:
+            if await signal_agent(assigned_agent_id, story_id, "pause", project_id):
+                self.logger.info(f"[pause] Signal sent to agent {assigned_agent_id}")
             else:
-                self.logger.warning(f"[pause] No assigned_agent_id for story {story_id}")
+                self.logger.warning(f"[pause] Agent {assigned_agent_id} not found in any pool")
+        else:
+            self.logger.warning(f"[pause] No assigned_agent_id for story {story_id}")
 
     async def _resume_story_task(self, event_dict: Dict[str, Any], project_id: str | UUID) -> None:
         """Resume a paused story task by re-routing to developer."""
@@ -1398,7 +1423,7 @@ class DelegationRouter(BaseEventRouter):
             event_type="router.task.dispatched",
             task_id=uuid4(),
             task_type=event_dict.get("task_type", AgentTaskType.MESSAGE),
-            agent_id=agent.id,
+            agent_id=agent.agent_id,
             agent_role=target_role,
             source_event_type=event_dict.get("source_event_type"),
             source_event_id=event_dict.get("source_event_id"),
@@ -1406,47 +1431,32 @@ class DelegationRouter(BaseEventRouter):
             priority=event_dict.get("priority", "high"),
             project_id=str(project_id),
             user_id=event_dict.get("user_id"),
-            context=delegation_context
+            context=delegation_context,
+            reserved=holds_reservation(agent),
         )
         
-        await producer.publish(
-            topic=KafkaTopics.AGENT_TASKS,
-            event=task_event
-        )
+        await publish_reserved_task(producer, task_event)
         
-        await self._update_active_agent(project_id, agent.id)
+        await self._update_active_agent(project_id, agent.agent_id)
         
-        self.logger.info(f"[DelegationRouter] Delegated to {agent.human_name} (role={target_role}) for project {project_id}")
+        self.logger.info(f"[DelegationRouter] Delegated to {agent.name} (role={target_role}) for project {project_id}")
     
-    async def _find_best_agent(self, project_id: UUID, role_type: str) -> Optional[Agent]:
-        """Find best agent for role - prefers idle agents."""
-        with Session(engine) as session:
-            agents = session.exec(
-                select(Agent).where(
-                    Agent.project_id == project_id,
-                    Agent.role_type == role_type,
-                    Agent.status.not_in(["terminated", "stopped", "error"])
-                )
-            ).all()
-            
-            if not agents:
-                self.logger.warning(f"[DelegationRouter] No agents found for role '{role_type}' in project {project_id}")
-                return None
-            
-            self.logger.info(
-                f"[DelegationRouter] Found {len(agents)} agents for role '{role_type}': "
-                f"{[(str(a.id), a.human_name, a.status) for a in agents]}"
-            )
-            
-            idle_agents = [a for a in agents if a.status == "idle"]
-            if idle_agents:
-                selected = idle_agents[0]
-                self.logger.info(f"[DelegationRouter] Selected idle agent: {selected.human_name} (id={selected.id})")
-                return selected
-            
-            selected = agents[0]
-            self.logger.info(f"[DelegationRouter] Selected busy agent: {selected.human_name} (id={selected.id})")
-            return selected
+    async def _find_best_agent(self, project_id: UUID, role_type: str) -> Optional[Union["BaseAgent", "RemoteAgent"]]:
+        """Find least-loaded live agent for role (in-memory; Agent rows when sharded)."""
+        from app.core.agent.agent_directory import agent_directory
+        from app.core.agent.sharding import RemoteAgent, select_agent
+        
+        selected = select_agent(project_id, role_type)
+        if not selected:
+            self.logger.warning(f"[DelegationRouter] No agents found for role '{role_type}' in project {project_id}")
+            return None
+        
+        load = "remote" if isinstance(selected, RemoteAgent) else f"{agent_directory.load_of(selected):.2f}"
+        self.logger.info(
+            f"[DelegationRouter] Selected {selected.name} (id={selected.agent_id}, "
+            f"state={selected.state.value}, load={load})"
+        )
+        return selected
     
     async def _update_active_agent(self, project_id: UUID, agent_id: UUID) -> None:
         """Update project's active agent context."""
@@ -1596,7 +1606,7 @@ class AgentCollaborationRouter(BaseEventRouter):
         
         # Dispatch task to target agent
         await self.publish_task(
-            agent_id=agent.id,
+            agent_id=agent.agent_id,
             task_type=AgentTaskType.COLLABORATION_REQUEST,
             source_event=event_dict,
             routing_reason=f"collaboration_from_{from_role}",
@@ -1609,11 +1619,12 @@ class AgentCollaborationRouter(BaseEventRouter):
                 "from_agent_role": from_role,
                 "collaboration_context": event_dict.get("context", {}),
                 "depth": depth,
-            }
+            },
+            reserved=holds_reservation(agent),
         )
         
         self.logger.info(
-            f"[COLLABORATION] Dispatched request to {agent.human_name} ({to_role})"
+            f"[COLLABORATION] Dispatched request to {agent.name} ({to_role})"
         )
     
     async def _handle_response(self, event_dict: Dict[str, Any]) -> None:
@@ -1649,26 +1660,11 @@ class AgentCollaborationRouter(BaseEventRouter):
             f"[COLLABORATION] Response for {request_id} dispatched to agent {to_agent_id}"
         )
     
-    async def _find_agent_by_role(self, project_id: UUID, role_type: str) -> Optional[Agent]:
-        """Find best agent for role - prefers idle agents (same as DelegationRouter)."""
-        with Session(engine) as session:
-            agents = session.exec(
-                select(Agent).where(
-                    Agent.project_id == project_id,
-                    Agent.role_type == role_type,
-                    Agent.status.not_in(["terminated", "stopped", "error"])
-                )
-            ).all()
-            
-            if not agents:
-                return None
-            
-            # Prefer idle agents
-            idle_agents = [a for a in agents if a.status == "idle"]
-            if idle_agents:
-                return idle_agents[0]
-            
-            return agents[0]
+    async def _find_agent_by_role(self, project_id: UUID, role_type: str) -> Optional[Union["BaseAgent", "RemoteAgent"]]:
+        """Find least-loaded live agent for role (same as DelegationRouter)."""
+        from app.core.agent.sharding import select_agent
+        
+        return select_agent(project_id, role_type)
     
     async def _send_error_response(self, request: Dict[str, Any], error: str) -> None:
         """Send error response back to requesting agent."""
@@ -0,0 +1,133 @@
+"""
+Sharded Agent Runtime
+
+With ``AGENT_WORKERS = 0`` (default) agents run inside the API process.
+With ``AGENT_WORKERS = N`` agents are hosted by N ``app.core.agent.worker``
+processes, each owning the projects whose ``project_id`` hashes to its
+``AGENT_WORKER_INDEX``. The API process keeps the router and WebSocket
+bridge; tasks reach workers over ``AGENT_TASKS`` as before, and cancel/pause
+signals for agents hosted elsewhere are published there as
+``AgentSignalEvent``. Routing targets for agents hosted elsewhere are picked
+from ``Agent`` rows (``select_agent``).
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Union
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.kafka.event_schemas import AgentSignalEvent, KafkaTopics
+from app.models import Agent, AgentStatus, Project
+
+if TYPE_CHECKING:
+    from app.core.agent.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(project_id: UUID | str, workers: int) -> int:
+    """Stable worker index for a project (same in every process)."""
+    digest = hashlib.sha1(str(project_id).encode()).digest()
+    return int.from_bytes(digest[:8], "big") % workers
+
+
+def is_sharded() -> bool:
+    """Whether agents run in separate worker processes."""
+    return settings.AGENT_WORKERS > 0
+
+
+def hosts_agents() -> bool:
+    """Whether this process runs agent pools (API process in-process mode, or a worker)."""
+    return not is_sharded() or settings.AGENT_WORKER_INDEX is not None
+
+
+def owns_project(project_id: UUID | str) -> bool:
+    """Whether this process hosts the agents of a project."""
+    if not is_sharded():
+        return True
+    if settings.AGENT_WORKER_INDEX is None:
+        return False
+    return shard_of(project_id, settings.AGENT_WORKERS) == settings.AGENT_WORKER_INDEX
+
+
+def owned_project_ids(session: Session) -> Optional[List[UUID]]:
+    """Projects hosted by this worker, or None when not sharded (all projects)."""
+    if not is_sharded():
+        return None
+    project_ids = session.exec(select(Project.id)).all()
+    return [project_id for project_id in project_ids if owns_project(project_id)]
+
+
+async def signal_agent(agent_id: UUID, story_id: str, signal: str, project_id: UUID | str | None = None) -> bool:
+    """Deliver a cancel/pause signal to an agent wherever it is hosted.
+
+    Agents in a local pool are signalled directly; otherwise, in sharded
+    mode, the signal is published to the owning worker.
+
+    Returns:
+        True if the signal was delivered or forwarded
+    """
+    from app.api.routes.agent_management import find_pool_for_agent
+
+    pool = find_pool_for_agent(agent_id)
+    if pool:
+        return pool.signal_agent(agent_id, story_id, signal)
+
+    if not is_sharded():
+        return False
+
+    from app.kafka.producer import get_kafka_producer
+
+    producer = await get_kafka_producer()
+    await producer.publish(
+        topic=KafkaTopics.AGENT_TASKS,
+        event=AgentSignalEvent(
+            agent_id=agent_id,
+            story_id=story_id,
+            signal=signal,
+            project_id=str(project_id) if project_id else None,
+        ),
+    )
+    logger.info(f"[SHARD] Forwarded '{signal}' for story {story_id} to agent {agent_id}")
+    return True
+
+
+@dataclass
+class RemoteAgent:
+    """Routing target hosted by another process (from its ``Agent`` row)."""
+
+    agent_id: UUID
+    name: str
+    state: AgentStatus
+
+
+def select_agent(project_id: UUID, role_type: str) -> Optional[Union["BaseAgent", RemoteAgent]]:
+    """Pick a routing target for a role wherever its agents are hosted.
+
+    Agents in this process come from the in-memory directory (least-loaded).
+    The API process of a sharded runtime hosts none, so it falls back to the
+    ``Agent`` rows written by the workers, preferring idle agents.
+    """
+    from app.core.agent.agent_directory import UNAVAILABLE_STATES, agent_directory
+    from app.core.db import engine
+
+    selected = agent_directory.select(project_id, role_type)
+    if selected is not None or hosts_agents():
+        return selected
+
+    with Session(engine) as session:
+        agents = session.exec(
+            select(Agent).where(
+                Agent.project_id == project_id,
+                Agent.role_type == role_type,
+                Agent.status.not_in(UNAVAILABLE_STATES),
+            )
+        ).all()
+    if not agents:
+        return None
+    agent = next((a for a in agents if a.status == AgentStatus.idle), agents[0])
+    return RemoteAgent(agent_id=agent.id, name=agent.human_name, state=agent.status)
@@ -0,0 +1,150 @@
+"""
+Sharded runtime throughput benchmark.
+
+Replays the same synthetic task mix through 1, 2 and 4 worker processes,
+sharding tasks by ``project_id`` exactly like ``app.core.agent.worker``.
+Each task does the agent-side CPU work that competes with the event loop
+(event validation, state JSON encoding, ``analyze_error_type`` on a build
+log) around a simulated LLM wait, with a fixed number of concurrent tasks
+per worker.
+
+Usage::
+
+    python -m app.core.agent.sharding_benchmark
+    python -m app.core.agent.sharding_benchmark --tasks 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+from uuid import uuid4
+
+from app.core.agent.sharding import shard_of
+
+BUILD_LOG = "\n".join(
+    [
+        "src/app/page.tsx(12,7): error TS2304: Cannot find name 'useStore'.",
+        "./src/components/cart/CartItem.tsx:41:15",
+        "Type error: Property 'price' does not exist on type 'Product'.",
+        "Module not found: Can't resolve '@/lib/utils' in 'src/components'",
+        "   at Object.<anonymous> (src/lib/api.ts:3:1)",
+    ]
+    * 40
+)
+
+
+@dataclass
+class BenchmarkResult:
+    workers: int
+    tasks: int
+    seconds: float
+    largest_shard: int
+    smallest_shard: int
+
+    @property
+    def tasks_per_second(self) -> float:
+        return self.tasks / self.seconds if self.seconds else 0.0
+
+
+def make_tasks(count: int, projects: int, seed: int = 7) -> List[Dict[str, str]]:
+    """Synthetic router task payloads spread over ``projects`` projects."""
+    rng = random.Random(seed)
+    project_ids = [str(uuid4()) for _ in range(projects)]
+    tasks = []
+    for _ in range(count):
+        project_id = rng.choice(project_ids)
+        tasks.append({
+            "project_id": project_id,
+            "payload": json.dumps({
+                "event_type": "router.task.dispatched",
+                "project_id": project_id,
+                "agent_id": str(uuid4()),
+                "task_type": "implement_story",
+                "source_event_type": "story.status.changed",
+                "source_event_id": str(uuid4()),
+                "routing_reason": "benchmark",
+                "context": {"story_id": str(uuid4()), "content": "x" * 2000},
+            }),
+        })
+    return tasks
+
+
+async def _run_shard(tasks: List[Dict[str, str]], concurrency: int, llm_ms: float) -> None:
+    from app.agents.developer.src.utils.story_logger import analyze_error_type
+    from app.kafka.event_schemas import RouterTaskEvent
+
+    semaphore = asyncio.Semaphore(concurrency)
+    state = {"files": {f"src/file_{i}.tsx": "export const x = 1;\n" * 40 for i in range(50)}}
+
+    async def handle(task: Dict[str, str]) -> None:
+        async with semaphore:
+            event = RouterTaskEvent.model_validate_json(task["payload"])
+            await asyncio.sleep(llm_ms / 1000)
+            json.dumps({**state, "task": event.model_dump(mode="json")})
+            analyze_error_type(BUILD_LOG)
+
+    await asyncio.gather(*(handle(task) for task in tasks))
+
+
+def _worker(tasks, concurrency, llm_ms, barrier, results) -> None:
+    # Warm imports before the timed section
+    from app.agents.developer.src.utils.story_logger import analyze_error_type  # noqa: F401
+
+    barrier.wait()
+    started = time.perf_counter()
+    asyncio.run(_run_shard(tasks, concurrency, llm_ms))
+    results.put(time.perf_counter() - started)
+
+
+def run(tasks: List[Dict[str, str]], workers: int, concurrency: int = 8, llm_ms: float = 20) -> BenchmarkResult:
+    """Run all tasks through ``workers`` processes sharded by project."""
+    shards: List[List[Dict[str, str]]] = [[] for _ in range(workers)]
+    for task in tasks:
+        shards[shard_of(task["project_id"], workers)].append(task)
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(shard, concurrency, llm_ms, barrier, results))
+        for shard in shards
+    ]
+    for process in processes:
+        process.start()
+    elapsed = max(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+
+    sizes = [len(shard) for shard in shards]
+    return BenchmarkResult(workers, len(tasks), elapsed, max(sizes), min(sizes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare agent throughput across worker counts")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent tasks per worker")
+    parser.add_argument("--llm-ms", type=float, default=20, help="Simulated LLM wait per task")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks, args.projects)
+    print(f"cpus={multiprocessing.cpu_count()} tasks={args.tasks} projects={args.projects}")  # noqa: T201
+    baseline = None
+    for workers in args.workers:
+        result = run(tasks, workers, args.concurrency, args.llm_ms)
+        baseline = baseline or result.tasks_per_second
+        print(  # noqa: T201
+            f"workers={workers}: {result.tasks_per_second:.0f} tasks/s "
+            f"({result.tasks_per_second / baseline:.2f}x) in {result.seconds:.2f}s, "
+            f"shard sizes {result.smallest_shard}-{result.largest_shard}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Streaming structured output.
+
+``with_structured_output(...).ainvoke()`` returns only after the whole tool
+call has arrived. ``astream_structured`` streams the same bound model instead,
+decodes the tool-call arguments incrementally (top-level string fields are
+reported as they grow, every field when it completes) and finally runs the
+same output parser on the aggregated message, so the result is identical to
+``ainvoke``.
+"""
+
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps
+from langchain_core.messages import BaseMessage, message_chunk_to_message
+from langchain_core.messages.ai import add_ai_message_chunks
+from langchain_core.outputs import ChatGeneration
+from langchain_core.runnables import Runnable, RunnableSequence
+
+logger = logging.getLogger(__name__)
+
+OnDelta = Callable[[str, str], Awaitable[None]]
+OnComplete = Callable[[str, Any], Awaitable[None]]
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Scanner states
+_KEY, _IN_KEY, _COLON, _VALUE, _IN_STRING, _IN_OTHER, _AFTER, _DONE = range(8)
+
+
+class ToolArgsScanner:
+    """Incremental decoder for a streamed JSON object of tool arguments.
+
+    Linear in the input: each character is looked at once, so 16k-token
+    arguments cost the same as a single ``json.loads``.
+    """
+
+    def __init__(self):
+        self.state = _KEY
+        self.values: Dict[str, Any] = {}
+        self._key: List[str] = []
+        self._current: Optional[str] = None
+        self._string: List[str] = []
+        self._other: List[str] = []
+        self._escape: Optional[str] = None  # Pending escape sequence after a backslash
+        self._high_surrogate: Optional[int] = None
+        self._depth = 0
+        self._other_in_string = False
+        self._other_escape = False
+
+    def feed(self, text: str) -> List[Tuple[str, str, Any]]:
+        """Consume more argument text; returns ("delta", key, text) / ("complete", key, value) events."""
+        events: List[Tuple[str, str, Any]] = []
+        delta: List[str] = []
+
+        def flush_delta() -> None:
+            if delta and self._current is not None:
+                chunk = "".join(delta)
+                self._string.append(chunk)
+                events.append(("delta", self._current, chunk))
+                delta.clear()
+
+        for ch in text:
+            state = self.state
+            if state == _IN_STRING:
+                if self._escape is not None:
+                    self._escape += ch
+                    decoded = self._decode_escape()
+                    if decoded is not None:
+                        delta.append(decoded)
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    flush_delta()
+                    self._complete("".join(self._string), events)
+                else:
+                    delta.append(ch)
+            elif state == _IN_OTHER:
+                if self._other_in_string:
+                    self._other_in_string = not (ch == '"' and not self._other_escape)
+                    self._other_escape = ch == "\\" and not self._other_escape
+                    self._other.append(ch)
+                elif ch in "{[":
+                    self._depth += 1
+                    self._other.append(ch)
+                elif ch in "}]" and self._depth > 0:
+                    self._depth -= 1
+                    self._other.append(ch)
+                elif self._depth == 0 and ch in ",}":
+                    self._complete(json.loads("".join(self._other)), events)
+                    self.state = _KEY if ch == "," else _DONE
+                else:
+                    self._other_in_string = ch == '"'
+                    self._other.append(ch)
+            elif state == _IN_KEY:
+                if ch == '"':
+                    self._current = "".join(self._key)
+                    self.state = _COLON
+                else:
+                    self._key.append(ch)
+            elif ch.isspace():
+                continue
+            elif state == _KEY:
+                if ch == '"':
+                    self._key = []
+                    self.state = _IN_KEY
+                elif ch == "}":
+                    self.state = _DONE
+            elif state == _COLON:
+                if ch == ":":
+                    self.state = _VALUE
+            elif state == _VALUE:
+                if ch == '"':
+                    self._string, self._escape, self._high_surrogate = [], None, None
+                    self.state = _IN_STRING
+                else:
+                    self._other, self._depth, self._other_in_string, self._other_escape = [ch], 0, False, False
+                    self._depth = 1 if ch in "{[" else 0
+                    self.state = _IN_OTHER
+            elif state == _AFTER:
+                if ch == ",":
+                    self.state = _KEY
+                elif ch == "}":
+                    self.state = _DONE
+        flush_delta()
+        return events
+
+    def _complete(self, value: Any, events: List[Tuple[str, str, Any]]) -> None:
+        self.values[self._current] = value
+        events.append(("complete", self._current, value))
+        self.state = _AFTER
+
+    def _decode_escape(self) -> Optional[str]:
+        seq = self._escape
+        if seq[0] != "u":
+            self._escape = None
+            return _ESCAPES.get(seq, seq)
+        if len(seq) < 5:
+            return None
+        self._escape = None
+        code = int(seq[1:], 16)
+        if 0xD800 <= code <= 0xDBFF:
+            self._high_surrogate = code
+            return None
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        return chr(code)
+
+    @property
+    def done(self) -> bool:
+        return self.state == _DONE
+
+
+async def astream_structured(
+    structured_llm: Runnable,
+    messages: List[BaseMessage],
+    config: Optional[dict] = None,
+    on_delta: Optional[OnDelta] = None,
+    on_complete: Optional[OnComplete] = None,
+) -> Any:
+    """Run a ``with_structured_output`` runnable by streaming its model.
+
+    Args:
+        structured_llm: Result of ``llm.with_structured_output(schema)``
+        messages: Prompt messages
+        config: Runnable config (callbacks, run name, ...)
+        on_delta: Awaited with (field, new_text) as a string field grows
+        on_complete: Awaited with (field, value) as soon as a field is complete
+
+    Returns:
+        The parsed output, exactly as ``structured_llm.ainvoke`` would return it.
+        Runnables that are not model | parser sequences fall back to ``ainvoke``.
+    """
+    if not isinstance(structured_llm, RunnableSequence) or len(structured_llm.steps) != 2:
+        return await structured_llm.ainvoke(messages, config=config)
+
+    model, parser = structured_llm.first, structured_llm.last
+    scanner = ToolArgsScanner()
+
+    async def feed(args: str) -> None:
+        for kind, field, value in scanner.feed(args):
+            try:
+                if kind == "delta" and on_delta:
+                    await on_delta(field, value)
+                elif kind == "complete" and on_complete:
+                    await on_complete(field, value)
+            except Exception as e:
+                logger.debug(f"[astream_structured] {kind} callback for '{field}' failed: {e}")
+
+    # astream() skips the model's response cache; look it up (and fill it) here
+    cache_key = _response_cache_key(model, messages)
+    if cache_key is not None:
+        cache, prompt, llm_string = cache_key
+        cached = await cache.alookup(prompt, llm_string)
+        if cached:
+            message = cached[0].message
+            if message.tool_calls:
+                await feed(json.dumps(message.tool_calls[0]["args"]))
+            return await parser.ainvoke(message)
+
+    tool_index = None
+    chunks = []
+    async for chunk in model.astream(messages, config=config):
+        chunks.append(chunk)
+        for tool_chunk in chunk.tool_call_chunks:
+            if tool_index is None:
+                tool_index = tool_chunk.get("index")
+            if tool_chunk.get("index") == tool_index and tool_chunk.get("args") and not scanner.done:
+                await feed(tool_chunk["args"])
+
+    if not chunks:
+        raise ValueError("LLM stream returned no output")
+    # Merged once: `full + chunk` per chunk re-parses the partial tool args each time (quadratic)
+    full = add_ai_message_chunks(chunks[0], *chunks[1:])
+    if cache_key is not None:
+        await cache.aupdate(prompt, llm_string, [ChatGeneration(message=message_chunk_to_message(full))])
+    return await parser.ainvoke(full)
+
+
+def _response_cache_key(model: Runnable, messages: List[BaseMessage]) -> Optional[Tuple[BaseCache, str, str]]:
+    """(cache, prompt, llm_string) as BaseChatModel.agenerate would use them, if the model has a cache."""
+    llm = getattr(model, "bound", model)
+    cache = getattr(llm, "cache", None)
+    if not isinstance(cache, BaseCache):
+        return None
+    kwargs = {k: v for k, v in getattr(model, "kwargs", {}).items() if k != "ls_structured_output_format"}
+    normalized = [m.model_copy(update={"id": None}) if getattr(m, "id", None) is not None else m for m in messages]
+    return cache, dumps(normalized), llm._get_llm_string(**kwargs)
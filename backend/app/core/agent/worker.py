@@ -0,0 +1,176 @@
+"""
+Agent Worker Process
+
+Hosts the agent pools for one shard of projects when ``AGENT_WORKERS > 0``
+(see ``app.core.agent.sharding``). Each worker restores the agents of the
+projects it owns, runs the agent monitor (health, hibernation, autoscaling,
+drain handoffs) and periodically reconciles with the database: agents created by the API
+process are spawned here, agents stopped or deleted there are terminated.
+
+Usage::
+
+    # One shard per process (e.g. under a process supervisor)
+    AGENT_WORKERS=4 AGENT_WORKER_INDEX=0 python -m app.core.agent.worker
+
+    # Launch all shards as child processes
+    python -m app.core.agent.worker --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, List, Tuple, Type
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.agent.sharding import owned_project_ids
+from app.models import Agent, AgentStatus
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_agents() -> Dict[str, int]:
+    """Align this worker's pools with the ``Agent`` rows of its projects.
+
+    Returns:
+        Counts of agents ``spawned`` and ``terminated``
+    """
+    from app.api.routes.agent_management import _manager_registry, ensure_role_class_map, get_available_pool
+
+    with Session(engine) as db_session:
+        owned = owned_project_ids(db_session)
+        query = select(Agent.id, Agent.role_type, Agent.status)
+        if owned is not None:
+            query = query.where(Agent.project_id.in_(owned))
+        rows = {agent_id: (role_type, status) for agent_id, role_type, status in db_session.exec(query).all()}
+
+    hosted = {
+        agent_id: manager
+        for manager in _manager_registry.values()
+        for agent_id in list(manager.agents) + list(manager.hibernated)
+    }
+
+    # Terminate agents stopped or deleted elsewhere
+    terminated = 0
+    for agent_id, manager in hosted.items():
+        row = rows.get(agent_id)
+        if row is None or row[1] in (AgentStatus.stopped, AgentStatus.terminated):
+            if await manager.terminate_agent(agent_id, graceful=True):
+                terminated += 1
+
+    # Spawn idle agents not hosted yet (new projects, bulk spawn from the API)
+    role_class_map = ensure_role_class_map()
+    batches: Dict[str, Tuple[object, List[Tuple[UUID, Type]]]] = {}
+    for agent_id, (role_type, status) in rows.items():
+        if status != AgentStatus.idle or agent_id in hosted:
+            continue
+        role_class = role_class_map.get(role_type)
+        manager = get_available_pool(role_type=role_type)
+        if role_class and manager:
+            batches.setdefault(manager.pool_name, (manager, []))[1].append((agent_id, role_class))
+
+    spawned = 0
+    for manager, batch in batches.values():
+        result = await manager.spawn_many(batch, heartbeat_interval=30, max_idle_time=300)
+        spawned += len(result["spawned"])
+
+    if spawned or terminated:
+        logger.info(f"[WORKER {settings.AGENT_WORKER_INDEX}] Reconciled agents: +{spawned} -{terminated}")
+    return {"spawned": spawned, "terminated": terminated}
+
+
+async def run_worker() -> None:
+    """Run one agent worker until SIGINT/SIGTERM."""
+    from app.api.routes.agent_management import _manager_registry, initialize_default_pools
+    from app.core.agent import get_agent_monitor
+    from app.core.agent.drain import drain_all_pools, resume_handoffs
+    from app.core.agent.llm_factory import reset_llm_clients
+    from app.kafka import shutdown_kafka_producer
+    from app.websocket.kanban_projection import kanban_projection
+
+    index = settings.AGENT_WORKER_INDEX
+    logger.info(f"[WORKER {index}] Starting agent worker {index + 1}/{settings.AGENT_WORKERS}")
+
+    # Boards live in the API process: forward this worker's story writes to it
+    kanban_projection.track_story_writes(forward=True)
+    await initialize_default_pools()
+    await resume_handoffs()
+    monitor = get_agent_monitor()
+    await monitor.start(monitor_interval=30)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.AGENT_WORKER_RECONCILE_INTERVAL)
+        except asyncio.TimeoutError:
+            try:
+                await reconcile_agents()
+            except Exception as e:
+                logger.error(f"[WORKER {index}] Reconcile failed: {e}", exc_info=True)
+
+    logger.info(f"[WORKER {index}] Stopping agent worker...")
+    await monitor.stop()
+    if settings.AGENT_DRAIN_ON_SHUTDOWN:
+        await drain_all_pools()
+    for pool_name, manager in list(_manager_registry.items()):
+        try:
+            await manager.stop(graceful=True)
+        except (Exception, asyncio.CancelledError) as e:
+            logger.error(f"[WORKER {index}] Error stopping pool '{pool_name}': {e}")
+    _manager_registry.clear()
+    await shutdown_kafka_producer()
+    await reset_llm_clients()
+
+
+def _launch_all(workers: int) -> int:
+    """Start one child process per shard and wait for them."""
+    children = []
+    for index in range(workers):
+        env = {**os.environ, "AGENT_WORKERS": str(workers), "AGENT_WORKER_INDEX": str(index)}
+        children.append(subprocess.Popen([sys.executable, "-m", "app.core.agent.worker"], env=env))
+
+    try:
+        return max(child.wait() for child in children)
+    except KeyboardInterrupt:
+        for child in children:
+            child.send_signal(signal.SIGTERM)
+        return max(child.wait() for child in children)
+
+
+def main() -> None:
+    from app.core.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Run sharded agent worker process(es)")
+    parser.add_argument("--workers", type=int, default=settings.AGENT_WORKERS, help="Total shards")
+    parser.add_argument("--index", type=int, default=settings.AGENT_WORKER_INDEX, help="Shard to host")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("set --workers or AGENT_WORKERS to at least 1")
+    if args.index is None:
+        sys.exit(_launch_all(args.workers))
+    if not 0 <= args.index < args.workers:
+        parser.error(f"--index must be in [0, {args.workers})")
+
+    settings.AGENT_WORKERS = args.workers
+    settings.AGENT_WORKER_INDEX = args.index
+    setup_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
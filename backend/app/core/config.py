@@ -142,6 +142,28 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     ANTHROPIC_API_BASE: str = "https://api.anthropic.com"
 
+    # Shared keep-alive HTTP client for all LLM clients in the process
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection is kept open
+
+    # Process-wide LLM rate limiter per model tier (token buckets + AIMD concurrency window)
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_RATE_LIMIT_SHARED: bool = False          # Coordinate per-minute budgets and 429 backoff via Redis
+    LLM_RATE_LIMIT_MIN_CONCURRENCY: int = 1      # AIMD never shrinks the window below this
+    LLM_RATE_LIMITS: dict = Field(default_factory=lambda: {
+        "fast": {"rpm": 4000, "tpm": 2_000_000, "max_concurrency": 32},
+        "medium": {"rpm": 2000, "tpm": 800_000, "max_concurrency": 24},
+        "complex": {"rpm": 1000, "tpm": 400_000, "max_concurrency": 8},
+        "default": {"rpm": 1000, "tpm": 400_000, "max_concurrency": 16},
+    })
+
+    # LLM response cache for steps with a cache_ttl in STEP_CONFIG (opt-in)
+    LLM_RESPONSE_CACHE_ENABLED: bool = False
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 1000                     # In-memory LRU size per process
+    LLM_RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "disk"] = "memory"  # Shared tier behind the LRU
+    LLM_RESPONSE_CACHE_DIR: str = ".llm_cache"                     # Used by the disk backend
+
     SENTRY_DSN: HttpUrl | None = None
 
     REDIS_HOST: str = "localhost"
@@ -181,6 +203,7 @@ class Settings(BaseSettings):
     AGENT_POOL_AUTO_SCALE_ENABLED: bool = True
     AGENT_POOL_AUTO_SCALE_THRESHOLD: float = 0.8
     AGENT_POOL_USE_ROLE_SPECIFIC: bool = True
+    AGENT_POOL_SPAWN_CONCURRENCY: int = 10  # Max agents started in parallel by spawn_many
     AGENT_POOL_ROLE_CONFIGS: dict = Field(default_factory=lambda: {
         "team_leader": {"max_agents": 20, "priority": 1},
         "developer": {"max_agents": 50, "priority": 2},
@@ -188,6 +211,68 @@ class Settings(BaseSettings):
         "business_analyst": {"max_agents": 20, "priority": 1},
     })
 
+    # AGENT AUTOSCALER (per project role; uses AGENT_POOL_AUTO_SCALE_ENABLED)
+    AGENT_AUTOSCALE_ROLES: list[str] = ["developer", "tester"]
+    AGENT_AUTOSCALE_MAX_AGENTS_PER_ROLE: int = 3
+    AGENT_AUTOSCALE_LLM_CONCURRENCY_LIMIT: int = 20  # No scale-up above this many in-flight LLM calls
+
+    # AGENT TASK CONCURRENCY (per agent instance)
+    AGENT_MAX_CONCURRENT_CHAT_TASKS: int = 1   # Chat messages / collaboration requests
+    AGENT_MAX_CONCURRENT_STORY_TASKS: int = 1  # Story work (implement, test, analyze, ...)
+
+    # SHARDED AGENT RUNTIME (0 = agents run in the API process)
+    AGENT_WORKERS: int = 0                        # Worker processes; agents sharded by project_id hash
+    AGENT_WORKER_INDEX: int | None = None         # Set in each `python -m app.core.agent.worker` process
+    AGENT_WORKER_RECONCILE_INTERVAL: int = 15     # Seconds between worker checks for new/removed agents
+
+    # AGENT HIBERNATION (idle agents past max_idle_time drop to a stub, woken on dispatch)
+    AGENT_HIBERNATION_ENABLED: bool = True
+
+    # AGENT DRAIN (on shutdown, in-flight stories pause at a node boundary and resume on the next process)
+    AGENT_DRAIN_ON_SHUTDOWN: bool = True
+    AGENT_DRAIN_TIMEOUT_SECONDS: int = 60          # Wait for running graphs to reach a node boundary
+    AGENT_DRAIN_HANDOFF_TTL_SECONDS: int = 86400   # Unclaimed handoffs expire (story stays PAUSED)
+
+    # STREAMED IMPLEMENT OUTPUT (partial file content pushed to the story room as it is generated)
+    AGENT_STREAM_IMPLEMENT_OUTPUT: bool = True
+    AGENT_STREAM_FLUSH_INTERVAL: float = 0.25      # Seconds; at most one story_stream frame per room
+
+    # WORKTREE POOL (spare worktrees per project, at main HEAD with dependencies installed; 0 = off)
+    WORKTREE_POOL_SIZE: int = 2
+
+    # NODE_MODULES SNAPSHOT CACHE (node_modules per pnpm-lock.yaml hash, shared by all worktrees)
+    NODE_MODULES_CACHE_ENABLED: bool = True
+    NODE_MODULES_CACHE_DIR: str = ".node_modules_cache"
+    NODE_MODULES_CACHE_MAX_GB: float = 20                # LRU eviction above this
+
+    # VALIDATION CACHE (run_code format/lint/typecheck/build results per source tree hash)
+    VALIDATION_CACHE_ENABLED: bool = True
+    VALIDATION_CACHE_MAX_ENTRIES: int = 256
+
+    # STORY DATABASES ("shared": per-story databases cloned from a schema template on one server,
+    # "container": a Postgres container per story; also the fallback if the shared server fails)
+    STORY_DB_MODE: Literal["shared", "container"] = "shared"
+    STORY_DB_SERVER_URL: str = ""  # Admin URL of the shared server; empty = container "vibesdlc-story-db", kept across restarts
+
+    # AGENT PROCESS RUNNER (async pnpm/jest/eslint/prisma commands from agent nodes)
+    AGENT_PROCESS_MAX_PER_NODE: int = 4  # Concurrent commands per node name; the rest wait for a slot
+
+    # TESTER JEST WORKER (warm jest process per workspace; re-runs only tests affected by changes)
+    TESTER_JEST_WORKER_ENABLED: bool = True
+    TESTER_JEST_MAX_WORKERS: int = 0               # Jest workers per run; 0 = CPU cores - 1
+    TESTER_JEST_WORKER_IDLE_SECONDS: int = 600     # Worker exits after this long without a run
+
+    # LINT DAEMON (warm prettier/ESLint/tsc process per workspace for run_code and auto-fix)
+    LINT_DAEMON_ENABLED: bool = True
+    LINT_DAEMON_MAX_LIVE: int = 8                  # Live daemons in this process; least recently used stops first
+    LINT_DAEMON_IDLE_SECONDS: int = 600            # Daemon exits after this long without a request
+
+    # WORKSPACE INDEX (in-memory file tree/components/routes per worktree, shared by Developer and Tester planning)
+    WORKSPACE_INDEX_MAX_ENTRIES: int = 32          # Indexed worktrees kept; least recently used dropped first
+
+    # CODE SEARCH (grep_files/glob_files agent tools; the walk prunes excluded and .gitignored dirs)
+    CODE_SEARCH_RIPGREP: bool = True               # Use ripgrep to find candidate files when it is on PATH
+
     # AGENT HEALTH CHECK SETTINGS
     AGENT_HEALTH_MAX_CONSECUTIVE_FAILURES: int = 20     # Terminate after 20 consecutive failures
     AGENT_HEALTH_STALE_BUSY_TIMEOUT_SECONDS: int = 1800 # 30 min busy without activity = stale
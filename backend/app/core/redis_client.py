@@ -97,6 +97,28 @@ class RedisClient:
         except Exception:
             return False
     
+    def scan_keys(self, pattern: str) -> list[str]:
+        if not self.is_connected():
+            if not self.connect():
+                return []
+        try:
+            return list(self._client.scan_iter(match=pattern))
+        except Exception:
+            return []
+
+    def incr_window(self, key: str, amount: int, ttl: int) -> Optional[int]:
+        """INCRBY a counter and set its expiry; None if Redis is unavailable."""
+        if not self.is_connected():
+            if not self.connect():
+                return None
+        try:
+            pipe = self._client.pipeline()
+            pipe.incrby(key, amount)
+            pipe.expire(key, ttl)
+            return pipe.execute()[0]
+        except Exception:
+            return None
+
     def ttl(self, key: str) -> int:
         if not self.is_connected():
             if not self.connect():
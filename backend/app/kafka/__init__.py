@@ -12,6 +12,7 @@ from app.kafka.consumer_registry import (
 )
 from app.kafka.event_schemas import (
     AgentEvent,
+    AgentSignalEvent,
     AgentTaskEvent,
     AgentTaskStatus,
     AgentTaskType,
@@ -66,6 +67,7 @@ __all__ = [
     "ConversationOwnershipChangedEvent",
     "ConversationOwnershipReleasedEvent",
     "RouterTaskEvent",
+    "AgentSignalEvent",
     # Agent Task Events (Unified)
     "AgentTaskType",
     "AgentTaskStatus",
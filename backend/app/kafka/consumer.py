@@ -316,6 +316,7 @@ class BaseKafkaConsumer(ABC):
 
         if self.consumer:
             self.consumer.close()
+            self.consumer = None  # close() is not idempotent (drained agents are stopped again)
             logger.info(f"Kafka consumer stopped for topics {self.topics}")
 
     async def commit(self):
@@ -341,6 +341,16 @@ class RouterTaskEvent(BaseKafkaEvent):
     routing_reason: str
     priority: str = "medium"
     context: Dict[str, Any] = Field(default_factory=dict)
+    reserved: bool = False  # Holds an AgentDirectory dispatch slot, released when the agent receives it
+
+
+class AgentSignalEvent(BaseKafkaEvent):
+    """Cancel/pause signal for an agent hosted in another process (sharded runtime)."""
+
+    event_type: str = "agent.signal"
+    agent_id: UUID
+    story_id: str
+    signal: str  # 'cancel' | 'pause'
 
 
 class AgentEventType:
@@ -431,6 +441,7 @@ EVENT_TYPE_TO_SCHEMA = {
     "agent.task.failed": AgentTaskEvent,
     "agent.task.cancelled": AgentTaskEvent,
     "router.task.dispatched": RouterTaskEvent,
+    "agent.signal": AgentSignalEvent,
 }
 
 
@@ -38,13 +38,16 @@ async def cleanup_stale_story_states():
     
     When backend restarts, any stories in PENDING/PROCESSING state
     are stale (no agent is actually processing them). Reset to null
-    and clear checkpoints.
+    and clear checkpoints. Stories handed off by a drained agent keep
+    their state and checkpoint; they are resumed once agents start.
     """
     from sqlmodel import Session
     from sqlalchemy import text
+    from app.core.agent.drain import handed_off_story_ids
 
     
     try:
+        handed_off = handed_off_story_ids()
         with Session(engine) as session:
             # Find stories with stale states (any non-finished state)
             stale_stories = session.exec(
@@ -54,7 +57,10 @@ async def cleanup_stale_story_states():
                     WHERE agent_state IN ('PENDING', 'PROCESSING', 'PAUSED', 'CANCEL_REQUESTED')
                 """)
             ).all()
+            stale_stories = [s for s in stale_stories if str(s[0]) not in handed_off]
             
+            if handed_off:
+                logger.info(f"Keeping {len(handed_off)} handed-off stories for resume")
             if not stale_stories:
                 logger.info("✓ No stale story states to cleanup")
                 return
@@ -71,17 +77,18 @@ async def cleanup_stale_story_states():
                     SET agent_state = NULL,
                         checkpoint_thread_id = NULL,
                         assigned_agent_id = NULL
-                    WHERE agent_state IN ('PENDING', 'PROCESSING', 'PAUSED', 'CANCEL_REQUESTED')
-                """)
+                    WHERE CAST(id AS TEXT) = ANY(:story_ids)
+                """),
+                params={"story_ids": story_ids},
             )
             
             # Clear checkpoint data for these stories
             if checkpoint_ids:
                 for tid in checkpoint_ids:
                     try:
-                        session.exec(text("DELETE FROM checkpoint_writes WHERE thread_id = :tid"), {"tid": tid})
-                        session.exec(text("DELETE FROM checkpoint_blobs WHERE thread_id = :tid"), {"tid": tid})
-                        session.exec(text("DELETE FROM checkpoints WHERE thread_id = :tid"), {"tid": tid})
+                        session.exec(text("DELETE FROM checkpoint_writes WHERE thread_id = :tid"), params={"tid": tid})
+                        session.exec(text("DELETE FROM checkpoint_blobs WHERE thread_id = :tid"), params={"tid": tid})
+                        session.exec(text("DELETE FROM checkpoints WHERE thread_id = :tid"), params={"tid": tid})
                     except Exception as e:
                         logger.warning(f"Failed to delete checkpoint {tid}: {e}")
             
@@ -121,10 +128,22 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️ Failed to start Kafka consumers: {e}")
 
     from app.api.routes.agent_management import initialize_default_pools
-    try:
-        await initialize_default_pools()
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to initialize agent pools: {e}")
+    from app.core.agent.sharding import hosts_agents
+    if hosts_agents():
+        try:
+            await initialize_default_pools()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to initialize agent pools: {e}")
+
+        from app.core.agent.drain import resume_handoffs
+        try:
+            resumed = await resume_handoffs()
+            if resumed:
+                logger.info(f"✓ Resumed {resumed} tasks handed off by drained agents")
+        except Exception as e:
+            logger.warning(f"Failed to resume handed-off tasks: {e}")
+    else:
+        logger.info(f"Agents hosted by {settings.AGENT_WORKERS} agent worker processes (python -m app.core.agent.worker)")
 
     from app.core.agent import get_agent_monitor
     try:
@@ -139,6 +158,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to start activity buffer: {e}")
 
+    from app.websocket.presence import presence_registry
+    try:
+        await presence_registry.start()
+    except Exception as e:
+        logger.warning(f"Failed to start presence registry: {e}")
+
+    # Patch Kanban boards on every committed story write
+    from app.websocket.kanban_projection import kanban_projection
+    kanban_projection.track_story_writes()
+
     from app.websocket.kafka_bridge import websocket_kafka_bridge
     try:
         await websocket_kafka_bridge.start()
@@ -158,12 +187,24 @@ async def lifespan(app: FastAPI):
         except (Exception, asyncio.CancelledError) as e:
             logger.error(f"Error stopping activity buffer: {e}")
 
+        try:
+            await presence_registry.stop()
+        except (Exception, asyncio.CancelledError) as e:
+            logger.error(f"Error stopping presence registry: {e}")
+
         try:
             monitor = get_agent_monitor()
             await monitor.stop()
         except (Exception, asyncio.CancelledError) as e:
             logger.error(f"Error shutting down monitoring system: {e}")
 
+        if settings.AGENT_DRAIN_ON_SHUTDOWN:
+            from app.core.agent.drain import drain_all_pools
+            try:
+                await drain_all_pools()
+            except (Exception, asyncio.CancelledError) as e:
+                logger.error(f"Error draining agent pools: {e}")
+
         from app.api.routes.agent_management import _manager_registry
         try:
             for pool_name, manager in list(_manager_registry.items()):
@@ -184,6 +225,12 @@ async def lifespan(app: FastAPI):
             await stop_router_service()
         except (Exception, asyncio.CancelledError) as e:
             logger.error(f"Error shutting down Message Router: {e}")
+
+        from app.core.agent.llm_factory import reset_llm_clients
+        try:
+            await reset_llm_clients()
+        except (Exception, asyncio.CancelledError) as e:
+            logger.error(f"Error closing LLM clients: {e}")
     
     except (KeyboardInterrupt, asyncio.CancelledError):
         pass
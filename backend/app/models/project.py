@@ -120,4 +120,9 @@ class ProjectPreference(BaseModel, table=True):
     # All preferences stored as flexible JSONB
     preferences: dict = Field(default_factory=dict, sa_column=Column(JSON))
 
+    # Rolling conversation summary (ProjectContext) and the created_at of the
+    # last message it covers, so a restart only reloads the unsummarized tail
+    conversation_summary: str | None = Field(default=None, sa_column=Column(Text))
+    summary_through: datetime | None = Field(default=None)
+
     project: Project = Relationship(back_populates="preference")
@@ -119,17 +119,20 @@ class PoolService:
             last_stopped_at=datetime.now(timezone.utc)
         )
     
-    def increment_spawn_count(self, pool_id: UUID) -> Optional[AgentPool]:
+    def increment_spawn_count(
+        self, pool_id: UUID, count: int = 1, commit: bool = True
+    ) -> Optional[AgentPool]:
         """Increment total_spawned and current_agent_count."""
         pool = self.session.get(AgentPool, pool_id)
         if not pool:
             return None
         
-        pool.total_spawned += 1
-        pool.current_agent_count += 1
+        pool.total_spawned += count
+        pool.current_agent_count += count
         self.session.add(pool)
-        self.session.commit()
-        self.session.refresh(pool)
+        if commit:
+            self.session.commit()
+            self.session.refresh(pool)
         return pool
     
     def increment_terminate_count(self, pool_id: UUID) -> Optional[AgentPool]:
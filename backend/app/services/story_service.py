@@ -816,29 +816,7 @@ class StoryService:
         for story in stories:
             column = story.status.value
             if column in board:
-                story_data = StoryPublic.model_validate(story)
-                # Add epic info if epic exists
-                if story.epic:
-                    story_data.epic_code = story.epic.epic_code
-                    story_data.epic_title = story.epic.title
-                    story_data.epic_description = story.epic.description
-                    story_data.epic_domain = story.epic.domain
-                
-                # Pre-compute blocked state (skip for Done/Archived columns)
-                is_blocked = False
-                blocked_by_count = 0
-                if column not in ["Done", "Archived"] and story.dependencies:
-                    # Count incomplete dependencies
-                    for dep_id in story.dependencies:
-                        if dep_id and dep_id not in completed_story_ids:
-                            blocked_by_count += 1
-                    is_blocked = blocked_by_count > 0
-                
-                # Add computed fields to response
-                story_dict = story_data.model_dump()
-                story_dict["is_blocked"] = is_blocked
-                story_dict["blocked_by_count"] = blocked_by_count
-                board[column].append(story_dict)
+                board[column].append(self.to_kanban_story(story, completed_story_ids))
 
         # Get WIP limits
         wip_limits = {}
@@ -856,6 +834,65 @@ class StoryService:
             "wip_limits": wip_limits
         }
 
+    def to_kanban_story(self, story: Story, completed_story_ids: set[str]) -> Dict[str, Any]:
+        """Serialize a story for the Kanban board with pre-computed blocked state.
+
+        Args:
+            story: Story with epic loaded
+            completed_story_ids: IDs of Done/Archived stories in the project
+
+        Returns:
+            JSON-ready story dict with is_blocked and blocked_by_count
+        """
+        column = story.status.value
+        story_data = StoryPublic.model_validate(story)
+        # Add epic info if epic exists
+        if story.epic:
+            story_data.epic_code = story.epic.epic_code
+            story_data.epic_title = story.epic.title
+            story_data.epic_description = story.epic.description
+            story_data.epic_domain = story.epic.domain
+
+        # Pre-compute blocked state (skip for Done/Archived columns)
+        is_blocked = False
+        blocked_by_count = 0
+        if column not in ["Done", "Archived"] and story.dependencies:
+            # Count incomplete dependencies
+            for dep_id in story.dependencies:
+                if dep_id and dep_id not in completed_story_ids:
+                    blocked_by_count += 1
+            is_blocked = blocked_by_count > 0
+
+        # Add computed fields to response
+        story_dict = story_data.model_dump(mode="json")
+        story_dict["is_blocked"] = is_blocked
+        story_dict["blocked_by_count"] = blocked_by_count
+        return story_dict
+
+    def get_kanban_story(
+        self,
+        story_id: UUID,
+        completed_story_ids: set[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single Kanban board entry (used for incremental board updates).
+
+        Args:
+            story_id: Story UUID
+            completed_story_ids: IDs of Done/Archived stories in the project
+
+        Returns:
+            Story dict as in get_kanban_board, or None if story not found
+        """
+        from sqlalchemy.orm import selectinload
+
+        statement = select(Story).where(Story.id == story_id).options(
+            selectinload(Story.epic)
+        )
+        story = self.session.exec(statement).first()
+        if not story:
+            return None
+        return self.to_kanban_story(story, completed_story_ids)
+
     def assign(
         self,
         story_id: UUID,
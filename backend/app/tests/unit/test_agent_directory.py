@@ -0,0 +1,113 @@
+"""Unit tests for in-memory least-loaded agent selection"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.agent import agent_directory as directory_module
+from app.core.agent.agent_directory import AgentDirectory
+from app.core.agent.base_agent import BaseAgent
+from app.core.agent.router import publish_reserved_task
+from app.kafka.event_schemas import AgentTaskType, RouterTaskEvent
+from app.models import AgentStatus
+
+
+def make_agent(project_id, role_type="developer", state=AgentStatus.idle, queued=0, latency_ms=None):
+    return SimpleNamespace(
+        agent_id=uuid4(),
+        project_id=project_id,
+        role_type=role_type,
+        name="Agent",
+        state=state,
+        queue_depth=queued,
+        active_task_count=1 if state == AgentStatus.busy else 0,
+        _latency_ewma_ms=latency_ms,
+    )
+
+
+class TestAgentDirectory:
+    def test_selects_least_loaded(self):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        busy = make_agent(project_id, state=AgentStatus.busy)
+        idle = make_agent(project_id)
+        directory.register(busy)
+        directory.register(idle)
+
+        assert directory.select(project_id, "developer") is idle
+
+    def test_queue_depth_beats_stale_idle(self):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        queued = make_agent(project_id, queued=3)
+        busy = make_agent(project_id, state=AgentStatus.busy)
+        directory.register(queued)
+        directory.register(busy)
+
+        assert directory.select(project_id, "developer") is busy
+
+    def test_inflight_dispatch_spreads_load(self):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        first = make_agent(project_id)
+        second = make_agent(project_id)
+        directory.register(first)
+        directory.register(second)
+
+        picked = {directory.select(project_id, "developer").agent_id for _ in range(2)}
+        assert picked == {first.agent_id, second.agent_id}
+
+        directory.acknowledge(first.agent_id)
+        assert directory.get_stats()["inflight_dispatches"] == 1
+
+    def test_skips_unavailable_and_unregistered(self):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        stopped = make_agent(project_id, state=AgentStatus.stopped)
+        other_role = make_agent(project_id, role_type="tester")
+        directory.register(stopped)
+        directory.register(other_role)
+
+        assert directory.select(project_id, "developer") is None
+
+        directory.unregister(other_role)
+        assert directory.select(project_id, "tester") is None
+        assert directory.total_misses == 2
+
+
+class TestReservations:
+    def test_failed_publish_releases_the_slot(self, monkeypatch):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        monkeypatch.setattr(directory_module, "agent_directory", directory)
+        agent = make_agent(project_id)
+        directory.register(agent)
+        directory.select(project_id, "developer")
+
+        class DownProducer:
+            async def publish(self, topic, event):
+                return False
+
+        task = RouterTaskEvent(
+            task_type=AgentTaskType.MESSAGE, agent_id=agent.agent_id, source_event_type="test",
+            source_event_id="e1", routing_reason="test", reserved=True,
+        )
+        assert asyncio.run(publish_reserved_task(DownProducer(), task)) is False
+        assert directory.inflight(agent.agent_id) == 0
+
+    def test_only_reserved_tasks_release_on_receipt(self, monkeypatch):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        monkeypatch.setattr(directory_module, "agent_directory", directory)
+        agent = make_agent(project_id)
+        agent.name = "Dev"
+        agent._task_queues = {"chat": asyncio.Queue(), "story": asyncio.Queue()}
+        agent._get_task_class = BaseAgent._get_task_class
+        directory.register(agent)
+        directory.select(project_id, "developer")
+
+        # A task routed without select() (e.g. @mention) must not consume the reservation
+        asyncio.run(BaseAgent._process_router_task(agent, {"task_id": "t1", "task_type": "message"}))
+        assert directory.inflight(agent.agent_id) == 1
+
+        asyncio.run(BaseAgent._process_router_task(agent, {"task_id": "t2", "task_type": "message", "reserved": True}))
+        assert directory.inflight(agent.agent_id) == 0
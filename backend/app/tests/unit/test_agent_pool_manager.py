@@ -0,0 +1,129 @@
+"""Unit tests for AgentPoolManager.spawn_many"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.agent import agent_pool_manager
+from app.core.agent.agent_directory import AgentDirectory
+from app.core.agent.agent_pool_manager import AgentPoolManager
+from app.models import AgentStatus
+
+
+class FakeAgent:
+    def __init__(self, agent_model, heartbeat_interval=30, max_idle_time=300, tech_stack=None):
+        self.agent_id = agent_model.id
+        self.project_id = agent_model.project_id
+        self.role_type = "developer"
+        self.name = "Agent"
+        self.tech_stack = tech_stack
+        self.persona_metadata = {}
+        self.state = AgentStatus.idle
+        self.queue_depth = 0
+        self.active_task_count = 0
+        self._latency_ewma_ms = None
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+        return True
+
+
+class FailingAgent(FakeAgent):
+    async def start(self):
+        return False
+
+
+class FakeDB:
+    """Stands in for sqlmodel.Session: serves prefetch rows, records writes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+        self.spawn_counts = []
+        self.commits = 0
+
+    def session(self, _engine):
+        db = self
+
+        class FakeSession:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def exec(self, statement):
+                if statement.is_update:
+                    db.updates.append(statement.compile().params)
+                    return None
+                return SimpleNamespace(all=lambda: db.rows)
+
+            def commit(self):
+                db.commits += 1
+
+        return FakeSession()
+
+    def pool_service(self, _session):
+        db = self
+
+        class FakePoolService:
+            def increment_spawn_count(self, pool_id, count=1, commit=True):
+                db.spawn_counts.append((pool_id, count, commit))
+
+        return FakePoolService()
+
+
+@pytest.fixture
+def project_id():
+    return uuid4()
+
+
+def make_manager(monkeypatch, db, max_agents):
+    monkeypatch.setattr(agent_pool_manager, "Session", db.session)
+    monkeypatch.setattr(agent_pool_manager, "PoolService", db.pool_service)
+    monkeypatch.setattr(agent_pool_manager, "agent_directory", AgentDirectory())
+    return AgentPoolManager("developer_pool", max_agents=max_agents, pool_id=uuid4())
+
+
+def row(agent_id, project_id):
+    return (SimpleNamespace(id=agent_id, project_id=project_id), "nextjs")
+
+
+class TestSpawnMany:
+    def test_filters_caps_and_persists_once(self, monkeypatch, project_id):
+        existing, a, b, missing, over = (uuid4() for _ in range(5))
+        db = FakeDB([row(a, project_id), row(b, project_id)])
+        manager = make_manager(monkeypatch, db, max_agents=4)
+        manager.agents[existing] = FakeAgent(SimpleNamespace(id=existing, project_id=project_id))
+
+        result = asyncio.run(manager.spawn_many(
+            [(existing, FakeAgent), (a, FakeAgent), (a, FakeAgent), (b, FakeAgent),
+             (missing, FakeAgent), (over, FakeAgent)],
+            concurrency=2,
+        ))
+
+        assert sorted(result["spawned"]) == sorted([a, b])
+        assert result["failed"] == {
+            existing: "already_spawned", over: "pool_at_capacity", missing: "not_found",
+        }
+        assert manager.agents[a].tech_stack == "nextjs"
+        assert manager.total_spawned == 2 and not manager._spawning
+        assert agent_pool_manager.agent_directory.select(project_id, "developer") is not None
+
+        # One UPDATE, pool counters in the same transaction, one commit
+        [params] = db.updates
+        assert params["status"] == AgentStatus.idle and params["pool_id"] == manager.pool_id
+        assert db.spawn_counts == [(manager.pool_id, 2, False)]
+        assert db.commits == 1
+
+    def test_failed_start_is_not_persisted(self, monkeypatch, project_id):
+        agent_id = uuid4()
+        db = FakeDB([row(agent_id, project_id)])
+        manager = make_manager(monkeypatch, db, max_agents=4)
+
+        result = asyncio.run(manager.spawn_many([(agent_id, FailingAgent)]))
+
+        assert result["spawned"] == [] and result["failed"] == {agent_id: "start_failed"}
+        assert db.updates == [] and db.spawn_counts == [] and db.commits == 0
+        assert not manager.agents
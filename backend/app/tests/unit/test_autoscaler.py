@@ -0,0 +1,77 @@
+"""Unit tests for the agent autoscaler control step and simulation harness"""
+from datetime import datetime
+from uuid import uuid4
+
+from app.core.agent.autoscaler import AgentAutoscaler, GroupSignals, ScalingPolicy, cron_matches
+from app.core.agent.autoscaler_simulation import simulate, synthetic_trace
+
+
+KEY = (uuid4(), "developer")
+
+
+def autoscaler(**policy):
+    return AgentAutoscaler(policy=ScalingPolicy(**policy), executor=object())
+
+
+def overloaded(agents=1):
+    return GroupSignals(agents=agents, busy_agents=agents, queue_depth=5 * agents, p95_wait_seconds=120)
+
+
+def quiet(agents=2, removable=1):
+    return GroupSignals(agents=agents, busy_agents=0, queue_depth=0, p95_wait_seconds=0, removable_agents=removable)
+
+
+class TestDecide:
+    def test_scale_up_needs_consecutive_ticks(self):
+        scaler = autoscaler(scale_up_stable_ticks=2)
+        assert scaler.decide(KEY, overloaded(), now=0) == 0
+        assert scaler.decide(KEY, overloaded(), now=30) == 1
+
+    def test_cooldown_blocks_repeat_scale_up(self):
+        scaler = autoscaler(scale_up_stable_ticks=1, scale_up_cooldown_seconds=60)
+        assert scaler.decide(KEY, overloaded(), now=0) == 1
+        assert scaler.decide(KEY, overloaded(2), now=30) == 0
+        assert scaler.decide(KEY, overloaded(2), now=60) == 1
+
+    def test_respects_max_agents(self):
+        scaler = autoscaler(scale_up_stable_ticks=1, max_agents=2)
+        assert scaler.decide(KEY, overloaded(2), now=0) == 0
+
+    def test_llm_saturation_suppresses_scale_up(self):
+        scaler = autoscaler(scale_up_stable_ticks=1, llm_concurrency_limit=4)
+        assert scaler.decide(KEY, overloaded(), llm_inflight=4, now=0) == 0
+        assert scaler.total_suppressed == 1
+
+    def test_scale_down_only_removable_agents(self):
+        scaler = autoscaler(scale_down_stable_ticks=1, scale_down_cooldown_seconds=0)
+        assert scaler.decide(KEY, quiet(removable=0), now=0) == 0
+        assert scaler.decide(KEY, quiet(removable=1), now=30) == -1
+
+    def test_hysteresis_resets_on_flap(self):
+        scaler = autoscaler(scale_down_stable_ticks=3, scale_down_cooldown_seconds=0)
+        scaler.decide(KEY, quiet(), now=0)
+        scaler.decide(KEY, quiet(), now=30)
+        scaler.decide(KEY, overloaded(2), now=60)
+        assert scaler.decide(KEY, quiet(), now=90) == 0
+
+
+class TestCron:
+    def test_weekday_morning(self):
+        monday_9 = datetime(2026, 10, 19, 9, 0)
+        assert cron_matches("0 9 * * 1-5", monday_9)
+        assert not cron_matches("0 9 * * 1-5", monday_9.replace(day=18))  # Sunday
+        assert cron_matches("*/15 * * * *", monday_9.replace(minute=45))
+
+
+class TestSimulation:
+    def test_autoscaling_beats_single_agent_and_releases_capacity(self):
+        trace = synthetic_trace()
+        policy = ScalingPolicy(max_agents=3)
+
+        scaled = simulate(trace, policy)
+        single = simulate(trace, ScalingPolicy(min_agents=1, max_agents=1))
+        static = simulate(trace, ScalingPolicy(min_agents=3, max_agents=3), initial_agents=3)
+
+        assert scaled.p95_wait_seconds < single.p95_wait_seconds
+        assert scaled.agent_seconds < static.agent_seconds
+        assert any(event["delta"] < 0 for event in scaled.events)
@@ -0,0 +1,83 @@
+"""Unit tests for the pruned code search behind grep_files/glob_files"""
+import os
+import stat
+
+import pytest
+
+from app.agents.tester.src.utils import code_search
+from app.core.config import settings
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    _write(tmp_path, ".gitignore", "/generated\n*.log\nsrc/legacy/\n!keep.log\n")
+    _write(tmp_path, "src/app/page.tsx", "export default function Page() {}\nconst x = 1;\n")
+    _write(tmp_path, "src/lib/api.ts", "export const api = 1;\nexport function get() {}\n")
+    _write(tmp_path, "src/lib/.gitignore", "*.gen.ts\n")
+    _write(tmp_path, "src/lib/types.gen.ts", "export const api = 2;\n")
+    _write(tmp_path, "src/legacy/old.ts", "export const api = 3;\n")
+    _write(tmp_path, "generated/client.ts", "export const api = 4;\n")
+    _write(tmp_path, "debug.log", "export const api = 5;\n")
+    _write(tmp_path, "keep.log", "export const api = 6;\n")
+    _write(tmp_path, "node_modules/react/index.ts", "export const api = 7;\n")
+    return tmp_path
+
+
+class TestGlob:
+    def test_prunes_excluded_and_gitignored_paths(self, workspace):
+        assert sorted(code_search.glob_paths(workspace, ["**/*.ts", "**/*.log"])) == [
+            "keep.log", "src/lib/api.ts",
+        ]
+        assert list(code_search.glob_paths(workspace, ["src/**/*.{ts,tsx}"])) == [
+            "src/app/page.tsx", "src/lib/api.ts",
+        ]
+        assert code_search.literal_prefix("src/app/**/[id]/*.tsx") == "src/app"
+
+
+class TestGrep:
+    def test_streams_matches_up_to_the_cap(self, workspace):
+        matches = list(code_search.grep(workspace, r"^export", "src/**/*", context_lines=1, max_matches=2))
+
+        assert [(m.path, m.line_no) for m in matches] == [("src/app/page.tsx", 1), ("src/lib/api.ts", 1)]
+        assert matches[0].context == [(1, "export default function Page() {}"), (2, "const x = 1;")]
+
+    def test_line_semantics_without_whole_file_prefilter(self, workspace):
+        # Per line, "1;" is followed by nothing; in the whole file by a newline
+        matches = list(code_search.grep(workspace, r"1;(?!\s)", file_pattern="src/**/*.ts"))
+        assert [(m.path, m.line_no) for m in matches] == [("src/lib/api.ts", 1)]
+
+    def test_ripgrep_lists_candidates(self, workspace, tmp_path_factory, monkeypatch):
+        bin_dir = tmp_path_factory.mktemp("bin")
+        rg = bin_dir / "rg"
+        rg.write_text("#!/bin/sh\ncase \"$*\" in *lookahead*) exit 2;; esac\necho ./src/lib/api.ts\n")
+        rg.chmod(rg.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(settings, "CODE_SEARCH_RIPGREP", True)
+        before = code_search.get_code_search_stats()["ripgrep_greps"]
+
+        found = [(m.path, m.line_no) for m in code_search.grep(workspace, "export")]
+        fallback = [m.path for m in code_search.grep(workspace, "(?=lookahead)|default")]
+
+        assert found == [("src/lib/api.ts", 1), ("src/lib/api.ts", 2)]
+        assert fallback == ["src/app/page.tsx"]  # ripgrep rejected the pattern
+        assert code_search.get_code_search_stats()["ripgrep_greps"] == before + 2
+
+    def test_ripgrep_candidates_use_glob_semantics(self, workspace, tmp_path_factory, monkeypatch):
+        _write(workspace, "root.ts", "export const root = 1;\n")
+        _write(workspace, "logo.png", "export\n")
+        bin_dir = tmp_path_factory.mktemp("bin")
+        rg = bin_dir / "rg"
+        # ripgrep's *.ts matches at any depth, and it lists binaries that match as text
+        rg.write_text("#!/bin/sh\necho ./root.ts\necho ./src/lib/api.ts\necho ./logo.png\n")
+        rg.chmod(rg.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(settings, "CODE_SEARCH_RIPGREP", True)
+
+        assert [m.path for m in code_search.grep(workspace, "export", "*.ts")] == ["root.ts"]
+        assert [m.path for m in code_search.grep(workspace, "export", "*")] == ["root.ts"]
@@ -0,0 +1,108 @@
+"""Unit tests for the dependency-DAG implement scheduler"""
+import asyncio
+
+from app.agents.developer.src.nodes.parallel_utils import build_step_dag, run_dag_parallel
+
+
+def step(path, *deps):
+    return {"file_path": path, "dependencies": list(deps)}
+
+
+class TestBuildStepDag:
+    def test_declared_schema_conflict_and_cycle_edges(self):
+        steps = [
+            step("prisma/schema.prisma"),
+            step("src/lib/a.ts", "src/lib/b.ts"),
+            step("src/lib/b.ts", "src/lib/a.ts"),  # Cycle with a.ts
+            step("src/components/Card.tsx", "src/lib/a.ts", "README.md"),
+            step("src/lib/a.ts"),  # Second write of a.ts
+        ]
+        deps = build_step_dag(steps)
+
+        assert deps[0] == set()
+        assert deps[1] == {0}  # Edge to the later b.ts dropped to break the cycle
+        assert deps[2] == {0, 1}
+        assert deps[3] == {0, 1}  # Existing README.md is not a step
+        assert deps[4] == {0, 1}
+
+    def test_steps_downstream_of_a_cycle_keep_forward_dependencies(self):
+        steps = [
+            step("src/lib/a.ts", "src/lib/b.ts"),
+            step("src/lib/b.ts", "src/lib/a.ts"),  # Cycle with a.ts
+            step("src/components/Card.tsx", "src/lib/a.ts", "src/lib/format.ts"),
+            step("src/lib/format.ts"),  # Written after the component that imports it
+        ]
+        deps = build_step_dag(steps)
+
+        assert deps[0] == set()
+        assert deps[1] == {0}
+        assert deps[2] == {0, 3}
+        assert deps[3] == set()
+
+
+class TestRunDagParallel:
+    def test_steps_start_when_dependencies_are_written(self):
+        durations = {"src/lib/slow.ts": 0.2, "src/lib/fast.ts": 0.01, "src/components/Fast.tsx": 0.01,
+                     "src/app/page.tsx": 0.01, "src/lib/x.ts": 0.01, "src/lib/y.ts": 0.01}
+        steps = [
+            step("src/lib/slow.ts"),
+            step("src/lib/fast.ts"),
+            step("src/components/Fast.tsx", "src/lib/fast.ts"),
+            step("src/app/page.tsx", "src/components/Fast.tsx", "src/lib/slow.ts"),
+            step("src/lib/x.ts"),
+            step("src/lib/y.ts"),
+        ]
+        events, inflight, peak = [], 0, 0
+
+        async def implement_fn(s):
+            nonlocal inflight, peak
+            inflight += 1
+            peak = max(peak, inflight)
+            events.append(("start", s["file_path"]))
+            await asyncio.sleep(durations[s["file_path"]])
+            inflight -= 1
+            events.append(("end", s["file_path"]))
+            return {"file_path": s["file_path"], "success": True}
+
+        results = asyncio.run(run_dag_parallel(steps, implement_fn, max_concurrent=3, completed={5}))
+
+        assert sorted(results) == [0, 1, 2, 3, 4]
+        assert peak == 3
+        # Component starts as soon as its lib is done, without waiting for the slow file
+        assert events.index(("start", "src/components/Fast.tsx")) < events.index(("end", "src/lib/slow.ts"))
+        assert events.index(("start", "src/app/page.tsx")) > events.index(("end", "src/lib/slow.ts"))
+
+    def test_stop_lets_inflight_finish_and_starts_nothing_new(self):
+        steps = [step(f"src/lib/{i}.ts") for i in range(4)]
+        done = []
+
+        async def implement_fn(s):
+            await asyncio.sleep(0.01)
+            return {"file_path": s["file_path"], "success": True}
+
+        async def on_step_done(idx, _result):
+            done.append(idx)
+
+        results = asyncio.run(run_dag_parallel(
+            steps, implement_fn, max_concurrent=2, on_step_done=on_step_done, should_stop=lambda: len(done) >= 2,
+        ))
+
+        assert sorted(results) == sorted(done) == [0, 1]
+
+    def test_uses_the_dag_it_is_given(self, monkeypatch):
+        from app.agents.developer.src.nodes import parallel_utils
+
+        steps = [step("src/lib/a.ts"), step("src/lib/b.ts")]
+        order = []
+
+        async def implement_fn(s):
+            order.append(s["file_path"])
+            return {"file_path": s["file_path"], "success": True}
+
+        def fail_build(_steps):
+            raise AssertionError("DAG rebuilt")
+
+        monkeypatch.setattr(parallel_utils, "build_step_dag", fail_build)
+        asyncio.run(run_dag_parallel(steps, implement_fn, max_concurrent=2, dag={0: {1}, 1: set()}))
+
+        assert order == ["src/lib/b.ts", "src/lib/a.ts"]
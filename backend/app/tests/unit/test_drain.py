@@ -0,0 +1,131 @@
+"""Unit tests for agent drain and story handoff"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.agent import drain
+from app.core.agent.base_agent import BaseAgent
+from app.models.base import StoryAgentState
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+    def scan_keys(self, pattern):
+        return [key for key in self.data if key.startswith(pattern.rstrip("*"))]
+
+
+def make_agent():
+    return SimpleNamespace(
+        agent_id=uuid4(),
+        project_id=uuid4(),
+        role_type="developer",
+        name="Dev",
+        _draining=False,
+        _consumer=None,
+        _task_queues={"chat": asyncio.Queue(), "story": asyncio.Queue()},
+        _active_task_count=0,
+        _inflight_tasks={},
+    )
+
+
+class TestStoryIdOf:
+    def test_developer_and_tester_context(self):
+        assert drain.story_id_of({"context": {"story_id": "s1"}}) == "s1"
+        assert drain.story_id_of({"context": {"story_ids": ["s2", "s3"]}}) == "s2"
+        assert drain.story_id_of({"context": {}}) is None
+
+
+class TestAgentDrain:
+    def test_queued_and_running_tasks_are_handed_off(self, monkeypatch):
+        redis = FakeRedis()
+        paused = []
+        monkeypatch.setattr(drain, "redis_client", redis)
+        monkeypatch.setattr(drain, "set_story_state", lambda story_id, state, only_from=None: paused.append(story_id))
+
+        agent = make_agent()
+        queued = {"task_id": "t1", "context": {"story_id": "s1"}, "_enqueued_at": 1.0}
+        running = {"task_id": "t2", "context": {"story_id": "s2"}}
+        agent._task_queues["story"].put_nowait(queued)
+        agent._inflight_tasks[id(running)] = running
+        agent._active_task_count = 1
+
+        assert asyncio.run(BaseAgent.drain(agent, timeout=0)) == 2
+        assert agent._draining
+        assert paused == ["s2"]
+        assert redis.data["agent_handoff:t1"]["resume"] is False
+        assert "_enqueued_at" not in redis.data["agent_handoff:t1"]["task"]
+        assert redis.data["agent_handoff:t2"]["resume"] is True
+
+
+class TestPrepareTask:
+    def record(self, resume):
+        return {"task": {"task_id": "t1", "agent_id": "old", "context": {"story_id": "s1"}}, "resume": resume}
+
+    def test_paused_story_resumes_from_checkpoint(self, monkeypatch):
+        monkeypatch.setattr(drain, "set_story_state", lambda story_id, state, only_from=None: True)
+        agent_id = uuid4()
+        task = drain._prepare_task(self.record(resume=True), agent_id)
+        assert task["context"]["resume"] is True
+        assert task["agent_id"] == str(agent_id)
+        assert task["routing_reason"] == "drain_handoff"
+
+    def test_story_no_longer_paused_is_dropped(self, monkeypatch):
+        monkeypatch.setattr(drain, "set_story_state", lambda story_id, state, only_from=None: False)
+        assert drain._prepare_task(self.record(resume=True), uuid4()) is None
+
+    def test_cancelled_queued_story_is_dropped(self, monkeypatch):
+        monkeypatch.setattr(drain, "get_story_state", lambda story_id: StoryAgentState.CANCEL_REQUESTED)
+        assert drain._prepare_task(self.record(resume=False), uuid4()) is None
+
+
+class TestResumeHandoffs:
+    def handoff(self, monkeypatch, agent):
+        from app.core.agent import sharding
+
+        redis = FakeRedis()
+        states = []
+        monkeypatch.setattr(drain, "redis_client", redis)
+        monkeypatch.setattr(drain, "set_story_state", lambda story_id, state, only_from=None: states.append(state) or True)
+        monkeypatch.setattr(sharding, "owns_project", lambda project_id: True)
+
+        async def select(project_id, role_type):
+            return agent
+
+        monkeypatch.setattr(drain, "_select_agent", select)
+        drain.record_handoff(agent, {"task_id": "t1", "context": {"story_id": "s1"}}, resume=True)
+        return redis, states
+
+    def test_failed_redelivery_keeps_the_handoff(self, monkeypatch):
+        agent = make_agent()
+        agent.has_queue_room = lambda task: True
+
+        async def process(task):
+            raise RuntimeError("queue gone")
+
+        agent._process_router_task = process
+        redis, states = self.handoff(monkeypatch, agent)
+
+        assert asyncio.run(drain.resume_handoffs()) == 0
+        assert redis.data["agent_handoff:t1"]["task"]["task_id"] == "t1"
+        assert "key" not in redis.data["agent_handoff:t1"]
+        assert states == [StoryAgentState.PROCESSING, StoryAgentState.PAUSED]
+
+    def test_full_queue_leaves_the_handoff_unclaimed(self, monkeypatch):
+        agent = make_agent()
+        agent.has_queue_room = lambda task: False
+        redis, states = self.handoff(monkeypatch, agent)
+
+        assert asyncio.run(drain.resume_handoffs()) == 0
+        assert "agent_handoff:t1" in redis.data and states == []
@@ -0,0 +1,126 @@
+"""Unit tests for idle agent hibernation and rehydration"""
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.agent import agent_pool_manager
+from app.core.agent.agent_directory import AgentDirectory
+from app.core.agent.agent_pool_manager import AgentPoolManager
+from app.core.agent.hibernation import HibernatedAgent, is_hibernatable
+from app.models import AgentStatus
+
+
+class FakeAgent:
+    def __init__(self, agent_model, heartbeat_interval=30, max_idle_time=300, tech_stack=None):
+        self.agent_id = agent_model.id
+        self.project_id = agent_model.project_id
+        self.role_type = "developer"
+        self.name = "Agent"
+        self.tech_stack = tech_stack
+        self.heartbeat_interval = heartbeat_interval
+        self.max_idle_time = max_idle_time
+        self.persona_metadata = {}
+        self.state = AgentStatus.idle
+        self.queue_depth = 0
+        self.active_task_count = 0
+        self._latency_ewma_ms = None
+        self._pending_collaborations = {}
+        self._pending_signals = {}
+        self._last_activity_at = datetime.now(timezone.utc)
+        self.delivered = []
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+        return True
+
+    async def stop(self):
+        pass
+
+    async def deliver_task(self, task_data):
+        self.delivered.append(task_data)
+
+
+def make_manager(monkeypatch, project_id):
+    @contextmanager
+    def session(_engine):
+        yield SimpleNamespace(get=lambda _model, agent_id: SimpleNamespace(id=agent_id, project_id=project_id))
+
+    monkeypatch.setattr(agent_pool_manager, "Session", session)
+    monkeypatch.setattr(agent_pool_manager, "agent_directory", AgentDirectory())
+    manager = AgentPoolManager("developer_pool")
+    manager._wake_consumer = object()  # no Kafka in unit tests
+    return manager
+
+
+def add_idle_agent(manager, project_id, idle_seconds=600):
+    agent = FakeAgent(SimpleNamespace(id=uuid4(), project_id=project_id), max_idle_time=300, tech_stack="nextjs")
+    agent._last_activity_at -= timedelta(seconds=idle_seconds)
+    manager.agents[agent.agent_id] = agent
+    agent_pool_manager.agent_directory.register(agent)
+    return agent
+
+
+class TestHibernatable:
+    def test_requires_idle_past_max_idle_time(self):
+        agent = FakeAgent(SimpleNamespace(id=uuid4(), project_id=uuid4()))
+        now = datetime.now(timezone.utc).timestamp()
+        assert not is_hibernatable(agent, now)
+        assert is_hibernatable(agent, now + 301)
+
+        agent._pending_signals["story"] = "pause"
+        assert not is_hibernatable(agent, now + 301)
+
+
+class TestHibernateRehydrate:
+    def test_round_trip_keeps_agent_routable(self, monkeypatch):
+        project_id = uuid4()
+        manager = make_manager(monkeypatch, project_id)
+        agent = add_idle_agent(manager, project_id)
+        add_idle_agent(manager, project_id, idle_seconds=0)
+
+        assert asyncio.run(manager._hibernate_idle_agents()) == 1
+        assert manager.has_agent(agent.agent_id)
+        assert manager.get_agent(agent.agent_id) is None
+        stub = manager.hibernated[agent.agent_id]
+        assert isinstance(stub, HibernatedAgent) and stub.tech_stack == "nextjs"
+        assert len(agent_pool_manager.agent_directory.get_agents(project_id, "developer")) == 2
+
+        async def wake_twice():
+            return await asyncio.gather(
+                manager.rehydrate_agent(agent.agent_id),
+                manager.rehydrate_agent(agent.agent_id),
+            )
+
+        first, second = asyncio.run(wake_twice())
+        assert first is second and isinstance(first, FakeAgent)
+        assert manager.get_agent(agent.agent_id) is first
+        assert not manager.is_hibernated(agent.agent_id)
+
+        stats = manager.get_hibernation_stats()
+        assert stats["total_hibernated"] == 1
+        assert stats["total_rehydrated"] == 1
+        assert stats["rehydration_p50_ms"] >= 10
+
+    def test_live_agent_preferred_over_stub(self):
+        project_id = uuid4()
+        directory = AgentDirectory()
+        live = FakeAgent(SimpleNamespace(id=uuid4(), project_id=project_id))
+        stub = HibernatedAgent.from_agent(FakeAgent(SimpleNamespace(id=uuid4(), project_id=project_id)))
+        directory.register(live)
+        directory.register(stub)
+
+        assert directory.select(project_id, "developer") is live
+
+    def test_terminate_hibernated_agent(self, monkeypatch):
+        project_id = uuid4()
+        manager = make_manager(monkeypatch, project_id)
+        agent = add_idle_agent(manager, project_id)
+        asyncio.run(manager.hibernate_agent(agent.agent_id))
+
+        monkeypatch.setattr(agent_pool_manager, "PoolService", lambda _session: None)
+        monkeypatch.setattr("app.services.AgentService", lambda _session: SimpleNamespace(update_status=lambda *a, **k: None))
+        assert asyncio.run(manager.terminate_agent(agent.agent_id))
+        assert not manager.has_agent(agent.agent_id)
+        assert agent_pool_manager.agent_directory.get_agents(project_id, "developer") == []
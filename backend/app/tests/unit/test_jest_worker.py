@@ -0,0 +1,106 @@
+"""Unit tests for the warm jest worker (runs against a fake jest package)"""
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from app.agents.tester.src.utils.jest_worker import JestWorker
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+
+# runCLI stand-in: a test file's result is read from its "// passed failed" header;
+# with findRelatedTests, tests whose source mentions a changed file's name are related
+FAKE_JEST = r"""
+const fs = require("fs"), path = require("path");
+exports.getVersion = () => "fake";
+exports.runCLI = async (argv, [root]) => {
+  fs.appendFileSync(path.join(root, "calls.log"), JSON.stringify({ paths: argv._, related: !!argv.findRelatedTests }) + "\n");
+  let tests = argv._;
+  if (argv.findRelatedTests) {
+    const names = argv._.map((p) => path.basename(p).split(".")[0]);
+    tests = argv.testPathPattern.map((p) => p.replace(/\\/g, "")).filter((t) => {
+      const src = fs.readFileSync(path.join(root, t), "utf8");
+      return argv._.includes(t) || names.some((n) => src.includes(n));
+    });
+  }
+  return { results: { testResults: tests.map((t) => {
+    const [passed, failed] = fs.readFileSync(path.join(root, t), "utf8").match(/\/\/ (\d+) (\d+)/).slice(1).map(Number);
+    return {
+      testFilePath: path.join(root, t), numPassingTests: passed, numFailingTests: failed, testExecError: null,
+      failureMessage: failed ? `Error: ${t} failed` : "",
+      testResults: failed ? [{ status: "failed", title: `case in ${t}` }] : [],
+    };
+  }) } };
+};
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "node_modules" / "jest").mkdir(parents=True)
+    (tmp_path / "node_modules" / "jest" / "index.js").write_text(FAKE_JEST)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "math.ts").write_text("export const add = (a, b) => a + b;\n")
+    (tmp_path / "src" / "math.test.ts").write_text("// 2 0\nimport { add } from './math';\n")
+    (tmp_path / "src" / "other.test.ts").write_text("// 1 0\n")
+    return tmp_path
+
+
+def _calls(workspace):
+    return [json.loads(line) for line in (workspace / "calls.log").read_text().splitlines()]
+
+
+class TestJestWorker:
+    def test_reruns_only_affected_tests_in_one_process(self, workspace):
+        worker = JestWorker(workspace, max_workers=2, idle_seconds=30)
+        files = ["src/math.test.ts", "src/other.test.ts"]
+
+        async def run():
+            try:
+                first = await worker.run(files)
+                unchanged = await worker.run(files)
+                (workspace / "src" / "math.ts").write_text("export const add = (a, b) => a - b;\n")
+                (workspace / "src" / "math.test.ts").write_text("// 1 1\nimport { add } from './math';\n")
+                changed = await worker.run(files)
+                return first, unchanged, changed
+            finally:
+                await worker.aclose()
+
+        first, unchanged, changed = asyncio.run(run())
+
+        assert (first.ran, first.passed, first.failed) == (2, 3, 0) and first.success
+        assert (unchanged.ran, unchanged.cached) == (0, 2)
+        assert (changed.ran, changed.cached) == (1, 1)
+        assert not changed.success
+        summary = changed.summary()
+        assert summary == {
+            "passed": 2,
+            "failed": 1,
+            "failed_tests": ["case in src/math.test.ts"],
+            "error_messages": ["src/math.test.ts failed"],
+            "setup_error": None,
+        }
+        calls = _calls(workspace)
+        assert len(calls) == 2 and calls[1]["related"]
+        assert worker.get_stats()["starts"] == 1
+
+    def test_config_change_restarts_and_runs_everything(self, workspace):
+        worker = JestWorker(workspace, max_workers=1, idle_seconds=30)
+
+        async def run():
+            try:
+                await worker.run(["src/other.test.ts"])
+                (workspace / "jest.config.js").write_text("module.exports = {};\n")
+                return await worker.run(["src/other.test.ts"])
+            finally:
+                await worker.aclose()
+
+        result = asyncio.run(run())
+        assert result.ran == 1
+        assert worker.stats["restarts"] == 1 and worker.get_stats()["starts"] == 2
+        assert not _calls(workspace)[1]["related"]
+
+    def test_missing_jest_falls_back(self, tmp_path):
+        worker = JestWorker(tmp_path, max_workers=1, idle_seconds=30)
+        assert asyncio.run(worker.run(["a.test.ts"])) is None
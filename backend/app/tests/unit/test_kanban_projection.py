@@ -0,0 +1,179 @@
+"""Unit tests for Kanban board projection deltas"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import async_db
+from app.models import Story
+from app.websocket import kanban_projection as projection_module
+from app.websocket.connection_manager import ConnectionManager
+from app.websocket.kanban_projection import BoardState, KanbanProjection, diff_story
+
+
+def make_story(status="Todo", rank=1, dependencies=None, **extra):
+    story = {
+        "id": str(uuid4()),
+        "title": "Story",
+        "status": status,
+        "rank": rank,
+        "dependencies": dependencies or [],
+        "is_blocked": False,
+        "blocked_by_count": 0,
+    }
+    story.update(extra)
+    return story
+
+
+def projection():
+    return KanbanProjection(ConnectionManager())
+
+
+def make_state(*stories):
+    board = {"Todo": [], "InProgress": [], "Review": [], "Done": [], "Archived": []}
+    for story in stories:
+        board[story["status"]].append(story)
+    return BoardState(project_id=uuid4(), project_name="P", wip_limits={}, board=board)
+
+
+class TestDiffStory:
+    def test_field_replace_only(self):
+        old = {"id": "1", "title": "A", "rank": 1}
+        new = {"id": "1", "title": "B", "rank": 1}
+        assert diff_story("/board/Todo/0", old, new) == [
+            {"op": "replace", "path": "/board/Todo/0/title", "value": "B"}
+        ]
+
+    def test_no_change(self):
+        story = make_story()
+        assert diff_story("/board/Todo/0", story, dict(story)) == []
+
+
+class TestApply:
+    def test_insert_new_story_by_rank(self):
+        first = make_story(rank=1)
+        third = make_story(rank=3)
+        state = make_state(first, third)
+        new = make_story(rank=2)
+
+        ops = projection()._apply(state, new["id"], new)
+
+        assert ops == [{"op": "add", "path": "/board/Todo/1", "value": new}]
+        assert [s["rank"] for s in state.board["Todo"]] == [1, 2, 3]
+
+    def test_move_column_emits_remove_and_add(self):
+        story = make_story(rank=1)
+        state = make_state(story)
+        moved = {**story, "status": "InProgress"}
+
+        ops = projection()._apply(state, story["id"], moved)
+
+        assert ops[0] == {"op": "remove", "path": "/board/Todo/0"}
+        assert ops[1]["op"] == "add" and ops[1]["path"] == "/board/InProgress/0"
+        assert state.board["Todo"] == []
+
+    def test_done_unblocks_dependents(self):
+        dependency = make_story(status="Review", rank=1)
+        dependent = make_story(
+            rank=1,
+            dependencies=[dependency["id"]],
+            is_blocked=True,
+            blocked_by_count=1,
+        )
+        state = make_state(dependency, dependent)
+        done = {**dependency, "status": "Done"}
+
+        ops = projection()._apply(state, dependency["id"], done)
+
+        assert {"op": "replace", "path": "/board/Todo/0/is_blocked", "value": False} in ops
+        assert state.board["Todo"][0]["blocked_by_count"] == 0
+
+    def test_delete_story(self):
+        story = make_story()
+        state = make_state(story)
+
+        ops = projection()._apply(state, story["id"], None)
+
+        assert ops == [{"op": "remove", "path": "/board/Todo/0"}]
+
+
+class TestVersions:
+    def test_monotonic_across_rebuilds(self, monkeypatch):
+        story = make_story()
+
+        class FakeDB:
+            @staticmethod
+            async def execute(fn):
+                return {"project_name": "P", "wip_limits": {}, "board": {"Todo": [dict(story)]}}
+
+        monkeypatch.setattr(async_db, "DB", FakeDB)
+        kanban = projection()
+        project_id = uuid4()
+
+        async def run():
+            first = (await kanban.get_board(project_id))["version"]
+            delta = await kanban.apply_story_change(project_id, story["id"], deleted=True)
+            kanban.invalidate(project_id)
+            rebuilt = (await kanban.get_board(project_id))["version"]
+            return first, delta, rebuilt
+
+        first, delta, rebuilt = asyncio.run(run())
+        assert delta["base_version"] == first and delta["version"] > first
+        assert rebuilt > delta["version"]  # Never reuses a version a client may hold
+
+
+class TestStoryWriteTracking:
+    @pytest.fixture
+    def applied(self, monkeypatch):
+        kanban = projection()
+        applied = []
+
+        async def apply_story_change(project_id, story_id, deleted=False):
+            applied.append((project_id, story_id, deleted))
+
+        monkeypatch.setattr(kanban, "apply_story_change", apply_story_change)
+        monkeypatch.setattr(projection_module, "kanban_projection", kanban)
+        return kanban, applied
+
+    def test_committed_writes_patch_the_board(self, applied):
+        kanban, applied = applied
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine)
+        project_id = uuid4()
+        kanban.invalidate(project_id)
+
+        async def run():
+            kanban.track_story_writes()
+            with Session(engine) as session:
+                story = Story(project_id=project_id, title="A")
+                session.add(story)
+                session.commit()
+                await asyncio.sleep(0)
+                created = list(applied)
+
+                story.title = "B"
+                session.add(story)
+                session.flush()
+                session.rollback()  # Discarded: never committed
+                await asyncio.sleep(0)
+                rolled_back = len(applied)
+
+                session.delete(session.get(Story, story.id))
+                session.commit()
+                await asyncio.sleep(0)
+                deleted = applied[-1]
+
+            kanban._boards[project_id] = make_state()
+            with Session(engine) as session:
+                session.exec(update(Story).values(rank=1))  # Bulk write: boards rebuilt
+                session.commit()
+            await asyncio.sleep(0)
+            return story.id, created, rolled_back, deleted
+
+        story_id, created, rolled_back, deleted = asyncio.run(run())
+        assert created == [(project_id, str(story_id), False)]
+        assert rolled_back == 1
+        assert deleted == (project_id, str(story_id), True)
+        assert kanban.get_stats()["cached_projects"] == 0
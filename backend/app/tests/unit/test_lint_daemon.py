@@ -0,0 +1,161 @@
+"""Unit tests for the lint daemon (runs against fake prettier/eslint packages)"""
+import asyncio
+import importlib
+import shutil
+
+import pytest
+
+from app.agents.developer.src.utils import lint_daemon
+from app.agents.developer.src.utils.lint_daemon import LintDaemon
+from app.core.config import settings
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+
+# prettier stand-in: collapses ";;" into ";"
+FAKE_PRETTIER = r"""
+exports.version = "fake";
+exports.getFileInfo = async () => ({ ignored: false, inferredParser: "babel" });
+exports.resolveConfig = async () => ({});
+exports.format = async (src) => src.replace(/;;/g, ";");
+"""
+
+# eslint stand-in: fixes "var" to "let", reports "debugger" as an error, logs the files it linted
+FAKE_ESLINT = r"""
+const fs = require("fs"), path = require("path");
+class ESLint {
+  constructor(opts) { this.cwd = opts.cwd; }
+  async isPathIgnored() { return false; }
+  async lintFiles(files) {
+    fs.appendFileSync(path.join(this.cwd, "linted.log"), files.join(",") + "\n");
+    return files.map((f) => {
+      const filePath = path.join(this.cwd, f), src = fs.readFileSync(filePath, "utf8");
+      const out = src.replace(/\bvar\b/g, "let");
+      const bad = src.includes("debugger");
+      return {
+        filePath, output: out !== src ? out : undefined, errorCount: bad ? 1 : 0,
+        messages: bad ? [{ line: 1, column: 1, severity: 2, message: "Unexpected debugger", ruleId: "no-debugger" }] : [],
+      };
+    });
+  }
+  static async outputFixes(results) {
+    for (const r of results) if (r.output !== undefined) fs.writeFileSync(r.filePath, r.output);
+  }
+}
+ESLint.version = "fake";
+exports.ESLint = ESLint;
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    for name, source in (("prettier", FAKE_PRETTIER), ("eslint", FAKE_ESLINT)):
+        (tmp_path / "node_modules" / name).mkdir(parents=True)
+        (tmp_path / "node_modules" / name / "index.js").write_text(source)
+    (tmp_path / "package.json").write_text('{"name": "app"}')
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.ts").write_text("var a = 1;;\n")
+    (tmp_path / "src" / "b.ts").write_text("let b = 2;\n")
+    return tmp_path
+
+
+@needs_node
+class TestLintDaemon:
+    def test_format_and_lint_only_changed_files(self, workspace):
+        daemon = LintDaemon(workspace, idle_seconds=30)
+
+        async def run():
+            try:
+                first = (await daemon.format(), await daemon.lint_fix())
+                unchanged = await daemon.lint_fix()
+                (workspace / "src" / "b.ts").write_text("var b = 2;\ndebugger;\n")
+                second = await daemon.lint_fix()
+                typecheck = await daemon.typecheck()
+                return first, unchanged, second, typecheck
+            finally:
+                await daemon.aclose()
+
+        (formatted, linted), unchanged, second, typecheck = asyncio.run(run())
+
+        assert formatted.ok and formatted.changed == ["src/a.ts"]
+        assert linted.ok and linted.changed == ["src/a.ts"]
+        assert (workspace / "src" / "a.ts").read_text() == "let a = 1;\n"
+        assert unchanged.ok and unchanged.changed == []
+        assert not second.ok and "no-debugger" in second.output
+        assert (workspace / "linted.log").read_text().splitlines() == ["src/a.ts,src/b.ts", "src/b.ts"]
+        assert typecheck is None  # No typescript package: caller runs the pnpm script
+        assert daemon.get_stats()["starts"] == 1
+
+
+class TestRegistry:
+    def test_live_daemon_cap_stops_least_recently_used(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "LINT_DAEMON_MAX_LIVE", 2)
+        monkeypatch.setattr(lint_daemon.shutil, "which", lambda name: "/usr/bin/node")
+        monkeypatch.setattr(lint_daemon, "_daemons", lint_daemon.OrderedDict())
+        workspaces = []
+        for name in ("one", "two", "three"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "package.json").write_text("{}")
+            workspaces.append(tmp_path / name)
+
+        first = lint_daemon.get_lint_daemon(workspaces[0])
+        lint_daemon.get_lint_daemon(workspaces[1])
+        assert lint_daemon.get_lint_daemon(workspaces[0]) is first  # Now most recently used
+        lint_daemon.get_lint_daemon(workspaces[2])
+
+        assert [s["workspace"] for s in lint_daemon.get_lint_daemon_stats()] == [
+            str(workspaces[0].resolve()), str(workspaces[2].resolve()),
+        ]
+        assert lint_daemon.get_lint_daemon(tmp_path) is None  # Not a node project
+
+
+class FakeDaemon:
+    def __init__(self, lint_result=None):
+        self.calls = []
+        self.lint_result = lint_result
+
+    async def format(self, timeout=120):
+        self.calls.append("format")
+        return lint_daemon.DaemonResult(ok=True, changed=["src/a.ts"])
+
+    async def lint_fix(self, timeout=120):
+        self.calls.append("lint_fix")
+        return self.lint_result
+
+
+class TestDaemonSubstitution:
+    def test_only_plain_prettier_eslint_scripts_use_the_daemon(self, tmp_path, monkeypatch):
+        run_code = importlib.import_module("app.agents.developer.src.nodes.run_code")
+        (tmp_path / "package.json").write_text(
+            '{"scripts": {"format": "prettier --write .", "lint:fix": "next lint --fix && node scripts/fix-imports.js"}}'
+        )
+        ran = []
+        monkeypatch.setattr(run_code, "_run_step", lambda step, cmd, *args: ran.append(cmd) or (True, "", ""))
+        daemon = FakeDaemon()
+        svc = {"format_cmd": "pnpm run format", "lint_fix_cmd": "pnpm run lint:fix"}
+
+        asyncio.run(run_code._format_lint_via_daemon(daemon, svc, str(tmp_path), "app"))
+
+        assert daemon.calls == ["format"]
+        assert ran == ["pnpm run lint:fix"]
+
+    def test_auto_fix_runs_the_script_when_the_daemon_changed_nothing(self, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+
+        from app.agents.developer.src.utils import story_logger
+        from app.utils import subprocess_utils
+
+        daemon = FakeDaemon(lint_daemon.DaemonResult(ok=False, output="1 error"))
+        monkeypatch.setattr(lint_daemon, "get_lint_daemon", lambda path: daemon)
+        ran = []
+
+        async def run_process(cmd, **kwargs):
+            ran.append(cmd)
+            return SimpleNamespace(returncode=1, stdout="", stderr="")
+
+        monkeypatch.setattr(subprocess_utils, "run_process", run_process)
+        fixed = asyncio.run(story_logger.try_auto_fix(
+            {"auto_fixable": True, "fix_strategy": "eslint_fix"}, str(tmp_path)
+        ))
+
+        assert daemon.calls == ["lint_fix"]
+        assert ran[0] == "pnpm run lint:fix" and fixed is False
@@ -0,0 +1,33 @@
+"""Unit tests for the shared LLM client registry"""
+import asyncio
+
+from langchain_core.runnables import RunnableBinding
+
+from app.core.agent import llm_factory
+
+
+class TestLLMRegistry:
+    def setup_method(self):
+        asyncio.run(llm_factory.reset_llm_clients())
+
+    def test_same_settings_share_one_client(self):
+        assert llm_factory.get_llm("implement") is llm_factory.get_llm("implement")
+        assert llm_factory.get_llm("router") is llm_factory.get_llm("clarify")
+        assert llm_factory.get_llm("router") is not llm_factory.get_llm("review")
+        assert llm_factory.get_llm("router") is not llm_factory.get_raw_llm("router")
+        stats = llm_factory.get_llm_registry_stats()
+        assert stats["clients"] == 4
+        assert stats["hits"] == 4
+
+    def test_overrides_bind_on_shared_client(self):
+        bound = llm_factory.create_fast_llm(stop=["</done>"])
+        assert isinstance(bound, RunnableBinding)
+        assert bound.bound is llm_factory.create_fast_llm()
+        assert bound.kwargs == {"stop": ["</done>"]}
+
+    def test_sdk_clients_use_shared_http_client(self):
+        fast = llm_factory.get_llm("router")
+        medium = llm_factory.get_llm("implement")
+        assert fast._async_client._client is medium._async_client._client
+        assert fast._async_client._client is llm_factory.get_async_http_client()
+        assert fast._client._client is llm_factory.get_http_client()
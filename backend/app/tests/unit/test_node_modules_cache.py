@@ -0,0 +1,71 @@
+"""Unit tests for the lockfile-keyed node_modules snapshot store"""
+import os
+
+from app.utils import node_modules_cache
+from app.utils.node_modules_cache import NODE_MODULES, SnapshotStore, lockfile_key
+
+
+def make_workspace(root, lock="lockfileVersion: '9.0'\n"):
+    node_modules = root / "node_modules"
+    pkg = node_modules / ".pnpm" / "react@18.3.1" / "node_modules" / "react"
+    pkg.mkdir(parents=True)
+    (pkg / "index.js").write_text("module.exports = {};\n")
+    os.symlink(".pnpm/react@18.3.1/node_modules/react", node_modules / "react")
+    client = node_modules / ".pnpm" / "@prisma+client@5.22.0" / "node_modules" / ".prisma" / "client"
+    client.mkdir(parents=True)
+    (client / "index.js").write_text("// generated\n")
+    (root / "pnpm-lock.yaml").write_text(lock)
+    return root
+
+
+def no_reflink(store):
+    store._reflink = False  # Exercise the hardlink path on any filesystem
+    return store
+
+
+class TestSnapshotStore:
+    def test_restore_hardlinks_packages_and_copies_prisma_client(self, tmp_path):
+        store = no_reflink(SnapshotStore(tmp_path / "store", max_bytes=10 ** 9))
+        src = make_workspace(tmp_path / "a")
+        key = lockfile_key(src)
+
+        assert store.restore(NODE_MODULES, key, tmp_path / "b" / "node_modules") is False
+        assert store.save(NODE_MODULES, key, src / "node_modules") is True
+        (tmp_path / "b").mkdir()
+        assert store.restore(NODE_MODULES, key, tmp_path / "b" / "node_modules") is True
+
+        restored = tmp_path / "b" / "node_modules"
+        package = "react/index.js"
+        generated = ".pnpm/@prisma+client@5.22.0/node_modules/.prisma/client/index.js"
+        assert os.readlink(restored / "react") == ".pnpm/react@18.3.1/node_modules/react"
+        assert os.stat(restored / package).st_ino == os.stat(src / "node_modules" / package).st_ino
+        assert os.stat(restored / generated).st_ino != os.stat(src / "node_modules" / generated).st_ino
+        assert store.get_stats()["hits"] == 1 and store.get_stats()["misses"] == 1
+
+    def test_prisma_client_snapshot_restores_generated_dirs(self, tmp_path, monkeypatch):
+        store = no_reflink(SnapshotStore(tmp_path / "store", max_bytes=10 ** 9))
+        monkeypatch.setattr(node_modules_cache, "get_snapshot_store", lambda: store)
+        for name in ("a", "b"):
+            make_workspace(tmp_path / name)
+            (tmp_path / name / "prisma").mkdir()
+            (tmp_path / name / "prisma" / "schema.prisma").write_text("model User { id Int @id }\n")
+        generated = "node_modules/.pnpm/@prisma+client@5.22.0/node_modules/.prisma/client/index.js"
+        (tmp_path / "a" / generated).write_text("// User client\n")
+
+        assert node_modules_cache.restore_prisma_client(tmp_path / "b") is False
+        assert node_modules_cache.snapshot_prisma_client(tmp_path / "a") is True
+        assert node_modules_cache.restore_prisma_client(tmp_path / "b") is True
+        assert (tmp_path / "b" / generated).read_text() == "// User client\n"
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        store = no_reflink(SnapshotStore(tmp_path / "store", max_bytes=10 ** 9))
+        for name in ("a", "b", "c"):
+            make_workspace(tmp_path / name, lock=f"lock {name}\n")
+            store.save(NODE_MODULES, lockfile_key(tmp_path / name), tmp_path / name / "node_modules")
+        oldest = tmp_path / "store" / NODE_MODULES / lockfile_key(tmp_path / "a") / "meta.json"
+        os.utime(oldest, (1, 1))
+
+        store.max_bytes = store.get_stats()["bytes"] - 1
+        assert store.evict() == 1
+        assert not oldest.exists()
+        assert store.get_stats()["entries"] == 2
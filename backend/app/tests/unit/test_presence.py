@@ -0,0 +1,119 @@
+"""Unit tests for the WebSocket presence registry"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core import async_db
+from app.websocket import presence as presence_module
+from app.websocket.presence import PresenceRegistry
+
+
+class FakeSession:
+    """Stands in for sqlmodel.Session; records each bulk UPDATE."""
+
+    writes = []
+    fail = 0
+
+    def __init__(self, engine):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, rows):
+        if FakeSession.fail:
+            FakeSession.fail -= 1
+            raise RuntimeError("database is down")
+        FakeSession.writes.append(rows)
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    FakeSession.writes, FakeSession.fail = [], 0
+    monkeypatch.setattr(presence_module, "Session", FakeSession)
+
+    async def run_in_thread(fn, *args):
+        return fn(*args)
+
+    monkeypatch.setattr(async_db, "run_in_thread", run_in_thread)
+    return FakeSession
+
+
+class TestFlush:
+    def test_batches_changed_projects_into_one_write(self, db):
+        registry = PresenceRegistry(last_seen_resolution=60)
+        a, b = uuid4(), uuid4()
+
+        async def run():
+            registry.mark_connected(a)
+            registry.mark_connected(b)
+            registry.mark_connected(b)
+            first = await registry.flush()
+            registry.touch(a)  # Within last_seen_resolution: nothing to write
+            second = await registry.flush()
+            registry.mark_disconnected(a)
+            third = await registry.flush()
+            for task in registry._clear_tasks.values():
+                task.cancel()
+            return first, second, third
+
+        assert asyncio.run(run()) == (2, 0, 1)
+        assert len(db.writes) == 2
+        assert {row["id"] for row in db.writes[0]} == {a, b}
+        assert [(row["id"], row["websocket_connected"]) for row in db.writes[1]] == [(a, False)]
+
+    def test_loop_survives_a_failed_flush(self, db):
+        registry = PresenceRegistry(flush_interval=0.01)
+        project_id = uuid4()
+        db.fail = 1
+
+        async def run():
+            registry.mark_connected(project_id)
+            await registry.start()
+            await asyncio.sleep(0.1)
+            alive, flushes = not registry._flush_task.done(), registry.get_stats()["total_flushes"]
+            await registry.stop()
+            return alive, flushes
+
+        alive, flushes = asyncio.run(run())
+        assert alive and flushes == 1  # Written by the tick after the failed one
+        assert len(db.writes) == 1
+
+
+class TestActiveAgentGrace:
+    @pytest.fixture
+    def cleared(self, monkeypatch):
+        cleared = []
+
+        class FakeDB:
+            @staticmethod
+            async def execute(fn):
+                cleared.append(fn)
+                return "agent-1"
+
+        monkeypatch.setattr(async_db, "DB", FakeDB)
+        return cleared
+
+    def test_clears_after_grace_unless_reconnected(self, cleared):
+        registry = PresenceRegistry(active_agent_grace_seconds=0.05)
+        left, back = uuid4(), uuid4()
+
+        async def run():
+            for project_id in (left, back):
+                registry.mark_connected(project_id)
+                registry.mark_disconnected(project_id)
+            await asyncio.sleep(0.01)
+            registry.mark_connected(back)  # Within the grace period
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+        assert len(cleared) == 1
+        assert registry.is_connected(back) and not registry.is_connected(left)
+        assert registry.get_stats()["pending_clears"] == 0
@@ -0,0 +1,78 @@
+"""Unit tests for the async agent process runner"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.utils.subprocess_utils import run_process
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell commands")
+
+
+def _is_dead(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] == "Z"  # Killed, not yet reaped by init
+    except FileNotFoundError:
+        return True
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+class TestRunProcess:
+    def test_result_and_streamed_output(self):
+        streamed = []
+        result = asyncio.run(run_process(
+            "echo out; echo err >&2; exit 3",
+            on_output=lambda name, text: streamed.append((name, text)),
+        ))
+        assert result.returncode == 3 and not result.success
+        assert result.stdout == "out\n" and result.stderr == "err\n"
+        assert ("stdout", "out\n") in streamed and ("stderr", "err\n") in streamed
+
+    def test_argv_runs_without_shell(self, tmp_path):
+        result = asyncio.run(run_process([sys.executable, "-c", "import os; print(os.getcwd())"], cwd=tmp_path))
+        assert result.success
+        assert os.path.realpath(result.stdout.strip()) == os.path.realpath(tmp_path)
+
+    def test_timeout_kills_process_group(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        # The shell's background child keeps the pipes open; it must die with the group
+        result = asyncio.run(run_process(f"sleep 30 & echo $! > {pid_file}; wait", timeout=0.5))
+        assert result.timed_out and result.returncode == -1
+        assert result.duration < 10
+        child = int(pid_file.read_text())
+        time.sleep(0.1)
+        assert _is_dead(child)
+
+    def test_event_loop_not_blocked_and_node_cap(self, monkeypatch):
+        monkeypatch.setattr(settings, "AGENT_PROCESS_MAX_PER_NODE", 2)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            tick_task = asyncio.create_task(ticker())
+            started = time.monotonic()
+            results = await asyncio.gather(*(run_process("sleep 0.3", node="capped") for _ in range(4)))
+            elapsed = time.monotonic() - started
+            tick_task.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(run())
+        assert all(r.success for r in results)
+        assert elapsed >= 0.55  # 4 commands, 2 at a time
+        assert ticks >= 20
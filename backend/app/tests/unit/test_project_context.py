@@ -0,0 +1,92 @@
+"""Unit tests for background conversation summarization in ProjectContext"""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.agent import llm_factory, project_context
+from app.core.agent.project_context import SUMMARY_THRESHOLD, ProjectContext
+
+
+class SlowSummarizer:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await self.release.wait()
+        return SimpleNamespace(content=f" summary {self.calls} ")
+
+
+class TestBackgroundSummary:
+    def test_summary_runs_off_the_request_path_and_is_persisted(self, monkeypatch):
+        monkeypatch.setattr(project_context, "SUMMARY_DEBOUNCE", 0.01)
+        persisted = []
+        stored_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        def persist(_self, summary, message_ids):
+            persisted.append((summary, message_ids))
+            return stored_at
+
+        monkeypatch.setattr(ProjectContext, "_persist_summary", persist)
+        message_ids = [uuid4() for _ in range(SUMMARY_THRESHOLD)]
+
+        async def run():
+            llm = SlowSummarizer()
+            monkeypatch.setattr(llm_factory, "create_openai_llm", lambda *args, **kwargs: llm)
+            context = ProjectContext(uuid4())
+            for i in range(SUMMARY_THRESHOLD):
+                context.add_message("user", f"message {i}", message_id=message_ids[i])
+
+            context.maybe_summarize()  # Returns without waiting for the LLM
+            context.maybe_summarize()  # Coalesced into the pending task
+            await asyncio.sleep(0.05)
+            assert llm.calls == 1
+            context.add_message("assistant", "tail reply")
+            during = context.format_memory(exclude_last=False)
+
+            llm.release.set()
+            await context._summary_task
+            return context, during
+
+        context, during = asyncio.run(run())
+
+        assert "Tóm tắt" not in during and "message 0" in during
+        assert [m["content"] for m in context.memory] == ["tail reply"]
+        assert context.format_memory(exclude_last=False).startswith("## Tóm tắt:\nsummary 1")
+        # Watermark: the summarized rows' persisted created_at, resolved by id
+        assert persisted == [("summary 1", message_ids)]
+        assert context._summary_through == stored_at
+
+
+class TestSummaryWatermark:
+    def test_restart_skips_rows_persisted_after_the_summary_stamp(self, monkeypatch):
+        from datetime import timedelta
+
+        from sqlmodel import Session, SQLModel, create_engine
+
+        from app.core import db
+        from app.models import AuthorType, Message
+
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine)
+        monkeypatch.setattr(db, "engine", engine)
+        project_id, now = uuid4(), datetime.now(timezone.utc)
+        rows = [
+            Message(project_id=project_id, content="question", author_type=AuthorType.USER, created_at=now),
+            # Reply row written after the agent added it to memory
+            Message(project_id=project_id, content="answer", author_type=AuthorType.AGENT, created_at=now + timedelta(seconds=5)),
+            Message(project_id=project_id, content="next question", author_type=AuthorType.USER, created_at=now + timedelta(seconds=9)),
+        ]
+        with Session(engine) as session:
+            session.add_all(rows)
+            session.commit()
+            ids = [row.id for row in rows]
+
+        ProjectContext(project_id)._persist_summary("summary", ids[:2])
+        restarted = ProjectContext(project_id)
+        asyncio.run(restarted._load_memory())
+
+        assert restarted._summary == "summary"
+        assert [m["content"] for m in restarted.memory] == ["next question"]
@@ -0,0 +1,113 @@
+"""Unit tests for prompt-prefix caching of skill-heavy system prompts"""
+import asyncio
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.agent import llm_factory
+from app.core.agent.prompt_utils import cached_system_message
+
+# The nodes package re-exports the `implement` node function under the module's name
+implement = importlib.import_module("app.agents.developer.src.nodes.implement")
+
+
+class CapturingHandler(BaseHTTPRequestHandler):
+    """Mock Messages API: records request bodies, answers with the ImplementOutput tool."""
+
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        CapturingHandler.requests.append(body)
+        cached = 1800 if len(CapturingHandler.requests) > 1 else 0
+        response = json.dumps({
+            "id": "msg_test",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "tool_use", "id": "tu_1", "name": "ImplementOutput", "input": {"content": "export {}"}}],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": 50,
+                "output_tokens": 5,
+                "cache_read_input_tokens": cached,
+                "cache_creation_input_tokens": 1800 - cached,
+            },
+        }).encode()
+        head = f"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: {len(response)}\r\n\r\n"
+        self.wfile.write(head.encode() + response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_anthropic():
+    CapturingHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CapturingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_registry():
+    def get_skill(skill_id):
+        return SimpleNamespace(
+            load_content=lambda: f"{skill_id} patterns " * 200,
+            list_bundled_files=lambda: ["reference.md"],
+            load_bundled_file=lambda name: f"{skill_id} reference",
+        )
+    return SimpleNamespace(get_skill=get_skill)
+
+
+class TestCachedSystemMessage:
+    def test_prefix_marked_and_suffix_after_breakpoint(self):
+        message = cached_system_message("persona", "", "skills", suffix="volatile")
+        assert message.content[0] == {
+            "type": "text",
+            "text": "persona\n\nskills",
+            "cache_control": {"type": "ephemeral"},
+        }
+        assert message.content[1] == {"type": "text", "text": "volatile"}
+
+
+class TestDeveloperPromptPrefix:
+    def test_prefix_byte_identical_across_steps(self, mock_anthropic, monkeypatch, tmp_path):
+        llm = llm_factory.SharedChatAnthropic(
+            model=llm_factory.MODELS["medium"],
+            max_tokens=1024,
+            base_url=mock_anthropic,
+            api_key="test",
+            callbacks=[llm_factory._token_callback],
+        )
+        monkeypatch.setattr(implement, "implement_llm", llm)
+        steps = [
+            {"file_path": "src/a.ts", "task": "Create A", "action": "create", "skills": ["api-route", "database-model"]},
+            {"file_path": "src/b.ts", "task": "Create B", "action": "create", "skills": ["database-model", "api-route"]},
+        ]
+
+        async def run_steps():
+            usage = llm_factory.reset_token_count()
+            results = [
+                await implement._implement_single_step(step, {"total_steps": 2}, make_registry(), str(tmp_path), {})
+                for step in steps
+            ]
+            await llm_factory.reset_llm_clients()
+            return results, usage
+
+        results, usage = asyncio.run(run_steps())
+
+        assert all(result["success"] for result in results)
+        first, second = CapturingHandler.requests
+        assert first["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert first["system"] == second["system"]
+        assert first["messages"] != second["messages"]
+        assert usage.cache_read_tokens == 1800
+        assert usage.cache_creation_tokens == 1800
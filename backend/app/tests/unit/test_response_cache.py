@@ -0,0 +1,172 @@
+"""Unit tests for the content-addressed LLM response cache"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_core.messages import HumanMessage
+from pydantic import BaseModel
+
+from app.core.agent import llm_factory
+from app.core.agent.response_cache import ResponseStore, StepResponseCache, bypass_response_cache
+
+
+class Intent(BaseModel):
+    intent: str
+
+
+class Route(BaseModel):
+    intent: str
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Mock Messages API: answers every tool call with {"intent": "interview"}."""
+
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        CountingHandler.calls += 1
+        response = json.dumps({
+            "id": "msg_test",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "tool_use", "id": "tu_1", "name": body["tools"][0]["name"], "input": {"intent": "interview"}}],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 40, "output_tokens": 10},
+        }).encode()
+        head = f"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: {len(response)}\r\n\r\n"
+        self.wfile.write(head.encode() + response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_anthropic():
+    CountingHandler.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_llm(base_url, store, temperature=0):
+    return llm_factory.SharedChatAnthropic(
+        model=llm_factory.MODELS["fast"],
+        temperature=temperature,
+        max_tokens=256,
+        base_url=base_url,
+        api_key="test",
+        cache=StepResponseCache(ttl=60, store=store),
+    )
+
+
+def run_calls(coro_factory):
+    async def run():
+        try:
+            return await coro_factory()
+        finally:
+            await llm_factory.reset_llm_clients()
+    return asyncio.run(run())
+
+
+class TestStepResponseCache:
+    def test_identical_requests_hit_and_bypass_skips(self, mock_anthropic):
+        store = ResponseStore()
+        llm = make_llm(mock_anthropic, store)
+        messages = [HumanMessage(content="tạo website bán sách")]
+
+        async def calls():
+            first = await llm.with_structured_output(Intent).ainvoke(messages)
+            second = await llm.with_structured_output(Intent).ainvoke(messages)
+            with bypass_response_cache():
+                await llm.with_structured_output(Intent).ainvoke(messages)
+            return first, second
+
+        first, second = run_calls(calls)
+
+        assert first == second == Intent(intent="interview")
+        assert CountingHandler.calls == 2
+        stats = store.get_stats()
+        assert stats["hits"] == 1
+        assert stats["bypassed"] == 1
+        assert stats["saved_tokens"] == 50
+        assert stats["hit_ratio"] == 0.5
+
+    def test_key_covers_schema_params_and_messages(self, mock_anthropic):
+        store = ResponseStore()
+        messages = [HumanMessage(content="hello")]
+
+        async def calls():
+            await make_llm(mock_anthropic, store).with_structured_output(Intent).ainvoke(messages)
+            await make_llm(mock_anthropic, store).with_structured_output(Route).ainvoke(messages)
+            await make_llm(mock_anthropic, store, temperature=0.5).with_structured_output(Intent).ainvoke(messages)
+            await make_llm(mock_anthropic, store).with_structured_output(Intent).ainvoke([HumanMessage(content="hi")])
+
+        run_calls(calls)
+
+        assert CountingHandler.calls == 4
+        assert store.get_stats()["hits"] == 0
+
+    def test_disk_tier_survives_new_process_store(self, mock_anthropic, tmp_path):
+        messages = [HumanMessage(content="hello")]
+
+        async def calls():
+            await make_llm(mock_anthropic, ResponseStore(backend="disk", cache_dir=str(tmp_path))).with_structured_output(Intent).ainvoke(messages)
+            fresh = ResponseStore(backend="disk", cache_dir=str(tmp_path))
+            result = await make_llm(mock_anthropic, fresh).with_structured_output(Intent).ainvoke(messages)
+            return result, fresh
+
+        result, fresh = run_calls(calls)
+
+        assert result == Intent(intent="interview")
+        assert CountingHandler.calls == 1
+        assert fresh.get_stats()["shared_hits"] == 1
+
+
+class TestResponseStore:
+    def test_lru_eviction_and_ttl(self, monkeypatch):
+        store = ResponseStore(max_entries=2)
+        now = [1000.0]
+        monkeypatch.setattr("app.core.agent.response_cache.time.time", lambda: now[0])
+        store.put("a", [], ttl=10)
+        store.put("b", [], ttl=None)
+        store.put("c", [], ttl=None)
+        assert store.get("a") is None  # evicted
+        assert store.get("b") == []
+        store.put("d", [], ttl=5)
+        now[0] += 6
+        assert store.get("d") is None  # expired
+        assert store.get("b") == []
+
+    def test_async_shared_tier_io_runs_off_the_loop(self, tmp_path):
+        store = ResponseStore(backend="disk", cache_dir=str(tmp_path))
+        threads = []
+        get_shared, put_shared = store._get_shared, store._put_shared
+
+        def record(fn):
+            def wrapper(*args):
+                threads.append((fn.__name__, threading.get_ident()))
+                return fn(*args)
+            return wrapper
+
+        store._get_shared, store._put_shared = record(get_shared), record(put_shared)
+
+        async def run():
+            await store.aput("a", [], ttl=None)
+            memory_hit = await store.aget("a")
+            store._entries.clear()
+            shared_hit = await store.aget("a")
+            return threading.get_ident(), memory_hit, shared_hit
+
+        loop_thread, memory_hit, shared_hit = asyncio.run(run())
+        assert memory_hit == [] and shared_hit == []
+        assert [name for name, _ in threads] == ["_put_shared", "_get_shared"]  # Memory hit stays inline
+        assert all(thread != loop_thread for _, thread in threads)
+        assert store.get_stats()["shared_hits"] == 1
@@ -0,0 +1,97 @@
+"""Unit tests for project sharding of the agent runtime"""
+import asyncio
+from uuid import UUID, uuid4
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import db
+from app.core.agent import agent_directory as directory_module
+from app.core.agent import sharding
+from app.core.agent.agent_directory import AgentDirectory
+from app.core.agent.router import AgentCollaborationRouter, DelegationRouter
+from app.core.agent.sharding import RemoteAgent, hosts_agents, owns_project, select_agent, shard_of
+from app.kafka.event_schemas import AgentSignalEvent, get_event_schema
+from app.models import Agent, AgentStatus
+
+
+class TestShardOf:
+    def test_stable_and_in_range(self):
+        project_id = UUID("6f1c1c3e-2b7a-4f43-9d8e-1a2b3c4d5e6f")
+        assert shard_of(project_id, 4) == shard_of(str(project_id), 4)
+        assert all(0 <= shard_of(uuid4(), 4) < 4 for _ in range(100))
+
+    def test_spreads_projects(self):
+        counts = [0] * 4
+        for _ in range(2000):
+            counts[shard_of(uuid4(), 4)] += 1
+        assert min(counts) > 400
+
+
+class TestOwnership:
+    def test_in_process_mode_owns_everything(self, monkeypatch):
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKERS", 0)
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKER_INDEX", None)
+        assert hosts_agents()
+        assert owns_project(uuid4())
+
+    def test_api_process_hosts_nothing_when_sharded(self, monkeypatch):
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKERS", 2)
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKER_INDEX", None)
+        assert not hosts_agents()
+        assert not owns_project(uuid4())
+
+    def test_each_project_has_one_owner(self, monkeypatch):
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKERS", 3)
+        project_id = uuid4()
+        owners = []
+        for index in range(3):
+            monkeypatch.setattr(sharding.settings, "AGENT_WORKER_INDEX", index)
+            if owns_project(project_id):
+                owners.append(index)
+        assert owners == [shard_of(project_id, 3)]
+
+
+class TestSelectAgent:
+    def test_api_process_routes_to_worker_hosted_agents(self, monkeypatch):
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKERS", 2)
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKER_INDEX", None)
+        monkeypatch.setattr(directory_module, "agent_directory", AgentDirectory())
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine)
+        monkeypatch.setattr(db, "engine", engine)
+
+        project_id = uuid4()
+        with Session(engine) as session:
+            for name, role, status in [
+                ("Busy", "developer", AgentStatus.busy),
+                ("Idle", "developer", AgentStatus.idle),
+                ("Gone", "tester", AgentStatus.terminated),
+            ]:
+                session.add(Agent(project_id=project_id, name=name, human_name=name, role_type=role, status=status))
+            session.commit()
+
+        selected = select_agent(project_id, "developer")
+        assert isinstance(selected, RemoteAgent) and selected.name == "Idle"
+        assert select_agent(project_id, "tester") is None
+
+        delegation = DelegationRouter.__new__(DelegationRouter)
+        delegation.logger = sharding.logger
+        collaboration = AgentCollaborationRouter.__new__(AgentCollaborationRouter)
+
+        async def run():
+            return (
+                await delegation._find_best_agent(project_id, "developer"),
+                await collaboration._find_agent_by_role(project_id, "developer"),
+            )
+
+        assert [agent.agent_id for agent in asyncio.run(run())] == [selected.agent_id] * 2
+
+        # A worker routes only to agents it hosts
+        monkeypatch.setattr(sharding.settings, "AGENT_WORKER_INDEX", 0)
+        assert select_agent(project_id, "developer") is None
+
+
+class TestSignalEvent:
+    def test_registered_schema(self):
+        event = AgentSignalEvent(agent_id=uuid4(), story_id="s1", signal="pause")
+        assert get_event_schema(event.event_type) is AgentSignalEvent
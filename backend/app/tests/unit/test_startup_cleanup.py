@@ -0,0 +1,52 @@
+"""Unit tests for stale story state cleanup on startup"""
+import asyncio
+from uuid import uuid4
+
+import sqlmodel
+
+from app import main
+from app.core.agent import drain
+
+
+class FakeSession:
+    """Stands in for sqlmodel.Session; serves stale rows, records statements."""
+
+    rows = []
+    statements = []
+    commits = 0
+
+    def __init__(self, engine):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec(self, statement, *, params=None):
+        FakeSession.statements.append((" ".join(str(statement).split()), params))
+        return self
+
+    def all(self):
+        return FakeSession.rows
+
+    def commit(self):
+        FakeSession.commits += 1
+
+
+class TestCleanupStaleStoryStates:
+    def test_resets_stale_stories_except_handed_off(self, monkeypatch):
+        handed_off, stale = uuid4(), uuid4()
+        FakeSession.rows = [(handed_off, "thread-handed-off"), (stale, "thread-stale")]
+        FakeSession.statements, FakeSession.commits = [], 0
+        monkeypatch.setattr(sqlmodel, "Session", FakeSession)
+        monkeypatch.setattr(drain, "handed_off_story_ids", lambda: {str(handed_off)})
+
+        asyncio.run(main.cleanup_stale_story_states())
+
+        [update] = [(sql, params) for sql, params in FakeSession.statements if sql.startswith("UPDATE stories")]
+        assert update[1] == {"story_ids": [str(stale)]}
+        deletes = [params for sql, params in FakeSession.statements if sql.startswith("DELETE")]
+        assert deletes == [{"tid": "thread-stale"}] * 3
+        assert FakeSession.commits == 1
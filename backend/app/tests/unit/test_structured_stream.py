@@ -0,0 +1,184 @@
+"""Unit tests for streamed structured output of implement steps"""
+import asyncio
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.agent import llm_factory
+from app.core.agent.structured_stream import ToolArgsScanner
+from app.websocket.stream_buffer import StreamBuffer
+
+# The nodes package re-exports the `implement` node function under the module's name
+implement = importlib.import_module("app.agents.developer.src.nodes.implement")
+
+CONTENT = 'export const greet = (name: string) => `Hi ${name}\\t"ok"`;\n// ünïcode 😀\n' * 40
+USAGE = {"input_tokens": 50, "output_tokens": 120, "cache_read_input_tokens": 1800, "cache_creation_input_tokens": 0}
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class StreamingHandler(BaseHTTPRequestHandler):
+    """Mock Messages API: ImplementOutput tool call as JSON, or as SSE in 7-char deltas."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        tool = {"type": "tool_use", "id": "tu_1", "name": "ImplementOutput", "input": {"content": CONTENT}}
+        if not body.get("stream"):
+            payload = json.dumps({
+                "id": "msg_test", "type": "message", "role": "assistant", "model": body["model"],
+                "content": [tool], "stop_reason": "tool_use", "stop_sequence": None, "usage": USAGE,
+            }).encode()
+            content_type = "application/json"
+        else:
+            args = json.dumps(tool["input"])
+            events = [
+                sse("message_start", {"type": "message_start", "message": {
+                    "id": "msg_test", "type": "message", "role": "assistant", "model": body["model"], "content": [],
+                    "stop_reason": None, "stop_sequence": None, "usage": {**USAGE, "output_tokens": 1}}}),
+                sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {**tool, "input": {}}}),
+            ]
+            events += [
+                sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                            "delta": {"type": "input_json_delta", "partial_json": args[i:i + 7]}})
+                for i in range(0, len(args), 7)
+            ]
+            events += [
+                sse("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                sse("message_delta", {"type": "message_delta", "usage": USAGE,
+                                      "delta": {"stop_reason": "tool_use", "stop_sequence": None}}),
+                sse("message_stop", {"type": "message_stop"}),
+            ]
+            payload = "".join(events).encode()
+            content_type = "text/event-stream"
+        head = f"HTTP/1.1 200 OK\r\ncontent-type: {content_type}\r\ncontent-length: {len(payload)}\r\n\r\n"
+        self.wfile.write(head.encode() + payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_anthropic():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestToolArgsScanner:
+    def test_decodes_split_escapes_and_surrogates(self):
+        args = json.dumps({"content": 'a"b\\c\n😀é', "count": 3, "meta": {"x": "}", "y": [1, 2]}})
+        scanner = ToolArgsScanner()
+        events = [event for ch in args for event in scanner.feed(ch)]
+
+        text = "".join(value for kind, field, value in events if kind == "delta")
+        completed = {field: value for kind, field, value in events if kind == "complete"}
+        assert text == 'a"b\\c\n😀é'
+        assert completed == json.loads(args)
+        assert scanner.done
+
+
+class TestStreamBuffer:
+    def test_deltas_coalesced_into_one_frame_per_room(self, monkeypatch):
+        from app.websocket import connection_manager as cm
+
+        frames = []
+
+        async def broadcast(message, project_id):
+            frames.append((project_id, message))
+            return 1
+
+        monkeypatch.setattr(cm, "connection_manager", SimpleNamespace(broadcast_to_project=broadcast))
+        buffer = StreamBuffer(flush_interval=0.01)
+        project_id = uuid4()
+
+        async def run():
+            for part in ["ab", "cd", "ef"]:
+                buffer.push(project_id, "s1", "src/a.ts", part)
+            await asyncio.sleep(0.05)
+            buffer.push(project_id, "s1", "src/a.ts", "g", done=True)
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        assert len(frames) == 2
+        first, second = frames[0][1]["updates"][0], frames[1][1]["updates"][0]
+        assert (first["offset"], first["delta"], first["done"]) == (0, "abcdef", False)
+        assert (second["offset"], second["delta"], second["done"]) == (6, "g", True)
+
+
+class TestStreamedImplementStep:
+    def run_step(self, base_url, tmp_path, story_logger):
+        llm = llm_factory.SharedChatAnthropic(
+            model=llm_factory.MODELS["medium"], max_tokens=1024, base_url=base_url, api_key="test",
+            callbacks=[llm_factory._token_callback],
+        )
+        registry = SimpleNamespace(get_skill=lambda skill_id: None)
+        step = {"file_path": "src/greet.ts", "task": "Create greet", "action": "create", "skills": []}
+
+        async def run():
+            usage = llm_factory.reset_token_count()
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(implement, "implement_llm", llm)
+                result = await implement._implement_single_step(
+                    step, {"total_steps": 1}, registry, str(tmp_path), {}, story_logger=story_logger
+                )
+            await llm_factory.reset_llm_clients()
+            return result, usage
+
+        return asyncio.run(run())
+
+    def test_streamed_result_and_tokens_match_non_streamed(self, mock_anthropic, tmp_path):
+        calls = []
+
+        class RecordingLogger:
+            story_id = uuid4()
+
+            async def stream(self, file_path, delta="", done=False):
+                calls.append((delta, done))
+
+        streamed, streamed_usage = self.run_step(mock_anthropic, tmp_path / "streamed", RecordingLogger())
+        plain, plain_usage = self.run_step(mock_anthropic, tmp_path / "plain", None)
+
+        assert streamed == plain == {"file_path": "src/greet.ts", "success": True, "modified_files": ["src/greet.ts"]}
+        assert (tmp_path / "streamed/src/greet.ts").read_text() == CONTENT
+        assert (tmp_path / "plain/src/greet.ts").read_text() == CONTENT
+        assert "".join(delta for delta, _ in calls) == CONTENT
+        assert len(calls) > 10
+        assert calls[-1] == ("", True)
+        assert streamed_usage == plain_usage
+        assert streamed_usage.tokens == 170 and streamed_usage.cache_read_tokens == 1800
+
+    def test_no_file_written_when_final_parse_fails(self, tmp_path, monkeypatch):
+        class RecordingLogger:
+            story_id = uuid4()
+
+            async def stream(self, file_path, delta="", done=False):
+                pass
+
+        async def astream_structured(_llm, _messages, _config, on_complete=None, **_kwargs):
+            await on_complete("content", CONTENT)  # Field complete, then the final validation fails
+            raise ValueError("ImplementOutput validation failed")
+
+        monkeypatch.setattr(implement, "astream_structured", astream_structured)
+        monkeypatch.setattr(implement, "implement_llm", SimpleNamespace(with_structured_output=lambda schema: None))
+        registry = SimpleNamespace(get_skill=lambda skill_id: None)
+        step = {"file_path": "src/greet.ts", "task": "Create greet", "action": "create", "skills": []}
+
+        result = asyncio.run(implement._implement_single_step(
+            step, {"total_steps": 1}, registry, str(tmp_path), {}, story_logger=RecordingLogger()
+        ))
+
+        assert result["success"] is False and "validation" in result["error"]
+        assert not (tmp_path / "src/greet.ts").exists()
@@ -0,0 +1,92 @@
+"""Unit tests for per-task execution context and token attribution"""
+import asyncio
+from uuid import uuid4
+
+from langchain_core.outputs import LLMResult
+
+from app.agents.tester.tester import Tester
+from app.core.agent import base_agent
+from app.core.agent.base_agent import BaseAgent, TaskExecutionState
+from app.core.agent.llm_factory import (
+    _token_callback,
+    get_llm_call_count,
+    get_token_count,
+    reset_token_count,
+)
+
+
+def llm_result(input_tokens, output_tokens):
+    return LLMResult(
+        generations=[],
+        llm_output={"usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}},
+    )
+
+
+class TestTokenAttribution:
+    def test_concurrent_tasks_count_separately(self):
+        async def task(tokens, calls):
+            usage = reset_token_count()
+            for _ in range(calls):
+                await asyncio.sleep(0)
+                _token_callback.on_llm_end(llm_result(tokens, 0))
+            return usage.tokens, usage.llm_calls
+
+        async def run():
+            return await asyncio.gather(task(10, 3), task(100, 2))
+
+        assert asyncio.run(run()) == [(30, 3), (200, 2)]
+
+    def test_child_tasks_attribute_to_parent(self):
+        async def run():
+            reset_token_count()
+
+            async def child():
+                _token_callback.on_llm_end(llm_result(5, 5))
+
+            await asyncio.gather(child(), child())
+            return get_token_count(), get_llm_call_count()
+
+        assert asyncio.run(run()) == (20, 2)
+
+
+class TestTaskClass:
+    def test_chat_vs_story(self):
+        assert BaseAgent._get_task_class({"task_type": "message"}) == "chat"
+        assert BaseAgent._get_task_class({"task_type": "collaboration_request"}) == "chat"
+        assert BaseAgent._get_task_class({"task_type": "implement_story"}) == "story"
+
+
+class TestTesterAutoTask:
+    def test_auto_review_does_not_mute_concurrent_chat(self, monkeypatch):
+        sent = []
+
+        async def message_user(_self, event_type, content, _details=None, **_kwargs):
+            sent.append((event_type, content))
+
+        monkeypatch.setattr(BaseAgent, "message_user", message_user)
+        tester = Tester.__new__(Tester)
+        tester.name, tester.agent_id = "Tester", uuid4()
+        tester._idle_task_state = TaskExecutionState(agent_id=tester.agent_id)
+
+        async def in_task(fn):
+            base_agent._task_state.set(TaskExecutionState(agent_id=tester.agent_id))
+            await fn()
+
+        async def auto_review():
+            tester._is_auto_task = True
+            tester._current_story_ids = ["story-1"]
+            await asyncio.sleep(0.01)
+            await tester.message_user("thinking", "review")
+            await tester.message_user("response", "review done")
+
+        async def chat():
+            await asyncio.sleep(0.005)  # While the auto review is running
+            await tester.message_user("thinking", "chat")
+            await tester.message_user("response", "chat answer")
+
+        async def run():
+            await asyncio.gather(in_task(auto_review), in_task(chat))
+
+        asyncio.run(run())
+        assert sent == [("thinking", "chat"), ("response", "chat answer")]
+        assert not tester._is_auto_task  # Idle state untouched
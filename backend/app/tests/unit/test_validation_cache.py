@@ -0,0 +1,92 @@
+"""Unit tests for the run_code validation cache"""
+import importlib
+import json
+import os
+
+from app.agents.developer.src.utils import validation_cache
+from app.agents.developer.src.utils.validation_cache import TreeHasher, ValidationCache
+
+# The nodes package re-exports the `run_code` node function under the module's name
+run_code = importlib.import_module("app.agents.developer.src.nodes.run_code")
+
+
+def make_tree(root):
+    (root / "src" / "app").mkdir(parents=True)
+    (root / "src" / "app" / "page.tsx").write_text("export default function Page() {}\n")
+    (root / "node_modules" / "react").mkdir(parents=True)
+    (root / "node_modules" / "react" / "index.js").write_text("module.exports = {};\n")
+    (root / ".next" / "types").mkdir(parents=True)
+    (root / "package.json").write_text(json.dumps({"scripts": {"typecheck": "tsc --noEmit"}}))
+    return root
+
+
+class TestTreeHasher:
+    def test_hash_tracks_source_content_only(self, tmp_path):
+        root = make_tree(tmp_path)
+        hasher = TreeHasher()
+        base = hasher.hash_tree(str(root))
+
+        page = root / "src" / "app" / "page.tsx"
+        os.utime(page, ns=(1, 1))  # Rewritten with the same content
+        (root / "node_modules" / "react" / "index.js").write_text("changed")
+        (root / ".next" / "types" / "routes.d.ts").write_text("generated")
+        (root / "tsconfig.tsbuildinfo").write_text("{}")
+        assert hasher.hash_tree(str(root)) == base
+
+        page.write_text("export default function Page() { return null }\n")
+        assert hasher.hash_tree(str(root)) != base
+
+
+class TestCachedSteps:
+    def test_unchanged_tree_reuses_verdict(self, tmp_path, monkeypatch):
+        root = make_tree(tmp_path)
+        cache = ValidationCache()
+        monkeypatch.setattr(validation_cache, "_cache", cache)
+        calls = []
+
+        def fake_shell(cmd, _cwd, _timeout):
+            calls.append(cmd)
+            return {"exit_code": 1, "stdout": "", "stderr": "error TS2322"}
+
+        monkeypatch.setattr(run_code, "run_shell", fake_shell)
+        key = cache.key(cache.tree_hash(str(root)), str(root), "pnpm run build")
+
+        first = run_code._run_step("Build", "pnpm run build", str(root), "app", cache_key=key)
+        second = run_code._run_step("Build", "pnpm run build", str(root), "app", cache_key=key)
+
+        assert first == second == (False, "", "error TS2322")
+        assert calls == ["pnpm run build"]
+        assert cache.get_stats()["hits"] == 1
+
+    def test_timeouts_are_not_cached(self, tmp_path, monkeypatch):
+        cache = ValidationCache()
+        monkeypatch.setattr(validation_cache, "_cache", cache)
+        monkeypatch.setattr(run_code, "run_shell", lambda *_args: {"exit_code": -1, "stdout": "", "stderr": "Timed out"})
+
+        run_code._run_step("Build", "pnpm run build", str(tmp_path), "app", cache_key="k")
+
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestNextTypes:
+    def test_types_kept_until_routes_change(self, tmp_path):
+        root = make_tree(tmp_path)
+        ws = str(root)
+
+        assert run_code._clear_stale_next_types(ws) is True  # First check in this process
+        (root / ".next" / "types").mkdir()
+        (root / "src" / "app" / "page.tsx").write_text("// edited\n")
+        assert run_code._clear_stale_next_types(ws) is False
+        (root / "src" / "app" / "about").mkdir()
+        (root / "src" / "app" / "about" / "page.tsx").write_text("// new route\n")
+        assert run_code._clear_stale_next_types(ws) is True
+        assert not (root / ".next" / "types").exists()
+
+    def test_typecheck_made_incremental_unless_configured(self, tmp_path):
+        root = make_tree(tmp_path)
+        (root / "tsconfig.json").write_text('{"compilerOptions": {"strict": true}}')
+        assert run_code._incremental_typecheck_cmd(str(root), "pnpm run typecheck") == (
+            "pnpm run typecheck --incremental --tsBuildInfoFile .tsbuildinfo"
+        )
+        (root / "tsconfig.json").write_text('{"compilerOptions": {"incremental": true}}')
+        assert run_code._incremental_typecheck_cmd(str(root), "pnpm run typecheck") == "pnpm run typecheck"
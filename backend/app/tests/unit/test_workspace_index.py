@@ -0,0 +1,101 @@
+"""Unit tests for the shared incremental workspace index"""
+import importlib
+
+from app.agents.developer.src.utils import workspace_index
+from app.agents.developer.src.utils.workspace_index import WorkspaceIndex
+from app.agents.tester.src.utils import file_repository as tester_file_repository
+from app.core.config import settings
+
+# nodes/__init__ re-exports the node functions under the module names
+developer_plan = importlib.import_module("app.agents.developer.src.nodes.plan")
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _workspace(root):
+    _write(root, "package.json", '{"name": "app"}')
+    _write(root, "prisma/schema.prisma", "model User {\n  id    String @id @default(cuid())\n  email String @unique\n  name  String?\n  createdAt DateTime @default(now())\n}\n")
+    _write(root, "src/components/UserCard.tsx", "interface UserCardProps { name: string }\nexport function UserCard() {}\n")
+    _write(root, "src/components/ui/button.tsx", "export const Button = () => null;\n")
+    _write(root, "src/app/api/users/route.ts", "export async function GET() {}\n")
+    _write(root, "src/__tests__/users.test.ts", "test('x', () => {});\n")
+    _write(root, "node_modules/pkg/index.ts", "ignored\n")
+    return root
+
+
+class TestWorkspaceIndex:
+    def test_refresh_reads_only_changed_files(self, tmp_path):
+        index = WorkspaceIndex(_workspace(tmp_path)).refresh()
+
+        assert index.file_tree == [
+            "package.json", "prisma/schema.prisma", "src/__tests__/users.test.ts",
+            "src/app/api/users/route.ts", "src/components/UserCard.tsx", "src/components/ui/button.tsx",
+        ]
+        assert index.components == {"UserCard": "@/src/components/UserCard"}
+        assert index.api_routes == ["src/app/api/users/route.ts"]
+        assert index.test_files == ["src/__tests__/users.test.ts"]
+        assert index.component_analysis["src/components/UserCard.tsx"]["props"] == ["name"]
+        assert index.stats["files_read"] == 4  # package.json, schema, component, route
+
+        index.refresh()
+        assert index.stats["last_changed"] == 0 and index.stats["files_read"] == 4
+
+        _write(tmp_path, "src/components/UserCard.tsx", "export default function UserCard() { useEffect(); }\n")
+        (tmp_path / "src/app/api/users/route.ts").unlink()
+        index.refresh()
+        assert index.stats["last_changed"] == 2 and index.stats["files_read"] == 5
+        assert index.api_routes == []
+        analysis = index.component_analysis["src/components/UserCard.tsx"]
+        assert analysis["has_use_effect"] and analysis["exports"] == ["UserCard"]
+
+    def test_both_agents_share_one_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(workspace_index, "_indexes", workspace_index.OrderedDict())
+        _workspace(tmp_path)
+
+        context = developer_plan.FileRepository(str(tmp_path)).to_context()
+        tester_repo = tester_file_repository.FileRepository(str(tmp_path))
+
+        assert "model User" in context and "UserCard → `import { UserCard } from '@/src/components/UserCard'`" in context
+        assert tester_repo.api_routes == ["src/app/api/users/route.ts"]
+        assert "export async function GET" in tester_repo.get_api_source_code()
+        [stats] = workspace_index.get_workspace_index_stats()
+        assert stats["refreshes"] == 2 and stats["files_read"] == 4
+
+    def test_each_agent_keeps_its_own_important_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(workspace_index, "_indexes", workspace_index.OrderedDict())
+        _workspace(tmp_path)
+        _write(tmp_path, "tsconfig.json", "{}")
+        _write(tmp_path, "jest.config.ts", "export default {};\n")
+
+        developer_files = developer_plan.FileRepository(str(tmp_path)).files
+        tester_files = tester_file_repository.FileRepository(str(tmp_path)).files
+
+        assert sorted(developer_files) == ["package.json", "prisma/schema.prisma"]
+        assert sorted(tester_files) == ["jest.config.ts", "package.json", "prisma/schema.prisma", "tsconfig.json"]
+
+    def test_registry_drops_least_recently_used(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "WORKSPACE_INDEX_MAX_ENTRIES", 1)
+        monkeypatch.setattr(workspace_index, "_indexes", workspace_index.OrderedDict())
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        workspace_index.get_workspace_index(tmp_path / "a")
+        workspace_index.get_workspace_index(tmp_path / "b")
+
+        assert [s["workspace"] for s in workspace_index.get_workspace_index_stats()] == [str((tmp_path / "b").resolve())]
+
+    def test_removing_a_worktree_drops_its_index(self, tmp_path, monkeypatch):
+        from app.utils.workspace_utils import cleanup_old_worktree
+
+        monkeypatch.setattr(workspace_index, "_indexes", workspace_index.OrderedDict())
+        worktree = _workspace(tmp_path / "ws_story")
+        workspace_index.get_workspace_index(worktree)
+
+        cleanup_old_worktree(tmp_path, "story_x", worktree)
+
+        assert not worktree.exists()
+        assert workspace_index.get_workspace_index_stats() == []
@@ -0,0 +1,57 @@
+"""Unit tests for the pre-warmed git worktree pool"""
+import subprocess
+from pathlib import Path
+
+from app.utils.workspace_utils import setup_git_worktree
+from app.utils.worktree_pool import WorktreePool, get_worktree_pool
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path: Path) -> Path:
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    git(path, "config", "user.email", "dev@example.com")
+    git(path, "config", "user.name", "dev")
+    (path / ".gitignore").write_text(".worktrees/\nnode_modules/\n")
+    (path / "package.json").write_text("{}")
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+def prepare(workspace_path):
+    (Path(workspace_path) / "node_modules").mkdir()
+    (Path(workspace_path) / "node_modules" / "installed").write_text("yes")
+
+
+class TestWorktreePool:
+    def test_story_claims_prepared_spare_on_its_branch_at_main_head(self, tmp_path):
+        repo = make_repo(tmp_path / "project")
+        pool = get_worktree_pool(repo, prepare=prepare)
+        assert pool.fill() == pool.size
+
+        # Main moves after the spares were made: the claimed one is brought up to date
+        (repo / "README.md").write_text("new")
+        info = setup_git_worktree("STORY-1", repo, worktree_type="story")
+
+        worktree = Path(info["workspace_path"])
+        assert info["pooled"] and info["workspace_ready"]
+        assert worktree == (repo / ".worktrees" / "STORY-1").resolve()
+        assert git(worktree, "rev-parse", "--abbrev-ref", "HEAD") == "story_STORY-1"
+        assert git(worktree, "rev-parse", "HEAD") == git(repo, "rev-parse", "HEAD")
+        assert (worktree / "README.md").read_text() == "new"
+        assert (worktree / "node_modules" / "installed").exists()
+        stats = pool.get_stats()
+        assert (stats["hits"], stats["refreshed"]) == (1, 1)
+
+    def test_spares_from_previous_process_are_adopted(self, tmp_path):
+        repo = make_repo(tmp_path / "project")
+        WorktreePool(repo, size=2, prepare=prepare).fill()
+
+        restarted = WorktreePool(repo, size=2)
+        assert restarted.fill() == 0
+        assert restarted.claim("story_A", repo / ".worktrees" / "A")
+        assert (repo / ".worktrees" / "A" / "node_modules" / "installed").exists()
@@ -162,6 +162,9 @@ def git_worktree_remove(
     Returns:
         True if successful, False otherwise
     """
+    from app.agents.developer.src.utils.workspace_index import drop_workspace_index
+
+    drop_workspace_index(worktree_path)
     try:
         # Pre-cleanup: remove locks before git command
         _remove_worktree_locks(worktree_path)
@@ -0,0 +1,342 @@
+"""Content-addressed node_modules snapshot store shared by all worktrees on the node.
+
+Every story worktree of a project installs the same lockfile, and projects
+created from the same boilerplate share it too. After a real install the
+store keeps a snapshot of ``node_modules`` keyed by the ``pnpm-lock.yaml``
+hash; the next worktree with that lockfile gets it materialized instead of
+running ``pnpm install``:
+
+- reflinks (copy-on-write, ``cp --reflink``) where the filesystem supports it
+- otherwise hardlinks, like pnpm's own content-addressable store (package
+  files are never written in place); per-file copy across devices
+
+``prisma generate`` does write in place, into every ``.prisma`` directory
+(``node_modules/.prisma`` or, with pnpm, inside ``.pnpm/@prisma+client*``),
+so those subtrees are always real copies. The generated client is also its
+own snapshot keyed by ``schema.prisma`` + lockfile hash, holding just those
+directories.
+
+Layout: ``{NODE_MODULES_CACHE_DIR}/{kind}/{key}/tree`` plus ``meta.json``,
+whose mtime is the entry's last use. Entries are evicted LRU once the store
+exceeds ``NODE_MODULES_CACHE_MAX_GB``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+NODE_MODULES = "node_modules"
+PRISMA_CLIENT = "prisma"
+
+
+def _hash_file(path: Path, extra: str = "") -> Optional[str]:
+    try:
+        digest = hashlib.sha256(path.read_bytes())
+    except OSError:
+        return None
+    digest.update(extra.encode())
+    return digest.hexdigest()[:32]
+
+
+def lockfile_key(workspace_path: str | Path) -> Optional[str]:
+    return _hash_file(Path(workspace_path) / "pnpm-lock.yaml")
+
+
+def prisma_key(workspace_path: str | Path) -> Optional[str]:
+    """Generated client depends on the schema and the Prisma version (in the lockfile)."""
+    lock = lockfile_key(workspace_path)
+    if lock is None:
+        return None
+    return _hash_file(Path(workspace_path) / "prisma" / "schema.prisma", extra=lock)
+
+
+# =============================================================================
+# TREE CLONING
+# =============================================================================
+
+def _reflink_tree(src: Path, dst: Path) -> bool:
+    try:
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=always", str(src), str(dst)],
+            capture_output=True,
+            timeout=600,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    if result.returncode != 0:
+        shutil.rmtree(dst, ignore_errors=True)
+        return False
+    return True
+
+
+def _link_tree(src: Path, dst: Path, copy_dirs: Iterable[str] = ()) -> None:
+    """Recreate ``src`` at ``dst``: directories, symlinks as-is, files as hardlinks.
+
+    Files below a directory named in ``copy_dirs`` are copied instead.
+    """
+    copy_dirs = set(copy_dirs)
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target = dst if rel == "." else dst / rel
+        target.mkdir(parents=True, exist_ok=True)
+        copy = bool(copy_dirs.intersection(Path(rel).parts))
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), target / name)
+            elif name in files:
+                if copy:
+                    shutil.copy2(path, target / name)
+                    continue
+                try:
+                    os.link(path, target / name)
+                except OSError:
+                    shutil.copy2(path, target / name)  # Other device / link limit
+
+
+class SnapshotStore:
+    """Snapshots keyed by (kind, content hash), LRU-evicted by disk budget."""
+
+    def __init__(self, root: Path | str, max_bytes: int):
+        self.root = Path(root).resolve()
+        self.max_bytes = max_bytes
+        self._reflink: Optional[bool] = None  # Probed on first clone
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "saves": 0, "evictions": 0, "restore_seconds": 0.0}
+
+    def _entry(self, kind: str, key: str) -> Path:
+        return self.root / kind / key
+
+    def _clone(self, src: Path, dst: Path, link: bool) -> None:
+        if self._reflink is not False:
+            self._reflink = _reflink_tree(src, dst)
+            if self._reflink:
+                return
+        if link:
+            _link_tree(src, dst, copy_dirs=(".prisma",))
+        else:
+            shutil.copytree(src, dst, symlinks=True)
+
+    def restore(self, kind: str, key: str, dst: Path | str, link: bool = True) -> bool:
+        """Materialize a snapshot at ``dst`` (which must not exist). False on a miss."""
+        started = time.monotonic()
+        dst = Path(dst)
+        entry = self._entry(kind, key)
+        tree = entry / "tree"
+        if dst.exists() or not tree.is_dir():
+            with self._lock:
+                self.stats["misses"] += 1
+            return False
+
+        tmp = dst.parent / f".{dst.name}.restore-{uuid4().hex[:8]}"
+        try:
+            self._clone(tree, tmp, link)
+            os.rename(tmp, dst)
+            os.utime(entry / "meta.json")
+        except Exception as e:
+            logger.warning(f"[node_modules_cache] Restoring {kind}/{key[:12]} failed: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            with self._lock:
+                self.stats["misses"] += 1
+            return False
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["restore_seconds"] += elapsed
+        logger.info(f"[node_modules_cache] Restored {kind} {key[:12]} into {dst.parent.name} in {elapsed:.1f}s")
+        return True
+
+    def restore_paths(self, kind: str, key: str, dst: Path | str) -> bool:
+        """Copy a snapshot saved with ``paths`` back into ``dst``, replacing those paths."""
+        started = time.monotonic()
+        dst = Path(dst)
+        entry = self._entry(kind, key)
+        try:
+            paths = json.loads((entry / "meta.json").read_text())["paths"]
+            for rel in paths:
+                target = dst / rel
+                tmp = target.parent / f".{target.name}.restore-{uuid4().hex[:8]}"
+                target.parent.mkdir(parents=True, exist_ok=True)
+                self._clone(entry / "tree" / rel, tmp, link=False)
+                shutil.rmtree(target, ignore_errors=True)
+                os.rename(tmp, target)
+            os.utime(entry / "meta.json")
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"[node_modules_cache] Restoring {kind}/{key[:12]} failed: {e}")
+            with self._lock:
+                self.stats["misses"] += 1
+            return False
+
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["restore_seconds"] += time.monotonic() - started
+        return True
+
+    def save(self, kind: str, key: str, src: Path | str, link: bool = True, paths: Optional[Iterable[str]] = None) -> bool:
+        """Snapshot ``src`` (or only ``paths`` below it) under (kind, key) unless stored, then evict."""
+        src = Path(src)
+        entry = self._entry(kind, key)
+        if (entry / "meta.json").exists() or not src.is_dir():
+            return False
+
+        tmp = self.root / kind / f".save-{uuid4().hex[:8]}"
+        meta: Dict[str, Any] = {"created": time.time()}
+        try:
+            tmp.mkdir(parents=True)
+            if paths is None:
+                self._clone(src, tmp / "tree", link)
+            else:
+                meta["paths"] = sorted(paths)
+                for rel in meta["paths"]:
+                    (tmp / "tree" / rel).parent.mkdir(parents=True, exist_ok=True)
+                    self._clone(src / rel, tmp / "tree" / rel, link)
+            size = meta["size"] = sum(
+                os.lstat(os.path.join(root, name)).st_size
+                for root, _, files in os.walk(tmp / "tree")
+                for name in files
+            )
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            os.rename(tmp, entry)  # Fails if another worktree stored the same key first
+        except Exception as e:
+            logger.debug(f"[node_modules_cache] Not storing {kind}/{key[:12]}: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+        with self._lock:
+            self.stats["saves"] += 1
+        logger.info(f"[node_modules_cache] Stored {kind} {key[:12]} ({size / 1024 ** 2:.0f} MB)")
+        self.evict(keep=entry)
+        return True
+
+    def _entries(self) -> list:
+        entries = []
+        for kind_dir in self.root.iterdir() if self.root.exists() else []:
+            for entry in kind_dir.iterdir() if kind_dir.is_dir() else []:
+                meta = entry / "meta.json"
+                try:
+                    entries.append((meta.stat().st_mtime, json.loads(meta.read_text())["size"], entry))
+                except (OSError, ValueError, KeyError):
+                    continue  # In-progress save or foreign file
+        return entries
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Remove least recently used entries until the store fits its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            trash = entry.parent / f".evict-{uuid4().hex[:8]}"
+            try:
+                os.rename(entry, trash)  # Restores in progress keep their open tree
+            except OSError:
+                continue
+            shutil.rmtree(trash, ignore_errors=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            with self._lock:
+                self.stats["evictions"] += evicted
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            return {
+                "root": str(self.root),
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "reflink": self._reflink,
+                **self.stats,
+            }
+
+
+# =============================================================================
+# WORKSPACE HELPERS
+# =============================================================================
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Node-wide store, or None when NODE_MODULES_CACHE_ENABLED is off."""
+    global _store
+    from app.core.config import settings
+
+    if not settings.NODE_MODULES_CACHE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore(
+                settings.NODE_MODULES_CACHE_DIR,
+                max_bytes=int(settings.NODE_MODULES_CACHE_MAX_GB * 1024 ** 3),
+            )
+        return _store
+
+
+def restore_node_modules(workspace_path: str | Path) -> bool:
+    """Materialize node_modules for the workspace's lockfile (fresh workspaces only)."""
+    store = get_snapshot_store()
+    key = lockfile_key(workspace_path)
+    if store is None or key is None:
+        return False
+    return store.restore(NODE_MODULES, key, Path(workspace_path) / "node_modules")
+
+
+def snapshot_node_modules(workspace_path: str | Path) -> bool:
+    """Store node_modules after a successful install."""
+    store = get_snapshot_store()
+    key = lockfile_key(workspace_path)
+    if store is None or key is None:
+        return False
+    return store.save(NODE_MODULES, key, Path(workspace_path) / "node_modules")
+
+
+def _prisma_client_dirs(node_modules: Path) -> list:
+    """Generated client locations relative to node_modules (hoisted and pnpm layouts)."""
+    found = [node_modules / ".prisma"] + list(node_modules.glob(".pnpm/@prisma+client*/node_modules/.prisma"))
+    return [str(path.relative_to(node_modules)) for path in found if path.is_dir()]
+
+
+def restore_prisma_client(workspace_path: str | Path) -> bool:
+    """Copy the generated client for this schema + lockfile into node_modules."""
+    store = get_snapshot_store()
+    key = prisma_key(workspace_path)
+    node_modules = Path(workspace_path) / "node_modules"
+    if store is None or key is None or not node_modules.is_dir():
+        return False
+    return store.restore_paths(PRISMA_CLIENT, key, node_modules)
+
+
+def snapshot_prisma_client(workspace_path: str | Path) -> bool:
+    """Store the generated client after a successful ``prisma generate``."""
+    store = get_snapshot_store()
+    key = prisma_key(workspace_path)
+    node_modules = Path(workspace_path) / "node_modules"
+    if store is None or key is None or not node_modules.is_dir():
+        return False
+    paths = _prisma_client_dirs(node_modules)
+    return bool(paths) and store.save(PRISMA_CLIENT, key, node_modules, link=False, paths=paths)
+
+
+def get_node_modules_cache_stats() -> Optional[Dict[str, Any]]:
+    with _store_lock:
+        store = _store
+    return store.get_stats() if store else None
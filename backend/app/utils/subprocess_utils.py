@@ -5,16 +5,20 @@ the application, particularly for managing dev servers and git operations.
 """
 
 import asyncio
+import codecs
 import logging
 import os
 import platform
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
 import time
+import weakref
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -220,6 +224,186 @@ async def run_subprocess_async(
     return await asyncio.to_thread(_run)
 
 
+# =============================================================================
+# ASYNC PROCESS RUNNER
+# =============================================================================
+# Agent nodes run pnpm/jest/eslint/prisma commands that take seconds to
+# minutes. subprocess.run on the event loop stalls every other story (and
+# the websocket) for that long; run_process awaits the child instead,
+# streams its output while it runs and kills the whole process tree on
+# timeout or cancellation.
+
+@dataclass
+class ProcessResult:
+    """Outcome of run_process."""
+
+    cmd: str
+    returncode: int  # -1 if the process timed out or could not start
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def output(self) -> str:
+        return self.stdout + self.stderr
+
+
+# Per event loop (asyncio primitives are loop-bound): node name -> semaphore
+_node_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+_process_stats = {"started": 0, "failed": 0, "timed_out": 0, "cancelled": 0, "running": 0, "queued": 0, "seconds": 0.0}
+
+
+def _node_slot(node: str) -> asyncio.Semaphore:
+    from app.core.config import settings
+
+    slots = _node_slots.setdefault(asyncio.get_running_loop(), {})
+    if node not in slots:
+        slots[node] = asyncio.Semaphore(max(1, settings.AGENT_PROCESS_MAX_PER_NODE))
+    return slots[node]
+
+
+def _kill_tree(proc: asyncio.subprocess.Process) -> None:
+    """Kill the process and everything it spawned (pnpm -> node -> workers)."""
+    if proc.returncode is not None:
+        return
+    if IS_WINDOWS:
+        kill_process(proc.pid, force=True)  # taskkill /T
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)  # Own session: pgid == pid
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_process(
+    cmd: list[str] | str,
+    cwd: str | Path | None = None,
+    timeout: float = 120,
+    env: Optional[Dict[str, str]] = None,
+    node: str = "default",
+    on_output: Optional[Callable[[str, str], Any]] = None,
+    story_logger: Any = None,
+) -> ProcessResult:
+    """Run a command without blocking the event loop.
+
+    Args:
+        cmd: Shell command string, or argv list (run without a shell)
+        cwd: Working directory
+        timeout: Seconds before the process tree is killed
+        env: Extra environment variables (merged over os.environ)
+        node: Concurrency group; at most AGENT_PROCESS_MAX_PER_NODE processes
+            of one node run at once, the rest wait
+        on_output: Called with (stream name, text chunk) as output arrives
+        story_logger: StoryLogger to stream the output to (under "$ cmd")
+
+    Returns:
+        ProcessResult; timeouts are reported in it, not raised
+    """
+    display = cmd if isinstance(cmd, str) else subprocess.list2cmdline(cmd)
+    spawn: Dict[str, Any] = {
+        "cwd": str(cwd) if cwd else None,
+        "env": {**os.environ, **env} if env else None,
+        "stdin": asyncio.subprocess.DEVNULL,
+        "stdout": asyncio.subprocess.PIPE,
+        "stderr": asyncio.subprocess.PIPE,
+    }
+    if IS_WINDOWS:
+        spawn["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        spawn["start_new_session"] = True
+
+    slot = _node_slot(node)
+    _process_stats["queued"] += 1
+    try:
+        await slot.acquire()
+    finally:
+        _process_stats["queued"] -= 1
+
+    started = time.monotonic()
+    chunks: Dict[str, list] = {"stdout": [], "stderr": []}
+
+    async def pump(reader: asyncio.StreamReader, name: str) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await reader.read(65536)
+            text = decoder.decode(data, final=not data)
+            if text:
+                chunks[name].append(text)
+                if on_output is not None:
+                    on_output(name, text)
+                if story_logger is not None:
+                    await story_logger.stream(f"$ {display}", text)
+            if not data:
+                return
+
+    proc = None
+    _process_stats["running"] += 1
+    try:
+        try:
+            if isinstance(cmd, str):
+                proc = await asyncio.create_subprocess_shell(cmd, **spawn)
+            else:
+                proc = await asyncio.create_subprocess_exec(*cmd, **spawn)
+        except OSError as e:
+            _process_stats["failed"] += 1
+            logger.warning(f"[run_process] Could not start '{display}': {e}")
+            return ProcessResult(display, -1, "", str(e), time.monotonic() - started)
+        _process_stats["started"] += 1
+
+        timed_out = False
+        pumps = asyncio.gather(pump(proc.stdout, "stdout"), pump(proc.stderr, "stderr"))
+        try:
+            await asyncio.wait_for(asyncio.shield(pumps), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _process_stats["timed_out"] += 1
+            logger.warning(f"[run_process] '{display}' timed out after {timeout}s, killing process group")
+            _kill_tree(proc)
+        except asyncio.CancelledError:
+            _process_stats["cancelled"] += 1
+            _kill_tree(proc)
+            pumps.cancel()
+            raise
+        finally:
+            if timed_out:
+                # Grandchildren holding the pipes are gone with the group; don't wait on them forever
+                try:
+                    await asyncio.wait_for(pumps, 5)
+                except (asyncio.TimeoutError, Exception):
+                    pumps.cancel()
+        try:
+            await asyncio.wait_for(proc.wait(), 5 if timed_out else None)
+        except asyncio.TimeoutError:
+            pass
+
+        if story_logger is not None:
+            await story_logger.stream(f"$ {display}", done=True)
+        duration = time.monotonic() - started
+        _process_stats["seconds"] += duration
+        return ProcessResult(
+            cmd=display,
+            returncode=-1 if timed_out or proc.returncode is None else proc.returncode,
+            stdout="".join(chunks["stdout"]),
+            stderr="".join(chunks["stderr"]),
+            duration=duration,
+            timed_out=timed_out,
+        )
+    finally:
+        _process_stats["running"] -= 1
+        slot.release()
+        if proc is not None and proc.returncode is None:
+            _kill_tree(proc)  # Cancelled while waiting: never leave orphans behind
+
+
+def get_process_runner_stats() -> Dict[str, Any]:
+    return {**_process_stats, "seconds": round(_process_stats["seconds"], 1)}
+
+
 def cleanup_dev_server(
     workspace_path: Path | str | None = None,
     port: int | None = None,
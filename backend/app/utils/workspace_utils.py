@@ -1,7 +1,7 @@
 """Shared workspace utilities for all agents (Developer, Tester, BA, etc.)
 
 This module provides unified workspace management functions including:
-- Git worktree setup and cleanup
+- Git worktree setup and cleanup (with a pre-warmed worktree pool)
 - Context file reading (AGENTS.md, README.md, etc.)
 - Workspace commit operations
 - ProjectWorkspaceManager class for workspace path management
@@ -20,6 +20,8 @@ from uuid import UUID
 
 from sqlmodel import Session
 
+from app.utils.worktree_pool import get_worktree_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +50,9 @@ def cleanup_old_worktree(
     Clean up worktree and branch
     """
     import platform
+    from app.agents.developer.src.utils.workspace_index import drop_workspace_index
+    
+    drop_workspace_index(worktree_path)
     
     # Prune first
     try:
@@ -117,6 +122,34 @@ def cleanup_old_worktree(
         pass
 
 
+def _auto_commit_uncommitted(main_workspace: Path, agent_name: str = "Agent") -> None:
+    """Commit uncommitted files in the main workspace so a new worktree has them."""
+    try:
+        status = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=str(main_workspace),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if status.returncode == 0 and status.stdout.strip():
+            subprocess.run(
+                ["git", "add", "-A"],
+                cwd=str(main_workspace),
+                capture_output=True,
+                timeout=30
+            )
+            subprocess.run(
+                ["git", "commit", "-m", "Auto-commit before worktree creation"],
+                cwd=str(main_workspace),
+                capture_output=True,
+                timeout=30,
+            )
+            logger.debug(f"[{agent_name}] Auto-committed uncommitted files")
+    except Exception as e:
+        logger.warning(f"[{agent_name}] Auto-commit failed: {e}")
+
+
 def setup_git_worktree(
     story_code: str,
     main_workspace: Path | str,
@@ -174,35 +207,28 @@ def setup_git_worktree(
             "workspace_ready": False,
         }
     
+    # Fast path: claim a pre-created, pre-installed worktree from the pool
+    pool = get_worktree_pool(main_workspace) if worktree_type in ("story", "test") else None
+    if pool is not None and pool.has_spare():
+        if worktree_type == "story":
+            _auto_commit_uncommitted(main_workspace, agent_name)
+        if pool.claim(branch_name, worktree_path, agent_name):
+            return {
+                "workspace_path": str(worktree_path),
+                "branch_name": branch_name,
+                "main_workspace": str(main_workspace),
+                "workspace_ready": True,
+                "pooled": True,
+            }
+    elif pool is not None:
+        pool.refill_async()  # Empty pool: this story builds its own, the next one is warm
+    
     # Clean up old worktree
     cleanup_old_worktree(main_workspace, branch_name, worktree_path, agent_name)
     
     # Auto-commit uncommitted files so worktree has them (story type only)
     if worktree_type == "story":
-        try:
-            status = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=str(main_workspace),
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if status.returncode == 0 and status.stdout.strip():
-                subprocess.run(
-                    ["git", "add", "-A"],
-                    cwd=str(main_workspace),
-                    capture_output=True,
-                    timeout=30
-                )
-                subprocess.run(
-                    ["git", "commit", "-m", "Auto-commit before worktree creation"],
-                    cwd=str(main_workspace),
-                    capture_output=True,
-                    timeout=30,
-                )
-                logger.debug(f"[{agent_name}] Auto-committed uncommitted files")
-        except Exception as e:
-            logger.warning(f"[{agent_name}] Auto-commit failed: {e}")
+        _auto_commit_uncommitted(main_workspace, agent_name)
     
     logger.info(f"[{agent_name}] Creating worktree '{branch_name}' at: {worktree_path}")
     
@@ -0,0 +1,250 @@
+"""Pre-warmed git worktree pool per project workspace.
+
+Creating a story worktree from scratch runs a series of blocking git
+commands and leaves a checkout without ``node_modules``, so the first
+``pnpm install`` happens on the story's critical path. The pool keeps a few
+spare worktrees per main workspace, checked out (detached) at the main
+HEAD and already prepared (``pnpm install``), under
+``{main}/.worktrees/_pool_*``.
+
+Claiming a spare for a story is a ``git worktree move`` plus a branch
+checkout (and a fast-forward checkout if main moved since the spare was
+made). The pool is refilled in a background thread. Spares left over from
+a previous process are adopted on the first fill.
+"""
+
+import logging
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+POOL_PREFIX = "_pool_"
+
+class WorktreePool:
+    """Spare worktrees of one main workspace."""
+
+    def __init__(self, main_workspace: Path, size: int, prepare: Optional[Callable[[str], Any]] = None):
+        self.main_workspace = Path(main_workspace).resolve()
+        self.size = size
+        self.prepare = prepare  # e.g. pnpm install; called with the spare's path
+
+        self._spares: List[Path] = []
+        self._lock = threading.Lock()
+        self._filling = False
+        self._adopted = False
+        self.stats = {
+            "claims": 0,
+            "hits": 0,
+            "misses": 0,
+            "refreshed": 0,
+            "created": 0,
+            "fill_errors": 0,
+            "claim_seconds": 0.0,
+        }
+
+    @property
+    def pool_dir(self) -> Path:
+        return self.main_workspace / ".worktrees"
+
+    def _git(self, *args: str, cwd: Optional[Path] = None, timeout: int = 60) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["git", *args],
+            cwd=str(cwd or self.main_workspace),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+    def _head(self, cwd: Optional[Path] = None) -> Optional[str]:
+        result = self._git("rev-parse", "HEAD", cwd=cwd, timeout=10)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    # ----- fill -----
+
+    def _adopt_existing(self) -> None:
+        """Reuse spares created by a previous process (already prepared)."""
+        result = self._git("worktree", "list", "--porcelain", timeout=10)
+        if result.returncode != 0:
+            return
+        for line in result.stdout.splitlines():
+            if not line.startswith("worktree "):
+                continue
+            path = Path(line[len("worktree "):]).resolve()
+            if path.parent == self.pool_dir and path.name.startswith(POOL_PREFIX) and path.is_dir():
+                if len(self._spares) < self.size:
+                    self._spares.append(path)
+                else:
+                    self._remove(path)
+        if self._spares:
+            logger.info(f"[WorktreePool] Adopted {len(self._spares)} spare worktrees in {self.main_workspace}")
+
+    def fill(self) -> int:
+        """Create spares until the pool is full (blocking). Returns spares created."""
+        with self._lock:
+            if not self._adopted:
+                self._adopted = True
+                self._adopt_existing()
+
+        created = 0
+        while True:
+            with self._lock:
+                if len(self._spares) >= self.size:
+                    return created
+            head = self._head()
+            if head is None:
+                return created
+            self.pool_dir.mkdir(exist_ok=True)
+            path = self.pool_dir / f"{POOL_PREFIX}{uuid4().hex[:8]}"
+            result = self._git("worktree", "add", "--detach", str(path), head)
+            if result.returncode != 0 or not path.is_dir():
+                self.stats["fill_errors"] += 1
+                logger.warning(f"[WorktreePool] Could not create spare worktree: {result.stderr.strip()[:200]}")
+                return created
+            if self.prepare:
+                try:
+                    self.prepare(str(path))
+                except Exception as e:
+                    logger.warning(f"[WorktreePool] Preparing {path.name} failed: {e}")
+            with self._lock:
+                self._spares.append(path)
+                self.stats["created"] += 1
+            created += 1
+
+    def refill_async(self) -> None:
+        """Top the pool up in the background (no-op while a refill runs)."""
+        with self._lock:
+            if self._filling or (self._adopted and len(self._spares) >= self.size):
+                return
+            self._filling = True
+
+        def run() -> None:
+            try:
+                self.fill()
+            except Exception as e:
+                logger.warning(f"[WorktreePool] Refill failed for {self.main_workspace}: {e}")
+            finally:
+                with self._lock:
+                    self._filling = False
+
+        # Daemon thread: git + pnpm install stay off the event loop and never hold up shutdown
+        threading.Thread(target=run, name=f"worktree-pool-{self.main_workspace.name}", daemon=True).start()
+
+    # ----- claim -----
+
+    def claim(self, branch_name: str, worktree_path: Path, agent_name: str = "Agent") -> bool:
+        """Turn a spare into ``worktree_path`` on a fresh ``branch_name``.
+
+        Returns:
+            True if the worktree is ready; False if no spare was available or
+            it could not be used (the caller creates the worktree itself)
+        """
+        started = time.monotonic()
+        with self._lock:
+            self.stats["claims"] += 1
+            spare = self._spares.pop(0) if self._spares else None
+            if spare is None:
+                self.stats["misses"] += 1
+        if spare is None:
+            self.refill_async()
+            return False
+
+        try:
+            ok = self._checkout(spare, branch_name, Path(worktree_path), agent_name)
+        except Exception as e:
+            logger.warning(f"[{agent_name}] Claiming pooled worktree failed: {e}")
+            ok = False
+        if not ok:
+            self._remove(spare)
+        with self._lock:
+            self.stats["hits" if ok else "misses"] += 1
+            if ok:
+                self.stats["claim_seconds"] += time.monotonic() - started
+        if ok:
+            logger.info(f"[{agent_name}] Claimed pooled worktree for '{branch_name}' in {time.monotonic() - started:.2f}s")
+        self.refill_async()
+        return ok
+
+    def _checkout(self, spare: Path, branch_name: str, worktree_path: Path, agent_name: str) -> bool:
+        from app.utils.workspace_utils import cleanup_old_worktree
+
+        head = self._head()
+        if head and self._head(cwd=spare) != head:
+            # Main moved since the spare was made; node_modules stays (install is lockfile-cached)
+            if self._git("checkout", "--detach", "--force", head, cwd=spare).returncode != 0:
+                return False
+            self.stats["refreshed"] += 1
+
+        if worktree_path.exists():
+            cleanup_old_worktree(self.main_workspace, branch_name, worktree_path, agent_name)
+        worktree_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._git("worktree", "move", str(spare), str(worktree_path)).returncode != 0:
+            return False
+
+        # -B resets a branch left over from an earlier run of the story
+        result = self._git("checkout", "-B", branch_name, cwd=worktree_path)
+        if result.returncode != 0:
+            logger.warning(f"[{agent_name}] Pooled worktree branch checkout failed: {result.stderr.strip()[:200]}")
+            cleanup_old_worktree(self.main_workspace, branch_name, worktree_path, agent_name)
+            return False
+        return True
+
+    def _remove(self, path: Path) -> None:
+        try:
+            self._git("worktree", "remove", "--force", str(path), timeout=30)
+        except Exception:
+            pass
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+        self._git("worktree", "prune", timeout=10)
+
+    def has_spare(self) -> bool:
+        with self._lock:
+            return bool(self._spares)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats["hits"]
+            return {
+                "main_workspace": str(self.main_workspace),
+                "size": self.size,
+                "spares": len(self._spares),
+                "filling": self._filling,
+                **self.stats,
+                "avg_claim_seconds": round(self.stats["claim_seconds"] / hits, 3) if hits else None,
+            }
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_pools: Dict[Path, WorktreePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_worktree_pool(main_workspace: Path | str, prepare: Optional[Callable[[str], Any]] = None) -> Optional[WorktreePool]:
+    """Process-wide pool of a main workspace, or None when pooling is off (WORKTREE_POOL_SIZE=0)."""
+    from app.core.config import settings
+
+    if settings.WORKTREE_POOL_SIZE <= 0:
+        return None
+    key = Path(main_workspace).resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = WorktreePool(key, settings.WORKTREE_POOL_SIZE, prepare)
+        elif prepare is not None:
+            pool.prepare = prepare
+        return pool
+
+
+def get_worktree_pool_stats() -> List[Dict[str, Any]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
@@ -0,0 +1,110 @@
+"""
+Worktree pool benchmark: time until a story workspace is ready.
+
+Builds a throwaway project repo and measures, per story, the time from
+``setup_git_worktree`` to a workspace with dependencies installed, which is
+what the Developer waits for before its first LLM call (``plan``):
+
+- cold: pool off, new worktree + dependency install on the critical path
+- pooled: a pre-warmed spare is claimed (install already done)
+
+The dependency install is simulated by materializing ``--deps`` files in
+``node_modules`` plus ``--install-seconds`` of wait (a real ``pnpm install``
+from the store typically takes several seconds), so the benchmark runs
+without node.
+
+Usage::
+
+    python -m app.utils.worktree_pool_benchmark
+    python -m app.utils.worktree_pool_benchmark --stories 10 --files 2000 --install-seconds 8
+"""
+
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.core.config import settings
+from app.utils.workspace_utils import setup_git_worktree
+from app.utils.worktree_pool import get_worktree_pool
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(cwd), capture_output=True, check=True)
+
+
+def make_project(root: Path, files: int) -> Path:
+    project = root / "project"
+    (project / "src").mkdir(parents=True)
+    _git(project, "init", "-q", "-b", "main")
+    _git(project, "config", "user.email", "bench@example.com")
+    _git(project, "config", "user.name", "bench")
+    (project / ".gitignore").write_text(".worktrees/\nnode_modules/\n")
+    (project / "package.json").write_text('{"name": "bench"}')
+    for i in range(files):
+        (project / "src" / f"file_{i}.ts").write_text(f"export const value{i} = {i};\n" * 20)
+    _git(project, "add", "-A")
+    _git(project, "commit", "-q", "-m", "init")
+    return project
+
+
+def make_install(deps: int, install_seconds: float):
+    def install(workspace_path: str) -> None:
+        node_modules = Path(workspace_path) / "node_modules"
+        if (node_modules / ".installed").exists():
+            return  # Lockfile unchanged: pnpm install is skipped
+        node_modules.mkdir(exist_ok=True)
+        for i in range(deps):
+            (node_modules / f"dep_{i}.js").write_text("module.exports = {};\n")
+        time.sleep(install_seconds)
+        (node_modules / ".installed").write_text("ok")
+
+    return install
+
+
+def time_stories(project: Path, stories: int, prefix: str, install, pooled: bool) -> List[float]:
+    pool = get_worktree_pool(project, prepare=install) if pooled else None
+    timings = []
+    for i in range(stories):
+        if pool is not None:
+            pool.fill()  # Background refill between stories in production
+        started = time.perf_counter()
+        info = setup_git_worktree(f"{prefix}-{i}", project, worktree_type="story", agent_name="bench")
+        install(info["workspace_path"])
+        timings.append(time.perf_counter() - started)
+    while pool is not None and pool.get_stats()["filling"]:
+        time.sleep(0.05)  # Let the background refill finish before the repo is deleted
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time to a ready story workspace: cold vs pooled worktrees")
+    parser.add_argument("--stories", type=int, default=5)
+    parser.add_argument("--files", type=int, default=500, help="Tracked files in the project")
+    parser.add_argument("--deps", type=int, default=500, help="Files written by the simulated install")
+    parser.add_argument("--install-seconds", type=float, default=3.0, help="Simulated pnpm install time")
+    args = parser.parse_args()
+
+    install = make_install(args.deps, args.install_seconds)
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_project(Path(tmp), args.files)
+        pool_size = settings.WORKTREE_POOL_SIZE
+        settings.WORKTREE_POOL_SIZE = 0
+        cold = time_stories(project, args.stories, "COLD", install, pooled=False)
+        settings.WORKTREE_POOL_SIZE = max(pool_size, 1)
+        warm = time_stories(project, args.stories, "WARM", install, pooled=True)
+        settings.WORKTREE_POOL_SIZE = pool_size
+
+    for name, timings in (("cold", cold), ("pooled", warm)):
+        print(  # noqa: T201
+            f"{name}: median {statistics.median(timings):.3f}s, "
+            f"max {max(timings):.3f}s over {len(timings)} stories"
+        )
+    print(f"speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
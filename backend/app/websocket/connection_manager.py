@@ -3,19 +3,19 @@
 Manages WebSocket connections per project room, handling:
 - Connection lifecycle (connect/disconnect)
 - Message broadcasting to project rooms
-- Database status synchronization
+- Presence tracking (persisted lazily by the presence registry)
 - Graceful cleanup of stale connections
 """
 
-import asyncio
 import logging
-from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 
+from app.websocket.presence import presence_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +44,7 @@ class ConnectionManager:
         self._connections[project_id].add(websocket)
         self._socket_to_project[websocket] = project_id
 
-        asyncio.create_task(self._update_project_status(project_id, connected=True))
+        presence_registry.mark_connected(project_id)
         
         logger.info(
             f"WebSocket connected to project {project_id} "
@@ -57,6 +57,8 @@ class ConnectionManager:
         if project_id is None:
             return
 
+        presence_registry.mark_disconnected(project_id)
+
         connections = self._connections.get(project_id)
         if connections:
             connections.discard(websocket)
@@ -64,22 +66,12 @@ class ConnectionManager:
             if not connections:
                 del self._connections[project_id]
                 logger.info(f"Project {project_id} room closed (no connections)")
-                self._schedule_disconnect_tasks(project_id)
             else:
                 logger.debug(
                     f"WebSocket disconnected from project {project_id} "
                     f"(remaining: {len(connections)})"
                 )
 
-    def _schedule_disconnect_tasks(self, project_id: UUID) -> None:
-        """Schedule background tasks for disconnect cleanup."""
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(self._update_project_status(project_id, connected=False))
-            loop.create_task(self._clear_active_agent(project_id))
-        except RuntimeError:
-            logger.debug("No event loop for disconnect cleanup")
-
     # =========================================================================
     # Message Sending
     # =========================================================================
@@ -178,49 +170,5 @@ class ConnectionManager:
         """Check if a project has any active connections."""
         return bool(self._connections.get(project_id))
 
-    # =========================================================================
-    # Database Operations (run in thread pool)
-    # =========================================================================
-
-    async def _update_project_status(self, project_id: UUID, connected: bool) -> None:
-        """Update project's WebSocket status in database."""
-        def _update(session):
-            from app.models import Project
-            project = session.get(Project, project_id)
-            if project:
-                project.websocket_connected = connected
-                project.websocket_last_seen = datetime.now(timezone.utc)
-                session.add(project)
-                session.commit()
-
-        try:
-            from app.core.async_db import DB
-            await DB.execute(_update)
-            logger.debug(f"Updated WebSocket status: project={project_id}, connected={connected}")
-        except Exception as e:
-            logger.error(f"Failed to update WebSocket status: {e}")
-
-    async def _clear_active_agent(self, project_id: UUID) -> None:
-        """Clear active agent context when project disconnects."""
-        def _clear(session):
-            from app.models import Project
-            project = session.get(Project, project_id)
-            if project and project.active_agent_id:
-                old_agent = project.active_agent_id
-                project.active_agent_id = None
-                project.active_agent_updated_at = None
-                session.add(project)
-                session.commit()
-                return old_agent
-            return None
-
-        try:
-            from app.core.async_db import DB
-            old_agent = await DB.execute(_clear)
-            if old_agent:
-                logger.info(f"Cleared active agent for project {project_id} (was: {old_agent})")
-        except Exception as e:
-            logger.error(f"Failed to clear active agent: {e}")
-
 
 connection_manager = ConnectionManager()
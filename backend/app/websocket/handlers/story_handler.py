@@ -2,6 +2,7 @@
 
 import logging
 from .base import BaseEventHandler
+from app.websocket.kanban_projection import kanban_projection
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class StoryHandler(BaseEventHandler):
             }
 
             await self._broadcast(project_id, ws_message)
+            await self._apply_to_projection(project_id, event_data)
 
         except Exception as e:
             logger.error(f"Error handling story created: {e}", exc_info=True)
@@ -51,6 +53,7 @@ class StoryHandler(BaseEventHandler):
             }
 
             await self._broadcast(project_id, ws_message)
+            await self._apply_to_projection(project_id, event_data)
 
         except Exception as e:
             logger.error(f"Error handling story updated: {e}", exc_info=True)
@@ -74,6 +77,7 @@ class StoryHandler(BaseEventHandler):
             }
 
             await self._broadcast(project_id, ws_message)
+            await self._apply_to_projection(project_id, event_data)
 
         except Exception as e:
             logger.error(f"Error handling story status change: {e}", exc_info=True)
@@ -100,7 +104,49 @@ class StoryHandler(BaseEventHandler):
             }
 
             await self._broadcast(project_id, ws_message)
+            await self._apply_to_projection(project_id, event_data)
             logger.debug(f"Broadcasted story agent state to project {project_id}")
 
         except Exception as e:
             logger.error(f"Error handling story agent state: {e}", exc_info=True)
+
+    async def handle_story_assigned(self, event):
+        """Handle assignee/reviewer change (board delta only)."""
+        try:
+            event_data = self._normalize_event(event)
+            project_id = self._to_uuid(event_data.get("project_id"))
+
+            if not project_id:
+                logger.warning("Story assigned event missing project_id")
+                return
+
+            await self._apply_to_projection(project_id, event_data)
+
+        except Exception as e:
+            logger.error(f"Error handling story assigned: {e}", exc_info=True)
+
+    async def handle_story_deleted(self, event):
+        """Handle story deletion (board delta only)."""
+        try:
+            event_data = self._normalize_event(event)
+            project_id = self._to_uuid(event_data.get("project_id"))
+
+            if not project_id:
+                logger.warning("Story deleted event missing project_id")
+                return
+
+            await self._apply_to_projection(project_id, event_data, deleted=True)
+
+        except Exception as e:
+            logger.error(f"Error handling story deleted: {e}", exc_info=True)
+
+    async def _apply_to_projection(self, project_id, event_data, deleted: bool = False) -> None:
+        """Patch the server-side Kanban projection and push a `kanban_patch` delta."""
+        story_id = event_data.get("story_id")
+        if not story_id:
+            return
+        try:
+            await kanban_projection.apply_story_change(project_id, story_id, deleted=deleted)
+        except Exception as e:
+            logger.warning(f"Failed to apply story {story_id} to Kanban projection: {e}")
+            kanban_projection.invalidate(project_id)
@@ -84,6 +84,8 @@ class WebSocketKafkaBridge:
             self.consumer.register_handler("story.updated", self.story_handler.handle_story_updated)
             self.consumer.register_handler("story.status.changed", self.story_handler.handle_story_status_changed)
             self.consumer.register_handler("story.agent_state.changed", self.story_handler.handle_story_agent_state_changed)
+            self.consumer.register_handler("story.assigned", self.story_handler.handle_story_assigned)
+            self.consumer.register_handler("story.deleted", self.story_handler.handle_story_deleted)
 
             # Register flow handlers
             self.consumer.register_handler("flow.started", self.flow_handler.handle_flow_event)
@@ -0,0 +1,443 @@
+"""
+Kanban Board Projection
+
+Server-maintained per-project Kanban board kept up to date from ``story.*``
+events and from every committed ORM write to a story (see
+``track_story_writes``). Each change is pushed to the project room as a
+JSON-patch-style delta, so clients only need a full board on first load (or
+after a version gap).
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.websocket.connection_manager import ConnectionManager, connection_manager
+
+
+logger = logging.getLogger(__name__)
+
+
+COMPLETED_COLUMNS = ("Done", "Archived")
+
+
+def _rank_key(story: Dict[str, Any]) -> Tuple[bool, int]:
+    """Sort key matching ``ORDER BY rank`` (NULLs last)."""
+    rank = story.get("rank")
+    return (rank is None, rank or 0)
+
+
+def diff_story(path: str, old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build field-level JSON-patch ops turning ``old`` into ``new``."""
+    ops = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append({"op": "add", "path": f"{path}/{key}", "value": value})
+        elif old[key] != value:
+            ops.append({"op": "replace", "path": f"{path}/{key}", "value": value})
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{key}"})
+    return ops
+
+
+@dataclass
+class BoardState:
+    """In-memory Kanban board for one project."""
+
+    project_id: UUID
+    project_name: str
+    wip_limits: Dict[str, Any]
+    board: Dict[str, List[Dict[str, Any]]]
+    version: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def locate(self, story_id: str) -> Optional[Tuple[str, int]]:
+        for column, stories in self.board.items():
+            for index, story in enumerate(stories):
+                if story["id"] == story_id:
+                    return column, index
+        return None
+
+    def completed_ids(self) -> set[str]:
+        return {
+            story["id"]
+            for column in COMPLETED_COLUMNS
+            for story in self.board.get(column, [])
+        }
+
+    def to_response(self) -> Dict[str, Any]:
+        """Same shape as ``StoryService.get_kanban_board`` plus version."""
+        return {
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "board": self.board,
+            "wip_limits": self.wip_limits,
+            "version": self.version,
+        }
+
+
+class KanbanProjection:
+    """
+    Maintain Kanban boards in memory and emit deltas on story changes.
+
+    The board for a project is built once from the database (cold start) and
+    then patched one story at a time. Every patch bumps ``version``; a client
+    whose version does not match ``base_version`` of a delta re-fetches.
+    Versions stay monotonic across rebuilds (and restarts): a rebuilt board
+    starts above both the last version of that project and the current time
+    in microseconds, so an old board version never matches a new board.
+    """
+
+    def __init__(self, manager: ConnectionManager, max_projects: int = 200):
+        self.connection_manager = manager
+        self.max_projects = max_projects
+
+        # project_id -> BoardState (insertion order used for LRU eviction)
+        self._boards: Dict[UUID, BoardState] = {}
+        self._build_locks: Dict[UUID, asyncio.Lock] = {}
+        # project_id -> last version handed out (kept after invalidation/eviction)
+        self._versions: Dict[UUID, int] = {}
+
+        # Committed story writes (see track_story_writes)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._forward = False
+        self._pending: Set[asyncio.Task] = set()
+
+        # Statistics
+        self.total_builds = 0
+        self.total_deltas = 0
+
+    # =========================================================================
+    # Board Access
+    # =========================================================================
+
+    async def get_board(self, project_id: UUID) -> Dict[str, Any]:
+        """Get the board for a project, building it on cold start.
+
+        Raises:
+            ValueError: If project not found
+        """
+        state = self._boards.get(project_id)
+        if state is None:
+            state = await self._build(project_id)
+        else:
+            # Refresh LRU position
+            self._boards.pop(project_id)
+            self._boards[project_id] = state
+        return state.to_response()
+
+    def invalidate(self, project_id: UUID) -> None:
+        """Drop a cached board (next read rebuilds it)."""
+        self._boards.pop(project_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cached_projects": len(self._boards),
+            "total_builds": self.total_builds,
+            "total_deltas": self.total_deltas,
+            "tracking_story_writes": self._loop is not None,
+            "forwarding_story_writes": self._forward,
+        }
+
+    def _next_version(self, project_id: UUID) -> int:
+        version = max(self._versions.get(project_id, -1) + 1, time.time_ns() // 1000)
+        self._versions[project_id] = version
+        return version
+
+    async def _build(self, project_id: UUID) -> BoardState:
+        lock = self._build_locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            state = self._boards.get(project_id)
+            if state is not None:
+                return state
+
+            from app.core.async_db import DB
+            from app.services.story_service import StoryService
+
+            data = await DB.execute(
+                lambda session: StoryService(session).get_kanban_board(project_id)
+            )
+            state = BoardState(
+                project_id=project_id,
+                project_name=data["project_name"],
+                wip_limits=data["wip_limits"],
+                board=data["board"],
+                version=self._next_version(project_id),
+            )
+            self._boards[project_id] = state
+            self.total_builds += 1
+
+            while len(self._boards) > self.max_projects:
+                evicted = next(iter(self._boards))
+                del self._boards[evicted]
+                logger.debug(f"Evicted Kanban projection for project {evicted}")
+
+            self._build_locks.pop(project_id, None)
+            return state
+
+    # =========================================================================
+    # Incremental Updates
+    # =========================================================================
+
+    async def apply_story_change(
+        self,
+        project_id: UUID,
+        story_id: UUID | str,
+        deleted: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Patch the project board for one changed story and broadcast the delta.
+
+        Only projects with a cached board are patched; others are built lazily
+        on the next read.
+
+        Returns:
+            The delta message, or None if nothing changed / board not cached
+        """
+        state = self._boards.get(project_id)
+        if state is None:
+            return None
+
+        story_id = str(story_id)
+        async with state.lock:
+            new_story = None
+            if not deleted:
+                from app.core.async_db import DB
+                from app.services.story_service import StoryService
+
+                completed = state.completed_ids()
+                new_story = await DB.execute(
+                    lambda session: StoryService(session).get_kanban_story(
+                        UUID(story_id), completed
+                    )
+                )
+
+            ops = self._apply(state, story_id, new_story)
+            if not ops:
+                return None
+
+            base_version = state.version
+            state.version = self._next_version(project_id)
+            delta = {
+                "type": "kanban_patch",
+                "project_id": str(project_id),
+                "base_version": base_version,
+                "version": state.version,
+                "ops": ops,
+            }
+
+        self.total_deltas += 1
+        await self.connection_manager.broadcast_to_project(delta, project_id)
+        return delta
+
+    def _apply(
+        self,
+        state: BoardState,
+        story_id: str,
+        new_story: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Mutate board state and return JSON-patch ops describing the change."""
+        ops: List[Dict[str, Any]] = []
+        location = state.locate(story_id)
+        old_story = None
+        was_completed = False
+
+        if location:
+            column, index = location
+            old_story = state.board[column][index]
+            was_completed = column in COMPLETED_COLUMNS
+
+        new_column = new_story["status"] if new_story else None
+        if new_column is not None and new_column not in state.board:
+            new_column = None
+            new_story = None
+
+        if old_story is not None and new_story is not None:
+            column, index = location
+            stories = state.board[column]
+            same_slot = column == new_column and _rank_key(old_story) == _rank_key(new_story)
+            if same_slot:
+                ops.extend(diff_story(f"/board/{column}/{index}", old_story, new_story))
+                stories[index] = new_story
+            else:
+                del stories[index]
+                ops.append({"op": "remove", "path": f"/board/{column}/{index}"})
+                ops.append(self._insert(state, new_column, new_story))
+        elif old_story is not None:
+            column, index = location
+            del state.board[column][index]
+            ops.append({"op": "remove", "path": f"/board/{column}/{index}"})
+        elif new_story is not None:
+            ops.append(self._insert(state, new_column, new_story))
+
+        is_completed = new_column in COMPLETED_COLUMNS if new_column else False
+        if was_completed != is_completed or (old_story is not None and new_story is None):
+            ops.extend(self._recompute_dependents(state, story_id))
+
+        return ops
+
+    # =========================================================================
+    # Committed Story Writes
+    # =========================================================================
+
+    def track_story_writes(self, forward: bool = False) -> None:
+        """Patch boards (or forward events) for every committed ORM write to a story.
+
+        Must be called from the process event loop. The API process applies
+        writes to its own boards; agent worker processes (``forward=True``)
+        hold no boards and publish ``story.updated``/``story.deleted`` for the
+        API process's Kafka bridge instead.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._forward = forward
+        _register_session_hooks()
+
+    def story_writes_committed(self, changes: Dict[str, Tuple[Optional[UUID], bool]]) -> None:
+        """Called from ``Session.after_commit`` (any thread) with story_id -> (project_id, deleted)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        def schedule():
+            task = loop.create_task(self._apply_committed(changes))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            schedule()
+        else:
+            loop.call_soon_threadsafe(schedule)
+
+    async def _apply_committed(self, changes: Dict[str, Tuple[Optional[UUID], bool]]) -> None:
+        if BULK_STORY_WRITE in changes:
+            # ORM bulk UPDATE/DELETE: affected stories unknown, rebuild on next read
+            self._boards.clear()
+        for story_id, (project_id, deleted) in changes.items():
+            if story_id == BULK_STORY_WRITE or project_id is None:
+                continue
+            try:
+                if self._forward:
+                    await _publish_story_change(project_id, story_id, deleted)
+                else:
+                    await self.apply_story_change(project_id, story_id, deleted=deleted)
+            except Exception as e:
+                logger.warning(f"Failed to apply committed write of story {story_id}: {e}")
+                self.invalidate(project_id)
+
+    @staticmethod
+    def _insert(state: BoardState, column: str, story: Dict[str, Any]) -> Dict[str, Any]:
+        stories = state.board[column]
+        keys = [_rank_key(s) for s in stories]
+        index = bisect.bisect_right(keys, _rank_key(story))
+        stories.insert(index, story)
+        return {"op": "add", "path": f"/board/{column}/{index}", "value": story}
+
+    @staticmethod
+    def _recompute_dependents(state: BoardState, story_id: str) -> List[Dict[str, Any]]:
+        """Refresh blocked state of stories that depend on ``story_id``."""
+        ops = []
+        completed = state.completed_ids()
+        for column, stories in state.board.items():
+            if column in COMPLETED_COLUMNS:
+                continue
+            for index, story in enumerate(stories):
+                dependencies = story.get("dependencies") or []
+                if story_id not in dependencies:
+                    continue
+                blocked_by_count = sum(
+                    1 for dep_id in dependencies if dep_id and dep_id not in completed
+                )
+                updated = {
+                    **story,
+                    "is_blocked": blocked_by_count > 0,
+                    "blocked_by_count": blocked_by_count,
+                }
+                ops.extend(diff_story(f"/board/{column}/{index}", story, updated))
+                stories[index] = updated
+        return ops
+
+
+kanban_projection = KanbanProjection(connection_manager)
+
+
+# =============================================================================
+# Story Write Tracking (SQLAlchemy session events)
+# =============================================================================
+
+STORY_CHANGES_KEY = "kanban_story_changes"
+BULK_STORY_WRITE = "*"
+
+_hooks_registered = False
+
+
+def _register_session_hooks() -> None:
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    event.listen(Session, "after_flush", _record_flush)
+    event.listen(Session, "do_orm_execute", _record_bulk_write)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _discard_changes)
+    _hooks_registered = True
+
+
+def _record_flush(session, _flush_context) -> None:
+    """Collect stories inserted, modified or deleted by this flush (pre-flush state is still visible)."""
+    from app.models import Story
+
+    changes = session.info.setdefault(STORY_CHANGES_KEY, {})
+    for obj in session.new:
+        if isinstance(obj, Story):
+            changes[str(obj.id)] = (obj.project_id, False)
+    for obj in session.dirty:
+        if isinstance(obj, Story) and session.is_modified(obj, include_collections=False):
+            changes[str(obj.id)] = (obj.project_id, False)
+    for obj in session.deleted:
+        if isinstance(obj, Story):
+            changes[str(obj.id)] = (obj.project_id, True)
+
+
+def _record_bulk_write(orm_execute_state) -> None:
+    from app.models import Story
+
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Story:
+        orm_execute_state.session.info.setdefault(STORY_CHANGES_KEY, {})[BULK_STORY_WRITE] = (None, False)
+
+
+def _after_commit(session) -> None:
+    changes = session.info.pop(STORY_CHANGES_KEY, None)
+    if changes:
+        kanban_projection.story_writes_committed(changes)
+
+
+def _discard_changes(session) -> None:
+    session.info.pop(STORY_CHANGES_KEY, None)
+
+
+async def _publish_story_change(project_id: UUID, story_id: str, deleted: bool) -> None:
+    """Forward a committed story write to the API process (story.updated / story.deleted)."""
+    from app.kafka import KafkaTopics, StoryEvent, StoryEventType, get_kafka_producer
+
+    producer = await get_kafka_producer()
+    await producer.publish(
+        topic=KafkaTopics.STORY_EVENTS,
+        event=StoryEvent(
+            event_type=(StoryEventType.DELETED if deleted else StoryEventType.UPDATED).value,
+            project_id=str(project_id),
+            story_id=story_id,
+        ),
+    )
@@ -0,0 +1,299 @@
+"""
+Presence Registry
+
+In-memory WebSocket presence per project with debounced, batched persistence
+of ``websocket_connected`` / ``websocket_last_seen`` and a grace period before
+the active agent is cleared on disconnect.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import Project
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProjectPresence:
+    """Live presence state for one project room."""
+
+    connections: int = 0
+    last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    disconnected_at: Optional[datetime] = None
+
+    # Last values written to the database
+    persisted_connected: Optional[bool] = None
+    persisted_last_seen: Optional[datetime] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.connections > 0
+
+
+class PresenceRegistry:
+    """
+    Track WebSocket presence in memory and persist it lazily.
+
+    Connect/disconnect/activity only touch memory. A periodic flush writes
+    the projects whose state actually changed in a single transaction, so
+    page reloads and tab churn collapse into at most one write per project
+    per flush interval.
+    """
+
+    def __init__(
+        self,
+        flush_interval: int = 10,
+        last_seen_resolution: int = 60,
+        active_agent_grace_seconds: int = 120,
+    ):
+        """
+        Initialize presence registry.
+
+        Args:
+            flush_interval: Seconds between batched DB flushes
+            last_seen_resolution: Minimum drift (seconds) before an activity-only
+                ``websocket_last_seen`` change is persisted
+            active_agent_grace_seconds: Seconds a room must stay empty before
+                ``active_agent_id`` is cleared
+        """
+        self.flush_interval = flush_interval
+        self.last_seen_resolution = last_seen_resolution
+        self.active_agent_grace_seconds = active_agent_grace_seconds
+
+        # project_id -> ProjectPresence
+        self._presence: Dict[UUID, ProjectPresence] = {}
+        # project_id -> pending active agent clear
+        self._clear_tasks: Dict[UUID, asyncio.Task] = {}
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Statistics
+        self.total_flushes = 0
+        self.total_rows_written = 0
+
+    async def start(self) -> None:
+        """Start periodic flush task."""
+        if self._running:
+            logger.warning("Presence registry already running")
+            return
+
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+        logger.info(f"Presence registry started (flush_interval={self.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Stop flush task, cancel pending clears and persist final state."""
+        self._running = False
+
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        for task in list(self._clear_tasks.values()):
+            task.cancel()
+        self._clear_tasks.clear()
+
+        try:
+            await self.flush()
+        except (Exception, asyncio.CancelledError) as e:
+            logger.error(f"Error during final presence flush: {e}")
+
+        logger.info("Presence registry stopped")
+
+    async def _flush_loop(self) -> None:
+        """Periodic flush loop; a failed flush is retried on the next tick."""
+        try:
+            while self._running:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Error in presence flush loop: {e}")
+        except asyncio.CancelledError:
+            logger.debug("Presence flush loop cancelled")
+
+    # =========================================================================
+    # State Updates (memory only)
+    # =========================================================================
+
+    def mark_connected(self, project_id: UUID) -> None:
+        """Record a new socket in the project room."""
+        presence = self._presence.setdefault(project_id, ProjectPresence())
+        presence.connections += 1
+        presence.last_seen = datetime.now(timezone.utc)
+        presence.disconnected_at = None
+
+        pending = self._clear_tasks.pop(project_id, None)
+        if pending:
+            pending.cancel()
+            logger.debug(f"Reconnected within grace period, kept active agent for {project_id}")
+
+    def mark_disconnected(self, project_id: UUID) -> None:
+        """Record a socket leaving the project room."""
+        presence = self._presence.get(project_id)
+        if presence is None:
+            return
+
+        presence.connections = max(0, presence.connections - 1)
+        presence.last_seen = datetime.now(timezone.utc)
+
+        if not presence.connected:
+            presence.disconnected_at = presence.last_seen
+            self._schedule_active_agent_clear(project_id)
+
+    def touch(self, project_id: UUID) -> None:
+        """Record user activity on an open socket."""
+        presence = self._presence.get(project_id)
+        if presence is not None:
+            presence.last_seen = datetime.now(timezone.utc)
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def is_connected(self, project_id: UUID) -> bool:
+        """Check if any socket is open for the project."""
+        presence = self._presence.get(project_id)
+        return bool(presence and presence.connected)
+
+    def get_last_seen(self, project_id: UUID) -> Optional[datetime]:
+        """Get last connect/disconnect/activity time for the project."""
+        presence = self._presence.get(project_id)
+        return presence.last_seen if presence else None
+
+    def get_stats(self) -> dict:
+        """Get registry statistics."""
+        return {
+            "tracked_projects": len(self._presence),
+            "connected_projects": sum(1 for p in self._presence.values() if p.connected),
+            "pending_clears": len(self._clear_tasks),
+            "total_flushes": self.total_flushes,
+            "total_rows_written": self.total_rows_written,
+        }
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def _needs_write(self, presence: ProjectPresence) -> bool:
+        if presence.persisted_connected != presence.connected:
+            return True
+        if presence.persisted_last_seen is None:
+            return True
+        drift = (presence.last_seen - presence.persisted_last_seen).total_seconds()
+        return drift >= self.last_seen_resolution
+
+    async def flush(self) -> int:
+        """
+        Persist changed presence rows in one transaction.
+
+        Returns:
+            Number of project rows written
+        """
+        rows = []
+        for project_id, presence in self._presence.items():
+            if self._needs_write(presence):
+                rows.append({
+                    "id": project_id,
+                    "websocket_connected": presence.connected,
+                    "websocket_last_seen": presence.last_seen,
+                })
+
+        if not rows:
+            return 0
+
+        def _write():
+            with Session(engine) as session:
+                session.execute(update(Project), rows)
+                session.commit()
+
+        from app.core.async_db import run_in_thread
+        await run_in_thread(_write)
+
+        for row in rows:
+            presence = self._presence.get(row["id"])
+            if presence is None:
+                continue
+            presence.persisted_connected = row["websocket_connected"]
+            presence.persisted_last_seen = row["websocket_last_seen"]
+
+        self._evict_idle()
+
+        self.total_flushes += 1
+        self.total_rows_written += len(rows)
+        logger.debug(f"Flushed presence for {len(rows)} projects")
+        return len(rows)
+
+    def _evict_idle(self) -> None:
+        """Drop fully persisted, disconnected entries past the grace period."""
+        now = datetime.now(timezone.utc)
+        for project_id, presence in list(self._presence.items()):
+            if presence.connected or presence.disconnected_at is None:
+                continue
+            if project_id in self._clear_tasks or self._needs_write(presence):
+                continue
+            idle = (now - presence.disconnected_at).total_seconds()
+            if idle > self.active_agent_grace_seconds:
+                del self._presence[project_id]
+
+    def _schedule_active_agent_clear(self, project_id: UUID) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("No event loop for active agent clear")
+            return
+
+        pending = self._clear_tasks.pop(project_id, None)
+        if pending:
+            pending.cancel()
+        self._clear_tasks[project_id] = loop.create_task(
+            self._clear_active_agent_after_grace(project_id)
+        )
+
+    async def _clear_active_agent_after_grace(self, project_id: UUID) -> None:
+        """Clear active agent context if the room stays empty for the grace period."""
+        try:
+            await asyncio.sleep(self.active_agent_grace_seconds)
+        except asyncio.CancelledError:
+            return
+
+        self._clear_tasks.pop(project_id, None)
+        if self.is_connected(project_id):
+            return
+
+        def _clear(session):
+            project = session.get(Project, project_id)
+            if project and project.active_agent_id:
+                old_agent = project.active_agent_id
+                project.active_agent_id = None
+                project.active_agent_updated_at = None
+                session.add(project)
+                session.commit()
+                return old_agent
+            return None
+
+        try:
+            from app.core.async_db import DB
+            old_agent = await DB.execute(_clear)
+            if old_agent:
+                logger.info(f"Cleared active agent for project {project_id} (was: {old_agent})")
+        except Exception as e:
+            logger.error(f"Failed to clear active agent: {e}")
+
+
+presence_registry = PresenceRegistry()
@@ -0,0 +1,137 @@
+"""
+Stream Buffer
+
+Coalesces partial LLM output (e.g. a file being generated by an implement
+step) into at most one ``story_stream`` frame per project room per flush
+interval. Deltas for the same (story, file) are concatenated, so a frame
+carries everything that arrived since the previous one.
+
+Frame::
+
+    {
+        "type": "story_stream",
+        "updates": [
+            {"story_id", "file_path", "node", "offset", "delta", "chars", "tokens", "done"},
+        ],
+        "timestamp": "...",
+    }
+
+``offset`` is the position of ``delta`` in the file content, so clients can
+detect a gap (e.g. after reconnecting) and wait for the written file.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+from uuid import UUID
+
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # Output token progress is estimated until the final usage arrives
+
+
+class StreamBuffer:
+    """Per-room coalescing of streamed LLM output."""
+
+    def __init__(self, flush_interval: float = 0.25):
+        self.flush_interval = flush_interval
+
+        # project_id -> (story_id, file_path) -> pending update
+        self._pending: Dict[UUID, Dict[Tuple[str, str], dict]] = {}
+        # (story_id, file_path) -> chars sent so far
+        self._offsets: Dict[Tuple[str, str], int] = {}
+        self._flush_tasks: Dict[UUID, asyncio.Task] = {}
+
+        # Statistics
+        self.total_updates = 0
+        self.total_frames = 0
+
+    def push(
+        self,
+        project_id: UUID,
+        story_id: str,
+        file_path: str,
+        delta: str = "",
+        node: str = "",
+        done: bool = False,
+    ) -> None:
+        """Queue a delta; a frame for the room is sent within ``flush_interval``."""
+        key = (story_id, file_path)
+        room = self._pending.setdefault(project_id, {})
+        offset = self._offsets.get(key, 0)
+        update = room.get(key)
+        if update is None:
+            update = room[key] = {
+                "story_id": story_id,
+                "file_path": file_path,
+                "node": node,
+                "offset": offset,
+                "parts": [],
+                "done": False,
+            }
+        if delta:
+            update["parts"].append(delta)
+            offset += len(delta)
+        update["chars"] = offset
+        update["done"] = update["done"] or done
+        if done:
+            self._offsets.pop(key, None)
+        else:
+            self._offsets[key] = offset
+        self.total_updates += 1
+
+        if project_id not in self._flush_tasks:
+            self._flush_tasks[project_id] = asyncio.create_task(self._flush_later(project_id))
+
+    async def _flush_later(self, project_id: UUID) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+        finally:
+            self._flush_tasks.pop(project_id, None)
+        await self.flush(project_id)
+
+    async def flush(self, project_id: UUID) -> int:
+        """Send pending updates of a room as one frame."""
+        from app.websocket.connection_manager import connection_manager
+
+        room = self._pending.pop(project_id, None)
+        if not room:
+            return 0
+
+        updates = []
+        for update in room.values():
+            parts = update.pop("parts")
+            updates.append({
+                **update,
+                "delta": "".join(parts),
+                "tokens": update["chars"] // CHARS_PER_TOKEN,
+            })
+        self.total_frames += 1
+        try:
+            return await connection_manager.broadcast_to_project({
+                "type": "story_stream",
+                "updates": updates,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }, project_id)
+        except Exception as e:
+            logger.debug(f"[StreamBuffer] Flush for {project_id} failed: {e}")
+            return 0
+
+    def get_stats(self) -> dict:
+        return {
+            "rooms_pending": len(self._pending),
+            "streams_open": len(self._offsets),
+            "total_updates": self.total_updates,
+            "total_frames": self.total_frames,
+        }
+
+
+def _create_stream_buffer() -> StreamBuffer:
+    from app.core.config import settings
+
+    return StreamBuffer(flush_interval=settings.AGENT_STREAM_FLUSH_INTERVAL)
+
+
+stream_buffer = _create_stream_buffer()
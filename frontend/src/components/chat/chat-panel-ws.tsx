@@ -1267,7 +1267,8 @@ export function ChatPanelWS({
                                     : story
                                 )
                               }
-                              return { ...oldData, board: newBoard }
+                              // Local edit: drop the version so kanban_patch ops (index-addressed) re-fetch until the refetch lands
+                              return { ...oldData, board: newBoard, version: undefined }
                             })
                           }
                           // Also refetch to ensure consistency
@@ -1293,7 +1294,8 @@ export function ChatPanelWS({
                               for (const column of Object.keys(newBoard)) {
                                 newBoard[column] = newBoard[column].filter((story: any) => story.id !== removedStoryId)
                               }
-                               return { ...oldData, board: newBoard }
+                              // Local edit: drop the version so kanban_patch ops (index-addressed) re-fetch until the refetch lands
+                              return { ...oldData, board: newBoard, version: undefined }
                             })
                           }
                           // Also refetch to ensure consistency
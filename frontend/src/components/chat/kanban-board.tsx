@@ -56,6 +56,32 @@ const COLUMNS: Column[] = [
   { id: "archived", title: "Archived" },
 ]
 
+// Kanban Patch Helper
+// Apply JSON-patch ops (add/remove/replace) from a `kanban_patch` delta to board data
+function applyKanbanPatch(data: any, ops: any[]): any {
+  const next = { ...data, board: { ...data.board } }
+  for (const op of ops) {
+    const [, root, column, indexStr, field] = op.path.split('/')
+    if (root !== 'board' || !column) continue
+    const items = [...(next.board[column] || [])]
+    const index = indexStr === '-' ? items.length : Number(indexStr)
+    if (field) {
+      const item = { ...items[index] }
+      if (op.op === 'remove') delete item[field]
+      else item[field] = op.value
+      items[index] = item
+    } else if (op.op === 'add') {
+      items.splice(index, 0, op.value)
+    } else if (op.op === 'remove') {
+      items.splice(index, 1)
+    } else if (op.op === 'replace') {
+      items[index] = op.value
+    }
+    next.board[column] = items
+  }
+  return next
+}
+
 // Sortable Card Component
 function SortableCard({
   card,
@@ -359,6 +385,31 @@ export function KanbanBoard({ kanbanData, projectId, onViewFiles }: KanbanBoardP
     }
   }, [])
 
+  // Apply server-side board deltas; re-fetch on version gap
+  useEffect(() => {
+    const handleKanbanPatch = (event: CustomEvent) => {
+      const { project_id, base_version, version, ops } = event.detail
+      if (project_id !== projectId) return
+
+      let stale = false
+      queryClient.setQueryData(['kanban-board', projectId], (oldData: any) => {
+        if (!oldData?.board || oldData.version !== base_version) {
+          stale = true
+          return oldData
+        }
+        return { ...applyKanbanPatch(oldData, ops), version }
+      })
+      if (stale) {
+        queryClient.invalidateQueries({ queryKey: ['kanban-board', projectId] })
+      }
+    }
+
+    window.addEventListener('kanban-patch', handleKanbanPatch as EventListener)
+    return () => {
+      window.removeEventListener('kanban-patch', handleKanbanPatch as EventListener)
+    }
+  }, [projectId, queryClient])
+
   // Get cards by column
   const getCardsByColumn = useCallback((columnId: string) => {
     return cards
@@ -10,6 +10,7 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import type { KanbanCardData } from "./kanban-card"
 import React, { useState, useRef, useEffect, useMemo } from "react"
 import { ErrorBoundary } from "@/components/shared/error-boundary"
+import { applyStoryStreamUpdate, type StoryStreamUpdate, type StreamedFile } from "@/lib/story-stream"
 
 // DiffsView component for showing git diffs
 interface DiffFile {
@@ -333,10 +334,30 @@ export function TaskDetailModal({ card, open, onOpenChange, onDownloadResult, al
     return () => window.removeEventListener('story-log', handleStoryLog as EventListener)
   }, [card?.id])
   
+  // Partial output of files being generated (story_stream frames, not persisted)
+  const [streamedFiles, setStreamedFiles] = useState<Record<string, StreamedFile>>({})
+  
+  useEffect(() => {
+    if (!card?.id) return
+    
+    const handleStoryStream = (event: CustomEvent<StoryStreamUpdate>) => {
+      if (event.detail.story_id === card.id) {
+        setStreamedFiles(prev => applyStoryStreamUpdate(prev, event.detail))
+      }
+    }
+    
+    window.addEventListener('story-stream', handleStoryStream as EventListener)
+    return () => window.removeEventListener('story-stream', handleStoryStream as EventListener)
+  }, [card?.id])
+  
+  // Written files drop out: their content is in the workspace, their progress in the logs
+  const liveFiles = useMemo(() => Object.values(streamedFiles).filter(file => !file.done), [streamedFiles])
+  
   // Fetch historical logs and clear when modal opens for a new card
   useEffect(() => {
     if (open && card?.id) {
       setStoryLogs([])
+      setStreamedFiles({})
       // Fetch historical logs from API
       const fetchLogs = async () => {
         try {
@@ -375,7 +396,7 @@ export function TaskDetailModal({ card, open, onOpenChange, onDownloadResult, al
         })
       }, 50)
     }
-  }, [storyLogs])
+  }, [storyLogs, streamedFiles])
 
   // Cancel task handler
   const handleCancelTask = async () => {
@@ -1215,7 +1236,7 @@ export function TaskDetailModal({ card, open, onOpenChange, onDownloadResult, al
           {/* Logs Tab - Timeline style */}
           <TabsContent value="logs" ref={logsScrollRef} className="flex-1 overflow-y-auto mt-4 min-h-0">
             <div className="space-y-1 px-1 font-mono text-xs">
-              {storyLogs.length === 0 ? (
+              {storyLogs.length === 0 && liveFiles.length === 0 ? (
                 <div className="text-center text-muted-foreground py-8">
                   <ScrollText className="w-12 h-12 mx-auto mb-3 opacity-50" />
                   <p className="text-sm">No logs yet</p>
@@ -1248,6 +1269,21 @@ export function TaskDetailModal({ card, open, onOpenChange, onDownloadResult, al
                   </div>
                 ))
               )}
+              {liveFiles.map((file) => (
+                <div key={file.file_path} className="rounded border border-primary/20 bg-muted/30 px-2 py-1">
+                  <div className="flex items-center gap-2 text-muted-foreground">
+                    <Loader2 className="w-3 h-3 animate-spin shrink-0" />
+                    {file.node && <span className="text-primary/70 shrink-0">[{file.node}]</span>}
+                    <span className="flex-1 truncate" title={file.file_path}>{file.file_path}</span>
+                    <span className="shrink-0">~{file.tokens} tokens</span>
+                  </div>
+                  {file.gap ? (
+                    <p className="mt-1 text-muted-foreground/70">Output resumes when the file is written</p>
+                  ) : (
+                    <pre className="mt-1 max-h-48 overflow-y-auto whitespace-pre-wrap break-all">{file.content.slice(-4000)}</pre>
+                  )}
+                </div>
+              ))}
             </div>
           </TabsContent>
 
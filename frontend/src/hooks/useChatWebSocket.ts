@@ -192,6 +192,10 @@ export function useChatWebSocket(
         handleStoryTask(msg)
         break
       
+      case 'story_stream':
+        handleStoryStream(msg)
+        break
+      
       case 'story_state_changed':
         handleStoryStateChanged(msg)
         break
@@ -200,6 +204,10 @@ export function useChatWebSocket(
         handleStoryStatusChanged(msg)
         break
       
+      case 'kanban_patch':
+        handleKanbanPatch(msg)
+        break
+      
       case 'branch_changed':
         handleBranchChanged(msg)
         break
@@ -608,6 +616,13 @@ export function useChatWebSocket(
     }))
   }
   
+  const handleStoryStream = (msg: any) => {
+    // One frame carries the coalesced deltas of every file streaming in the room
+    for (const update of msg.updates || []) {
+      window.dispatchEvent(new CustomEvent('story-stream', { detail: update }))
+    }
+  }
+  
   const handleStoryLog = (msg: any) => {
     
     window.dispatchEvent(new CustomEvent('story-log', {
@@ -649,6 +664,18 @@ export function useChatWebSocket(
     }))
   }
   
+  const handleKanbanPatch = (msg: any) => {
+    // Dispatch custom event for KanbanBoard to apply board delta
+    window.dispatchEvent(new CustomEvent('kanban-patch', {
+      detail: {
+        project_id: msg.project_id,
+        base_version: msg.base_version,
+        version: msg.version,
+        ops: msg.ops,
+      }
+    }))
+  }
+  
   const handleBranchChanged = (msg: any) => {    
     // Dispatch custom event for FileExplorer to listen
     window.dispatchEvent(new CustomEvent('branch-changed', {
@@ -0,0 +1,57 @@
+/**
+ * Story Stream - partial agent output from `story_stream` WebSocket frames
+ *
+ * The backend coalesces deltas per (story, file) and sends each with the
+ * `offset` it starts at, so a client that missed a frame (e.g. while
+ * reconnecting) can tell and stop appending until the file is written.
+ */
+
+export interface StoryStreamUpdate {
+  story_id: string
+  file_path: string
+  node: string
+  offset: number
+  delta: string
+  chars: number
+  tokens: number
+  done: boolean
+}
+
+export interface StreamedFile {
+  file_path: string
+  node: string
+  content: string
+  chars: number
+  tokens: number
+  done: boolean
+  gap: boolean  // A frame was missed: content is incomplete
+}
+
+export function applyStoryStreamUpdate(
+  files: Record<string, StreamedFile>,
+  update: StoryStreamUpdate
+): Record<string, StreamedFile> {
+  const current = update.offset === 0 ? undefined : files[update.file_path]
+  let content = current?.content ?? ""
+  let gap = current?.gap ?? false
+
+  if (!gap && update.offset > content.length) {
+    gap = true  // Wait for the written file instead of showing a hole
+  } else if (!gap) {
+    // Replayed deltas start before the end of what we have: keep the prefix
+    content = content.slice(0, update.offset) + update.delta
+  }
+
+  return {
+    ...files,
+    [update.file_path]: {
+      file_path: update.file_path,
+      node: update.node,
+      content,
+      chars: update.chars,
+      tokens: update.tokens,
+      done: update.done,
+      gap,
+    },
+  }
+}
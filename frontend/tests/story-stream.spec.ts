@@ -0,0 +1,46 @@
+import { expect, test } from "@playwright/test"
+
+import { applyStoryStreamUpdate, type StoryStreamUpdate } from "../src/lib/story-stream"
+
+function update(offset: number, delta: string, done = false): StoryStreamUpdate {
+  const chars = offset + delta.length
+  return { story_id: "s1", file_path: "src/app/page.tsx", node: "implement", offset, delta, chars, tokens: Math.floor(chars / 4), done }
+}
+
+test.describe("applyStoryStreamUpdate", () => {
+  test("appends consecutive deltas", () => {
+    let files = applyStoryStreamUpdate({}, update(0, "export default "))
+    files = applyStoryStreamUpdate(files, update(15, "function Page() {}"))
+
+    expect(files["src/app/page.tsx"]).toMatchObject({
+      content: "export default function Page() {}",
+      chars: 33,
+      gap: false,
+      done: false,
+    })
+  })
+
+  test("stops appending after a missed frame until the stream restarts", () => {
+    let files = applyStoryStreamUpdate({}, update(0, "export "))
+    files = applyStoryStreamUpdate(files, update(20, "lost frame before this"))
+    files = applyStoryStreamUpdate(files, update(42, "more", true))
+
+    expect(files["src/app/page.tsx"]).toMatchObject({ content: "export ", gap: true, done: true })
+
+    files = applyStoryStreamUpdate(files, update(0, "retry"))
+    expect(files["src/app/page.tsx"]).toMatchObject({ content: "retry", gap: false })
+  })
+
+  test("joining mid-stream waits for the written file", () => {
+    const files = applyStoryStreamUpdate({}, update(10, "const x = 1"))
+
+    expect(files["src/app/page.tsx"]).toMatchObject({ content: "", gap: true })
+  })
+
+  test("replayed deltas overwrite from their offset", () => {
+    let files = applyStoryStreamUpdate({}, update(0, "abcdef"))
+    files = applyStoryStreamUpdate(files, update(3, "XYZ"))
+
+    expect(files["src/app/page.tsx"].content).toBe("abcXYZ")
+  })
+})